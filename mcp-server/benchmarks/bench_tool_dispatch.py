@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""工具分发微基准测试。
+
+测量 MCP Server 每次工具调用的分发开销（不含工具本身的业务逻辑）：
+1. list_tools：返回缓存的 Tool 列表
+2. 注册表查找 + 参数校验
+3. 响应序列化（共享编码器）
+4. 完整 call_tool 路径（查找、校验、工作池往返、序列化）
+
+运行方式：
+    cd mcp-server && PYTHONPATH=. python3 benchmarks/bench_tool_dispatch.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# 使用临时目录，避免在当前目录创建 .agent-orchestrator
+os.environ.setdefault("AGENT_ORCHESTRATOR_ROOT", tempfile.mkdtemp())
+
+from src import mcp_server  # noqa: E402
+
+ITERATIONS = 20000
+ASYNC_ITERATIONS = 2000
+
+_ARGUMENTS = {"workspace_id": "req-bench", "task_id": "task-001"}
+_PAYLOAD = {"success": True, "workspace_id": "req-bench", "tasks": [{"id": 1}] * 5}
+
+
+def _report(label: str, total_seconds: float, iterations: int) -> None:
+    """打印单项基准结果。"""
+    per_call_us = total_seconds / iterations * 1_000_000
+    print(f"{label:<40} {per_call_us:>10.2f} µs/call  ({iterations} 次)")
+
+
+def bench_sync() -> None:
+    """同步路径基准。"""
+    registry = mcp_server.tool_registry
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        registry.list_tools()
+    _report("list_tools（缓存）", time.perf_counter() - start, ITERATIONS)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        registry.get("generate_code").validate(_ARGUMENTS)
+    _report("注册表查找 + 参数校验", time.perf_counter() - start, ITERATIONS)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        mcp_server._to_text_content(_PAYLOAD)
+    _report("响应序列化（共享编码器）", time.perf_counter() - start, ITERATIONS)
+
+
+async def bench_call_tool() -> None:
+    """完整 call_tool 路径基准（使用无 I/O 的 ask_orchestrator_questions）。"""
+    await mcp_server.call_tool("ask_orchestrator_questions", {})  # 预热工作池
+
+    start = time.perf_counter()
+    for _ in range(ASYNC_ITERATIONS):
+        await mcp_server.call_tool("ask_orchestrator_questions", {})
+    _report("call_tool 完整路径", time.perf_counter() - start, ASYNC_ITERATIONS)
+
+
+if __name__ == "__main__":
+    print(f"已注册工具数: {len(mcp_server.tool_registry)}")
+    bench_sync()
+    asyncio.run(bench_call_tool())
+    mcp_server.worker_pool.shutdown()
@@ -16,5 +16,6 @@ setup(
     install_requires=[
         "mcp>=0.1.0",
         "pydantic>=2.0.0",
+        "httpx>=0.24.0",
     ],
 )
@@ -7,6 +7,26 @@ import os
 from pathlib import Path
 
 
+def _parse_list(value: str) -> list[str]:
+    """解析逗号分隔的列表配置，如 "a,b,c"。"""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _parse_bool(value: str) -> bool:
+    """解析布尔型配置（"1" / "true" / "yes" / "on" 为 True，不区分大小写）。"""
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _parse_limits(value: str) -> dict[str, int]:
+    """解析 "name=N,name=N" 格式的限制配置，忽略格式错误的条目。"""
+    limits = {}
+    for item in _parse_list(value):
+        name, sep, limit = item.partition("=")
+        if sep and name.strip() and limit.strip().isdigit():
+            limits[name.strip()] = int(limit.strip())
+    return limits
+
+
 class Config:
     """统一配置管理。"""
 
@@ -35,6 +55,17 @@ class Config:
         self.gemini_api_key = os.getenv("GEMINI_API_KEY", "")
         self.claude_api_key = os.getenv("CLAUDE_API_KEY", "")
 
+        # LLM 提供方（"stub" 为本地确定性实现，"gemini" / "claude" 调用对应 API）
+        self.llm_provider = os.getenv("LLM_PROVIDER", "stub").strip().lower()
+        self.llm_model = os.getenv("LLM_MODEL", "").strip()
+        self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+        self.llm_max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "10"))
+        self.llm_timeout = float(os.getenv("LLM_TIMEOUT", "60"))
+        self.llm_max_tokens = int(os.getenv("LLM_MAX_TOKENS", "4096"))
+        # 提示词 -> 响应的磁盘缓存（位于 cache_dir/llm）
+        self.llm_cache = _parse_bool(os.getenv("LLM_CACHE", "true"))
+        self.llm_cache_max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "4096"))
+
         # 重试配置
         self.max_retry_attempts = int(os.getenv("MAX_RETRY_ATTEMPTS", "3"))
         self.retry_delay = float(os.getenv("RETRY_DELAY", "1.0"))
@@ -42,6 +73,74 @@ class Config:
         # Review 循环最大次数
         self.max_review_cycles = int(os.getenv("MAX_REVIEW_CYCLES", "5"))
 
+        # 工具工作池配置（阻塞的工具处理函数在工作池中执行，不阻塞事件循环）
+        self.tool_worker_threads = int(os.getenv("TOOL_WORKER_THREADS", "8"))
+        self.tool_worker_processes = int(os.getenv("TOOL_WORKER_PROCESSES", "0"))
+        self.tool_process_tools = _parse_list(os.getenv("TOOL_PROCESS_TOOLS", ""))
+        self.tool_concurrency_limits = _parse_limits(
+            os.getenv(
+                "TOOL_CONCURRENCY_LIMITS",
+                "execute_full_workflow=1,execute_all_tasks=1,"
+                "analyze_coverage=1,execute_task=2",
+            )
+        )
+
+        # execute_all_tasks 同时执行的最大任务数
+        self.task_parallelism = int(os.getenv("TASK_PARALLELISM", "4"))
+
+        # 缓存目录（代码库扫描等可以重新生成的数据）
+        self.cache_dir = self.agent_orchestrator_dir / "cache"
+
+        # 需求文档保留的规范化文本字符数（生成 PRD 时使用，超出部分只统计大纲）
+        self.requirement_max_chars = int(os.getenv("REQUIREMENT_MAX_CHARS", "20000"))
+
+        # 下载需求文档（http(s) URL）的超时（秒）和大小上限（字节，0 表示不限制）
+        self.requirement_fetch_timeout = float(
+            os.getenv("REQUIREMENT_FETCH_TIMEOUT", "30")
+        )
+        self.requirement_fetch_max_bytes = int(
+            os.getenv("REQUIREMENT_FETCH_MAX_BYTES", str(50 * 1024 * 1024))
+        )
+
+        # 代码库扫描追加的忽略规则（.gitignore 语法，逗号分隔）
+        self.codebase_scan_excludes = _parse_list(
+            os.getenv("CODEBASE_SCAN_EXCLUDES", "")
+        )
+
+        # 覆盖率分析超时（秒）：检测 coverage 工具、运行测试、生成报告
+        self.coverage_probe_timeout = float(os.getenv("COVERAGE_PROBE_TIMEOUT", "10"))
+        self.coverage_run_timeout = float(os.getenv("COVERAGE_RUN_TIMEOUT", "600"))
+        self.coverage_report_timeout = float(os.getenv("COVERAGE_REPORT_TIMEOUT", "60"))
+
+        # 覆盖率分析并行运行测试的分片数（小于等于 1 时不分片）
+        self.coverage_parallel_workers = int(
+            os.getenv("COVERAGE_PARALLEL_WORKERS", "1")
+        )
+
+        # 代码审查：并行审查的最大进程数、启用的规则（为空表示全部）和函数圈复杂度上限
+        self.review_workers = int(os.getenv("REVIEW_WORKERS", "4"))
+        self.review_rules = _parse_list(os.getenv("REVIEW_RULES", ""))
+        self.review_max_complexity = int(os.getenv("REVIEW_MAX_COMPLEXITY", "10"))
+
+        # 审查结果缓存（按文件内容哈希，位于工作区的 review_cache 目录）最多保留的条目数
+        self.review_cache_max_entries = int(
+            os.getenv("REVIEW_CACHE_MAX_ENTRIES", "1024")
+        )
+
+        # 存储后端配置（"json" 或 "sqlite"）
+        self.storage_backend = os.getenv("STORAGE_BACKEND", "json").strip().lower()
+        self.storage_sqlite_path = Path(
+            os.getenv(
+                "STORAGE_SQLITE_PATH",
+                str(self.agent_orchestrator_dir / "orchestrator.db"),
+            )
+        )
+        # JSON 存储后端写入元数据文件时是否 fsync、是否使用紧凑 JSON（无缩进）
+        self.storage_fsync = _parse_bool(os.getenv("STORAGE_FSYNC", "true"))
+        self.storage_compact_json = _parse_bool(
+            os.getenv("STORAGE_COMPACT_JSON", "true")
+        )
+
     def get_workspace_path(self, workspace_id: str) -> Path:
         """获取工作区路径。
 
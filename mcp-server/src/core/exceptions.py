@@ -44,3 +44,9 @@ class GitError(AgentOrchestratorError):
     """Git 操作错误异常。"""
 
     pass
+
+
+class LLMError(AgentOrchestratorError):
+    """LLM 调用错误异常。"""
+
+    pass
@@ -0,0 +1,95 @@
+"""LLM 提供方接口 - 生成器调用大模型的抽象。
+
+Python 3.9+ 兼容
+
+PRD / TRD 生成、任务分解和代码生成通过 `LLMClient`（`src.llm.client`）调用大模型，
+具体实现：
+- `StubProvider`: 本地确定性实现，不访问网络（默认，用于离线开发和测试）
+- `GeminiProvider` / `ClaudeProvider`: 通过 HTTP API 调用（`src.llm.http_provider`）
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class LLMRequest:
+    """一次生成请求。"""
+
+    __slots__ = ("prompt", "system", "max_tokens", "temperature", "fallback")
+
+    def __init__(
+        self,
+        prompt: str,
+        system: str = "",
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        fallback: Optional[str] = None,
+    ) -> None:
+        """初始化生成请求。
+
+        Args:
+            prompt: 提示词
+            system: 系统提示词
+            max_tokens: 最大输出 token 数（None 表示使用 LLM_MAX_TOKENS 配置）
+            temperature: 采样温度
+            fallback: 模板生成的内容，调用失败时使用；StubProvider 直接返回它
+        """
+        self.prompt = prompt
+        self.system = system
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.fallback = fallback
+
+    def cache_key(self, namespace: str) -> str:
+        """缓存键（不包含 fallback，相同提示词的请求共享响应）。"""
+        payload = json.dumps(
+            [namespace, self.system, self.prompt, self.max_tokens, self.temperature],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMProvider(ABC):
+    """LLM 提供方接口。
+
+    `complete` 在 `LLMClient` 的后台事件循环中执行，实现可以持有该循环上的
+    异步资源（如连接池），在 `aclose` 中释放。
+    """
+
+    # 提供方名称（用于缓存命名空间和日志）
+    name = "base"
+
+    # 响应是否值得缓存到磁盘（本地确定性实现不需要）
+    cacheable = True
+
+    def __init__(self, model: str = "") -> None:
+        """初始化提供方。
+
+        Args:
+            model: 模型名称
+        """
+        self.model = model
+
+    @abstractmethod
+    async def complete(self, request: LLMRequest, max_tokens: int) -> str:
+        """生成文本。
+
+        Args:
+            request: 生成请求
+            max_tokens: 最大输出 token 数（已应用默认值）
+
+        Returns:
+            生成的文本
+
+        Raises:
+            LLMError: 当调用失败时
+        """
+
+    # 有意提供默认实现（而非抽象方法）：不持有资源的提供方不需要实现
+    async def aclose(self) -> None:  # noqa: B027
+        """释放提供方持有的资源。
+
+        默认无操作；持有连接池等异步资源的提供方（如 `HttpProvider`）覆盖此方法。
+        """
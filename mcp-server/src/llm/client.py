@@ -0,0 +1,170 @@
+"""LLM 客户端 - 并发限制、请求合并和磁盘缓存。
+
+Python 3.9+ 兼容
+
+- 提供方在一个常驻的后台事件循环中执行，连接池在多次调用之间复用；
+  MCP 工具是同步函数，通过 `complete` / `complete_many` 调用
+- `LLM_MAX_CONCURRENCY` 限制同时进行的请求数
+- 相同的进行中请求只调用一次提供方（请求合并）
+- 响应按 (提供方, 模型, 提示词) 的哈希缓存在 cache_dir/llm 下，LRU 淘汰
+"""
+
+import asyncio
+import threading
+from typing import Optional
+
+from src.core.config import Config
+from src.core.logger import setup_logger
+from src.llm.base import LLMProvider, LLMRequest
+from src.utils.content_cache import ContentHashLRUCache
+
+logger = setup_logger(__name__)
+
+# cache_dir 下的响应缓存目录名
+LLM_CACHE_DIR = "llm"
+
+
+class LLMClient:
+    """LLM 客户端。"""
+
+    def __init__(self, config: Config, provider: LLMProvider) -> None:
+        """初始化客户端。
+
+        Args:
+            config: 配置管理器
+            provider: LLM 提供方
+        """
+        self.provider = provider
+        self.max_tokens = config.llm_max_tokens
+        self.max_concurrency = max(1, config.llm_max_concurrency)
+        self.cache: Optional[ContentHashLRUCache] = None
+        if config.llm_cache and provider.cacheable:
+            self.cache = ContentHashLRUCache(
+                config.cache_dir / LLM_CACHE_DIR,
+                f"llm:{provider.name}:{provider.model}",
+                max_entries=config.llm_cache_max_entries,
+            )
+        self.calls = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """启动后台事件循环（第一次调用时）。"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="llm-client", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """限制同时进行的请求数的信号量（第一次使用时创建）。
+
+        须在后台事件循环中调用：Python 3.9 的 Semaphore 绑定创建时的事件循环。
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def acomplete(self, request: LLMRequest) -> str:
+        """生成文本（异步，须在后台事件循环中调用）。
+
+        Raises:
+            LLMError: 当提供方调用失败时
+        """
+        key = request.cache_key(f"{self.provider.name}:{self.provider.model}")
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None and isinstance(cached.get("text"), str):
+                return cached["text"]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            async with self._get_semaphore():
+                self.calls += 1
+                text = await self.provider.complete(
+                    request, request.max_tokens or self.max_tokens
+                )
+        except Exception as e:
+            future.set_exception(e)
+            # 没有等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(text)
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._inflight[key]
+
+        if self.cache is not None and text:
+            self.cache.put(key, {"text": text})
+            self.cache.evict()
+        return text
+
+    async def acomplete_many(self, requests: list[LLMRequest]) -> list[object]:
+        """并发生成多个请求（异步）。
+
+        Returns:
+            与 requests 一一对应的结果：成功为 str，失败为异常对象
+        """
+        return list(
+            await asyncio.gather(
+                *(self.acomplete(request) for request in requests),
+                return_exceptions=True,
+            )
+        )
+
+    def complete(self, request: LLMRequest) -> str:
+        """生成文本（同步）。
+
+        Raises:
+            LLMError: 当提供方调用失败时
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.acomplete(request), loop).result()
+
+    def complete_many(self, requests: list[LLMRequest]) -> list[object]:
+        """并发生成多个请求（同步）。
+
+        Returns:
+            与 requests 一一对应的结果：成功为 str，失败为异常对象
+        """
+        if not requests:
+            return []
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self.acomplete_many(requests), loop
+        ).result()
+
+    def close(self) -> None:
+        """释放提供方资源并停止后台事件循环。"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+            self._semaphore = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.provider.aclose(), loop).result(
+                timeout=10
+            )
+        except Exception as e:
+            logger.warning(f"关闭 LLM 提供方失败: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=10)
+        loop.close()
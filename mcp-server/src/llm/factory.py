@@ -0,0 +1,121 @@
+"""LLM 客户端工厂。
+
+Python 3.9+ 兼容
+"""
+
+import threading
+from typing import Optional
+
+from src.core.config import Config
+from src.core.exceptions import LLMError, ValidationError
+from src.core.logger import setup_logger
+from src.llm.base import LLMProvider, LLMRequest
+from src.llm.client import LLMClient
+from src.llm.http_provider import ClaudeProvider, GeminiProvider, HttpProvider
+from src.llm.stub_provider import StubProvider
+
+logger = setup_logger(__name__)
+
+# 提供方名称（LLM_PROVIDER）-> 实现类
+_PROVIDERS: dict[str, type[LLMProvider]] = {
+    StubProvider.name: StubProvider,
+    GeminiProvider.name: GeminiProvider,
+    ClaudeProvider.name: ClaudeProvider,
+}
+
+# 客户端按 (提供方, 模型, 缓存目录) 缓存，同一进程内复用连接池和后台事件循环
+_clients: dict[tuple[str, str, str], LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _create_provider(config: Config, provider_class: type[LLMProvider]) -> LLMProvider:
+    """创建提供方（HTTP API 提供方使用对应配置项中的 API 密钥）。
+
+    Raises:
+        ValidationError: 当缺少 API 密钥时
+    """
+    if not issubclass(provider_class, HttpProvider):
+        return provider_class(config.llm_model)
+    api_key = getattr(config, provider_class.api_key_setting)
+    if not api_key:
+        raise ValidationError(
+            f"LLM_PROVIDER={provider_class.name} 需要设置 "
+            f"{provider_class.api_key_setting.upper()}"
+        )
+    return provider_class(config, api_key, config.llm_model)
+
+
+def get_llm_client(config: Config) -> LLMClient:
+    """根据配置获取 LLM 客户端。
+
+    Args:
+        config: 配置管理器
+
+    Returns:
+        LLM 客户端实例
+
+    Raises:
+        ValidationError: 当提供方未知或缺少 API 密钥时
+    """
+    provider_class = _PROVIDERS.get(config.llm_provider)
+    if provider_class is None:
+        raise ValidationError(f"未知 LLM 提供方: {config.llm_provider}")
+    # 不使用磁盘缓存时与工作区根目录无关，所有工作区共享一个客户端
+    use_cache = config.llm_cache and provider_class.cacheable
+    cache_root = str(config.cache_dir.absolute()) if use_cache else ""
+    key = (config.llm_provider, config.llm_model, cache_root)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = LLMClient(config, _create_provider(config, provider_class))
+            _clients[key] = client
+    return client
+
+
+def close_llm_clients() -> None:
+    """关闭所有缓存的 LLM 客户端。"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def generate_texts(
+    requests: list[LLMRequest], config: Optional[Config] = None
+) -> list[str]:
+    """批量生成文本，失败时使用请求的 fallback。
+
+    生成器工具通过此函数调用 LLM：调用失败或响应为空时记录警告并使用模板内容，
+    不会让工具失败。
+
+    Args:
+        requests: 生成请求（每个请求都应带有 fallback）
+        config: 配置管理器（None 表示使用默认配置）
+
+    Returns:
+        与 requests 一一对应的文本
+
+    Raises:
+        ValidationError: 当 LLM 配置无效时
+        LLMError: 当调用失败且请求没有 fallback 时
+    """
+    client = get_llm_client(config or Config())
+    results = client.complete_many(requests)
+    texts = []
+    for request, result in zip(requests, results):
+        if isinstance(result, str) and result.strip():
+            texts.append(result)
+            continue
+        if request.fallback is None:
+            if isinstance(result, BaseException):
+                raise LLMError(f"LLM 调用失败: {result}") from result
+            raise LLMError("LLM 返回空响应")
+        reason = result if isinstance(result, BaseException) else "空响应"
+        logger.warning(f"LLM 生成失败，使用模板内容: {reason}")
+        texts.append(request.fallback)
+    return texts
+
+
+def generate_text(request: LLMRequest, config: Optional[Config] = None) -> str:
+    """生成单个文本，失败时使用请求的 fallback（见 `generate_texts`）。"""
+    return generate_texts([request], config)[0]
@@ -0,0 +1,177 @@
+"""HTTP API 提供方 - Gemini 和 Claude。
+
+Python 3.9+ 兼容
+
+- 每个提供方持有一个 `httpx.AsyncClient`（在 LLMClient 的后台事件循环中创建），
+  多次调用复用连接池
+- 429 和 5xx 响应、网络错误按 MAX_RETRY_ATTEMPTS / RETRY_DELAY 指数退避重试
+"""
+
+import asyncio
+from abc import abstractmethod
+from typing import Any, Optional
+
+from src.core.config import Config
+from src.core.exceptions import LLMError
+from src.core.logger import setup_logger
+from src.llm.base import LLMProvider, LLMRequest
+
+logger = setup_logger(__name__)
+
+# 可以重试的 HTTP 状态码
+_RETRY_STATUS = {408, 429, 500, 502, 503, 504, 529}
+
+
+class HttpProvider(LLMProvider):
+    """基于 HTTP API 的提供方基类。"""
+
+    # 未配置 LLM_MODEL 时使用的模型
+    default_model = ""
+
+    # API 密钥的配置项（Config 属性名，环境变量为其大写形式）
+    api_key_setting = ""
+
+    def __init__(self, config: Config, api_key: str, model: str = "") -> None:
+        """初始化提供方。
+
+        Args:
+            config: 配置管理器（超时、连接数、重试配置）
+            api_key: API 密钥
+            model: 模型名称（为空时使用 default_model）
+        """
+        super().__init__(model or self.default_model)
+        self.api_key = api_key
+        self.timeout = config.llm_timeout
+        self.max_connections = config.llm_max_connections
+        self.max_attempts = max(1, config.max_retry_attempts)
+        self.retry_delay = config.retry_delay
+        self._client: Optional[Any] = None
+
+    def _get_client(self) -> Any:
+        """获取连接池（延迟创建，绑定到当前事件循环）。"""
+        if self._client is None:
+            try:
+                import httpx
+            except ImportError as e:
+                raise LLMError("调用 LLM API 需要安装 httpx") from e
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    @abstractmethod
+    def build_request(
+        self, request: LLMRequest, max_tokens: int
+    ) -> tuple[str, dict, dict]:
+        """构造 HTTP 请求。
+
+        Returns:
+            (URL, 请求头, JSON 请求体)
+        """
+
+    @abstractmethod
+    def parse_response(self, data: dict) -> str:
+        """从 JSON 响应中提取生成的文本。"""
+
+    async def complete(self, request: LLMRequest, max_tokens: int) -> str:
+        """调用 API 生成文本，可重试的错误按指数退避重试。"""
+        client = self._get_client()
+        url, headers, body = self.build_request(request, max_tokens)
+        last_error = ""
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * (2 ** (attempt - 1)))
+            try:
+                response = await client.post(url, headers=headers, json=body)
+            except Exception as e:  # httpx.TransportError 等网络错误
+                last_error = f"请求失败: {e}"
+                logger.warning(f"{self.name} {last_error}，第 {attempt + 1} 次")
+                continue
+            if response.status_code in _RETRY_STATUS:
+                last_error = f"HTTP {response.status_code}"
+                logger.warning(f"{self.name} 返回 {last_error}，第 {attempt + 1} 次")
+                continue
+            if response.status_code >= 400:
+                raise LLMError(
+                    f"{self.name} 返回 HTTP {response.status_code}: "
+                    f"{response.text[:200]}"
+                )
+            try:
+                return self.parse_response(response.json())
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise LLMError(f"{self.name} 响应格式无效: {e}") from e
+        raise LLMError(
+            f"{self.name} 调用失败（重试 {self.max_attempts} 次）: {last_error}"
+        )
+
+    async def aclose(self) -> None:
+        """关闭连接池。"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class GeminiProvider(HttpProvider):
+    """Google Gemini（generateContent API）。"""
+
+    name = "gemini"
+    default_model = "gemini-1.5-flash"
+    api_key_setting = "gemini_api_key"
+    base_url = "https://generativelanguage.googleapis.com/v1beta"
+
+    def build_request(
+        self, request: LLMRequest, max_tokens: int
+    ) -> tuple[str, dict, dict]:
+        """构造 generateContent 请求。"""
+        body: dict = {
+            "contents": [{"role": "user", "parts": [{"text": request.prompt}]}],
+            "generationConfig": {
+                "maxOutputTokens": max_tokens,
+                "temperature": request.temperature,
+            },
+        }
+        if request.system:
+            body["systemInstruction"] = {"parts": [{"text": request.system}]}
+        url = f"{self.base_url}/models/{self.model}:generateContent"
+        return url, {"x-goog-api-key": self.api_key}, body
+
+    def parse_response(self, data: dict) -> str:
+        """拼接第一个候选结果的文本片段。"""
+        parts = data["candidates"][0]["content"]["parts"]
+        return "".join(part.get("text", "") for part in parts)
+
+
+class ClaudeProvider(HttpProvider):
+    """Anthropic Claude（Messages API）。"""
+
+    name = "claude"
+    default_model = "claude-3-5-sonnet-latest"
+    api_key_setting = "claude_api_key"
+    base_url = "https://api.anthropic.com/v1"
+
+    def build_request(
+        self, request: LLMRequest, max_tokens: int
+    ) -> tuple[str, dict, dict]:
+        """构造 Messages API 请求。"""
+        body: dict = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": request.temperature,
+            "messages": [{"role": "user", "content": request.prompt}],
+        }
+        if request.system:
+            body["system"] = request.system
+        headers = {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"}
+        return f"{self.base_url}/messages", headers, body
+
+    def parse_response(self, data: dict) -> str:
+        """拼接响应中的文本块。"""
+        return "".join(
+            block.get("text", "")
+            for block in data["content"]
+            if block.get("type") == "text"
+        )
@@ -0,0 +1,28 @@
+"""本地 stub 提供方 - 确定性生成，不访问网络。
+
+Python 3.9+ 兼容
+"""
+
+import hashlib
+
+from src.llm.base import LLMProvider, LLMRequest
+
+
+class StubProvider(LLMProvider):
+    """本地确定性提供方。
+
+    - 请求带有 fallback（模板生成的内容）时原样返回，生成器的输出与不使用 LLM 时一致
+    - 否则返回由提示词哈希确定的固定文本，相同请求总是得到相同响应
+    """
+
+    name = "stub"
+    cacheable = False
+
+    async def complete(self, request: LLMRequest, max_tokens: int) -> str:
+        """返回确定性的响应。"""
+        if request.fallback is not None:
+            return request.fallback
+        digest = hashlib.sha256(
+            f"{request.system}\0{request.prompt}".encode()
+        ).hexdigest()[:12]
+        return f"[stub:{digest}] {request.prompt[:200]}"
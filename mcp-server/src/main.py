@@ -13,7 +13,9 @@ Python 版本要求：>= 3.9
     2. Ctrl+C (SIGINT) - 优雅关闭
     3. kill <PID> (SIGTERM) - 优雅关闭
 """
+
 import atexit
+import contextlib
 import signal
 import sys
 from pathlib import Path
@@ -58,12 +60,9 @@ def safe_log_info(message: str) -> None:
         # 如果日志不可用，使用 print 输出到 stderr
         print(f"[INFO] {message}", file=sys.stderr)
     except (ValueError, AttributeError, OSError):
-        # 如果日志系统已关闭，使用 print
-        try:
+        # 如果日志系统已关闭，使用 print（stderr 也可能已关闭，忽略）
+        with contextlib.suppress(OSError):
             print(f"[INFO] {message}", file=sys.stderr)
-        except OSError:
-            # stderr 也可能已关闭，忽略
-            pass
 
 
 def cleanup_resources() -> None:
@@ -78,6 +77,38 @@ def cleanup_resources() -> None:
 
     safe_log_info("清理资源...")
 
+    # 关闭工具工作池（仅当 MCP Server 已加载时）
+    mcp_server = sys.modules.get("src.mcp_server")
+    if mcp_server is not None:
+        try:
+            mcp_server.worker_pool.shutdown(wait=False)
+        except Exception as e:
+            safe_log_info(f"关闭工具工作池时出错: {e}")
+
+    # 关闭存储后端（SQLite 连接）
+    storage_factory = sys.modules.get("src.storage.factory")
+    if storage_factory is not None:
+        try:
+            storage_factory.close_storage_backends()
+        except Exception as e:
+            safe_log_info(f"关闭存储后端时出错: {e}")
+
+    # 关闭 LLM 客户端（连接池和后台事件循环）
+    llm_factory = sys.modules.get("src.llm.factory")
+    if llm_factory is not None:
+        try:
+            llm_factory.close_llm_clients()
+        except Exception as e:
+            safe_log_info(f"关闭 LLM 客户端时出错: {e}")
+
+    # 关闭下载需求文档的 HTTP 客户端
+    requirement_fetcher = sys.modules.get("src.utils.requirement_fetcher")
+    if requirement_fetcher is not None:
+        try:
+            requirement_fetcher.close_requirement_clients()
+        except Exception as e:
+            safe_log_info(f"关闭 HTTP 客户端时出错: {e}")
+
     # TODO: 添加资源清理逻辑
     # - 关闭文件句柄
     # - 释放文件锁
@@ -3,15 +3,13 @@
 Python 3.9+ 兼容：使用内置类型 dict, list 而非 typing.Dict, typing.List
 """
 
-import json
-from pathlib import Path
 from typing import Optional
 
 from src.core.config import Config
 from src.core.exceptions import TaskNotFoundError
 from src.core.logger import setup_logger
 from src.managers.workspace_manager import WorkspaceManager
-from src.utils.file_lock import file_lock, read_lock
+from src.storage.base import StorageBackend
 
 logger = setup_logger(__name__)
 
@@ -19,38 +17,36 @@ logger = setup_logger(__name__)
 class TaskManager:
     """任务管理器。"""
 
-    def __init__(self, config: Optional[Config] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        storage: Optional[StorageBackend] = None,
+    ) -> None:
         """初始化任务管理器。
 
         Args:
             config: 配置管理器，如果为 None 则创建默认配置
+            storage: 存储后端，如果为 None 则根据配置（STORAGE_BACKEND）选择
         """
         self.config = config or Config()
-        self.workspace_manager = WorkspaceManager(config=self.config)
+        self.workspace_manager = WorkspaceManager(config=self.config, storage=storage)
+        self.storage = self.workspace_manager.storage
 
-    def get_tasks_file(self, workspace_id: str) -> Path:
-        """获取任务文件路径。
+    def has_tasks(self, workspace_id: str) -> bool:
+        """任务列表是否已保存（任务分解是否已产出结果）。
 
         Args:
             workspace_id: 工作区ID
 
         Returns:
-            任务文件路径
+            任务列表存在时返回 True
         """
-        workspace = self.workspace_manager.get_workspace(workspace_id)
-        tasks_path = workspace.get("files", {}).get("tasks_json_path")
-
-        if tasks_path:
-            return Path(tasks_path)
-
-        # 默认路径
-        workspace_dir = self.config.get_workspace_path(workspace_id)
-        return workspace_dir / "tasks.json"
+        return self.storage.has_tasks(workspace_id)
 
     def get_tasks(self, workspace_id: str) -> list[dict]:
         """获取所有任务。
 
-        使用读锁，允许多个进程同时读取任务列表。
+        JSON 后端使用读锁，允许多个进程同时读取任务列表。
 
         Args:
             workspace_id: 工作区ID
@@ -58,18 +54,10 @@ class TaskManager:
         Returns:
             任务列表
         """
-        tasks_file = self.get_tasks_file(workspace_id)
-
-        if not tasks_file.exists():
-            return []
-
-        # 使用读锁，允许多个进程同时读取
-        with read_lock(tasks_file), open(tasks_file, encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("tasks", [])
+        return self.storage.get_tasks(workspace_id)
 
     def get_task(self, workspace_id: str, task_id: str) -> dict:
-        """获取单个任务。
+        """获取单个任务（JSON 后端通过进程内 task_id 索引查找）。
 
         Args:
             workspace_id: 工作区ID
@@ -81,21 +69,46 @@ class TaskManager:
         Raises:
             TaskNotFoundError: 当任务不存在时
         """
-        tasks = self.get_tasks(workspace_id)
+        task = self.storage.get_task(workspace_id, task_id)
+        if task is None:
+            raise TaskNotFoundError(f"任务不存在: {task_id}")
+        return task
+
+    def get_tasks_by_status(self, workspace_id: str, status: str) -> list[dict]:
+        """按状态获取任务。
+
+        Args:
+            workspace_id: 工作区ID
+            status: 任务状态（如 "pending"、"completed"）
+
+        Returns:
+            任务列表（按保存顺序）
+        """
+        return self.storage.find_tasks_by_status(workspace_id, status)
+
+    def save_tasks(self, workspace_id: str, tasks_data: dict) -> str:
+        """保存完整的任务列表（替换已有任务）。
 
-        for task in tasks:
-            if task.get("task_id") == task_id:
-                return task
+        Args:
+            workspace_id: 工作区ID
+            tasks_data: 任务列表数据，格式同 tasks.json
 
-        raise TaskNotFoundError(f"任务不存在: {task_id}")
+        Returns:
+            任务列表的存储位置（JSON 后端为 tasks.json 路径）
+        """
+        location = self.storage.save_tasks(workspace_id, tasks_data)
+        logger.info(
+            f"保存任务列表: {workspace_id}, {len(tasks_data.get('tasks', []))} 个任务"
+        )
+        return location
 
     def update_task_status(
         self, workspace_id: str, task_id: str, status: str, **updates
     ) -> None:
         """更新任务状态。
 
-        使用文件锁确保并发安全。支持多个 Cursor 终端同时更新不同任务，
-        但同一任务的并发更新会被序列化。
+        JSON 后端使用文件锁确保并发安全；SQLite 后端只更新该任务所在的一行。
+        支持多个 Cursor 终端同时更新不同任务，但同一任务的并发更新会被序列化。
 
         Args:
             workspace_id: 工作区ID
@@ -106,34 +119,22 @@ class TaskManager:
         Raises:
             FileLockError: 当无法在超时时间内获取锁时（其他进程正在修改）
         """
-        tasks_file = self.get_tasks_file(workspace_id)
-
-        # 使用文件锁保护读取-修改-写入操作
-        with file_lock(tasks_file):
-            # 读取现有任务（重新读取最新数据）
-            if tasks_file.exists():
-                with open(tasks_file, encoding="utf-8") as f:
-                    data = json.load(f)
-            else:
-                data = {"workspace_id": workspace_id, "tasks": []}
-
-            # 更新任务
-            task_found = False
-            for task in data.get("tasks", []):
-                if task.get("task_id") == task_id:
-                    task["status"] = status
-                    task.update(updates)
-                    task_found = True
-                    break
-
-            if not task_found:
-                # 如果任务不存在，创建新任务
-                new_task = {"task_id": task_id, "status": status, **updates}
-                data.setdefault("tasks", []).append(new_task)
-
-            # 保存
-            tasks_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(tasks_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
+        self.storage.update_task(workspace_id, task_id, status, updates)
         logger.info(f"更新任务状态: {workspace_id}/{task_id} -> {status}")
+
+    def update_tasks_bulk(self, workspace_id: str, updates: dict[str, dict]) -> None:
+        """批量更新多个任务（一次加锁、一次写入）。
+
+        Args:
+            workspace_id: 工作区ID
+            updates: {任务ID: 要更新的字段}，如
+                {"task-001": {"status": "completed", "code_files": [...]}}。
+                不存在的任务会被追加
+
+        Raises:
+            FileLockError: 当无法在超时时间内获取锁时（其他进程正在修改）
+        """
+        if not updates:
+            return
+        self.storage.update_tasks(workspace_id, updates)
+        logger.info(f"批量更新任务: {workspace_id}, {len(updates)} 个任务")
@@ -3,15 +3,15 @@
 Python 3.9+ 兼容：使用内置类型 dict 而非 typing.Dict
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from src.core.config import Config
-from src.core.exceptions import ValidationError, WorkspaceNotFoundError
+from src.core.exceptions import ValidationError
 from src.core.logger import setup_logger
-from src.utils.file_lock import file_lock, read_lock
+from src.storage.base import StorageBackend, copy_json
+from src.storage.factory import get_storage_backend
 
 logger = setup_logger(__name__)
 
@@ -19,28 +19,19 @@ logger = setup_logger(__name__)
 class WorkspaceManager:
     """工作区管理器。"""
 
-    def __init__(self, config: Optional[Config] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        storage: Optional[StorageBackend] = None,
+    ) -> None:
         """初始化工作区管理器。
 
         Args:
             config: 配置管理器，如果为 None 则创建默认配置
+            storage: 存储后端，如果为 None 则根据配置（STORAGE_BACKEND）选择
         """
         self.config = config or Config()
-        self._load_workspace_index()
-
-    def _load_workspace_index(self) -> dict:
-        """加载工作区索引。"""
-        if self.config.workspace_index_file.exists():
-            with read_lock(self.config.workspace_index_file):
-                with open(self.config.workspace_index_file, encoding="utf-8") as f:
-                    return json.load(f)
-        return {}
-
-    def _save_workspace_index(self, index: dict) -> None:
-        """保存工作区索引。"""
-        with file_lock(self.config.workspace_index_file):
-            with open(self.config.workspace_index_file, "w", encoding="utf-8") as f:
-                json.dump(index, f, ensure_ascii=False, indent=2)
+        self.storage = storage or get_storage_backend(self.config)
 
     def _validate_project_path(self, project_path: str) -> Path:
         """验证并返回项目路径对象。"""
@@ -79,8 +70,8 @@ class WorkspaceManager:
         # 生成工作区ID
         workspace_id = self._generate_workspace_id(requirement_name)
 
-        # 创建工作区目录
-        workspace_dir = self.config.ensure_workspace_exists(workspace_id)
+        # 创建工作区目录（PRD/TRD 等文档保存在此目录）
+        self.config.ensure_workspace_exists(workspace_id)
 
         # 创建工作区元数据
         workspace_meta = {
@@ -99,20 +90,8 @@ class WorkspaceManager:
             "files": {"prd_path": None, "trd_path": None, "tasks_json_path": None},
         }
 
-        # 保存工作区元数据（使用文件锁）
-        meta_file = workspace_dir / "workspace.json"
-        with file_lock(meta_file), open(meta_file, "w", encoding="utf-8") as f:
-            json.dump(workspace_meta, f, ensure_ascii=False, indent=2)
-
-        # 更新索引（使用文件锁）
-        index = self._load_workspace_index()
-        index[workspace_id] = {
-            "workspace_id": workspace_id,
-            "project_path": str(validated_path),
-            "requirement_name": requirement_name,
-            "created_at": workspace_meta["created_at"],
-        }
-        self._save_workspace_index(index)
+        # 保存工作区元数据并更新索引
+        self.storage.create_workspace(workspace_meta)
 
         logger.info(f"创建工作区: {workspace_id}")
         return workspace_id
@@ -124,20 +103,32 @@ class WorkspaceManager:
             workspace_id: 工作区ID
 
         Returns:
-            工作区信息字典
+            工作区信息字典（副本，调用方可以自由修改）
 
         Raises:
             WorkspaceNotFoundError: 当工作区不存在时
         """
-        workspace_dir = self.config.get_workspace_path(workspace_id)
-        meta_file = workspace_dir / "workspace.json"
+        return self.storage.get_workspace(workspace_id)
+
+    def list_workspaces(self) -> dict[str, dict]:
+        """获取工作区索引。
 
-        if not meta_file.exists():
-            raise WorkspaceNotFoundError(f"Workspace not found: {workspace_id}")
+        Returns:
+            {工作区ID: 工作区摘要}
+        """
+        return self.storage.list_workspaces()
+
+    def find_workspaces_by_status(self, status_field: str, status: str) -> list[str]:
+        """按阶段状态查找工作区。
+
+        Args:
+            status_field: 状态字段（如 "prd_status"）
+            status: 状态值（如 "completed"）
 
-        # 使用读锁，允许多个进程同时读取
-        with read_lock(meta_file), open(meta_file, encoding="utf-8") as f:
-            return json.load(f)
+        Returns:
+            工作区ID列表
+        """
+        return self.storage.find_workspaces_by_status(status_field, status)
 
     def get_workspace_status(self, workspace_id: str) -> dict:
         """获取工作区状态。
@@ -163,23 +154,78 @@ class WorkspaceManager:
         Raises:
             FileLockError: 当无法在超时时间内获取锁时（其他进程正在修改）
         """
-        workspace_dir = self.config.get_workspace_path(workspace_id)
-        meta_file = workspace_dir / "workspace.json"
+        self._update_workspace(
+            workspace_id, lambda workspace: workspace["status"].update(status_updates)
+        )
+        logger.info(f"更新工作区状态: {workspace_id}, {status_updates}")
 
-        # 使用文件锁保护读取-修改-写入操作
-        with file_lock(meta_file):
-            # 重新读取最新数据（避免使用过期的缓存）
-            if not meta_file.exists():
-                raise WorkspaceNotFoundError(f"Workspace not found: {workspace_id}")
+    def update_workspace_files(self, workspace_id: str, file_updates: dict) -> None:
+        """更新工作区文件路径（如 prd_path、trd_path、tasks_json_path、test_path）。
 
-            with open(meta_file, encoding="utf-8") as f:
-                workspace = json.load(f)
+        Args:
+            workspace_id: 工作区ID
+            file_updates: 要更新的文件路径字段
 
-            # 更新状态
-            workspace["status"].update(status_updates)
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+            FileLockError: 当无法在超时时间内获取锁时
+        """
+        self._update_workspace(
+            workspace_id,
+            lambda workspace: workspace.setdefault("files", {}).update(file_updates),
+        )
+        logger.info(f"更新工作区文件路径: {workspace_id}, {file_updates}")
 
-            # 保存
-            with open(meta_file, "w", encoding="utf-8") as f:
-                json.dump(workspace, f, ensure_ascii=False, indent=2)
+    def update_workspace_fingerprints(
+        self, workspace_id: str, fingerprint_updates: dict
+    ) -> None:
+        """更新生成文档时的输入指纹（如 prd、trd，见 `src.utils.fingerprint`）。
 
-        logger.info(f"更新工作区状态: {workspace_id}, {status_updates}")
+        Args:
+            workspace_id: 工作区ID
+            fingerprint_updates: 要更新的指纹字段
+
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+            FileLockError: 当无法在超时时间内获取锁时
+        """
+        self._update_workspace(
+            workspace_id,
+            lambda workspace: workspace.setdefault("fingerprints", {}).update(
+                fingerprint_updates
+            ),
+        )
+
+    def update_workflow_state(self, workspace_id: str, workflow_state: dict) -> None:
+        """保存工作流状态。
+
+        Args:
+            workspace_id: 工作区ID
+            workflow_state: 完整的工作流状态
+
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+            FileLockError: 当无法在超时时间内获取锁时
+        """
+        # 复制一份，避免调用方后续修改影响缓存
+        workflow_state = copy_json(workflow_state)
+
+        def set_workflow_state(workspace: dict) -> None:
+            workspace["workflow_state"] = workflow_state
+
+        self._update_workspace(workspace_id, set_workflow_state)
+
+    def _update_workspace(
+        self, workspace_id: str, mutate: Callable[[dict], None]
+    ) -> None:
+        """原子地读取-修改-保存工作区元数据。
+
+        Args:
+            workspace_id: 工作区ID
+            mutate: 修改工作区数据的函数
+
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+            FileLockError: 当无法在超时时间内获取锁时
+        """
+        self.storage.update_workspace(workspace_id, mutate)
@@ -4,10 +4,15 @@
 Kiro CLI → MCP Server (中央编排服务) → 8个子SKILL模块 → 项目代码仓库
 
 本模块实现 MCP Server，暴露 8 个 SKILL 工具和基础设施工具。
+
+所有工具通过 `tool_registry` 注册（处理函数 + 输入 Schema），
+`list_tools` 返回启动时构建一次的 Tool 列表，`call_tool` 按名称 O(1) 分发。
 """
 
+import asyncio
 import json
-from typing import Any
+from concurrent.futures import Future
+from typing import Any, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -37,7 +42,12 @@ from src.tools.prd_confirmation import check_prd_confirmation, confirm_prd, modi
 from src.tools.prd_generator import generate_prd
 from src.tools.stage_dependency_checker import check_stage_ready
 from src.tools.task_decomposer import decompose_tasks
-from src.tools.task_executor import execute_all_tasks, execute_task
+from src.tools.task_executor import (
+    execute_all_tasks,
+    execute_task,
+    get_task_plan,
+    summarize_execution_result,
+)
 from src.tools.test_generator import generate_tests
 from src.tools.test_path_question import ask_test_path, submit_test_path
 from src.tools.test_reviewer import review_tests
@@ -45,6 +55,9 @@ from src.tools.trd_confirmation import check_trd_confirmation, confirm_trd, modi
 from src.tools.trd_generator import generate_trd
 from src.tools.workflow_orchestrator import execute_full_workflow
 from src.tools.workflow_status import get_workflow_status
+from src.utils.progress import progress_reporter
+from src.utils.tool_registry import ToolRegistry
+from src.utils.worker_pool import WorkerPool
 
 logger = setup_logger(__name__)
 
@@ -55,6 +68,35 @@ server = Server("agent-orchestrator")
 workspace_manager = WorkspaceManager()
 task_manager = TaskManager()
 
+# 工具工作池（阻塞的工具处理函数在此执行）
+worker_pool = WorkerPool(config=workspace_manager.config)
+
+# 工具注册表
+tool_registry = ToolRegistry()
+
+# 共享的 JSON 编码器（所有响应通过同一个编码路径序列化）
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+# 常用参数定义
+_WORKSPACE_ID = {"type": "string", "description": "工作区ID"}
+_TASK_ID = {"type": "string", "description": "任务ID"}
+_FORCE = {
+    "type": "boolean",
+    "description": "是否强制重新生成（默认为 False：输入未变化时直接返回已有文档）",
+}
+
+
+def _to_text_content(payload: dict) -> list[TextContent]:
+    """将响应字典序列化为 MCP 文本内容。
+
+    Args:
+        payload: 响应字典
+
+    Returns:
+        包含 JSON 文本的 TextContent 列表
+    """
+    return [TextContent(type="text", text=_json_encoder.encode(payload))]
+
 
 def _handle_error(error: Exception) -> list[TextContent]:
     """统一错误处理。
@@ -70,20 +112,599 @@ def _handle_error(error: Exception) -> list[TextContent]:
 
     logger.error(f"工具执行错误 [{error_type}]: {error_msg}", exc_info=True)
 
-    return [
-        TextContent(
-            type="text",
-            text=json.dumps(
-                {"success": False, "error": error_msg, "error_type": error_type},
-                ensure_ascii=False,
-            ),
-        )
-    ]
+    return _to_text_content(
+        {"success": False, "error": error_msg, "error_type": error_type}
+    )
 
 
 # ==================== 基础设施工具 ====================
 
 
+@tool_registry.tool(
+    name="create_workspace",
+    description="创建工作区",
+    properties={
+        "project_path": {"type": "string", "description": "项目路径"},
+        "requirement_name": {"type": "string", "description": "需求名称"},
+        "requirement_url": {"type": "string", "description": "需求URL或文件路径"},
+    },
+    required=["project_path", "requirement_name", "requirement_url"],
+)
+def _create_workspace(arguments: dict) -> dict:
+    """处理 create_workspace 工具调用。"""
+    workspace_id = workspace_manager.create_workspace(
+        project_path=arguments["project_path"],
+        requirement_name=arguments["requirement_name"],
+        requirement_url=arguments["requirement_url"],
+    )
+    return {"success": True, "workspace_id": workspace_id}
+
+
+@tool_registry.tool(
+    name="get_workspace",
+    description="获取工作区信息",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _get_workspace(arguments: dict) -> dict:
+    """处理 get_workspace 工具调用。"""
+    workspace = workspace_manager.get_workspace(arguments["workspace_id"])
+    return {"success": True, "workspace": workspace}
+
+
+@tool_registry.tool(
+    name="update_workspace_status",
+    description="更新工作区状态",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "status_updates": {"type": "object", "description": "状态更新字典"},
+    },
+    required=["workspace_id", "status_updates"],
+)
+def _update_workspace_status(arguments: dict) -> dict:
+    """处理 update_workspace_status 工具调用。"""
+    workspace_manager.update_workspace_status(
+        arguments["workspace_id"], arguments["status_updates"]
+    )
+    return {"success": True}
+
+
+@tool_registry.tool(
+    name="get_tasks",
+    description="获取任务列表",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _get_tasks(arguments: dict) -> dict:
+    """处理 get_tasks 工具调用。"""
+    tasks = task_manager.get_tasks(arguments["workspace_id"])
+    return {"success": True, "tasks": tasks}
+
+
+@tool_registry.tool(
+    name="update_task_status",
+    description="更新任务状态",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "task_id": _TASK_ID,
+        "status": {"type": "string", "description": "新状态"},
+        "updates": {"type": "object", "description": "其他更新字段"},
+    },
+    required=["workspace_id", "task_id", "status"],
+)
+def _update_task_status(arguments: dict) -> dict:
+    """处理 update_task_status 工具调用。"""
+    task_manager.update_task_status(
+        arguments["workspace_id"],
+        arguments["task_id"],
+        arguments["status"],
+        **arguments.get("updates", {}),
+    )
+    return {"success": True}
+
+
+# ==================== 工作流编排工具 ====================
+
+
+@tool_registry.tool(
+    name="ask_orchestrator_questions",
+    description="询问总编排器4个问题（项目路径、需求名称、需求URL、工作区路径）",
+)
+def _ask_orchestrator_questions(arguments: dict) -> dict:
+    """处理 ask_orchestrator_questions 工具调用。"""
+    return ask_orchestrator_questions()
+
+
+@tool_registry.tool(
+    name="submit_orchestrator_answers",
+    description="提交总编排器答案并创建工作区",
+    properties={
+        "project_path": {"type": "string", "description": "项目路径（必填）"},
+        "requirement_name": {"type": "string", "description": "需求名称（必填）"},
+        "requirement_url": {
+            "type": "string",
+            "description": "需求URL或文件路径（必填）",
+        },
+        "workspace_path": {"type": "string", "description": "工作区路径（可选）"},
+    },
+    required=["project_path", "requirement_name", "requirement_url"],
+)
+def _submit_orchestrator_answers(arguments: dict) -> dict:
+    """处理 submit_orchestrator_answers 工具调用。"""
+    return submit_orchestrator_answers(arguments)
+
+
+# PRD 确认工具
+@tool_registry.tool(
+    name="check_prd_confirmation",
+    description="检查 PRD 文件是否存在并返回确认请求",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _check_prd_confirmation(arguments: dict) -> dict:
+    """处理 check_prd_confirmation 工具调用。"""
+    return check_prd_confirmation(arguments["workspace_id"])
+
+
+@tool_registry.tool(
+    name="confirm_prd",
+    description="确认 PRD（更新状态为 completed）",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _confirm_prd(arguments: dict) -> dict:
+    """处理 confirm_prd 工具调用。"""
+    return confirm_prd(arguments["workspace_id"])
+
+
+@tool_registry.tool(
+    name="modify_prd",
+    description="标记需要修改 PRD（更新状态为 needs_regeneration）",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _modify_prd(arguments: dict) -> dict:
+    """处理 modify_prd 工具调用。"""
+    return modify_prd(arguments["workspace_id"])
+
+
+# TRD 确认工具
+@tool_registry.tool(
+    name="check_trd_confirmation",
+    description="检查 TRD 文件是否存在并返回确认请求",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _check_trd_confirmation(arguments: dict) -> dict:
+    """处理 check_trd_confirmation 工具调用。"""
+    return check_trd_confirmation(arguments["workspace_id"])
+
+
+@tool_registry.tool(
+    name="confirm_trd",
+    description="确认 TRD（更新状态为 completed）",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _confirm_trd(arguments: dict) -> dict:
+    """处理 confirm_trd 工具调用。"""
+    return confirm_trd(arguments["workspace_id"])
+
+
+@tool_registry.tool(
+    name="modify_trd",
+    description="标记需要修改 TRD（更新状态为 needs_regeneration）",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _modify_trd(arguments: dict) -> dict:
+    """处理 modify_trd 工具调用。"""
+    return modify_trd(arguments["workspace_id"])
+
+
+# 测试路径询问工具
+@tool_registry.tool(
+    name="ask_test_path",
+    description="询问测试路径（生成默认路径建议）",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _ask_test_path(arguments: dict) -> dict:
+    """处理 ask_test_path 工具调用。"""
+    return ask_test_path(arguments["workspace_id"])
+
+
+@tool_registry.tool(
+    name="submit_test_path",
+    description="提交测试路径并保存到工作区元数据",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "test_path": {"type": "string", "description": "测试输出目录路径"},
+    },
+    required=["workspace_id", "test_path"],
+)
+def _submit_test_path(arguments: dict) -> dict:
+    """处理 submit_test_path 工具调用。"""
+    return submit_test_path(
+        workspace_id=arguments["workspace_id"], test_path=arguments["test_path"]
+    )
+
+
+# ==================== 8 个 SKILL 工具 ====================
+
+
+@tool_registry.tool(
+    name="generate_prd",
+    description="生成 PRD 文档（SKILL: prd-generator）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "requirement_url": {
+            "type": "string",
+            "description": "需求文档URL或文件路径",
+        },
+        "force": _FORCE,
+    },
+    required=["workspace_id", "requirement_url"],
+)
+def _generate_prd(arguments: dict) -> dict:
+    """处理 generate_prd 工具调用。"""
+    return generate_prd(
+        workspace_id=arguments["workspace_id"],
+        requirement_url=arguments["requirement_url"],
+        force=arguments.get("force", False),
+    )
+
+
+@tool_registry.tool(
+    name="generate_trd",
+    description="生成 TRD 文档（SKILL: trd-generator）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "prd_path": {
+            "type": "string",
+            "description": "PRD 文档路径（可选，默认从工作区获取）",
+        },
+        "force": _FORCE,
+    },
+    required=["workspace_id"],
+)
+def _generate_trd(arguments: dict) -> dict:
+    """处理 generate_trd 工具调用。"""
+    # 如果没有提供 prd_path，从工作区获取
+    prd_path = arguments.get("prd_path")
+    if not prd_path:
+        workspace = workspace_manager.get_workspace(arguments["workspace_id"])
+        prd_path = workspace.get("files", {}).get("prd_path")
+        if not prd_path:
+            raise ValidationError("工作区中没有 PRD 文档，请先生成 PRD")
+
+    return generate_trd(
+        workspace_id=arguments["workspace_id"],
+        prd_path=prd_path,
+        force=arguments.get("force", False),
+    )
+
+
+@tool_registry.tool(
+    name="decompose_tasks",
+    description="分解任务（SKILL: task-decomposer）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "trd_path": {
+            "type": "string",
+            "description": "TRD 文档路径（可选，默认从工作区获取）",
+        },
+    },
+    required=["workspace_id"],
+)
+def _decompose_tasks(arguments: dict) -> dict:
+    """处理 decompose_tasks 工具调用。"""
+    # 如果没有提供 trd_path，从工作区获取
+    trd_path = arguments.get("trd_path")
+    if not trd_path:
+        workspace = workspace_manager.get_workspace(arguments["workspace_id"])
+        trd_path = workspace.get("files", {}).get("trd_path")
+        if not trd_path:
+            raise ValidationError("工作区中没有 TRD 文档，请先生成 TRD")
+
+    return decompose_tasks(workspace_id=arguments["workspace_id"], trd_path=trd_path)
+
+
+@tool_registry.tool(
+    name="generate_code",
+    description="生成代码（SKILL: code-generator）",
+    properties={"workspace_id": _WORKSPACE_ID, "task_id": _TASK_ID},
+    required=["workspace_id", "task_id"],
+)
+def _generate_code(arguments: dict) -> dict:
+    """处理 generate_code 工具调用。"""
+    return generate_code(
+        workspace_id=arguments["workspace_id"], task_id=arguments["task_id"]
+    )
+
+
+@tool_registry.tool(
+    name="review_code",
+    description="审查代码（SKILL: code-reviewer）",
+    properties={"workspace_id": _WORKSPACE_ID, "task_id": _TASK_ID},
+    required=["workspace_id", "task_id"],
+)
+def _review_code(arguments: dict) -> dict:
+    """处理 review_code 工具调用。"""
+    return review_code(
+        workspace_id=arguments["workspace_id"], task_id=arguments["task_id"]
+    )
+
+
+@tool_registry.tool(
+    name="generate_tests",
+    description="生成测试（SKILL: test-generator）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "test_output_dir": {"type": "string", "description": "测试输出目录（可选）"},
+    },
+    required=["workspace_id"],
+)
+def _generate_tests(arguments: dict) -> dict:
+    """处理 generate_tests 工具调用。"""
+    test_output_dir = arguments.get("test_output_dir", "")
+    return generate_tests(
+        workspace_id=arguments["workspace_id"], test_output_dir=test_output_dir
+    )
+
+
+@tool_registry.tool(
+    name="review_tests",
+    description="审查测试（SKILL: test-reviewer）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "test_files": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "测试文件路径列表",
+        },
+    },
+    required=["workspace_id", "test_files"],
+)
+def _review_tests(arguments: dict) -> dict:
+    """处理 review_tests 工具调用。"""
+    return review_tests(
+        workspace_id=arguments["workspace_id"],
+        test_files=arguments["test_files"],
+    )
+
+
+@tool_registry.tool(
+    name="analyze_coverage",
+    description="分析覆盖率（SKILL: coverage-analyzer）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "project_path": {
+            "type": "string",
+            "description": "项目路径（可选，默认从工作区获取）",
+        },
+        "parallel_workers": {
+            "type": "integer",
+            "description": "并行运行测试的分片数（可选，默认使用 COVERAGE_PARALLEL_WORKERS 配置）",
+        },
+        "source_files": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "只分析这些源文件（可选），只运行导入它们的测试并返回每个文件的覆盖率",
+        },
+        "task_id": {
+            "type": "string",
+            "description": "任务ID（可选），未提供 source_files 时分析该任务的 code_files",
+        },
+    },
+    required=["workspace_id"],
+)
+def _analyze_coverage(arguments: dict) -> dict:
+    """处理 analyze_coverage 工具调用。"""
+    # 如果没有提供 project_path，从工作区获取
+    project_path = arguments.get("project_path")
+    if not project_path:
+        workspace = workspace_manager.get_workspace(arguments["workspace_id"])
+        project_path = workspace.get("project_path")
+        if not project_path:
+            raise ValidationError("工作区中没有项目路径")
+
+    # 如果只提供了 task_id，分析该任务生成的代码文件
+    source_files = arguments.get("source_files")
+    if source_files is None and arguments.get("task_id"):
+        task = task_manager.get_task(arguments["workspace_id"], arguments["task_id"])
+        source_files = task.get("code_files", [])
+
+    return analyze_coverage(
+        workspace_id=arguments["workspace_id"],
+        project_path=project_path,
+        parallel_workers=arguments.get("parallel_workers"),
+        source_files=source_files,
+    )
+
+
+# ==================== 任务执行工具 ====================
+
+
+@tool_registry.tool(
+    name="execute_task",
+    description="执行单个任务（生成代码 → Review → 重试循环）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "task_id": _TASK_ID,
+        "max_review_retries": {
+            "type": "integer",
+            "description": "最大 Review 重试次数（可选，默认为 3）",
+        },
+    },
+    required=["workspace_id", "task_id"],
+)
+def _execute_task(arguments: dict) -> dict:
+    """处理 execute_task 工具调用。"""
+    return execute_task(
+        workspace_id=arguments["workspace_id"],
+        task_id=arguments["task_id"],
+        max_review_retries=arguments.get("max_review_retries", 3),
+    )
+
+
+@tool_registry.tool(
+    name="execute_all_tasks",
+    description="执行所有待处理任务（按 depends_on 依赖关系并发执行）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "max_review_retries": {
+            "type": "integer",
+            "description": "每个任务的最大 Review 重试次数（可选，默认为 3）",
+        },
+        "max_parallel_tasks": {
+            "type": "integer",
+            "description": "最大并发任务数（可选，默认使用 TASK_PARALLELISM 配置）",
+        },
+        "include_review_reports": {
+            "type": "boolean",
+            "description": "是否在结果中包含每个任务的 Review 报告全文（默认为 False）",
+        },
+    },
+    required=["workspace_id"],
+)
+def _execute_all_tasks(arguments: dict) -> dict:
+    """处理 execute_all_tasks 工具调用。"""
+    result = execute_all_tasks(
+        workspace_id=arguments["workspace_id"],
+        max_review_retries=arguments.get("max_review_retries", 3),
+        max_parallel_tasks=arguments.get("max_parallel_tasks"),
+    )
+    if arguments.get("include_review_reports", False):
+        return result
+    return summarize_execution_result(result)
+
+
+@tool_registry.tool(
+    name="get_task_plan",
+    description="获取任务执行计划（按 depends_on 依赖关系分为可并行的批次，并返回关键路径）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "include_completed": {
+            "type": "boolean",
+            "description": "是否包含已完成的任务（默认为 False，对已完成任务的依赖视为已满足）",
+        },
+    },
+    required=["workspace_id"],
+)
+def _get_task_plan(arguments: dict) -> dict:
+    """处理 get_task_plan 工具调用。"""
+    return get_task_plan(
+        workspace_id=arguments["workspace_id"],
+        include_completed=arguments.get("include_completed", False),
+    )
+
+
+# ==================== 多Agent支持工具 ====================
+
+
+@tool_registry.tool(
+    name="get_workflow_status",
+    description="获取工作流状态（各阶段状态、进度、可开始的阶段、被阻塞的阶段）",
+    properties={"workspace_id": _WORKSPACE_ID},
+    required=["workspace_id"],
+)
+def _get_workflow_status(arguments: dict) -> dict:
+    """处理 get_workflow_status 工具调用。"""
+    return get_workflow_status(workspace_id=arguments["workspace_id"])
+
+
+@tool_registry.tool(
+    name="check_stage_ready",
+    description="检查阶段是否可以开始（验证前置阶段依赖和文件依赖）",
+    properties={
+        "workspace_id": _WORKSPACE_ID,
+        "stage": {
+            "type": "string",
+            "description": "阶段名称（prd, trd, tasks, code, test, coverage）",
+        },
+    },
+    required=["workspace_id", "stage"],
+)
+def _check_stage_ready(arguments: dict) -> dict:
+    """处理 check_stage_ready 工具调用。"""
+    return check_stage_ready(
+        workspace_id=arguments["workspace_id"], stage=arguments["stage"]
+    )
+
+
+# ==================== 完整工作流编排工具 ====================
+
+
+@tool_registry.tool(
+    name="execute_full_workflow",
+    description="执行完整工作流（从需求输入到代码完成和覆盖率分析）",
+    properties={
+        "project_path": {
+            "type": "string",
+            "description": "项目路径（自动确认模式必需，交互模式可选）",
+        },
+        "requirement_name": {
+            "type": "string",
+            "description": "需求名称（自动确认模式必需，交互模式可选）",
+        },
+        "requirement_url": {
+            "type": "string",
+            "description": "需求URL或文件路径（自动确认模式必需，交互模式可选）",
+        },
+        "workspace_path": {
+            "type": "string",
+            "description": (
+                "工作区路径（可选，默认使用项目路径下的 .agent-orchestrator）"
+            ),
+        },
+        "workspace_id": {
+            "type": "string",
+            "description": "工作区ID（用于恢复工作流，可选）",
+        },
+        "auto_confirm": {
+            "type": "boolean",
+            "description": (
+                "是否自动确认（默认为 True）。True: 自动确认模式；False: 交互模式"
+            ),
+        },
+        "max_review_retries": {
+            "type": "integer",
+            "description": "每个任务的最大 Review 重试次数（可选，默认为 3）",
+        },
+        "interaction_response": {
+            "type": "object",
+            "description": (
+                "交互响应（用于恢复工作流，可选）。"
+                "包含 interaction_type 和相应的响应数据"
+            ),
+        },
+        "force_regenerate": {
+            "type": "boolean",
+            "description": (
+                "是否强制重新生成 PRD 和 TRD（默认为 False：输入未变化时复用已有文档）"
+            ),
+        },
+    },
+)
+def _execute_full_workflow(arguments: dict) -> dict:
+    """处理 execute_full_workflow 工具调用。"""
+    return execute_full_workflow(
+        project_path=arguments.get("project_path"),
+        requirement_name=arguments.get("requirement_name"),
+        requirement_url=arguments.get("requirement_url"),
+        workspace_path=arguments.get("workspace_path"),
+        workspace_id=arguments.get("workspace_id"),
+        auto_confirm=arguments.get("auto_confirm", True),
+        max_review_retries=arguments.get("max_review_retries", 3),
+        interaction_response=arguments.get("interaction_response"),
+        force_regenerate=arguments.get("force_regenerate", False),
+    )
+
+
+# ==================== MCP 协议处理 ====================
+
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """列出所有可用工具。
@@ -92,439 +713,110 @@ async def list_tools() -> list[Tool]:
     - 基础设施工具（5个）：工作区和任务管理
     - 工作流编排工具（10个）：用户交互、PRD/TRD确认、测试路径询问
     - SKILL工具（8个）：PRD/TRD生成、任务分解、代码生成/审查、测试生成/审查、覆盖率分析
-    - 任务执行工具（2个）：单个任务执行、所有任务执行
+    - 任务执行工具（3个）：单个任务执行、所有任务执行、任务执行计划
     - 多Agent支持工具（2个）：工作流状态查询、阶段依赖检查
     - 完整工作流编排工具（1个）：端到端工作流执行
 
-    总计：28个工具
+    总计：29个工具。Tool 列表由工具注册表构建一次并缓存。
     """
-    return [
-        # 基础设施工具
-        Tool(
-            name="create_workspace",
-            description="创建工作区",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_path": {"type": "string", "description": "项目路径"},
-                    "requirement_name": {"type": "string", "description": "需求名称"},
-                    "requirement_url": {
-                        "type": "string",
-                        "description": "需求URL或文件路径",
-                    },
-                },
-                "required": ["project_path", "requirement_name", "requirement_url"],
-            },
-        ),
-        Tool(
-            name="get_workspace",
-            description="获取工作区信息",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="update_workspace_status",
-            description="更新工作区状态",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "status_updates": {"type": "object", "description": "状态更新字典"},
-                },
-                "required": ["workspace_id", "status_updates"],
-            },
-        ),
-        Tool(
-            name="get_tasks",
-            description="获取任务列表",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="update_task_status",
-            description="更新任务状态",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "task_id": {"type": "string", "description": "任务ID"},
-                    "status": {"type": "string", "description": "新状态"},
-                    "updates": {"type": "object", "description": "其他更新字段"},
-                },
-                "required": ["workspace_id", "task_id", "status"],
-            },
-        ),
-        # 工作流编排工具
-        Tool(
-            name="ask_orchestrator_questions",
-            description="询问总编排器4个问题（项目路径、需求名称、需求URL、工作区路径）",
-            inputSchema={"type": "object", "properties": {}, "required": []},
-        ),
-        Tool(
-            name="submit_orchestrator_answers",
-            description="提交总编排器答案并创建工作区",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_path": {
-                        "type": "string",
-                        "description": "项目路径（必填）",
-                    },
-                    "requirement_name": {
-                        "type": "string",
-                        "description": "需求名称（必填）",
-                    },
-                    "requirement_url": {
-                        "type": "string",
-                        "description": "需求URL或文件路径（必填）",
-                    },
-                    "workspace_path": {
-                        "type": "string",
-                        "description": "工作区路径（可选）",
-                    },
-                },
-                "required": ["project_path", "requirement_name", "requirement_url"],
-            },
-        ),
-        # PRD 确认工具
-        Tool(
-            name="check_prd_confirmation",
-            description="检查 PRD 文件是否存在并返回确认请求",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="confirm_prd",
-            description="确认 PRD（更新状态为 completed）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="modify_prd",
-            description="标记需要修改 PRD（更新状态为 needs_regeneration）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        # TRD 确认工具
-        Tool(
-            name="check_trd_confirmation",
-            description="检查 TRD 文件是否存在并返回确认请求",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="confirm_trd",
-            description="确认 TRD（更新状态为 completed）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="modify_trd",
-            description="标记需要修改 TRD（更新状态为 needs_regeneration）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        # 测试路径询问工具
-        Tool(
-            name="ask_test_path",
-            description="询问测试路径（生成默认路径建议）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"}
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="submit_test_path",
-            description="提交测试路径并保存到工作区元数据",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "test_path": {"type": "string", "description": "测试输出目录路径"},
-                },
-                "required": ["workspace_id", "test_path"],
-            },
-        ),
-        # 8 个 SKILL 工具
-        Tool(
-            name="generate_prd",
-            description="生成 PRD 文档（SKILL: prd-generator）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "requirement_url": {
-                        "type": "string",
-                        "description": "需求文档URL或文件路径",
-                    },
-                },
-                "required": ["workspace_id", "requirement_url"],
-            },
-        ),
-        Tool(
-            name="generate_trd",
-            description="生成 TRD 文档（SKILL: trd-generator）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "prd_path": {
-                        "type": "string",
-                        "description": "PRD 文档路径（可选，默认从工作区获取）",
-                    },
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="decompose_tasks",
-            description="分解任务（SKILL: task-decomposer）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "trd_path": {
-                        "type": "string",
-                        "description": "TRD 文档路径（可选，默认从工作区获取）",
-                    },
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="generate_code",
-            description="生成代码（SKILL: code-generator）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "task_id": {"type": "string", "description": "任务ID"},
-                },
-                "required": ["workspace_id", "task_id"],
-            },
-        ),
-        Tool(
-            name="review_code",
-            description="审查代码（SKILL: code-reviewer）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "task_id": {"type": "string", "description": "任务ID"},
-                },
-                "required": ["workspace_id", "task_id"],
-            },
-        ),
-        Tool(
-            name="generate_tests",
-            description="生成测试（SKILL: test-generator）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "test_output_dir": {
-                        "type": "string",
-                        "description": "测试输出目录（可选）",
-                    },
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        Tool(
-            name="review_tests",
-            description="审查测试（SKILL: test-reviewer）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "test_files": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "测试文件路径列表",
-                    },
-                },
-                "required": ["workspace_id", "test_files"],
-            },
-        ),
-        Tool(
-            name="analyze_coverage",
-            description="分析覆盖率（SKILL: coverage-analyzer）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "project_path": {
-                        "type": "string",
-                        "description": "项目路径（可选，默认从工作区获取）",
-                    },
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        # 任务执行工具
-        Tool(
-            name="execute_task",
-            description="执行单个任务（生成代码 → Review → 重试循环）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "task_id": {"type": "string", "description": "任务ID"},
-                    "max_review_retries": {
-                        "type": "integer",
-                        "description": "最大 Review 重试次数（可选，默认为 3）",
-                    },
-                },
-                "required": ["workspace_id", "task_id"],
-            },
-        ),
-        Tool(
-            name="execute_all_tasks",
-            description="执行所有待处理任务",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "max_review_retries": {
-                        "type": "integer",
-                        "description": (
-                            "每个任务的最大 Review 重试次数（可选，默认为 3）"
-                        ),
-                    },
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        # 工作流状态查询工具
-        Tool(
-            name="get_workflow_status",
-            description="获取工作流状态（各阶段状态、进度、可开始的阶段、被阻塞的阶段）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                },
-                "required": ["workspace_id"],
-            },
-        ),
-        # 阶段依赖检查工具
-        Tool(
-            name="check_stage_ready",
-            description="检查阶段是否可以开始（验证前置阶段依赖和文件依赖）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "workspace_id": {"type": "string", "description": "工作区ID"},
-                    "stage": {
-                        "type": "string",
-                        "description": (
-                            "阶段名称（prd, trd, tasks, code, test, coverage）"
-                        ),
-                    },
-                },
-                "required": ["workspace_id", "stage"],
-            },
-        ),
-        # 完整工作流编排工具
-        Tool(
-            name="execute_full_workflow",
-            description="执行完整工作流（从需求输入到代码完成和覆盖率分析）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_path": {
-                        "type": "string",
-                        "description": "项目路径（自动确认模式必需，交互模式可选）",
-                    },
-                    "requirement_name": {
-                        "type": "string",
-                        "description": "需求名称（自动确认模式必需，交互模式可选）",
-                    },
-                    "requirement_url": {
-                        "type": "string",
-                        "description": (
-                            "需求URL或文件路径（自动确认模式必需，交互模式可选）"
-                        ),
-                    },
-                    "workspace_path": {
-                        "type": "string",
-                        "description": (
-                            "工作区路径（可选，默认使用项目路径下的 "
-                            ".agent-orchestrator）"
-                        ),
-                    },
-                    "workspace_id": {
-                        "type": "string",
-                        "description": "工作区ID（用于恢复工作流，可选）",
-                    },
-                    "auto_confirm": {
-                        "type": "boolean",
-                        "description": (
-                            "是否自动确认（默认为 True）。"
-                            "True: 自动确认模式；False: 交互模式"
-                        ),
-                    },
-                    "max_review_retries": {
-                        "type": "integer",
-                        "description": (
-                            "每个任务的最大 Review 重试次数（可选，默认为 3）"
-                        ),
-                    },
-                    "interaction_response": {
-                        "type": "object",
-                        "description": (
-                            "交互响应（用于恢复工作流，可选）。"
-                            "包含 interaction_type 和相应的响应数据"
-                        ),
-                    },
-                },
-                "required": [],
-            },
-        ),
-    ]
+    return tool_registry.list_tools()
+
+
+class _ProgressForwarder:
+    """将工具在工作线程中报告的进度转发为 MCP progress notification。
+
+    通知通过 `asyncio.run_coroutine_threadsafe` 提交到事件循环，工具线程不等待发送完成；
+    `call_tool` 返回结果前调用 `flush()`，保证所有进度通知先于最终结果发出。
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        progress_token: Any,
+        request_id: Any,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """初始化进度转发器。
+
+        Args:
+            session: 当前请求的 MCP 会话
+            progress_token: 客户端在请求中提供的 progressToken
+            request_id: 当前请求ID
+            loop: 运行 MCP 会话的事件循环
+        """
+        self._session = session
+        self._progress_token = progress_token
+        self._request_id = request_id
+        self._loop = loop
+        self._pending: list[Future] = []
+
+    def __call__(self, progress: float, total: Optional[float], message: str) -> None:
+        """发送进度通知（在工具线程中调用）。"""
+        self._pending.append(
+            asyncio.run_coroutine_threadsafe(
+                self._session.send_progress_notification(
+                    self._progress_token,
+                    progress,
+                    total=total,
+                    message=message or None,
+                    related_request_id=str(self._request_id),
+                ),
+                self._loop,
+            )
+        )
+
+    async def flush(self) -> None:
+        """等待已提交的进度通知发送完成（发送失败只记录日志）。"""
+        pending, self._pending = self._pending, []
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in pending),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"发送进度通知失败: {result}")
+
+
+def _create_progress_forwarder(name: str) -> Optional[_ProgressForwarder]:
+    """客户端请求了进度通知（请求中带 progressToken）时创建进度转发器。"""
+    if worker_pool.uses_process(name):
+        # 进程池中执行的工具无法回调到事件循环
+        return None
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return None
+    progress_token = ctx.meta.progressToken if ctx.meta is not None else None
+    if progress_token is None:
+        return None
+    return _ProgressForwarder(
+        ctx.session, progress_token, ctx.request_id, asyncio.get_running_loop()
+    )
+
+
+def _dispatch_tool(
+    name: str,
+    arguments: dict[str, Any],
+    progress: Optional[_ProgressForwarder] = None,
+) -> dict:
+    """执行工具处理逻辑。
+
+    同步函数，由 `call_tool` 提交到工具工作池中执行，避免阻塞事件循环。
+
+    Args:
+        name: 工具名称
+        arguments: 工具参数（字典格式，已通过 Schema 校验）
+        progress: 进度回调，工具通过 `report_progress()` 报告的进度会转发给它
+
+    Returns:
+        工具执行结果字典
+
+    Raises:
+        ValueError: 当工具名称未知时
+        其他异常原样抛出，由 `call_tool` 统一处理
+    """
+    with progress_reporter(progress):
+        return tool_registry.get(name).handler(arguments)
 
 
 @server.call_tool()
@@ -535,11 +827,17 @@ async def call_tool(name: str, arguments: dict[str, Any] | None) -> list[TextCon
     - 基础设施工具（5个）
     - 工作流编排工具（10个）
     - SKILL工具（8个）
-    - 任务执行工具（2个）
+    - 任务执行工具（3个）
     - 多Agent支持工具（2个）
     - 完整工作流编排工具（1个）
 
-    所有工具调用都通过统一的错误处理机制，返回 JSON 格式的结果。
+    工具查找和参数校验在事件循环中完成（不涉及 I/O），工具处理逻辑
+    （`_dispatch_tool`）在工具工作池中执行，因此长时间运行的工具不会阻塞其他
+    请求。所有工具调用都通过统一的错误处理机制，返回 JSON 格式的结果。
+
+    如果客户端在请求中提供了 progressToken，工具执行期间报告的进度
+    （如 `execute_full_workflow` 的每个步骤、`execute_all_tasks` 的每个任务）
+    会以 MCP progress notification 的形式实时发送。
 
     Args:
         name: 工具名称
@@ -550,289 +848,23 @@ async def call_tool(name: str, arguments: dict[str, Any] | None) -> list[TextCon
 
     Raises:
         ValueError: 当工具名称未知时
+        ValidationError: 当参数不符合工具 Schema 时
         其他异常通过 _handle_error 统一处理
     """
     if arguments is None:
         arguments = {}
 
     try:
-        # 基础设施工具
-        if name == "create_workspace":
-            workspace_id = workspace_manager.create_workspace(
-                project_path=arguments["project_path"],
-                requirement_name=arguments["requirement_name"],
-                requirement_url=arguments["requirement_url"],
-            )
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {"success": True, "workspace_id": workspace_id},
-                        ensure_ascii=False,
-                    ),
-                )
-            ]
-
-        elif name == "get_workspace":
-            workspace = workspace_manager.get_workspace(arguments["workspace_id"])
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {"success": True, "workspace": workspace}, ensure_ascii=False
-                    ),
-                )
-            ]
-
-        elif name == "update_workspace_status":
-            workspace_manager.update_workspace_status(
-                arguments["workspace_id"], arguments["status_updates"]
-            )
-            return [
-                TextContent(
-                    type="text", text=json.dumps({"success": True}, ensure_ascii=False)
-                )
-            ]
-
-        elif name == "get_tasks":
-            tasks = task_manager.get_tasks(arguments["workspace_id"])
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {"success": True, "tasks": tasks}, ensure_ascii=False
-                    ),
-                )
-            ]
-
-        elif name == "update_task_status":
-            task_manager.update_task_status(
-                arguments["workspace_id"],
-                arguments["task_id"],
-                arguments["status"],
-                **arguments.get("updates", {}),
-            )
-            return [
-                TextContent(
-                    type="text", text=json.dumps({"success": True}, ensure_ascii=False)
-                )
-            ]
-
-        # 工作流编排工具
-        elif name == "ask_orchestrator_questions":
-            result = ask_orchestrator_questions()
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "submit_orchestrator_answers":
-            result = submit_orchestrator_answers(arguments)
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # PRD 确认工具
-        elif name == "check_prd_confirmation":
-            result = check_prd_confirmation(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "confirm_prd":
-            result = confirm_prd(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "modify_prd":
-            result = modify_prd(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # TRD 确认工具
-        elif name == "check_trd_confirmation":
-            result = check_trd_confirmation(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "confirm_trd":
-            result = confirm_trd(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "modify_trd":
-            result = modify_trd(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # 测试路径询问工具
-        elif name == "ask_test_path":
-            result = ask_test_path(arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "submit_test_path":
-            result = submit_test_path(
-                workspace_id=arguments["workspace_id"], test_path=arguments["test_path"]
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # 8 个 SKILL 工具
-        elif name == "generate_prd":
-            result = generate_prd(
-                workspace_id=arguments["workspace_id"],
-                requirement_url=arguments["requirement_url"],
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "generate_trd":
-            # 如果没有提供 prd_path，从工作区获取
-            prd_path = arguments.get("prd_path")
-            if not prd_path:
-                workspace = workspace_manager.get_workspace(arguments["workspace_id"])
-                prd_path = workspace.get("files", {}).get("prd_path")
-                if not prd_path:
-                    raise ValidationError("工作区中没有 PRD 文档，请先生成 PRD")
-
-            result = generate_trd(
-                workspace_id=arguments["workspace_id"], prd_path=prd_path
+        tool_registry.get(name).validate(arguments)
+        progress = _create_progress_forwarder(name)
+        try:
+            result = await worker_pool.run(
+                name, _dispatch_tool, name, arguments, progress
             )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "decompose_tasks":
-            # 如果没有提供 trd_path，从工作区获取
-            trd_path = arguments.get("trd_path")
-            if not trd_path:
-                workspace = workspace_manager.get_workspace(arguments["workspace_id"])
-                trd_path = workspace.get("files", {}).get("trd_path")
-                if not trd_path:
-                    raise ValidationError("工作区中没有 TRD 文档，请先生成 TRD")
-
-            result = decompose_tasks(
-                workspace_id=arguments["workspace_id"], trd_path=trd_path
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "generate_code":
-            result = generate_code(
-                workspace_id=arguments["workspace_id"], task_id=arguments["task_id"]
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "review_code":
-            result = review_code(
-                workspace_id=arguments["workspace_id"], task_id=arguments["task_id"]
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "generate_tests":
-            test_output_dir = arguments.get("test_output_dir", "")
-            result = generate_tests(
-                workspace_id=arguments["workspace_id"], test_output_dir=test_output_dir
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "review_tests":
-            result = review_tests(
-                workspace_id=arguments["workspace_id"],
-                test_files=arguments["test_files"],
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "analyze_coverage":
-            # 如果没有提供 project_path，从工作区获取
-            project_path = arguments.get("project_path")
-            if not project_path:
-                workspace = workspace_manager.get_workspace(arguments["workspace_id"])
-                project_path = workspace.get("project_path")
-                if not project_path:
-                    raise ValidationError("工作区中没有项目路径")
-
-            result = analyze_coverage(
-                workspace_id=arguments["workspace_id"], project_path=project_path
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # 任务执行工具
-        elif name == "execute_task":
-            max_review_retries = arguments.get("max_review_retries", 3)
-            result = execute_task(
-                workspace_id=arguments["workspace_id"],
-                task_id=arguments["task_id"],
-                max_review_retries=max_review_retries,
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        elif name == "execute_all_tasks":
-            max_review_retries = arguments.get("max_review_retries", 3)
-            result = execute_all_tasks(
-                workspace_id=arguments["workspace_id"],
-                max_review_retries=max_review_retries,
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # 工作流状态查询工具
-        elif name == "get_workflow_status":
-            result = get_workflow_status(workspace_id=arguments["workspace_id"])
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # 阶段依赖检查工具
-        elif name == "check_stage_ready":
-            result = check_stage_ready(
-                workspace_id=arguments["workspace_id"], stage=arguments["stage"]
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        # 完整工作流编排工具
-        elif name == "execute_full_workflow":
-            result = execute_full_workflow(
-                project_path=arguments.get("project_path"),
-                requirement_name=arguments.get("requirement_name"),
-                requirement_url=arguments.get("requirement_url"),
-                workspace_path=arguments.get("workspace_path"),
-                workspace_id=arguments.get("workspace_id"),
-                auto_confirm=arguments.get("auto_confirm", True),
-                max_review_retries=arguments.get("max_review_retries", 3),
-                interaction_response=arguments.get("interaction_response"),
-            )
-            return [
-                TextContent(type="text", text=json.dumps(result, ensure_ascii=False))
-            ]
-
-        else:
-            raise ValueError(f"未知工具: {name}")
-
+        finally:
+            if progress is not None:
+                await progress.flush()
+        return _to_text_content(result)
     except (
         ValidationError,
         WorkspaceNotFoundError,
@@ -0,0 +1,152 @@
+"""存储后端接口 - 工作区和任务的持久化抽象。
+
+Python 3.9+ 兼容
+
+`WorkspaceManager` 和 `TaskManager` 通过存储后端读写工作区元数据和任务列表，
+具体实现：
+- `JsonStorageBackend`: 每个工作区一个 `workspace.json` / `tasks.json`（默认）
+- `SqliteStorageBackend`: 单个 SQLite 数据库（WAL 模式），支持行级任务更新和按状态索引查询
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+# 工作区状态字段（status 下的键），用于按状态查询
+WORKSPACE_STATUS_FIELDS = (
+    "prd_status",
+    "trd_status",
+    "tasks_status",
+    "code_status",
+    "test_status",
+)
+
+
+def copy_json(value: Any) -> Any:
+    """复制 JSON 数据（比 copy.deepcopy 快，仅支持 dict/list/标量）。"""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+class StorageBackend(ABC):
+    """存储后端接口。"""
+
+    # ---------------------------------------------------------------- 工作区
+
+    @abstractmethod
+    def create_workspace(self, workspace: dict) -> None:
+        """保存新工作区元数据并登记到工作区索引。
+
+        Args:
+            workspace: 工作区元数据（必须包含 workspace_id）
+        """
+
+    @abstractmethod
+    def get_workspace(self, workspace_id: str) -> dict:
+        """获取工作区元数据。
+
+        Args:
+            workspace_id: 工作区ID
+
+        Returns:
+            工作区元数据（副本，调用方可以自由修改）
+
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+        """
+
+    @abstractmethod
+    def update_workspace(
+        self, workspace_id: str, mutate: Callable[[dict], None]
+    ) -> None:
+        """原子地读取-修改-保存工作区元数据。
+
+        Args:
+            workspace_id: 工作区ID
+            mutate: 修改工作区数据的函数
+
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+        """
+
+    @abstractmethod
+    def list_workspaces(self) -> dict[str, dict]:
+        """获取工作区索引。
+
+        Returns:
+            {工作区ID: 工作区摘要（workspace_id、project_path、requirement_name、created_at）}
+        """
+
+    @abstractmethod
+    def find_workspaces_by_status(self, status_field: str, status: str) -> list[str]:
+        """按阶段状态查找工作区。
+
+        Args:
+            status_field: 状态字段，见 WORKSPACE_STATUS_FIELDS
+            status: 状态值
+
+        Returns:
+            工作区ID列表
+        """
+
+    # ------------------------------------------------------------------ 任务
+
+    @abstractmethod
+    def has_tasks(self, workspace_id: str) -> bool:
+        """任务列表是否已保存（任务分解是否已产出结果）。"""
+
+    @abstractmethod
+    def get_tasks(self, workspace_id: str) -> list[dict]:
+        """获取工作区的所有任务（按保存顺序），任务列表不存在时返回空列表。"""
+
+    @abstractmethod
+    def get_task(self, workspace_id: str, task_id: str) -> Optional[dict]:
+        """获取单个任务，不存在时返回 None。"""
+
+    @abstractmethod
+    def save_tasks(self, workspace_id: str, tasks_data: dict) -> str:
+        """保存完整的任务列表（替换已有任务）。
+
+        Args:
+            workspace_id: 工作区ID
+            tasks_data: 任务列表数据，格式同 tasks.json：
+                {"workspace_id": ..., "created_at": ..., "tasks": [...]}
+
+        Returns:
+            任务列表的存储位置（记录到工作区的 files.tasks_json_path）
+        """
+
+    @abstractmethod
+    def update_tasks(self, workspace_id: str, updates: dict[str, dict]) -> None:
+        """在一次原子操作中更新多个任务，不存在的任务追加到末尾。
+
+        Args:
+            workspace_id: 工作区ID
+            updates: {任务ID: 要更新的字段（如 {"status": "completed"}）}
+        """
+
+    def update_task(
+        self, workspace_id: str, task_id: str, status: str, updates: dict
+    ) -> None:
+        """更新单个任务的状态和字段，任务不存在时追加新任务。
+
+        Args:
+            workspace_id: 工作区ID
+            task_id: 任务ID
+            status: 新状态
+            updates: 其他要更新的字段
+        """
+        self.update_tasks(workspace_id, {task_id: {"status": status, **updates}})
+
+    @abstractmethod
+    def find_tasks_by_status(self, workspace_id: str, status: str) -> list[dict]:
+        """按状态查找任务（按保存顺序）。"""
+
+    # 有意提供默认实现（而非抽象方法）：不持有资源的后端不需要实现
+    def close(self) -> None:  # noqa: B027
+        """释放后端持有的资源。
+
+        默认无操作；持有连接等资源的后端（如 `SqliteStorageBackend`）覆盖此方法。
+        """
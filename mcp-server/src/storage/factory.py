@@ -0,0 +1,51 @@
+"""存储后端工厂。
+
+Python 3.9+ 兼容
+"""
+
+import threading
+
+from src.core.config import Config
+from src.core.exceptions import ValidationError
+from src.storage.base import StorageBackend
+from src.storage.json_backend import JsonStorageBackend
+from src.storage.sqlite_backend import SqliteStorageBackend
+
+# SQLite 后端按数据库路径缓存，同一进程内复用连接
+_sqlite_backends: dict[str, SqliteStorageBackend] = {}
+_sqlite_backends_lock = threading.Lock()
+
+
+def get_storage_backend(config: Config) -> StorageBackend:
+    """根据配置（STORAGE_BACKEND）获取存储后端。
+
+    Args:
+        config: 配置管理器
+
+    Returns:
+        存储后端实例
+
+    Raises:
+        ValidationError: 当存储后端类型未知时
+    """
+    if config.storage_backend == "json":
+        return JsonStorageBackend(config)
+
+    if config.storage_backend == "sqlite":
+        key = str(config.storage_sqlite_path.absolute())
+        with _sqlite_backends_lock:
+            backend = _sqlite_backends.get(key)
+            if backend is None:
+                backend = SqliteStorageBackend(config.storage_sqlite_path)
+                _sqlite_backends[key] = backend
+        return backend
+
+    raise ValidationError(f"未知存储后端: {config.storage_backend}")
+
+
+def close_storage_backends() -> None:
+    """关闭所有缓存的存储后端。"""
+    with _sqlite_backends_lock:
+        for backend in _sqlite_backends.values():
+            backend.close()
+        _sqlite_backends.clear()
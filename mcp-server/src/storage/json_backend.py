@@ -0,0 +1,355 @@
+"""JSON 文件存储后端（默认）。
+
+Python 3.9+ 兼容
+
+存储布局：
+- `.agent-orchestrator/.workspace-index.json`: 工作区索引
+- `.agent-orchestrator/requirements/<workspace_id>/workspace.json`: 工作区元数据
+- `tasks.json`: 任务列表（默认位于工作区目录，路径记录在 files.tasks_json_path）
+
+所有写入都在文件锁内通过原子写入完成。workspace.json 带有进程内缓存。
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.core.config import Config
+from src.core.exceptions import WorkspaceNotFoundError
+from src.core.logger import setup_logger
+from src.storage.base import StorageBackend, copy_json
+from src.utils.atomic_write import write_json_atomic
+from src.utils.file_lock import file_lock, read_lock
+
+logger = setup_logger(__name__)
+
+# 文件系统时间戳精度有限（部分平台为毫秒级），在此窗口内被其他写入方原地修改的文件
+# 可能出现同一时间戳、同样大小而签名不变的情况，因此读取时处于窗口内的缓存条目不可信
+_RACY_WINDOW_NS = 20_000_000
+
+
+def _file_signature(stat_result: os.stat_result) -> tuple[int, int, int]:
+    """根据 stat 结果生成文件签名。"""
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+class _FileCache:
+    """进程内 JSON 文件缓存：{文件路径: (文件签名, 是否可信, 缓存值)}。
+
+    所有后端实例共享，通过文件签名（inode + mtime_ns + size）校验，
+    命中时只需一次 stat，无需加锁和解析 JSON。
+    """
+
+    def __init__(self) -> None:
+        """初始化缓存。"""
+        self._entries: dict[str, tuple[tuple[int, int, int], bool, Any]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, path: Path, signature: tuple[int, int, int]) -> Any:
+        """查找缓存，签名不匹配或条目不可信时返回 None。"""
+        entry = self._entries.get(str(path))
+        if entry is None or entry[0] != signature or not entry[1]:
+            return None
+        return entry[2]
+
+    def store(
+        self,
+        path: Path,
+        value: Any,
+        stat_result: Optional[os.stat_result] = None,
+        written: bool = False,
+    ) -> None:
+        """写入缓存（调用方需持有该文件的锁，确保文件内容与 value 一致）。
+
+        Args:
+            path: 文件路径
+            value: 缓存值
+            stat_result: 文件的 stat 结果，None 时重新 stat
+            written: 是否为本进程刚原子写入的文件。原子写入总是产生新 inode，
+                条目直接可信；读取得到的条目在时间戳精度窗口之外才可信
+        """
+        stat_result = stat_result or path.stat()
+        trusted = written or (
+            time.time_ns() - stat_result.st_mtime_ns >= _RACY_WINDOW_NS
+        )
+        with self._lock:
+            self._entries[str(path)] = (_file_signature(stat_result), trusted, value)
+
+    def pop(self, path: Path) -> Any:
+        """移除并返回缓存值（不校验签名）。"""
+        with self._lock:
+            entry = self._entries.pop(str(path), None)
+        return entry[2] if entry is not None else None
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        with self._lock:
+            self._entries.clear()
+
+
+# workspace.json 缓存（值为工作区数据）
+_workspace_cache = _FileCache()
+
+# tasks.json 缓存（值为 (任务文件数据, {task_id: 任务在列表中的位置})）
+_tasks_cache = _FileCache()
+
+
+def _index_tasks(tasks: list[dict]) -> dict[str, int]:
+    """建立 task_id 到列表位置的索引。"""
+    return {task.get("task_id"): position for position, task in enumerate(tasks)}
+
+
+def clear_workspace_cache() -> None:
+    """清空进程内工作区和任务缓存。"""
+    _workspace_cache.clear()
+    _tasks_cache.clear()
+
+
+class JsonStorageBackend(StorageBackend):
+    """JSON 文件存储后端。"""
+
+    def __init__(self, config: Config) -> None:
+        """初始化 JSON 存储后端。
+
+        Args:
+            config: 配置管理器
+        """
+        self.config = config
+
+    def _meta_file(self, workspace_id: str) -> Path:
+        """工作区元数据文件路径。"""
+        return self.config.get_workspace_path(workspace_id) / "workspace.json"
+
+    def _tasks_file(self, workspace_id: str) -> Path:
+        """任务文件路径（优先使用工作区记录的 tasks_json_path）。"""
+        workspace = self.get_workspace(workspace_id)
+        tasks_path = workspace.get("files", {}).get("tasks_json_path")
+        if tasks_path:
+            return Path(tasks_path)
+        return self.config.get_workspace_path(workspace_id) / "tasks.json"
+
+    def _write_json(self, file_path: Path, data: Any) -> os.stat_result:
+        """原子写入元数据文件（按 STORAGE_FSYNC / STORAGE_COMPACT_JSON 配置）。"""
+        return write_json_atomic(
+            file_path,
+            data,
+            compact=self.config.storage_compact_json,
+            fsync=self.config.storage_fsync,
+        )
+
+    # ---------------------------------------------------------------- 工作区
+
+    def _load_workspace_index(self) -> dict:
+        """加载工作区索引。"""
+        index_file = self.config.workspace_index_file
+        if index_file.exists():
+            with read_lock(index_file), open(index_file, encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def create_workspace(self, workspace: dict) -> None:
+        """保存新工作区元数据并登记到工作区索引。"""
+        workspace_id = workspace["workspace_id"]
+        meta_file = self._meta_file(workspace_id)
+        workspace = copy_json(workspace)
+
+        with file_lock(meta_file):
+            stat_result = self._write_json(meta_file, workspace)
+            _workspace_cache.store(meta_file, workspace, stat_result, written=True)
+
+        # 在锁内读取-修改-写入索引，避免并发创建时丢失条目
+        index_file = self.config.workspace_index_file
+        with file_lock(index_file):
+            index = {}
+            if index_file.exists():
+                with open(index_file, encoding="utf-8") as f:
+                    index = json.load(f)
+            index[workspace_id] = {
+                "workspace_id": workspace_id,
+                "project_path": workspace.get("project_path"),
+                "requirement_name": workspace.get("requirement_name"),
+                "created_at": workspace.get("created_at"),
+            }
+            self._write_json(index_file, index)
+
+    def get_workspace(self, workspace_id: str) -> dict:
+        """获取工作区元数据。
+
+        优先使用进程内缓存：文件签名（inode + mtime_ns + size）未变化时直接返回
+        缓存数据的副本；否则在读锁下重新读取并更新缓存。
+        """
+        meta_file = self._meta_file(workspace_id)
+
+        try:
+            signature = _file_signature(meta_file.stat())
+        except FileNotFoundError:
+            _workspace_cache.pop(meta_file)
+            raise WorkspaceNotFoundError(
+                f"Workspace not found: {workspace_id}"
+            ) from None
+
+        cached = _workspace_cache.lookup(meta_file, signature)
+        if cached is not None:
+            return copy_json(cached)
+
+        # 使用读锁，允许多个进程同时读取
+        with read_lock(meta_file):
+            with open(meta_file, encoding="utf-8") as f:
+                workspace = json.load(f)
+            _workspace_cache.store(meta_file, workspace)
+
+        return copy_json(workspace)
+
+    def update_workspace(
+        self, workspace_id: str, mutate: Callable[[dict], None]
+    ) -> None:
+        """在文件锁内读取-修改-原子写入工作区元数据（写穿缓存）。
+
+        Raises:
+            WorkspaceNotFoundError: 当工作区不存在时
+            FileLockError: 当无法在超时时间内获取锁时（其他进程正在修改）
+        """
+        meta_file = self._meta_file(workspace_id)
+
+        # 使用文件锁保护读取-修改-写入操作
+        with file_lock(meta_file):
+            # 读取最新数据（文件签名与缓存一致时复用缓存，否则重新解析）
+            if not meta_file.exists():
+                raise WorkspaceNotFoundError(f"Workspace not found: {workspace_id}")
+
+            signature = _file_signature(meta_file.stat())
+            workspace = _workspace_cache.lookup(meta_file, signature)
+            if workspace is None:
+                with open(meta_file, encoding="utf-8") as f:
+                    workspace = json.load(f)
+            else:
+                workspace = copy_json(workspace)
+
+            mutate(workspace)
+
+            stat_result = self._write_json(meta_file, workspace)
+            _workspace_cache.store(meta_file, workspace, stat_result, written=True)
+
+    def list_workspaces(self) -> dict[str, dict]:
+        """获取工作区索引。"""
+        return self._load_workspace_index()
+
+    def find_workspaces_by_status(self, status_field: str, status: str) -> list[str]:
+        """按阶段状态查找工作区（逐个读取 workspace.json）。"""
+        result = []
+        for workspace_id in self._load_workspace_index():
+            try:
+                workspace = self.get_workspace(workspace_id)
+            except WorkspaceNotFoundError:
+                continue
+            if workspace.get("status", {}).get(status_field) == status:
+                result.append(workspace_id)
+        return result
+
+    # ------------------------------------------------------------------ 任务
+
+    def has_tasks(self, workspace_id: str) -> bool:
+        """任务文件是否存在。"""
+        return self._tasks_file(workspace_id).exists()
+
+    def _load_tasks(self, tasks_file: Path) -> Optional[tuple[dict, dict[str, int]]]:
+        """读取任务文件及其 task_id 索引（优先使用缓存），文件不存在时返回 None。
+
+        返回的是缓存中的对象，调用方不能修改。
+        """
+        try:
+            signature = _file_signature(tasks_file.stat())
+        except FileNotFoundError:
+            _tasks_cache.pop(tasks_file)
+            return None
+
+        cached = _tasks_cache.lookup(tasks_file, signature)
+        if cached is not None:
+            return cached
+
+        # 使用读锁，允许多个进程同时读取
+        with read_lock(tasks_file):
+            with open(tasks_file, encoding="utf-8") as f:
+                data = json.load(f)
+            entry = (data, _index_tasks(data.get("tasks", [])))
+            _tasks_cache.store(tasks_file, entry)
+        return entry
+
+    def get_tasks(self, workspace_id: str) -> list[dict]:
+        """读取任务文件中的所有任务。"""
+        loaded = self._load_tasks(self._tasks_file(workspace_id))
+        return copy_json(loaded[0].get("tasks", [])) if loaded is not None else []
+
+    def get_tasks_data(self, workspace_id: str) -> Optional[dict]:
+        """读取完整的 tasks.json 数据，文件不存在时返回 None。"""
+        loaded = self._load_tasks(self._tasks_file(workspace_id))
+        return copy_json(loaded[0]) if loaded is not None else None
+
+    def get_task(self, workspace_id: str, task_id: str) -> Optional[dict]:
+        """通过 task_id 索引查找单个任务。"""
+        loaded = self._load_tasks(self._tasks_file(workspace_id))
+        if loaded is None:
+            return None
+        data, index = loaded
+        position = index.get(task_id)
+        if position is None:
+            return None
+        return copy_json(data["tasks"][position])
+
+    def save_tasks(self, workspace_id: str, tasks_data: dict) -> str:
+        """写入工作区目录下的 tasks.json。"""
+        tasks_file = self.config.get_workspace_path(workspace_id) / "tasks.json"
+        tasks_data = copy_json(tasks_data)
+        with file_lock(tasks_file):
+            stat_result = self._write_json(tasks_file, tasks_data)
+            entry = (tasks_data, _index_tasks(tasks_data.get("tasks", [])))
+            _tasks_cache.store(tasks_file, entry, stat_result, written=True)
+        return str(tasks_file)
+
+    def update_tasks(self, workspace_id: str, updates: dict[str, dict]) -> None:
+        """在一次文件锁内读取-修改-原子写入 tasks.json（写穿缓存）。
+
+        Raises:
+            FileLockError: 当无法在超时时间内获取锁时（其他进程正在修改）
+        """
+        tasks_file = self._tasks_file(workspace_id)
+
+        # 使用文件锁保护读取-修改-写入操作
+        with file_lock(tasks_file):
+            # 读取最新数据（文件签名与缓存一致时复用缓存，否则重新解析；
+            # 当前线程已持有写锁，读锁直接重入）
+            loaded = self._load_tasks(tasks_file)
+            if loaded is None:
+                data = {"workspace_id": workspace_id, "tasks": []}
+                index: dict[str, int] = {}
+            else:
+                # 缓存中的对象可能正被同进程其他线程读取，不能原地修改：
+                # 浅拷贝外层结构，只替换被更新的任务
+                data = dict(loaded[0])
+                index = dict(loaded[1])
+            tasks = data["tasks"] = list(data.get("tasks", []))
+
+            for task_id, fields in updates.items():
+                fields = copy_json(fields)
+                position = index.get(task_id)
+                if position is not None:
+                    tasks[position] = {**tasks[position], **fields}
+                else:
+                    # 如果任务不存在，创建新任务
+                    index[task_id] = len(tasks)
+                    tasks.append({"task_id": task_id, **fields})
+
+            # 保存（原子写入）
+            stat_result = self._write_json(tasks_file, data)
+            _tasks_cache.store(tasks_file, (data, index), stat_result, written=True)
+
+    def find_tasks_by_status(self, workspace_id: str, status: str) -> list[dict]:
+        """按状态过滤任务。"""
+        return [
+            task
+            for task in self.get_tasks(workspace_id)
+            if task.get("status") == status
+        ]
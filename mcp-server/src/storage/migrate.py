@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""存储迁移命令 - 将 JSON 工作区导入 SQLite 数据库。
+
+Python 3.9+ 兼容
+
+运行方式：
+    cd mcp-server && PYTHONPATH=. python3 -m src.storage.migrate [--overwrite]
+
+迁移完成后设置环境变量 `STORAGE_BACKEND=sqlite` 即可切换到 SQLite 后端。
+原有的 JSON 文件不会被修改或删除。
+"""
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+from src.core.config import Config
+from src.core.exceptions import WorkspaceNotFoundError
+from src.core.logger import setup_logger
+from src.storage.json_backend import JsonStorageBackend
+from src.storage.sqlite_backend import SqliteStorageBackend
+
+logger = setup_logger(__name__)
+
+
+def migrate_json_to_sqlite(
+    config: Config,
+    target: Optional[SqliteStorageBackend] = None,
+    overwrite: bool = False,
+) -> dict:
+    """将 JSON 存储的工作区和任务导入 SQLite。
+
+    扫描 requirements 目录下所有 workspace.json（不依赖工作区索引，索引缺失的
+    工作区同样会被导入）。
+
+    Args:
+        config: 配置管理器（决定 JSON 工作区根目录和 SQLite 数据库路径）
+        target: 目标 SQLite 后端，如果为 None 则使用 config.storage_sqlite_path
+        overwrite: 是否覆盖数据库中已存在的工作区
+
+    Returns:
+        迁移统计，格式：
+        {
+            "workspaces": 导入的工作区数,
+            "tasks": 导入的任务数,
+            "skipped": 已存在而跳过的工作区ID列表,
+            "failed": {工作区ID: 错误信息}
+        }
+    """
+    source = JsonStorageBackend(config)
+    target = target or SqliteStorageBackend(config.storage_sqlite_path)
+    existing = set(target.list_workspaces())
+
+    result: dict = {"workspaces": 0, "tasks": 0, "skipped": [], "failed": {}}
+
+    for meta_file in sorted(config.requirements_dir.glob("*/workspace.json")):
+        workspace_id = meta_file.parent.name
+        if workspace_id in existing and not overwrite:
+            result["skipped"].append(workspace_id)
+            continue
+
+        try:
+            workspace = source.get_workspace(workspace_id)
+            workspace["workspace_id"] = workspace_id
+
+            tasks_data = source.get_tasks_data(workspace_id)
+            if tasks_data is not None:
+                location = target.save_tasks(workspace_id, tasks_data)
+                workspace.setdefault("files", {})["tasks_json_path"] = location
+                result["tasks"] += len(tasks_data.get("tasks", []))
+
+            target.create_workspace(workspace)
+        except (OSError, ValueError, KeyError, WorkspaceNotFoundError) as e:
+            logger.error(f"迁移工作区失败: {workspace_id}, {e}")
+            result["failed"][workspace_id] = str(e)
+            continue
+
+        result["workspaces"] += 1
+
+    logger.info(
+        f"迁移完成: {result['workspaces']} 个工作区, {result['tasks']} 个任务, "
+        f"跳过 {len(result['skipped'])} 个, 失败 {len(result['failed'])} 个"
+    )
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description="将 JSON 工作区导入 SQLite 数据库")
+    parser.add_argument(
+        "--overwrite", action="store_true", help="覆盖数据库中已存在的工作区"
+    )
+    args = parser.parse_args(argv)
+
+    config = Config()
+    result = migrate_json_to_sqlite(config, overwrite=args.overwrite)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"数据库: {config.storage_sqlite_path}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
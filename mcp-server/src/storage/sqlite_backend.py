@@ -0,0 +1,310 @@
+"""SQLite 存储后端。
+
+Python 3.9+ 兼容
+
+所有工作区和任务保存在一个 SQLite 数据库中（默认 `.agent-orchestrator/orchestrator.db`）：
+- WAL 模式：读取不阻塞写入，多个 Cursor 终端可以同时读写
+- 工作区状态字段单独成列并建立索引，按状态查询无需加载所有工作区
+- 每个任务一行，更新单个任务只修改一行，不再重写整个任务列表
+- 跨进程并发由 SQLite 的事务和 busy_timeout 保证，不再需要文件锁
+
+工作区和任务的完整数据以 JSON 文本保存在 data 列中，结构与 JSON 后端一致。
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.core.exceptions import ValidationError, WorkspaceNotFoundError
+from src.core.logger import setup_logger
+from src.storage.base import WORKSPACE_STATUS_FIELDS, StorageBackend
+
+logger = setup_logger(__name__)
+
+# 等待其他连接释放写锁的最长时间（毫秒）
+_BUSY_TIMEOUT_MS = 30000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspaces (
+    workspace_id TEXT PRIMARY KEY,
+    project_path TEXT,
+    requirement_name TEXT,
+    created_at TEXT,
+    prd_status TEXT,
+    trd_status TEXT,
+    tasks_status TEXT,
+    code_status TEXT,
+    test_status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_workspaces_prd_status ON workspaces (prd_status);
+CREATE INDEX IF NOT EXISTS idx_workspaces_trd_status ON workspaces (trd_status);
+CREATE INDEX IF NOT EXISTS idx_workspaces_tasks_status ON workspaces (tasks_status);
+CREATE INDEX IF NOT EXISTS idx_workspaces_code_status ON workspaces (code_status);
+CREATE INDEX IF NOT EXISTS idx_workspaces_test_status ON workspaces (test_status);
+
+CREATE TABLE IF NOT EXISTS task_lists (
+    workspace_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    workspace_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (workspace_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (workspace_id, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_position ON tasks (workspace_id, position);
+"""
+
+
+def _dumps(data: dict) -> str:
+    """序列化 data 列。"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _workspace_row(workspace: dict) -> tuple:
+    """工作区数据转换为 workspaces 表的一行（列顺序与建表语句一致）。"""
+    status = workspace.get("status", {})
+    return (
+        workspace["workspace_id"],
+        workspace.get("project_path"),
+        workspace.get("requirement_name"),
+        workspace.get("created_at"),
+        *(status.get(field) for field in WORKSPACE_STATUS_FIELDS),
+        _dumps(workspace),
+    )
+
+
+class SqliteStorageBackend(StorageBackend):
+    """SQLite 存储后端。"""
+
+    def __init__(self, db_path: Path) -> None:
+        """初始化 SQLite 存储后端（首次使用时创建数据库和表）。
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # sqlite3 连接不能跨线程使用，每个线程一个连接
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的连接。"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None,  # 手动管理事务
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """写事务（BEGIN IMMEDIATE 立即获取写锁，避免读后升级写锁时死锁）。"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """关闭所有线程的连接。"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ---------------------------------------------------------------- 工作区
+
+    def create_workspace(self, workspace: dict) -> None:
+        """插入新工作区。"""
+        with self._transaction() as conn:
+            self._upsert_workspace(conn, workspace)
+
+    def _upsert_workspace(self, conn: sqlite3.Connection, workspace: dict) -> None:
+        """插入或替换工作区行。"""
+        placeholders = ", ".join("?" * (len(WORKSPACE_STATUS_FIELDS) + 5))
+        conn.execute(
+            f"INSERT OR REPLACE INTO workspaces VALUES ({placeholders})",
+            _workspace_row(workspace),
+        )
+
+    def get_workspace(self, workspace_id: str) -> dict:
+        """按主键读取工作区。"""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT data FROM workspaces WHERE workspace_id = ?", (workspace_id,)
+            )
+            .fetchone()
+        )
+        if row is None:
+            raise WorkspaceNotFoundError(f"Workspace not found: {workspace_id}")
+        return json.loads(row[0])
+
+    def update_workspace(
+        self, workspace_id: str, mutate: Callable[[dict], None]
+    ) -> None:
+        """在写事务内读取-修改-保存工作区。"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM workspaces WHERE workspace_id = ?", (workspace_id,)
+            ).fetchone()
+            if row is None:
+                raise WorkspaceNotFoundError(f"Workspace not found: {workspace_id}")
+            workspace = json.loads(row[0])
+            mutate(workspace)
+            self._upsert_workspace(conn, workspace)
+
+    def list_workspaces(self) -> dict[str, dict]:
+        """从 workspaces 表的索引列生成工作区索引（不解析 data 列）。"""
+        rows = self._connect().execute(
+            "SELECT workspace_id, project_path, requirement_name, created_at "
+            "FROM workspaces ORDER BY created_at"
+        )
+        return {
+            row[0]: {
+                "workspace_id": row[0],
+                "project_path": row[1],
+                "requirement_name": row[2],
+                "created_at": row[3],
+            }
+            for row in rows
+        }
+
+    def find_workspaces_by_status(self, status_field: str, status: str) -> list[str]:
+        """使用状态列索引查找工作区。"""
+        if status_field not in WORKSPACE_STATUS_FIELDS:
+            raise ValidationError(f"未知状态字段: {status_field}")
+        rows = self._connect().execute(
+            f"SELECT workspace_id FROM workspaces WHERE {status_field} = ? "
+            "ORDER BY created_at",
+            (status,),
+        )
+        return [row[0] for row in rows]
+
+    # ------------------------------------------------------------------ 任务
+
+    def has_tasks(self, workspace_id: str) -> bool:
+        """任务列表是否已保存。"""
+        row = (
+            self._connect()
+            .execute("SELECT 1 FROM task_lists WHERE workspace_id = ?", (workspace_id,))
+            .fetchone()
+        )
+        return row is not None
+
+    def get_tasks(self, workspace_id: str) -> list[dict]:
+        """按保存顺序读取所有任务。"""
+        rows = self._connect().execute(
+            "SELECT data FROM tasks WHERE workspace_id = ? ORDER BY position",
+            (workspace_id,),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def get_task(self, workspace_id: str, task_id: str) -> Optional[dict]:
+        """按主键读取单个任务。"""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT data FROM tasks WHERE workspace_id = ? AND task_id = ?",
+                (workspace_id, task_id),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row is not None else None
+
+    def save_tasks(self, workspace_id: str, tasks_data: dict) -> str:
+        """替换工作区的全部任务。"""
+        list_data = {key: value for key, value in tasks_data.items() if key != "tasks"}
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO task_lists VALUES (?, ?)",
+                (workspace_id, _dumps(list_data)),
+            )
+            conn.execute("DELETE FROM tasks WHERE workspace_id = ?", (workspace_id,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        workspace_id,
+                        task["task_id"],
+                        position,
+                        task.get("status"),
+                        _dumps(task),
+                    )
+                    for position, task in enumerate(tasks_data.get("tasks", []))
+                ),
+            )
+        return f"{self.db_path}#tasks/{workspace_id}"
+
+    def update_tasks(self, workspace_id: str, updates: dict[str, dict]) -> None:
+        """在一个事务内逐行更新任务，不存在的任务追加到末尾。"""
+        with self._transaction() as conn:
+            for task_id, fields in updates.items():
+                row = conn.execute(
+                    "SELECT data FROM tasks WHERE workspace_id = ? AND task_id = ?",
+                    (workspace_id, task_id),
+                ).fetchone()
+                if row is not None:
+                    task = json.loads(row[0])
+                    task.update(fields)
+                    conn.execute(
+                        "UPDATE tasks SET status = ?, data = ? "
+                        "WHERE workspace_id = ? AND task_id = ?",
+                        (task.get("status"), _dumps(task), workspace_id, task_id),
+                    )
+                    continue
+
+                # 如果任务不存在，创建新任务
+                task = {"task_id": task_id, **fields}
+                conn.execute(
+                    "INSERT OR IGNORE INTO task_lists VALUES (?, ?)",
+                    (workspace_id, _dumps({"workspace_id": workspace_id})),
+                )
+                conn.execute(
+                    "INSERT INTO tasks VALUES (?, ?, "
+                    "(SELECT COALESCE(MAX(position), -1) + 1 FROM tasks "
+                    "WHERE workspace_id = ?), ?, ?)",
+                    (
+                        workspace_id,
+                        task_id,
+                        workspace_id,
+                        task.get("status"),
+                        _dumps(task),
+                    ),
+                )
+
+    def find_tasks_by_status(self, workspace_id: str, status: str) -> list[dict]:
+        """使用 (workspace_id, status) 索引查找任务。"""
+        rows = self._connect().execute(
+            "SELECT data FROM tasks WHERE workspace_id = ? AND status = ? "
+            "ORDER BY position",
+            (workspace_id, status),
+        )
+        return [json.loads(row[0]) for row in rows]
@@ -1,13 +1,20 @@
 """代码生成工具 - TDD 第二步：最小实现。
 
 Python 3.9+ 兼容
+
+- `generate_code`: 为单个任务生成代码
+- `generate_code_batch`: 为多个任务一次生成代码（工作区和任务只读取一次，
+  任务文件只写入一次，code_status 只计算一次，所有任务的 LLM 请求并发发出）
 """
 
+import re
 from pathlib import Path
 
 from src.core.config import Config
 from src.core.exceptions import ValidationError
 from src.core.logger import setup_logger
+from src.llm.base import LLMRequest
+from src.llm.factory import generate_texts
 from src.managers.task_manager import TaskManager
 from src.managers.workspace_manager import WorkspaceManager
 
@@ -58,27 +65,8 @@ def generate_code(workspace_id: str, task_id: str) -> dict:
     project_path = Path(workspace["project_path"])
 
     try:
-        # TODO: 调用 Cursor AI 生成代码
-        # 目前先创建占位文件
-
-        # 生成代码文件路径
-        code_files = []
-
-        # 根据任务描述生成文件名
-        safe_name = task_id.replace("-", "_")
-        code_file = project_path / f"{safe_name}.py"
-
-        # 生成代码内容
-        code_content = _generate_code_content(task, workspace)
-        code_file.write_text(code_content, encoding="utf-8")
-        code_files.append(str(code_file))
-
-        # 生成测试文件
-        test_file = project_path / "tests" / f"test_{safe_name}.py"
-        test_file.parent.mkdir(parents=True, exist_ok=True)
-        test_content = _generate_test_content(task, workspace)
-        test_file.write_text(test_content, encoding="utf-8")
-        code_files.append(str(test_file))
+        contents = _generate_task_contents([task], workspace, config)[0]
+        code_files = _write_task_files(task, project_path, contents)
 
         # 更新任务状态
         task_manager.update_task_status(
@@ -113,8 +101,222 @@ def generate_code(workspace_id: str, task_id: str) -> dict:
         raise
 
 
+def generate_code_batch(workspace_id: str, task_ids: list[str]) -> dict:
+    """为多个任务一次生成代码。
+
+    与逐个调用 `generate_code` 的结果相同，但工作区和任务列表只读取一次，
+    所有任务的状态通过一次 `update_tasks_bulk` 写入，code_status 只更新一次。
+    单个任务不存在、不是 pending 状态或写入文件失败不影响其他任务。
+
+    Args:
+        workspace_id: 工作区ID
+        task_ids: 任务ID列表
+
+    Returns:
+        包含生成结果的字典，格式：
+        {
+            "success": 是否所有任务都生成成功,
+            "workspace_id": 工作区ID,
+            "generated": {任务ID: 生成的文件路径列表},
+            "failed": {任务ID: 错误信息},
+            "code_status": 更新后的代码生成状态
+        }
+
+    Raises:
+        ValidationError: 当任务分解未完成时
+    """
+    config = Config()
+    workspace_manager = WorkspaceManager(config=config)
+    task_manager = TaskManager()
+
+    workspace = workspace_manager.get_workspace(workspace_id)
+    status = workspace.get("status", {})
+    if status.get("tasks_status") != "completed":
+        raise ValidationError("任务分解尚未完成，无法生成代码。请先完成任务分解。")
+
+    all_tasks = task_manager.get_tasks(workspace_id)
+    tasks_by_id = {task.get("task_id"): task for task in all_tasks}
+
+    generated: dict[str, list[str]] = {}
+    failed: dict[str, str] = {}
+    selected = []
+    for task_id in dict.fromkeys(task_ids):
+        task = tasks_by_id.get(task_id)
+        if task is None:
+            failed[task_id] = f"任务不存在: {task_id}"
+        elif task.get("status", "pending") != "pending":
+            failed[task_id] = (
+                f"任务状态为 {task.get('status')}，无法生成代码。"
+                "只能为 pending 状态的任务生成代码。"
+            )
+        else:
+            selected.append(task)
+
+    if not selected:
+        return {
+            "success": not failed,
+            "workspace_id": workspace_id,
+            "generated": generated,
+            "failed": failed,
+            "code_status": status.get("code_status", "pending"),
+        }
+
+    workspace_manager.update_workspace_status(
+        workspace_id, {"code_status": "in_progress"}
+    )
+
+    project_path = Path(workspace["project_path"])
+    try:
+        all_contents = _generate_task_contents(selected, workspace, config)
+    except Exception:
+        workspace_manager.update_workspace_status(
+            workspace_id, {"code_status": "failed"}
+        )
+        raise
+
+    write_failed = False
+    for task, contents in zip(selected, all_contents):
+        task_id = task["task_id"]
+        try:
+            generated[task_id] = _write_task_files(task, project_path, contents)
+        except Exception as e:
+            write_failed = True
+            failed[task_id] = f"代码生成失败: {e}"
+            logger.error(
+                f"代码生成失败: {workspace_id}/{task_id}, 错误: {e}", exc_info=True
+            )
+
+    try:
+        task_manager.update_tasks_bulk(
+            workspace_id,
+            {
+                task_id: {"status": "completed", "code_files": code_files}
+                for task_id, code_files in generated.items()
+            },
+        )
+    except Exception:
+        workspace_manager.update_workspace_status(
+            workspace_id, {"code_status": "failed"}
+        )
+        raise
+
+    # 用已读取的任务列表加上本次更新判断是否所有任务都已完成，不再重新读取
+    if write_failed:
+        code_status = "failed"
+    elif all(
+        task.get("task_id") in generated or task.get("status") == "completed"
+        for task in all_tasks
+    ):
+        code_status = "completed"
+    else:
+        code_status = "in_progress"
+    workspace_manager.update_workspace_status(
+        workspace_id, {"code_status": code_status}
+    )
+
+    logger.info(
+        f"批量代码生成完成: {workspace_id}, 成功: {len(generated)}, 失败: {len(failed)}"
+    )
+
+    return {
+        "success": not failed,
+        "workspace_id": workspace_id,
+        "generated": generated,
+        "failed": failed,
+        "code_status": code_status,
+    }
+
+
+def _generate_task_contents(
+    tasks: list[dict], workspace: dict, config: Config
+) -> list[tuple[str, str]]:
+    """为任务生成代码和测试代码（所有请求一次并发发出，失败时使用模板）。
+
+    Args:
+        tasks: 任务列表
+        workspace: 工作区信息
+        config: 配置管理器
+
+    Returns:
+        与 tasks 一一对应的 (代码内容, 测试代码内容)
+    """
+    requests = []
+    for task in tasks:
+        requests.append(_build_code_request(task, workspace))
+        requests.append(_build_test_request(task, workspace))
+    texts = [_strip_code_fence(text) for text in generate_texts(requests, config)]
+    return list(zip(texts[0::2], texts[1::2]))
+
+
+def _build_code_request(task: dict, workspace: dict) -> LLMRequest:
+    """构造代码生成请求（以模板内容作为 fallback）。"""
+    task_id = task.get("task_id", "")
+    function_name = task_id.replace("-", "_")
+    prompt = (
+        f"请为需求「{workspace.get('requirement_name', '未知需求')}」的任务 {task_id} "
+        f"编写 Python 模块 {function_name}.py，入口函数为 {function_name}()，"
+        "返回包含 status 和 task_id 的字典。只返回代码。\n\n"
+        f"任务描述：{task.get('description', '')}"
+    )
+    return LLMRequest(
+        prompt,
+        system="你是一名资深 Python 工程师。",
+        fallback=_generate_code_content(task, workspace),
+    )
+
+
+def _build_test_request(task: dict, workspace: dict) -> LLMRequest:
+    """构造测试代码生成请求（以模板内容作为 fallback）。"""
+    task_id = task.get("task_id", "")
+    function_name = task_id.replace("-", "_")
+    prompt = (
+        f"请为模块 {function_name}.py 的入口函数 {function_name}() 编写 pytest 测试，"
+        f"测试文件位于 tests/test_{function_name}.py。只返回代码。\n\n"
+        f"任务描述：{task.get('description', '')}"
+    )
+    return LLMRequest(
+        prompt,
+        system="你是一名资深 Python 测试工程师。",
+        fallback=_generate_test_content(task, workspace),
+    )
+
+
+def _strip_code_fence(text: str) -> str:
+    """去掉 LLM 响应外层的 Markdown 代码块标记。"""
+    match = re.fullmatch(r"\s*```[\w+-]*\n(.*?)\n?```\s*", text, re.DOTALL)
+    return match.group(1) + "\n" if match else text
+
+
+def _write_task_files(
+    task: dict, project_path: Path, contents: tuple[str, str]
+) -> list[str]:
+    """写入任务的代码文件和测试文件。
+
+    Args:
+        task: 任务信息
+        project_path: 项目路径
+        contents: (代码内容, 测试代码内容)
+
+    Returns:
+        生成的文件路径列表
+    """
+    code_content, test_content = contents
+
+    # 根据任务ID生成文件名
+    safe_name = task["task_id"].replace("-", "_")
+    code_file = project_path / f"{safe_name}.py"
+    code_file.write_text(code_content, encoding="utf-8")
+
+    # 生成测试文件
+    test_file = project_path / "tests" / f"test_{safe_name}.py"
+    test_file.parent.mkdir(parents=True, exist_ok=True)
+    test_file.write_text(test_content, encoding="utf-8")
+
+    return [str(code_file), str(test_file)]
+
+
 def _generate_code_content(task: dict, workspace: dict) -> str:
-    """生成代码内容。
+    """生成代码内容（模板）。
 
     Args:
         task: 任务信息
@@ -151,7 +353,7 @@ if __name__ == "__main__":
 
 
 def _generate_test_content(task: dict, workspace: dict) -> str:
-    """生成测试代码内容。
+    """生成测试代码内容（模板）。
 
     Args:
         task: 任务信息
@@ -1,14 +1,23 @@
 """代码审查工具 - TDD 第二步：最小实现。
 
 Python 3.9+ 兼容
-"""
 
-from pathlib import Path
+审查规则、并行执行和结构化结果见 `src.utils.review_engine`。
+"""
 
 from src.core.config import Config
 from src.core.logger import setup_logger
 from src.managers.task_manager import TaskManager
 from src.managers.workspace_manager import WorkspaceManager
+from src.utils.content_cache import ContentHashLRUCache
+from src.utils.review_engine import (
+    REVIEW_CACHE_DIR,
+    SEVERITY_ERROR,
+    SEVERITY_WARNING,
+    cache_namespace,
+    review_files,
+    summarize_findings,
+)
 
 logger = setup_logger(__name__)
 
@@ -21,7 +30,16 @@ def review_code(workspace_id: str, task_id: str) -> dict:
         task_id: 任务ID
 
     Returns:
-        包含审查结果的字典
+        包含审查结果的字典，格式：
+        {
+            "success": True,
+            "task_id": 任务ID,
+            "passed": 是否通过（没有 error 级别的发现）,
+            "review_report": Markdown 审查报告,
+            "findings": [{"file", "line", "rule", "severity", "message"}, ...],
+            "summary": {"error": n, "warning": n, "info": n},
+            "workspace_id": 工作区ID
+        }
     """
     config = Config()
     workspace_manager = WorkspaceManager(config=config)
@@ -32,12 +50,29 @@ def review_code(workspace_id: str, task_id: str) -> dict:
     code_files = task.get("code_files", [])
 
     # TODO: 调用 Gemini API 进行代码审查
-    # 目前先实现基础审查逻辑
-
-    review_report = _review_code_files(code_files, task)
-
-    # 判断是否通过（简化逻辑）
-    passed = _evaluate_review(review_report)
+    # 目前先使用基于 ast 的规则审查（src.utils.review_engine）
+
+    # 按文件内容哈希缓存每个文件的结果，Review 循环中未变化的文件不再审查
+    rules = config.review_rules or None
+    options = {"max_complexity": config.review_max_complexity}
+    cache = ContentHashLRUCache(
+        config.get_workspace_path(workspace_id) / REVIEW_CACHE_DIR,
+        cache_namespace(rules, options),
+        max_entries=config.review_cache_max_entries,
+    )
+    results = review_files(
+        code_files,
+        rules=rules,
+        options=options,
+        workers=config.review_workers,
+        cache=cache,
+    )
+    findings = [finding for result in results for finding in result["findings"]]
+    summary = summarize_findings(findings)
+    review_report = _render_review_report(task, results)
+
+    # 有 error 级别的发现（文件不存在、读取失败、语法错误等）时不通过
+    passed = summary[SEVERITY_ERROR] == 0
 
     # 更新任务状态
     if passed:
@@ -47,6 +82,7 @@ def review_code(workspace_id: str, task_id: str) -> dict:
             "reviewed",
             review_passed=True,
             review_report=review_report,
+            review_summary=summary,
         )
     else:
         task_manager.update_task_status(
@@ -55,75 +91,62 @@ def review_code(workspace_id: str, task_id: str) -> dict:
             "needs_fix",
             review_passed=False,
             review_report=review_report,
+            review_summary=summary,
         )
 
-    logger.info(f"代码审查完成: {task_id}, 通过: {passed}")
+    logger.info(f"代码审查完成: {task_id}, 通过: {passed}, 发现: {summary}")
 
     return {
         "success": True,
         "task_id": task_id,
         "passed": passed,
         "review_report": review_report,
+        "findings": findings,
+        "summary": summary,
         "workspace_id": workspace_id,
     }
 
 
-def _review_code_files(code_files: list[str], task: dict) -> str:
-    """审查代码文件。
+def _render_review_report(task: dict, results: list[dict]) -> str:
+    """把结构化的审查结果渲染为 Markdown 报告。
 
     Args:
-        code_files: 代码文件路径列表
         task: 任务信息
+        results: 每个文件的审查结果（格式见 review_engine.review_file）
 
     Returns:
         审查报告
     """
-    if not code_files:
+    if not results:
         return "警告：没有找到代码文件"
 
     report_lines = [f"# 代码审查报告: {task.get('task_id', 'unknown')}"]
     report_lines.append(f"\n任务描述: {task.get('description', 'N/A')}")
-    report_lines.append(f"\n审查文件数: {len(code_files)}")
-
-    # 检查文件是否存在
-    existing_files = []
-    for file_path in code_files:
-        path = Path(file_path)
-        if path.exists():
-            existing_files.append(file_path)
-            # 读取文件内容进行基础检查
-            try:
-                content = path.read_text(encoding="utf-8")
-                # 基础检查
-                if len(content) < 10:
-                    report_lines.append(f"\n⚠️ {file_path}: 文件内容过短")
-                elif "TODO" in content:
-                    report_lines.append(f"\n⚠️ {file_path}: 包含 TODO 注释")
-                else:
-                    report_lines.append(f"\n✅ {file_path}: 基础检查通过")
-            except Exception as e:
-                report_lines.append(f"\n❌ {file_path}: 读取失败 - {e}")
+    report_lines.append(f"\n审查文件数: {len(results)}")
+
+    for result in results:
+        severities = {finding["severity"] for finding in result["findings"]}
+        if SEVERITY_ERROR in severities:
+            icon = "❌"
+        elif SEVERITY_WARNING in severities:
+            icon = "⚠️"
         else:
-            report_lines.append(f"\n❌ {file_path}: 文件不存在")
-
-    if not existing_files:
+            icon = "✅"
+        if not result["findings"]:
+            report_lines.append(f"\n{icon} {result['file']}: 基础检查通过")
+            continue
+        report_lines.append(f"\n{icon} {result['file']}:")
+        for finding in result["findings"]:
+            location = f"第 {finding['line']} 行 " if finding["line"] else ""
+            report_lines.append(
+                f"  - [{finding['severity']}] {location}{finding['message']}"
+                f" ({finding['rule']})"
+            )
+
+    reviewed = sum(1 for result in results if result["status"] != "missing")
+    if not reviewed:
         report_lines.append("\n\n结论: 没有可审查的文件")
     else:
-        report_lines.append(f"\n\n结论: 审查了 {len(existing_files)} 个文件")
+        report_lines.append(f"\n\n结论: 审查了 {reviewed} 个文件")
 
     return "\n".join(report_lines)
-
-
-def _evaluate_review(review_report: str) -> bool:
-    """评估审查结果。
-
-    Args:
-        review_report: 审查报告
-
-    Returns:
-        是否通过
-    """
-    # 简化逻辑：如果没有严重错误，则认为通过
-    if "❌" in review_report or "文件不存在" in review_report:
-        return False
-    return True
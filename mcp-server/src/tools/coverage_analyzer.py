@@ -1,126 +1,687 @@
 """覆盖率分析工具 - TDD 第二步：最小实现。
 
 Python 3.9+ 兼容
+
+覆盖率分析流程：
+- coverage 工具是否可用在每个进程内只检测一次
+- 测试只运行一次（`coverage run -m pytest`），数据文件写入工作区目录
+- 可选分片并行：测试文件按大小分成 N 片，每片一个 `coverage run -p` 进程，
+  全部完成后 `coverage combine` 合并数据文件，并返回每个分片的耗时
+- JSON 报告（输出到 stdout 直接解析）和 HTML 报告并行生成
+- 各步骤的超时可以通过环境变量配置（COVERAGE_PROBE_TIMEOUT、COVERAGE_RUN_TIMEOUT、
+  COVERAGE_REPORT_TIMEOUT）
+- 结果按项目源文件和测试文件的指纹（路径和内容哈希）缓存在工作区目录中，
+  项目未变化时直接返回；只修改 mtime（touch、切换分支后切回）不会使缓存失效
+- 定向分析：传入源文件列表（如任务的 code_files）时，只运行直接导入这些源文件的
+  测试，并报告这些文件各自的覆盖率；数据文件和 HTML 报告（coverage_report/targeted-*）
+  与全量分析分开，不会覆盖全量分析的报告
 """
 
+import ast
+import hashlib
+import heapq
+import json
+import os
+import re
+import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from src.core.config import Config
 from src.core.logger import setup_logger
 from src.managers.workspace_manager import WorkspaceManager
+from src.utils.atomic_write import write_json_atomic
+from src.utils.file_index import FileIndex, get_file_index
 
 logger = setup_logger(__name__)
 
+# 运行 coverage 的 Python 解释器
+_PYTHON = "python3"
+
+# 覆盖率结果缓存文件名（位于工作区目录）和最多缓存的结果数
+_RESULT_CACHE_FILE = "coverage_cache.json"
+_MAX_CACHED_RESULTS = 16
+
+# HTML 报告目录（位于工作区目录）；定向分析的报告位于其下的 targeted-{缓存键前缀} 目录
+_REPORT_DIR = "coverage_report"
+_TARGETED_REPORT_PREFIX = "targeted-"
+
+# 影响测试结果的配置文件（参与缓存指纹计算）
+_CONFIG_FILES = {
+    ".coveragerc",
+    "setup.cfg",
+    "pyproject.toml",
+    "pytest.ini",
+    "tox.ini",
+    "conftest.py",
+}
+
+# 读取文件计算内容哈希的块大小
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# mtime 距今在此窗口内的文件不使用进程内的内容哈希缓存：文件系统的 mtime 精度
+# 有限（FAT 为 2 秒），窗口内再次写入相同大小的内容时 (size, mtime) 可能不变
+_RACY_WINDOW_NS = 2_000_000_000
+
+# pytest 默认收集的测试文件名
+_PYTEST_FILE_PATTERN = re.compile(r"^(?:test_.*|.*_test)\.py$")
+
+# coverage 工具检测结果：{解释器: 是否可用}
+_coverage_probe: dict[str, bool] = {}
+_coverage_probe_lock = threading.Lock()
+
 
-def analyze_coverage(workspace_id: str, project_path: str) -> dict:
+def analyze_coverage(
+    workspace_id: str,
+    project_path: str,
+    parallel_workers: Optional[int] = None,
+    source_files: Optional[list[str]] = None,
+) -> dict:
     """分析覆盖率。
 
     Args:
         workspace_id: 工作区ID
         project_path: 项目路径
+        parallel_workers: 并行运行测试的分片数（可选，默认使用 COVERAGE_PARALLEL_WORKERS
+            配置，小于等于 1 时不分片）
+        source_files: 只分析这些源文件（可选，绝对路径或相对项目路径）。只运行直接
+            导入它们的测试；列表中的测试文件会直接运行
 
     Returns:
-        包含覆盖率信息的字典
+        包含覆盖率信息的字典，格式：
+        {
+            "success": True,
+            "coverage": 覆盖率百分比（定向分析时为这些源文件的总覆盖率）,
+            "coverage_report_path": HTML 报告路径（未生成时为 None）,
+            "workspace_id": 工作区ID,
+            "cached": 是否直接使用了缓存的结果,
+            "shards": 分片运行信息（未分片时为空列表），每项格式：
+                {"shard": 分片序号, "test_files": 测试文件数,
+                 "duration": 耗时（秒）, "returncode": pytest 退出码},
+            # 以下字段只在定向分析时返回
+            "file_coverage": {源文件相对路径: 覆盖率百分比},
+            "test_files": 运行的测试文件相对路径列表
+        }
     """
     config = Config()
     workspace_manager = WorkspaceManager(config=config)
 
     # 获取工作区信息
-    workspace = workspace_manager.get_workspace(workspace_id)
+    workspace_manager.get_workspace(workspace_id)
     workspace_dir = config.get_workspace_path(workspace_id)
 
     project_dir = Path(project_path)
+    index = get_file_index(project_dir, config.cache_dir, config.codebase_scan_excludes)
+
+    targeted = source_files is not None
+    sources: list[str] = []
+    test_files = _pytest_files(index)
+    if targeted:
+        sources, test_files = _select_targeted_files(index, source_files, test_files)
+
+    # 项目源文件和测试文件未变化时直接返回上次的结果
+    cache_key = _project_fingerprint(project_dir, index)
+    if targeted:
+        cache_key = hashlib.sha256(
+            "\0".join([cache_key, *sources]).encode("utf-8")
+        ).hexdigest()
+    cached = _load_cached_result(workspace_dir, cache_key)
+    if cached is not None:
+        logger.info(
+            f"覆盖率分析使用缓存结果: {workspace_id}, 覆盖率: {cached['coverage']:.2f}%"
+        )
+        return _coverage_result(workspace_id, cached, targeted, cached=True)
 
     # 尝试运行覆盖率分析
-    coverage = 0.0
-    coverage_report_path = None
+    outcome = {
+        "coverage": 0.0,
+        "coverage_report_path": None,
+        "measured": False,
+        "shards": [],
+        "file_coverage": {},
+    }
+    if parallel_workers is None:
+        parallel_workers = config.coverage_parallel_workers
 
     try:
-        # 检查是否安装了 coverage
-        result = subprocess.run(
-            ["python3", "-m", "coverage", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
+        if targeted and not test_files:
+            logger.warning(f"没有测试导入这些源文件，跳过覆盖率分析: {sources}")
+        elif _coverage_available(config.coverage_probe_timeout):
+            outcome = _run_coverage(
+                project_dir,
+                workspace_dir,
+                config,
+                test_shards=_shard_test_files(test_files, parallel_workers),
+                test_files=[file["path"] for file in test_files] if targeted else None,
+                include=sources if targeted else None,
+                report_name=(
+                    f"{_TARGETED_REPORT_PREFIX}{cache_key[:12]}" if targeted else None
+                ),
+            )
+        else:
+            logger.warning("coverage 工具未安装，跳过覆盖率分析")
+    except subprocess.TimeoutExpired:
+        logger.warning("覆盖率分析超时")
+    except FileNotFoundError:
+        logger.warning("coverage 工具未安装，跳过覆盖率分析")
+    except Exception as e:
+        logger.error(f"覆盖率分析出错: {e}")
+
+    result = {
+        "coverage": outcome["coverage"],
+        "coverage_report_path": outcome["coverage_report_path"],
+        "shards": outcome["shards"],
+        "file_coverage": {
+            path: outcome["file_coverage"].get(path, 0.0) for path in sources
+        },
+        "test_files": [file["path"] for file in test_files],
+    }
+
+    # 如果没有运行覆盖率分析，使用简化统计（定向分析不估算）
+    if result["coverage"] == 0.0 and not targeted:
+        result["coverage"] = _estimate_coverage(index)
+    elif outcome["measured"]:
+        _save_cached_result(workspace_dir, cache_key, result)
+
+    logger.info(f"覆盖率分析完成: {workspace_id}, 覆盖率: {result['coverage']:.2f}%")
+
+    return _coverage_result(workspace_id, result, targeted, cached=False)
+
+
+def _coverage_result(
+    workspace_id: str, result: dict, targeted: bool, cached: bool
+) -> dict:
+    """生成 analyze_coverage 的返回值。"""
+    response = {
+        "success": True,
+        "coverage": result["coverage"],
+        "coverage_report_path": result["coverage_report_path"],
+        "workspace_id": workspace_id,
+        "cached": cached,
+        "shards": [] if cached else result["shards"],
+    }
+    if targeted:
+        response["file_coverage"] = result["file_coverage"]
+        response["test_files"] = result["test_files"]
+    return response
+
 
-        if result.returncode == 0:
-            # 运行覆盖率分析
-            coverage_result = subprocess.run(
-                ["python3", "-m", "coverage", "run", "-m", "pytest"],
-                cwd=str(project_dir),
+def _coverage_available(timeout: float) -> bool:
+    """检测 coverage 工具是否可用（每个进程只检测一次）。
+
+    Raises:
+        subprocess.TimeoutExpired: 检测超时（不缓存，下次重新检测）
+        FileNotFoundError: Python 解释器不存在
+    """
+    with _coverage_probe_lock:
+        available = _coverage_probe.get(_PYTHON)
+        if available is None:
+            result = subprocess.run(
+                [_PYTHON, "-m", "coverage", "--version"],
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=timeout,
             )
+            available = _coverage_probe[_PYTHON] = result.returncode == 0
+        return available
 
-            # 生成报告
-            report_result = subprocess.run(
-                ["python3", "-m", "coverage", "report", "--format=json"],
-                cwd=str(project_dir),
-                capture_output=True,
-                text=True,
-                timeout=10,
+
+def _pytest_files(index: FileIndex) -> list[dict]:
+    """项目中 pytest 默认会收集的测试文件。"""
+    return [
+        file
+        for file in index.files(language="python", is_test=True)
+        if _PYTEST_FILE_PATTERN.match(file["path"].rsplit("/", 1)[-1])
+    ]
+
+
+def _module_names(project_dir: Path, rel_path: str) -> set[str]:
+    """源文件可能的导入名（如 src/pkg/mod.py -> src.pkg.mod、pkg.mod）。
+
+    不是包（没有 __init__.py）的外层目录可能是导入根目录，依次去掉。
+    """
+    parts = rel_path[: -len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    names = set()
+    for start in range(len(parts)):
+        if (
+            start == 0
+            or not (project_dir.joinpath(*parts[:start], "__init__.py")).exists()
+        ):
+            names.add(".".join(parts[start:]))
+    return names
+
+
+@lru_cache(maxsize=4096)
+def _imported_modules(path: Path, size: int, mtime: int, package: str) -> frozenset:
+    """解析文件导入的模块名（size 和 mtime 只用作缓存键）。
+
+    `from a import b` 同时记录 a 和 a.b（b 可能是子模块），相对导入按 package 解析。
+    """
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return frozenset()
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                base = package.split(".") if package else []
+                if node.level - 1 > len(base):
+                    continue
+                base = base[: len(base) - (node.level - 1)]
+                module = ".".join(base + ([module] if module else []))
+            if module:
+                names.add(module)
+            names.update(
+                f"{module}.{alias.name}" if module else alias.name
+                for alias in node.names
+                if alias.name != "*"
             )
+    return frozenset(names)
 
-            if report_result.returncode == 0:
-                # 解析覆盖率（简化版）
-                import json
 
-                try:
-                    coverage_data = json.loads(report_result.stdout)
-                    total = coverage_data.get("totals", {})
-                    coverage = total.get("percent_covered", 0.0)
-                except Exception:
-                    pass
+def _select_targeted_files(
+    index: FileIndex, source_files: list[str], test_files: list[dict]
+) -> tuple[list[str], list[dict]]:
+    """确定定向分析的源文件和需要运行的测试文件。
 
-            # 生成 HTML 报告
-            html_report_dir = workspace_dir / "coverage_report"
-            html_report_dir.mkdir(exist_ok=True)
+    Returns:
+        (源文件相对路径列表, 直接导入这些源文件的测试文件 + 列表中的测试文件)
+    """
+    project_dir = index.project_path
+    indexed = {file["path"]: file for file in index.files(language="python")}
+    sources = set()
+    selected = set()
+    for source in source_files:
+        path = Path(source)
+        if not path.is_absolute():
+            path = project_dir / path
+        try:
+            rel = path.resolve().relative_to(project_dir).as_posix()
+        except ValueError:
+            logger.warning(f"源文件不在项目目录中，忽略: {source}")
+            continue
+        file = indexed.get(rel)
+        if file is None:
+            continue  # 非 Python 文件或被忽略的文件
+        if file["is_test"]:
+            selected.add(rel)
+        else:
+            sources.add(rel)
 
-            subprocess.run(
-                ["python3", "-m", "coverage", "html", "-d", str(html_report_dir)],
-                cwd=str(project_dir),
-                capture_output=True,
-                timeout=10,
+    modules = set()
+    for rel in sources:
+        modules |= _module_names(project_dir, rel)
+    for file in test_files:
+        package = ".".join(file["path"].split("/")[:-1])
+        imported = _imported_modules(
+            project_dir / file["path"], file["size"], file["mtime"], package
+        )
+        if any(
+            name == module or name.startswith(module + ".")
+            for name in imported
+            for module in modules
+        ):
+            selected.add(file["path"])
+
+    return sorted(sources), [file for file in test_files if file["path"] in selected]
+
+
+def _shard_test_files(test_files: list[dict], workers: int) -> list[list[str]]:
+    """把测试文件按大小分成最多 workers 片（每次分给当前最小的分片）。
+
+    Returns:
+        分片列表（每片为测试文件相对路径列表）；不需要分片时返回空列表
+    """
+    workers = min(workers, len(test_files))
+    if workers <= 1:
+        return []
+
+    # 文件大小近似测试耗时
+    heap = [(0, shard) for shard in range(workers)]
+    shards: list[list[str]] = [[] for _ in range(workers)]
+    for file in sorted(test_files, key=lambda f: (-f["size"], f["path"])):
+        total, shard = heapq.heappop(heap)
+        shards[shard].append(file["path"])
+        heapq.heappush(heap, (total + file["size"], shard))
+    return [sorted(shard) for shard in shards]
+
+
+def _run_tests_sharded(
+    project_dir: Path, env: dict, shards: list[list[str]], timeout: float
+) -> list[dict]:
+    """每个分片一个 `coverage run -p` 进程并行运行测试。
+
+    Returns:
+        每个分片的运行信息
+
+    Raises:
+        subprocess.TimeoutExpired: 某个分片超时
+    """
+
+    def run_shard(shard: int, test_files: list[str]) -> dict:
+        """运行一个分片（数据文件带进程后缀，由 `coverage combine` 合并）。"""
+        start = time.monotonic()
+        result = subprocess.run(
+            [_PYTHON, "-m", "coverage", "run", "-p", "-m", "pytest", *test_files],
+            cwd=str(project_dir),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=env,
+        )
+        duration = time.monotonic() - start
+        logger.info(
+            f"覆盖率分片 {shard} 完成: {len(test_files)} 个测试文件, "
+            f"耗时 {duration:.2f} 秒, 退出码 {result.returncode}"
+        )
+        return {
+            "shard": shard,
+            "test_files": len(test_files),
+            "duration": round(duration, 3),
+            "returncode": result.returncode,
+        }
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [
+            executor.submit(run_shard, shard, test_files)
+            for shard, test_files in enumerate(shards)
+        ]
+        return [future.result() for future in futures]
+
+
+def _run_coverage(
+    project_dir: Path,
+    workspace_dir: Path,
+    config: Config,
+    test_shards: Optional[list[list[str]]] = None,
+    test_files: Optional[list[str]] = None,
+    include: Optional[list[str]] = None,
+    report_name: Optional[str] = None,
+) -> dict:
+    """运行一次测试（可分片并行）并并行生成 JSON 和 HTML 报告。
+
+    Args:
+        project_dir: 项目目录
+        workspace_dir: 工作区目录（数据文件和 HTML 报告位置）
+        config: 配置
+        test_shards: 测试文件分片（为空时不分片）
+        test_files: 不分片时运行的测试文件（None 表示 pytest 默认收集的全部测试）
+        include: 报告只包含这些源文件（相对项目路径，None 表示全部）
+        report_name: 定向分析的报告名：使用单独的数据文件和 HTML 报告子目录，
+            不覆盖全量分析的数据和报告（None 表示全量分析）
+
+    Returns:
+        {
+            "coverage": 覆盖率,
+            "coverage_report_path": HTML 报告路径,
+            "measured": 是否成功得到覆盖率数据,
+            "shards": 分片运行信息,
+            "file_coverage": {源文件相对路径: 覆盖率}（只包含 include 中的文件）
+        }
+
+    Raises:
+        subprocess.TimeoutExpired: 运行测试或生成 JSON 报告超时
+    """
+    # 数据文件写入工作区目录，不污染项目目录
+    data_file = workspace_dir / ".coverage"
+    html_report_dir = workspace_dir / _REPORT_DIR
+    if report_name:
+        data_file = workspace_dir / f".coverage-{report_name}"
+        html_report_dir = html_report_dir / report_name
+    env = {**os.environ, "COVERAGE_FILE": str(data_file)}
+
+    # 运行测试（测试失败时仍然会生成覆盖率数据）
+    shards: list[dict] = []
+    if test_shards:
+        # 清理上次中断残留的分片数据文件，避免被合并进来
+        for stale in workspace_dir.glob(f"{data_file.name}.*"):
+            stale.unlink()
+        shards = _run_tests_sharded(
+            project_dir, env, test_shards, config.coverage_run_timeout
+        )
+        subprocess.run(
+            [_PYTHON, "-m", "coverage", "combine"],
+            cwd=str(project_dir),
+            capture_output=True,
+            text=True,
+            timeout=config.coverage_report_timeout,
+            env=env,
+        )
+    else:
+        subprocess.run(
+            [_PYTHON, "-m", "coverage", "run", "-m", "pytest", *(test_files or [])],
+            cwd=str(project_dir),
+            capture_output=True,
+            text=True,
+            timeout=config.coverage_run_timeout,
+            env=env,
+        )
+
+    html_report_dir.mkdir(parents=True, exist_ok=True)
+    report_options = []
+    if include:
+        report_options.append(
+            "--include="
+            + ",".join(
+                _include_pattern(project_dir.resolve() / path) for path in include
             )
+        )
 
-            coverage_report_path = str(html_report_dir / "index.html")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        json_future = executor.submit(
+            subprocess.run,
+            [_PYTHON, "-m", "coverage", "json", "-o", "-", *report_options],
+            cwd=str(project_dir),
+            capture_output=True,
+            text=True,
+            timeout=config.coverage_report_timeout,
+            env=env,
+        )
+        html_future = executor.submit(
+            subprocess.run,
+            [
+                _PYTHON,
+                "-m",
+                "coverage",
+                "html",
+                "-d",
+                str(html_report_dir),
+                *report_options,
+            ],
+            cwd=str(project_dir),
+            capture_output=True,
+            timeout=config.coverage_report_timeout,
+            env=env,
+        )
 
-    except subprocess.TimeoutExpired:
-        logger.warning("覆盖率分析超时")
-    except FileNotFoundError:
-        logger.warning("coverage 工具未安装，跳过覆盖率分析")
-    except Exception as e:
-        logger.error(f"覆盖率分析出错: {e}")
+        coverage = 0.0
+        measured = False
+        file_coverage = {}
+        report_result = json_future.result()
+        if report_result.returncode == 0:
+            try:
+                coverage_data = json.loads(report_result.stdout)
+                total = coverage_data.get("totals", {})
+                coverage = total.get("percent_covered", 0.0)
+                measured = True
+                if include:
+                    file_coverage = _file_coverage(project_dir, coverage_data)
+            except Exception:
+                pass
 
-    # 如果没有运行覆盖率分析，使用简化统计
-    if coverage == 0.0:
-        coverage = _estimate_coverage(project_dir)
+        coverage_report_path = None
+        try:
+            if html_future.result().returncode == 0:
+                coverage_report_path = str(html_report_dir / "index.html")
+        except Exception as e:
+            logger.warning(f"生成 HTML 覆盖率报告失败: {e}")
 
-    logger.info(f"覆盖率分析完成: {workspace_id}, 覆盖率: {coverage:.2f}%")
+    # 定向分析的数据文件只用于生成本次报告
+    if report_name:
+        data_file.unlink(missing_ok=True)
 
     return {
-        "success": True,
         "coverage": coverage,
         "coverage_report_path": coverage_report_path,
-        "workspace_id": workspace_id,
+        "measured": measured,
+        "shards": shards,
+        "file_coverage": file_coverage,
+    }
+
+
+def _file_coverage(project_dir: Path, coverage_data: dict) -> dict[str, float]:
+    """从 JSON 报告中提取每个文件的覆盖率（键为相对项目路径）。"""
+    project_dir = project_dir.resolve()
+    file_coverage = {}
+    for name, data in coverage_data.get("files", {}).items():
+        path = Path(name)
+        if not path.is_absolute():
+            path = project_dir / path
+        try:
+            rel = path.resolve().relative_to(project_dir).as_posix()
+        except ValueError:
+            continue
+        file_coverage[rel] = data.get("summary", {}).get("percent_covered", 0.0)
+    return file_coverage
+
+
+def _include_pattern(path: Path) -> str:
+    """把文件路径转换为 coverage 的 --include 模式。
+
+    --include 只能指定一次（重复指定时只有最后一个生效），多个模式用逗号分隔且
+    不支持转义，因此路径中的逗号和通配符（`*`、`?`、`[`、`]`）替换为匹配任意
+    单个字符的 `?`。这样最多多匹配仅在这些位置不同的文件，每个文件的覆盖率
+    仍然只取请求的源文件。
+    """
+    return re.sub(r"[,*?\[\]]", "?", str(path))
+
+
+def _content_hash(path: Path) -> str:
+    """文件内容的 sha256（文件无法读取时返回空字符串）。"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return ""
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=8192)
+def _cached_content_hash(path: Path, size: int, mtime: int) -> str:
+    """文件内容的 sha256（size 和 mtime 只用作缓存键）。"""
+    return _content_hash(path)
+
+
+def _project_fingerprint(project_dir: Path, index: FileIndex) -> str:
+    """根据源文件、测试文件和测试配置文件的路径和内容哈希计算项目指纹。
+
+    指纹只取决于文件内容，mtime 变化但内容不变（touch、切换分支后切回）时缓存
+    仍然命中。每个文件的内容哈希在进程内按 (路径, 大小, mtime) 缓存，未修改的
+    文件不重复读取；mtime 距今不超过 _RACY_WINDOW_NS 的文件每次重新计算。
+    """
+    racy_after = time.time_ns() - _RACY_WINDOW_NS
+    digest = hashlib.sha256()
+    for file in index.files():
+        name = file["path"].rsplit("/", 1)[-1]
+        if file["language"] or name in _CONFIG_FILES:
+            path = project_dir / file["path"]
+            if file["mtime"] >= racy_after:
+                content_hash = _content_hash(path)
+            else:
+                content_hash = _cached_content_hash(path, file["size"], file["mtime"])
+            digest.update(f"{file['path']}\0{content_hash}\n".encode())
+    return digest.hexdigest()
+
+
+def _load_cached_results(workspace_dir: Path) -> dict:
+    """读取工作区的覆盖率结果缓存：{缓存键: 结果}。"""
+    try:
+        data = json.loads((workspace_dir / _RESULT_CACHE_FILE).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    results = data.get("results") if isinstance(data, dict) else None
+    return results if isinstance(results, dict) else {}
+
+
+def _report_mtime(report_path: Optional[str]) -> Optional[int]:
+    """HTML 报告的 mtime（纳秒），没有报告或报告不存在时返回 None。"""
+    if not report_path:
+        return None
+    try:
+        return os.stat(report_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_cached_result(workspace_dir: Path, cache_key: str) -> Optional[dict]:
+    """读取缓存键匹配且 HTML 报告仍是当时生成的报告的缓存结果。
+
+    同一个报告目录会被之后的分析（如项目变化后的全量分析）重新生成，
+    因此比较保存结果时记录的报告 mtime，报告被覆盖或删除时不使用缓存。
+    """
+    cached = _load_cached_results(workspace_dir).get(cache_key)
+    if not isinstance(cached, dict):
+        return None
+    report_path = cached.get("coverage_report_path")
+    if report_path and _report_mtime(report_path) != cached.get("report_mtime"):
+        return None
+    return cached
+
+
+def _save_cached_result(workspace_dir: Path, cache_key: str, result: dict) -> None:
+    """保存覆盖率结果缓存，只保留最近的 _MAX_CACHED_RESULTS 个（失败时只记录警告）。"""
+    results = _load_cached_results(workspace_dir)
+    results.pop(cache_key, None)
+    results[cache_key] = {
+        key: value for key, value in result.items() if key != "shards"
+    }
+    results[cache_key]["report_mtime"] = _report_mtime(result["coverage_report_path"])
+    while len(results) > _MAX_CACHED_RESULTS:
+        results.pop(next(iter(results)))
+
+    # 删除不再被缓存结果引用的定向分析报告目录
+    referenced = {
+        Path(cached["coverage_report_path"]).parent.name
+        for cached in results.values()
+        if isinstance(cached, dict) and cached.get("coverage_report_path")
     }
+    for report_dir in (workspace_dir / _REPORT_DIR).glob(f"{_TARGETED_REPORT_PREFIX}*"):
+        if report_dir.name not in referenced:
+            shutil.rmtree(report_dir, ignore_errors=True)
+    try:
+        write_json_atomic(
+            workspace_dir / _RESULT_CACHE_FILE, {"results": results}, fsync=False
+        )
+    except OSError as e:
+        logger.warning(f"保存覆盖率结果缓存失败: {e}")
 
 
-def _estimate_coverage(project_dir: Path) -> float:
-    """估算覆盖率（简化版）。
+def _estimate_coverage(index: FileIndex) -> float:
+    """估算覆盖率（简化版，基于项目文件索引）。
 
     Args:
-        project_dir: 项目目录
+        index: 项目文件索引（与 TRD 生成共用，不再遍历整个项目）
 
     Returns:
         估算的覆盖率百分比
     """
     # 统计代码文件和测试文件
-    code_files = list(project_dir.rglob("*.py"))
-    test_files = [f for f in code_files if "test" in f.name.lower()]
+    code_files = [f for f in index.files() if f["language"]]
+    test_files = [f for f in code_files if f["is_test"]]
 
     if not code_files:
         return 0.0
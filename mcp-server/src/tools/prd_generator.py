@@ -3,23 +3,43 @@
 Python 3.9+ 兼容
 """
 
-import json
 from pathlib import Path
+from urllib.parse import urlparse
 
 from src.core.config import Config
 from src.core.exceptions import ValidationError
 from src.core.logger import setup_logger
+from src.llm.base import LLMRequest
+from src.llm.factory import generate_text
 from src.managers.workspace_manager import WorkspaceManager
+from src.utils.fingerprint import compute_fingerprint, is_artifact_current
+from src.utils.requirement_fetcher import (
+    REQUIREMENT_CACHE_DIR,
+    RequirementFetcher,
+    is_http_url,
+)
+from src.utils.requirement_reader import (
+    FORMAT_TEXT,
+    parse_requirement,
+    read_requirement,
+)
 
 logger = setup_logger(__name__)
 
+# PRD 生成逻辑（模板、提示词）的版本，变化时之前的输入指纹失效
+PRD_GENERATOR_VERSION = 1
 
-def generate_prd(workspace_id: str, requirement_url: str) -> dict:
+
+def generate_prd(workspace_id: str, requirement_url: str, force: bool = False) -> dict:
     """生成 PRD 文档。
 
+    需求内容、需求名称和 LLM 配置与上次生成时相同（输入指纹一致）、PRD 文件仍然存在
+    且 PRD 没有被标记为需要修改时，直接返回已有的 PRD（`skipped` 为 True）。
+
     Args:
         workspace_id: 工作区ID
         requirement_url: 需求文档URL或文件路径
+        force: 是否忽略输入指纹，强制重新生成
 
     Returns:
         包含 PRD 路径的字典
@@ -38,72 +58,154 @@ def generate_prd(workspace_id: str, requirement_url: str) -> dict:
     workspace = workspace_manager.get_workspace(workspace_id)
     workspace_dir = config.get_workspace_path(workspace_id)
 
-    # 读取需求文档
-    requirement_content = _read_requirement(requirement_url)
+    # 读取需求文档（流式读取，只保留规范化后的前 REQUIREMENT_MAX_CHARS 个字符和大纲）
+    requirement = _read_requirement(requirement_url, config)
 
-    # 生成 PRD 内容
-    prd_content = _generate_prd_content(requirement_content, workspace)
+    # 输入未变化时直接返回已有的 PRD
+    prd_path = workspace_dir / "PRD.md"
+    fingerprint = compute_fingerprint(
+        {
+            "version": PRD_GENERATOR_VERSION,
+            "requirement": requirement["sha256"],
+            "requirement_name": workspace.get("requirement_name"),
+            "max_chars": config.requirement_max_chars,
+            "llm": [config.llm_provider, config.llm_model],
+        }
+    )
+    if not force and is_artifact_current(workspace, "prd", fingerprint, prd_path):
+        logger.info(f"需求未变化，使用已有 PRD: {prd_path}")
+        return {
+            "success": True,
+            "prd_path": str(prd_path),
+            "workspace_id": workspace_id,
+            "skipped": True,
+        }
+
+    # 生成 PRD 内容（调用 LLM，失败时使用模板）
+    prd_content = generate_text(_build_prd_request(requirement, workspace), config)
 
     # 保存 PRD 文件
-    prd_path = workspace_dir / "PRD.md"
     prd_path.write_text(prd_content, encoding="utf-8")
 
-    # 更新工作区状态
-    workspace_manager.update_workspace_status(workspace_id, {"prd_status": "completed"})
-
     # 更新工作区文件路径
-    workspace["files"]["prd_path"] = str(prd_path)
-    meta_file = workspace_dir / "workspace.json"
-    with open(meta_file, "w", encoding="utf-8") as f:
-        json.dump(workspace, f, ensure_ascii=False, indent=2)
+    # 注意：PRD 状态保持不变，由 confirm_prd 确认后才标记为 completed
+    workspace_manager.update_workspace_files(workspace_id, {"prd_path": str(prd_path)})
+    workspace_manager.update_workspace_fingerprints(workspace_id, {"prd": fingerprint})
 
     logger.info(f"PRD 已生成: {prd_path}")
 
-    return {"success": True, "prd_path": str(prd_path), "workspace_id": workspace_id}
+    return {
+        "success": True,
+        "prd_path": str(prd_path),
+        "workspace_id": workspace_id,
+        "skipped": False,
+    }
 
 
-def _read_requirement(requirement_url: str) -> str:
-    """读取需求文档内容。
+def _read_requirement(requirement_url: str, config: Config) -> dict:
+    """读取需求文档。
 
     Args:
         requirement_url: 需求文档URL或文件路径
+        config: 配置管理器
 
     Returns:
-        需求文档内容
+        需求文档信息，格式见 `parse_requirement()`
     """
     path = Path(requirement_url)
 
     # 如果是文件路径
     if path.exists():
-        return path.read_text(encoding="utf-8")
-
-    # TODO: 如果是 URL，需要实现 HTTP 请求
-    # 目前先返回占位内容
-    return f"需求文档URL: {requirement_url}\n\n待实现：从URL读取需求文档"
+        return read_requirement(path, max_chars=config.requirement_max_chars)
+
+    # 如果是 URL：下载到本地缓存（未变化时不重新下载）后读取
+    if is_http_url(requirement_url):
+        fetcher = RequirementFetcher(
+            config.cache_dir / REQUIREMENT_CACHE_DIR,
+            timeout=config.requirement_fetch_timeout,
+            max_bytes=config.requirement_fetch_max_bytes,
+        )
+        try:
+            fetched = fetcher.fetch(requirement_url)
+        except ValidationError as e:
+            logger.warning(str(e))
+            placeholder = f"需求文档URL: {requirement_url}\n\n读取失败: {e}"
+        else:
+            return read_requirement(
+                Path(fetched["path"]),
+                max_chars=config.requirement_max_chars,
+                encoding=fetched["encoding"],
+                name=urlparse(requirement_url).path,
+                content_type=fetched["content_type"],
+            )
+    else:
+        placeholder = f"需求文档: {requirement_url}\n\n文件不存在"
+    return parse_requirement([placeholder], FORMAT_TEXT, config.requirement_max_chars)
+
+
+def _format_outline(outline: list[dict]) -> str:
+    """把章节大纲格式化为缩进列表。"""
+    return "\n".join(
+        f"{'  ' * (section['level'] - 1)}- {section['title']}" for section in outline
+    )
+
+
+def _build_prd_request(requirement: dict, workspace: dict) -> LLMRequest:
+    """构造 PRD 生成请求（以模板内容作为 fallback）。
 
+    Args:
+        requirement: 需求文档信息（见 `parse_requirement()`）
+        workspace: 工作区信息
 
-def _generate_prd_content(requirement_content: str, workspace: dict) -> str:
-    """生成 PRD 文档内容。
+    Returns:
+        LLM 生成请求
+    """
+    requirement_name = workspace.get("requirement_name", "未知需求")
+    prompt = (
+        f"请根据以下需求文档为「{requirement_name}」编写 PRD，使用 Markdown 格式，"
+        "包含需求概述、功能需求、非功能需求、验收标准和风险评估。\n\n"
+    )
+    if requirement["outline"]:
+        prompt += f"需求文档结构：\n{_format_outline(requirement['outline'])}\n\n"
+    if requirement["truncated"]:
+        prompt += (
+            f"需求文档共 {requirement['total_chars']} 个字符，"
+            f"以下是前 {len(requirement['text'])} 个字符。\n\n"
+        )
+    prompt += f"需求文档：\n{requirement['text']}"
+    return LLMRequest(
+        prompt,
+        system="你是一名资深产品经理。",
+        fallback=_generate_prd_content(requirement, workspace),
+    )
+
+
+def _generate_prd_content(requirement: dict, workspace: dict) -> str:
+    """生成 PRD 文档内容（模板）。
 
     Args:
-        requirement_content: 需求文档内容
+        requirement: 需求文档信息（见 `parse_requirement()`）
         workspace: 工作区信息
 
     Returns:
         PRD 文档内容
     """
     requirement_name = workspace.get("requirement_name", "未知需求")
+    outline = _format_outline(requirement["outline"]) or "待补充"
 
     prd_template = f"""# PRD: {requirement_name}
 
 ## 1. 需求概述
 
 ### 1.1 需求背景
-{requirement_content[:500]}
+{requirement['text'][:500]}
 
 ### 1.2 需求目标
 待补充
 
+### 1.3 需求文档结构
+{outline}
+
 ## 2. 功能需求
 
 ### 2.1 核心功能
@@ -12,6 +12,7 @@ from pathlib import Path
 
 from src.core.exceptions import ValidationError, WorkspaceNotFoundError
 from src.core.logger import setup_logger
+from src.managers.task_manager import TaskManager
 from src.managers.workspace_manager import WorkspaceManager
 
 logger = setup_logger(__name__)
@@ -103,8 +104,9 @@ def check_stage_ready(workspace_id: str, stage: str) -> dict:
             trd_path = files.get("trd_path")
             file_ready = trd_path is not None and Path(trd_path).exists()
         elif stage == "code":
-            tasks_json_path = files.get("tasks_json_path")
-            file_ready = tasks_json_path is not None and Path(tasks_json_path).exists()
+            file_ready = files.get("tasks_json_path") is not None and TaskManager(
+                config=workspace_manager.config, storage=workspace_manager.storage
+            ).has_tasks(workspace_id)
 
         # 生成原因说明
         if ready and file_ready:
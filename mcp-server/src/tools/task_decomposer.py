@@ -4,16 +4,32 @@ Python 3.9+ 兼容
 """
 
 import json
+import re
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from src.core.config import Config
 from src.core.exceptions import ValidationError
 from src.core.logger import setup_logger
+from src.llm.base import LLMRequest
+from src.llm.factory import generate_text
+from src.managers.task_manager import TaskManager
 from src.managers.workspace_manager import WorkspaceManager
+from src.utils.atomic_write import fsync_batch
+from src.utils.markdown_sections import parse_sections
+from src.utils.task_graph import build_task_graph, dependencies_of
 
 logger = setup_logger(__name__)
 
+# 生成任务的章节标题关键字
+_TASK_KEYWORDS = ("功能", "实现")
+
+# 任务描述的最小长度
+_MIN_DESCRIPTION_CHARS = 10
+
+_TASK_ID_PATTERN = re.compile(r"task-\d{3,}")
+
 
 def decompose_tasks(workspace_id: str, trd_path: str | None = None) -> dict:
     """分解任务。
@@ -23,7 +39,7 @@ def decompose_tasks(workspace_id: str, trd_path: str | None = None) -> dict:
         trd_path: TRD 文档路径（可选，默认从工作区获取）
 
     Returns:
-        包含 tasks.json 路径的字典
+        包含 tasks.json 路径、任务数、依赖图层数和关键路径的字典
 
     Raises:
         ValidationError: 当 TRD 状态未完成、TRD 路径无效或 TRD 文件不存在时
@@ -56,43 +72,51 @@ def decompose_tasks(workspace_id: str, trd_path: str | None = None) -> dict:
         workspace_id, {"tasks_status": "in_progress"}
     )
 
-    workspace_dir = config.get_workspace_path(workspace_id)
-
     try:
         # 读取 TRD 内容
         trd_content = trd_file.read_text(encoding="utf-8")
 
-        # 分解任务
+        # 分解任务（调用 LLM，失败或响应无效时使用规则分解的结果）
         tasks = _decompose_tasks_from_trd(trd_content, workspace)
+        tasks = _decompose_tasks_with_llm(trd_content, workspace, tasks, config)
+
+        # 依赖图（循环依赖时抛出 ValidationError）
+        graph = build_task_graph(tasks)
 
-        # 保存 tasks.json
-        tasks_file = workspace_dir / "tasks.json"
+        # 保存任务列表（JSON 后端为 tasks.json）
         tasks_data = {
             "workspace_id": workspace_id,
             "created_at": datetime.now().isoformat(),
             "tasks": tasks,
+            "graph": {
+                "levels": graph["levels"],
+                "critical_path": graph["critical_path"],
+                "critical_path_weight": graph["critical_path_weight"],
+            },
         }
-        with open(tasks_file, "w", encoding="utf-8") as f:
-            json.dump(tasks_data, f, ensure_ascii=False, indent=2)
+        task_manager = TaskManager(config=config, storage=workspace_manager.storage)
+        # tasks.json 和 workspace.json 的写入合并为一次 fsync
+        with fsync_batch():
+            tasks_json_path = task_manager.save_tasks(workspace_id, tasks_data)
 
-        # ✅ 新增：标记任务分解为已完成
-        workspace_manager.update_workspace_status(
-            workspace_id, {"tasks_status": "completed"}
-        )
+            # ✅ 新增：标记任务分解为已完成
+            workspace_manager.update_workspace_status(
+                workspace_id, {"tasks_status": "completed"}
+            )
 
-        # 更新工作区文件路径
-        workspace = workspace_manager.get_workspace(workspace_id)
-        workspace["files"]["tasks_json_path"] = str(tasks_file)
-        meta_file = workspace_dir / "workspace.json"
-        with open(meta_file, "w", encoding="utf-8") as f:
-            json.dump(workspace, f, ensure_ascii=False, indent=2)
+            # 更新工作区文件路径
+            workspace_manager.update_workspace_files(
+                workspace_id, {"tasks_json_path": tasks_json_path}
+            )
 
         logger.info(f"任务已分解: {len(tasks)} 个任务")
 
         return {
             "success": True,
-            "tasks_json_path": str(tasks_file),
+            "tasks_json_path": tasks_json_path,
             "task_count": len(tasks),
+            "level_count": len(graph["levels"]),
+            "critical_path": graph["critical_path"],
             "workspace_id": workspace_id,
         }
     except Exception as e:
@@ -104,8 +128,123 @@ def decompose_tasks(workspace_id: str, trd_path: str | None = None) -> dict:
         raise
 
 
+def _decompose_tasks_with_llm(
+    trd_content: str, workspace: dict, fallback_tasks: list[dict], config: Config
+) -> list[dict]:
+    """调用 LLM 分解任务。
+
+    要求 LLM 返回任务描述和依赖的 JSON 数组，规则分解的结果作为 fallback。
+
+    Args:
+        trd_content: TRD 文档内容
+        workspace: 工作区信息
+        fallback_tasks: 规则分解的任务列表
+        config: 配置管理器
+
+    Returns:
+        任务列表（响应无法解析时返回 fallback_tasks）
+    """
+    # 规则分解的任务ID来自章节 ID，提示词中的依赖统一用任务序号表示
+    positions = {task["task_id"]: index for index, task in enumerate(fallback_tasks, 1)}
+    fallback_items = [
+        {
+            "description": task["description"],
+            "depends_on": [
+                positions[dep] for dep in dependencies_of(task) if dep in positions
+            ],
+        }
+        for task in fallback_tasks
+    ]
+    fallback_text = json.dumps(fallback_items, ensure_ascii=False)
+    requirement_name = workspace.get("requirement_name", "未知需求")
+    prompt = (
+        f"请把以下 TRD 中「{requirement_name}」的实现工作分解为可以独立开发和测试的任务。"
+        '只返回 JSON 数组，每个元素形如 {"description": "任务描述", "depends_on": [1]}，'
+        "depends_on 为必须先完成的前面任务的序号（从 1 开始，没有依赖时为空数组）。\n\n"
+        f"TRD：\n{trd_content}"
+    )
+    request = LLMRequest(
+        prompt,
+        system="你是一名资深技术负责人。",
+        fallback=fallback_text,
+    )
+    items = _parse_llm_tasks(generate_text(request, config))
+    if not items:
+        logger.warning("LLM 任务分解响应无效，使用规则分解的结果")
+        return fallback_tasks
+    if items == _parse_llm_tasks(fallback_text):
+        return fallback_tasks
+
+    # LLM 返回的任务没有来源章节，任务ID按顺序编号
+    created_at = datetime.now().isoformat()
+    return [
+        {
+            "task_id": f"task-{index:03d}",
+            "description": item["description"],
+            "status": "pending",
+            "created_at": created_at,
+            "depends_on": item["depends_on"],
+        }
+        for index, item in enumerate(items, 1)
+    ]
+
+
+def _parse_llm_tasks(text: str) -> Optional[list[dict]]:
+    """解析 LLM 返回的任务 JSON 数组（允许包在 ```json 代码块中）。
+
+    元素可以是任务描述字符串，或包含 description 和可选 depends_on 的对象。
+    depends_on 可以是任务序号（从 1 开始）或任务ID，只保留指向前面任务的依赖，
+    因此结果不会有循环依赖。
+
+    Returns:
+        [{"description": 任务描述, "depends_on": [任务ID]}]，格式无效时返回 None
+    """
+    match = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if match:
+        text = match.group(1)
+    try:
+        items = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
+    tasks = []
+    for index, item in enumerate(items, 1):
+        depends_on: list = []
+        if isinstance(item, dict):
+            depends_on = item.get("depends_on") or []
+            if not isinstance(depends_on, list):
+                depends_on = [depends_on]
+            item = item.get("description")
+        if not isinstance(item, str) or not item.strip():
+            return None
+        dependencies = []
+        for dep in depends_on:
+            if isinstance(dep, int) and not isinstance(dep, bool):
+                dep = f"task-{dep:03d}"
+            if (
+                isinstance(dep, str)
+                and _TASK_ID_PATTERN.fullmatch(dep)
+                and 0 < int(dep[5:]) < index
+                and dep not in dependencies
+            ):
+                dependencies.append(dep)
+        tasks.append({"description": item.strip(), "depends_on": dependencies})
+    return tasks or None
+
+
+def _section_task_id(section_id: str) -> str:
+    """根据章节 ID 计算任务ID（如 sec-1a2b3c4d5e6f -> task-1a2b3c4d5e6f）。"""
+    return "task-" + section_id.removeprefix("sec-")
+
+
 def _decompose_tasks_from_trd(trd_content: str, workspace: dict) -> list[dict]:
-    """从 TRD 内容分解任务。
+    """从 TRD 内容分解任务（规则，LLM 分解的 fallback）。
+
+    一次遍历解析 TRD 的标题树，二级及以下、标题包含功能关键字且正文有意义的章节
+    生成一个任务。任务记录来源章节 ID、上级任务（最近的生成了任务的上级章节）
+    和估算大小（章节及下级章节的字符数），并依赖上级任务（先完成整体方案再实现细节）。
+    任务ID由章节 ID 计算，TRD 中增删其他章节时保持不变。
 
     Args:
         trd_content: TRD 文档内容
@@ -115,36 +254,41 @@ def _decompose_tasks_from_trd(trd_content: str, workspace: dict) -> list[dict]:
         任务列表
     """
     tasks = []
-
-    # 简化的任务分解逻辑
-    # TODO: 使用 AI 进行智能任务分解
-
-    # 根据 TRD 内容提取关键功能点
-    lines = trd_content.split("\n")
-    task_index = 1
-
-    for i, line in enumerate(lines):
-        # 检测功能点（以 ## 或 ### 开头）
-        if line.strip().startswith("##") and "功能" in line or "实现" in line:
-            # 提取后续内容作为任务描述
-            description_lines = []
-            for j in range(i + 1, min(i + 5, len(lines))):
-                if lines[j].strip().startswith("##"):
-                    break
-                if lines[j].strip():
-                    description_lines.append(lines[j].strip())
-
-            if description_lines:
-                task_description = " ".join(description_lines[:3])  # 取前3行
-                if len(task_description) > 10:  # 确保描述有意义
-                    task = {
-                        "task_id": f"task-{task_index:03d}",
-                        "description": task_description,
-                        "status": "pending",
-                        "created_at": datetime.now().isoformat(),
-                    }
-                    tasks.append(task)
-                    task_index += 1
+    created_at = datetime.now().isoformat()
+    sections = parse_sections(trd_content.splitlines())
+    sections_by_id = {section["id"]: section for section in sections}
+    task_ids: dict[str, str] = {}  # 章节 ID -> 任务 ID
+
+    for section in sections:
+        if section["level"] < 2:
+            continue
+        if not any(keyword in section["title"] for keyword in _TASK_KEYWORDS):
+            continue
+        task_description = " ".join(section["summary"])
+        if len(task_description) <= _MIN_DESCRIPTION_CHARS:  # 确保描述有意义
+            continue
+
+        parent_task_id = None
+        parent_id = section["parent_id"]
+        while parent_id is not None and parent_task_id is None:
+            parent_task_id = task_ids.get(parent_id)
+            parent_id = sections_by_id[parent_id]["parent_id"]
+
+        task_id = _section_task_id(section["id"])
+        task_ids[section["id"]] = task_id
+        tasks.append(
+            {
+                "task_id": task_id,
+                "description": task_description,
+                "status": "pending",
+                "created_at": created_at,
+                "title": section["title"],
+                "section_id": section["id"],
+                "parent_task_id": parent_task_id,
+                "estimated_size": section["total_size"],
+                "depends_on": [parent_task_id] if parent_task_id else [],
+            }
+        )
 
     # 如果没有提取到任务，创建默认任务
     if not tasks:
@@ -154,7 +298,8 @@ def _decompose_tasks_from_trd(trd_content: str, workspace: dict) -> list[dict]:
                 "task_id": "task-001",
                 "description": f"实现 {requirement_name} 的核心功能",
                 "status": "pending",
-                "created_at": datetime.now().isoformat(),
+                "created_at": created_at,
+                "depends_on": [],
             }
         )
 
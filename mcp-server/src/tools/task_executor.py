@@ -4,14 +4,21 @@ Python 3.9+ 兼容：使用内置类型 dict 而非 typing.Dict
 
 本模块实现任务执行功能：
 1. 执行单个任务（生成代码 → Review → 重试循环）
-2. 执行所有待处理任务
+2. 执行所有待处理任务（没有待处理依赖的任务先批量生成代码，再按 depends_on 依赖关系并发执行）
+3. 获取任务执行计划（按 depends_on 依赖关系分为可并行的批次，计算关键路径）
 """
 
+import threading
+from typing import Optional
+
 from src.core.exceptions import TaskNotFoundError
 from src.core.logger import setup_logger
 from src.managers.task_manager import TaskManager
-from src.tools.code_generator import generate_code
+from src.tools.code_generator import generate_code, generate_code_batch
 from src.tools.code_reviewer import review_code
+from src.utils.progress import report_progress
+from src.utils.task_graph import build_task_graph, dependencies_of
+from src.utils.task_scheduler import run_with_dependencies
 
 logger = setup_logger(__name__)
 
@@ -23,6 +30,7 @@ def execute_task(
     workspace_id: str,
     task_id: str,
     max_review_retries: int = DEFAULT_MAX_REVIEW_RETRIES,
+    generate_result: Optional[dict] = None,
 ) -> dict:
     """执行单个任务（生成代码 → Review → 重试循环）。
 
@@ -37,6 +45,8 @@ def execute_task(
         workspace_id: 工作区ID
         task_id: 任务ID
         max_review_retries: 最大 Review 重试次数，默认为 3
+        generate_result: 已经生成代码时的生成结果（格式同 `generate_code` 的返回值），
+            第一次循环直接使用，不再调用 `generate_code`
 
     Returns:
         包含执行结果的字典，格式：
@@ -76,7 +86,8 @@ def execute_task(
         try:
             # 1. 生成代码
             logger.info(f"生成代码: {workspace_id}/{task_id}, 重试次数: {retry_count}")
-            generate_result = generate_code(workspace_id, task_id)
+            if generate_result is None:
+                generate_result = generate_code(workspace_id, task_id)
 
             if not generate_result.get("success"):
                 error_msg = f"代码生成失败: {generate_result.get('error', '未知错误')}"
@@ -93,6 +104,7 @@ def execute_task(
                 }
 
             code_files = generate_result.get("code_files", [])
+            generate_result = None
             last_code_files = code_files
             logger.info(f"代码生成成功: {task_id}, 文件数: {len(code_files)}")
 
@@ -188,18 +200,75 @@ def execute_task(
     }
 
 
+def _task_error_result(workspace_id: str, task_id: str, error: str) -> dict:
+    """未能执行的任务的结果（格式与 execute_task 的返回值一致）。"""
+    return {
+        "success": False,
+        "task_id": task_id,
+        "workspace_id": workspace_id,
+        "passed": False,
+        "retry_count": 0,
+        "review_report": "",
+        "code_files": [],
+        "error": error,
+    }
+
+
+def _generate_ready_tasks(
+    workspace_id: str, task_ids: list[str], dependencies: dict[str, list[str]]
+) -> dict[str, dict]:
+    """为没有待处理依赖的任务批量生成代码。
+
+    有待处理依赖的任务仍在依赖完成后单独生成（依赖失败时不生成）；
+    批量生成失败的任务返回值中不包含，由 execute_task 单独生成并报告错误。
+
+    Returns:
+        {任务ID: 生成结果（格式同 generate_code 的返回值）}
+    """
+    pending = set(task_ids)
+    ready = [
+        task_id
+        for task_id in task_ids
+        if not any(dep in pending and dep != task_id for dep in dependencies[task_id])
+    ]
+    if not ready:
+        return {}
+
+    try:
+        batch = generate_code_batch(workspace_id, ready)
+    except Exception as e:
+        logger.warning(f"批量生成代码失败，改为逐个生成: {workspace_id}, 错误: {e}")
+        return {}
+
+    return {
+        task_id: {
+            "success": True,
+            "task_id": task_id,
+            "code_files": code_files,
+            "workspace_id": workspace_id,
+        }
+        for task_id, code_files in batch["generated"].items()
+    }
+
+
 def execute_all_tasks(
     workspace_id: str,
     max_review_retries: int = DEFAULT_MAX_REVIEW_RETRIES,
+    max_parallel_tasks: Optional[int] = None,
 ) -> dict:
     """执行所有待处理任务。
 
-    获取所有状态为 "pending" 的任务，循环执行每个任务（调用 `execute_task`），
+    获取所有状态为 "pending" 的任务，在线程池中并发执行（调用 `execute_task`），
     统计完成和失败的任务数，并返回执行结果统计。
 
+    任务可以通过 `depends_on` 字段（任务ID或任务ID列表）声明依赖，只有依赖的
+    待处理任务全部成功后才会执行；依赖失败的任务不会执行，记为失败。
+
     Args:
         workspace_id: 工作区ID
         max_review_retries: 每个任务的最大 Review 重试次数，默认为 3
+        max_parallel_tasks: 最大并发任务数，如果为 None 则使用配置
+            （TASK_PARALLELISM，默认 4）；为 1 时按顺序执行
 
     Returns:
         包含执行结果统计的字典，格式：
@@ -209,7 +278,7 @@ def execute_all_tasks(
             "total_tasks": 5,  # 总任务数
             "completed_tasks": 3,  # 成功完成的任务数
             "failed_tasks": 2,  # 失败的任务数
-            "task_results": [  # 每个任务的执行结果
+            "task_results": [  # 每个任务的执行结果（按任务列表顺序）
                 {
                     "task_id": "task-001",
                     "success": True,
@@ -247,71 +316,102 @@ def execute_all_tasks(
                 "task_results": [],
             }
 
-        # 循环执行每个任务
-        task_results = []
-        completed_count = 0
-        failed_count = 0
-
+        task_ids = []
+        dependencies = {}
         for task in pending_tasks:
             task_id = task.get("task_id")
             if not task_id:
                 logger.warning(f"任务缺少 task_id，跳过: {task}")
                 continue
+            task_ids.append(task_id)
+            dependencies[task_id] = dependencies_of(task)
+
+        # 没有待处理依赖的任务一次批量生成代码（工作区和任务文件只读写一次）
+        pregenerated = _generate_ready_tasks(workspace_id, task_ids, dependencies)
+
+        progress_lock = threading.Lock()
+        finished_count = 0
+        report_progress(0, len(task_ids), f"开始执行 {len(task_ids)} 个任务")
+
+        def run_task(task_id: str) -> dict:
+            """执行单个任务并报告进度。"""
+            nonlocal finished_count
+            result = execute_one(task_id)
+            passed = result.get("success") and result.get("passed")
+            with progress_lock:
+                finished_count += 1
+                report_progress(
+                    finished_count,
+                    len(task_ids),
+                    f"任务 {task_id} {'完成' if passed else '失败'}",
+                )
+            return result
 
+        def execute_one(task_id: str) -> dict:
+            """执行单个任务，异常转换为失败结果（不影响其他任务）。"""
             logger.info(f"执行任务: {workspace_id}/{task_id}")
-
             try:
-                # 执行任务
                 result = execute_task(
-                    workspace_id, task_id, max_review_retries=max_review_retries
+                    workspace_id,
+                    task_id,
+                    max_review_retries=max_review_retries,
+                    generate_result=pregenerated.get(task_id),
                 )
-                task_results.append(result)
-
-                # 统计成功和失败
-                if result.get("success") and result.get("passed"):
-                    completed_count += 1
-                    logger.info(f"任务执行成功: {workspace_id}/{task_id}")
-                else:
-                    failed_count += 1
-                    logger.warning(
-                        f"任务执行失败: {workspace_id}/{task_id}, "
-                        f"错误: {result.get('error', '未知错误')}"
-                    )
-
             except TaskNotFoundError as e:
                 # 任务不存在，记录错误但继续执行其他任务
-                failed_count += 1
-                error_result = {
-                    "success": False,
-                    "task_id": task_id,
-                    "workspace_id": workspace_id,
-                    "passed": False,
-                    "retry_count": 0,
-                    "review_report": "",
-                    "code_files": [],
-                    "error": f"任务不存在: {str(e)}",
-                }
-                task_results.append(error_result)
                 logger.error(f"任务不存在: {workspace_id}/{task_id}")
-
+                return _task_error_result(
+                    workspace_id, task_id, f"任务不存在: {str(e)}"
+                )
             except Exception as e:
                 # 其他异常，记录错误但继续执行其他任务
-                failed_count += 1
-                error_result = {
-                    "success": False,
-                    "task_id": task_id,
-                    "workspace_id": workspace_id,
-                    "passed": False,
-                    "retry_count": 0,
-                    "review_report": "",
-                    "code_files": [],
-                    "error": f"任务执行异常: {str(e)}",
-                }
-                task_results.append(error_result)
                 logger.error(
                     f"任务执行异常: {workspace_id}/{task_id}, 错误: {e}",
                     exc_info=True,
                 )
+                return _task_error_result(
+                    workspace_id, task_id, f"任务执行异常: {str(e)}"
+                )
+
+            if result.get("success") and result.get("passed"):
+                logger.info(f"任务执行成功: {workspace_id}/{task_id}")
+            else:
+                logger.warning(
+                    f"任务执行失败: {workspace_id}/{task_id}, "
+                    f"错误: {result.get('error', '未知错误')}"
+                )
+            return result
+
+        if max_parallel_tasks is None:
+            max_parallel_tasks = task_manager.config.task_parallelism
+        results, skipped = run_with_dependencies(
+            task_ids,
+            dependencies,
+            run_task,
+            max_workers=max_parallel_tasks,
+            succeeded=lambda result: bool(
+                result.get("success") and result.get("passed")
+            ),
+        )
+
+        report_progress(len(task_ids), len(task_ids), "所有任务执行完成")
+
+        # 按任务列表顺序汇总结果
+        task_results = []
+        completed_count = 0
+        failed_count = 0
+        for task_id in task_ids:
+            if task_id in results:
+                result = results[task_id]
+            else:
+                result = _task_error_result(workspace_id, task_id, skipped[task_id])
+            task_results.append(result)
+
+            # 统计成功和失败
+            if result.get("success") and result.get("passed"):
+                completed_count += 1
+            else:
+                failed_count += 1
 
         # 返回执行结果统计
         total_tasks = len(pending_tasks)
@@ -342,3 +442,73 @@ def execute_all_tasks(
             "task_results": [],
             "error": f"执行所有任务异常: {str(e)}",
         }
+
+
+def summarize_execution_result(result: dict) -> dict:
+    """精简 execute_all_tasks 的结果（去掉每个任务的 Review 报告全文）。
+
+    用于 MCP 响应：任务数量多时 Review 报告会让响应体积成倍增长，
+    需要完整报告时可以通过 `review_code` 单独获取。
+
+    Args:
+        result: execute_all_tasks 的返回值
+
+    Returns:
+        结构相同的字典，task_results 中每个任务只保留 task_id、success、passed、
+        retry_count、code_files 和 error（如果有）
+    """
+    summary_fields = ("task_id", "success", "passed", "retry_count", "code_files")
+    summary = dict(result)
+    summary["task_results"] = [
+        {
+            **{field: task_result.get(field) for field in summary_fields},
+            **({"error": task_result["error"]} if task_result.get("error") else {}),
+        }
+        for task_result in result.get("task_results", [])
+    ]
+    return summary
+
+
+def get_task_plan(workspace_id: str, include_completed: bool = False) -> dict:
+    """获取任务执行计划（可并行的批次和关键路径）。
+
+    按 depends_on 依赖关系把任务分为批次：同一批次的任务之间没有依赖，可以同时执行
+    （如分配给多个 Agent），每个批次只依赖前面批次的任务。默认只规划未完成的任务，
+    对已完成任务的依赖视为已满足。
+
+    Args:
+        workspace_id: 工作区ID
+        include_completed: 是否包含已完成的任务（默认为 False）
+
+    Returns:
+        执行计划，格式：
+        {
+            "success": True,
+            "workspace_id": "req-xxx",
+            "total_tasks": 5,  # 规划的任务数
+            "batches": [["task-001"], ["task-002", "task-003"], ...],
+            "max_parallelism": 2,  # 最大批次的任务数
+            "critical_path": ["task-001", "task-003", ...],
+            "critical_path_weight": 3,  # 关键路径上任务的 estimated_size 之和（没有时每个任务为 1）
+            "dependencies": {"task-002": ["task-001"], ...}
+        }
+
+    Raises:
+        ValidationError: 当任务存在循环依赖时
+    """
+    task_manager = TaskManager()
+    tasks = task_manager.get_tasks(workspace_id)
+    if not include_completed:
+        tasks = [task for task in tasks if task.get("status") != "completed"]
+
+    graph = build_task_graph(tasks)
+    return {
+        "success": True,
+        "workspace_id": workspace_id,
+        "total_tasks": len(graph["dependencies"]),
+        "batches": graph["levels"],
+        "max_parallelism": max((len(level) for level in graph["levels"]), default=0),
+        "critical_path": graph["critical_path"],
+        "critical_path_weight": graph["critical_path_weight"],
+        "dependencies": graph["dependencies"],
+    }
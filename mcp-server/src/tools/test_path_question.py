@@ -7,7 +7,6 @@ Python 3.9+ 兼容：使用内置类型 dict 而非 typing.Dict
 2. 提交测试路径并保存到工作区元数据
 """
 
-import json
 import os
 from pathlib import Path
 
@@ -15,7 +14,6 @@ from src.core.config import Config
 from src.core.exceptions import ValidationError, WorkspaceNotFoundError
 from src.core.logger import setup_logger
 from src.managers.workspace_manager import WorkspaceManager
-from src.utils.file_lock import file_lock
 
 logger = setup_logger(__name__)
 
@@ -166,28 +164,10 @@ def submit_test_path(workspace_id: str, test_path: str) -> dict:
             except Exception as e:
                 raise ValidationError(f"无法创建测试目录 {test_path_str}: {e}") from e
 
-        # 保存到工作区元数据（使用文件锁）
-        workspace_dir = config.get_workspace_path(workspace_id)
-        meta_file = workspace_dir / "workspace.json"
-
-        with file_lock(meta_file):
-            # 重新读取最新数据（避免使用过期的缓存）
-            if not meta_file.exists():
-                raise WorkspaceNotFoundError(f"Workspace not found: {workspace_id}")
-
-            with open(meta_file, encoding="utf-8") as f:
-                workspace_data = json.load(f)
-
-            # 确保 files 字段存在
-            if "files" not in workspace_data:
-                workspace_data["files"] = {}
-
-            # 更新 test_path
-            workspace_data["files"]["test_path"] = test_path_str
-
-            # 保存
-            with open(meta_file, "w", encoding="utf-8") as f:
-                json.dump(workspace_data, f, ensure_ascii=False, indent=2)
+        # 保存到工作区元数据
+        workspace_manager.update_workspace_files(
+            workspace_id, {"test_path": test_path_str}
+        )
 
         logger.info(f"成功保存测试路径: {workspace_id}, {test_path_str}")
 
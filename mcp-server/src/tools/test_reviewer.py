@@ -1,14 +1,47 @@
 """测试审查工具 - TDD 第二步：最小实现。
 
 Python 3.9+ 兼容
+
+每个测试文件用 ast 解析一次，统计测试函数、每个测试的断言数、fixture 和 mock，
+并标记空测试、没有断言的测试和只断言常量的测试：
+- 通过 `src.utils.review_engine.analyze_files` 解析：通常只有一两个测试文件，在当前进程中解析；
+  文件较多时才使用共享的进程池并行解析
+- 每个文件的结果按文件内容哈希缓存在工作区的 review_cache 目录中，重复审查时只解析内容变化的文件
+- 是否通过由结构化的统计结果决定，而不是扫描报告文本
 """
 
+import ast
 from pathlib import Path
+from typing import Optional
 
+from src.core.config import Config
 from src.core.logger import setup_logger
+from src.utils.content_cache import ContentHashLRUCache
+from src.utils.review_engine import REVIEW_CACHE_DIR, analyze_files
 
 logger = setup_logger(__name__)
 
+# 缓存命名空间（分析逻辑变化时递增版本）
+_CACHE_NAMESPACE = "test-review:2"
+
+# 创建 mock 的函数和 pytest 中提供 mock 能力的 fixture
+_MOCK_FACTORIES = {
+    "Mock",
+    "MagicMock",
+    "AsyncMock",
+    "NonCallableMock",
+    "create_autospec",
+}
+_MOCK_FIXTURES = {"mocker", "monkeypatch"}
+
+# 用作断言的上下文管理器（pytest.raises、self.assertRaises 等）
+_ASSERT_CONTEXTS = {"raises", "warns", "deprecated_call", "assertRaises", "assertWarns"}
+
+# 测试问题类型
+ISSUE_EMPTY = "empty"
+ISSUE_NO_ASSERTIONS = "no_assertions"
+ISSUE_TRIVIAL_ASSERTION = "trivial_assertion"
+
 
 def review_tests(workspace_id: str, test_files: list[str]) -> dict:
     """审查测试。
@@ -18,7 +51,20 @@ def review_tests(workspace_id: str, test_files: list[str]) -> dict:
         test_files: 测试文件路径列表
 
     Returns:
-        包含审查结果的字典
+        包含审查结果的字典，格式：
+        {
+            "success": True,
+            "passed": 是否通过（所有文件都能解析且至少有一个测试）,
+            "review_report": Markdown 审查报告,
+            "metrics": {
+                "files": 文件数, "tests": 测试数, "assertions": 断言数,
+                "assertions_per_test": 平均每个测试的断言数,
+                "fixtures": 定义的 fixture 数, "mocks": mock 使用次数,
+                "issues": 有问题的测试数
+            },
+            "files": 每个文件的分析结果（格式见 _analyze_test_file）,
+            "workspace_id": 工作区ID
+        }
     """
     if not test_files:
         return {
@@ -28,71 +74,301 @@ def review_tests(workspace_id: str, test_files: list[str]) -> dict:
             "workspace_id": workspace_id,
         }
 
-    review_report = _review_test_files(test_files)
-    passed = _evaluate_test_review(review_report)
+    config = Config()
+    cache = None
+    workspace_dir = config.get_workspace_path(workspace_id)
+    if workspace_dir.is_dir():
+        cache = ContentHashLRUCache(
+            workspace_dir / REVIEW_CACHE_DIR,
+            _CACHE_NAMESPACE,
+            max_entries=config.review_cache_max_entries,
+        )
 
-    logger.info(f"测试审查完成: {workspace_id}, 通过: {passed}")
+    results = analyze_files(
+        _analyze_test_file, test_files, workers=config.review_workers, cache=cache
+    )
+    metrics = _summarize_metrics(results)
+    passed = _evaluate_test_review(results, metrics)
+    review_report = _render_review_report(results, metrics)
+
+    logger.info(f"测试审查完成: {workspace_id}, 通过: {passed}, 统计: {metrics}")
 
     return {
         "success": True,
         "passed": passed,
         "review_report": review_report,
+        "metrics": metrics,
+        "files": results,
         "workspace_id": workspace_id,
     }
 
 
-def _review_test_files(test_files: list[str]) -> str:
-    """审查测试文件。
+def _call_name(node: ast.AST) -> str:
+    """调用或装饰器的函数名的最后一段（如 mock.patch.object -> object）。"""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _dotted_name(node: ast.AST) -> str:
+    """调用或装饰器的完整名称（如 pytest.fixture、mock.patch.object）。"""
+    if isinstance(node, ast.Call):
+        node = node.func
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _is_fixture(node: ast.AST) -> bool:
+    """是否为 pytest fixture 定义。"""
+    return any(_call_name(decorator) == "fixture" for decorator in node.decorator_list)
+
+
+def _is_mock_call(node: ast.AST) -> bool:
+    """是否为创建 mock 或打补丁的调用/装饰器。"""
+    name = _dotted_name(node)
+    last = name.rsplit(".", 1)[-1]
+    return (
+        last in _MOCK_FACTORIES
+        or last == "patch"
+        or ".patch." in f".{name}"
+        or name.startswith(("mocker.", "monkeypatch."))
+    )
+
+
+def _count_mocks(node: ast.AST) -> int:
+    """统计节点中创建 mock 或打补丁的调用次数（包括不带参数的 @patch 装饰器）。"""
+    count = 0
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call) and _is_mock_call(child):
+            count += 1
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            count += sum(
+                1
+                for decorator in child.decorator_list
+                if not isinstance(decorator, ast.Call) and _is_mock_call(decorator)
+            )
+    return count
+
+
+def _is_trivial_assert(node: ast.Assert) -> bool:
+    """是否为只断言常量的 assert（如 assert True、assert 1）。"""
+    return isinstance(node.test, ast.Constant) and bool(node.test.value)
+
+
+def _count_assertions(function: ast.AST) -> tuple[int, int]:
+    """统计函数中的断言数和只断言常量的 assert 数。
+
+    assert 语句、unittest 的 self.assert*、mock 的 assert_called* 和
+    pytest.raises 等上下文管理器都计为断言。
+    """
+    assertions = trivial = 0
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assert):
+            assertions += 1
+            trivial += _is_trivial_assert(node)
+        elif isinstance(node, ast.Call):
+            name = _call_name(node)
+            if name.startswith("assert") or name in _ASSERT_CONTEXTS:
+                assertions += 1
+    return assertions, trivial
+
+
+def _is_empty(function: ast.AST) -> bool:
+    """函数体是否只有文档字符串、pass 或 ...。"""
+    for statement in function.body:
+        if isinstance(statement, ast.Pass):
+            continue
+        if isinstance(statement, ast.Expr) and isinstance(
+            statement.value, ast.Constant
+        ):
+            continue
+        return False
+    return True
+
+
+def _analyze_test(function: ast.AST, name: str) -> dict:
+    """分析单个测试函数。"""
+    assertions, trivial = _count_assertions(function)
+    issues = []
+    if _is_empty(function):
+        issues.append(ISSUE_EMPTY)
+    elif assertions == 0:
+        issues.append(ISSUE_NO_ASSERTIONS)
+    elif trivial == assertions:
+        issues.append(ISSUE_TRIVIAL_ASSERTION)
+    params = {arg.arg for arg in function.args.args}
+    return {
+        "name": name,
+        "line": function.lineno,
+        "assertions": assertions,
+        "mocks": _count_mocks(function),
+        "fixtures": sorted(params - {"self", "cls"}),
+        "uses_mock_fixture": bool(params & _MOCK_FIXTURES),
+        "issues": issues,
+    }
+
+
+def _is_test_class(node: ast.ClassDef) -> bool:
+    """是否为测试类（Test 开头或继承 *TestCase）。"""
+    return node.name.startswith("Test") or any(
+        _call_name(base).endswith("TestCase") for base in node.bases
+    )
+
+
+def _analyze_test_file(path: str, data: Optional[bytes] = None) -> dict:
+    """解析并分析单个测试文件（进程池中执行的函数，参数和返回值都可 pickle）。
 
     Args:
-        test_files: 测试文件路径列表
+        path: 文件路径
+        data: 已读取的文件内容（None 表示从 path 读取）
 
     Returns:
-        审查报告
+        {
+            "file": 文件路径,
+            "status": "ok" / "missing" / "unreadable" / "syntax_error",
+            "error": 错误说明（status 不为 ok 时）,
+            "framework": "pytest" / "unittest" / None,
+            "tests": [{"name", "line", "assertions", "mocks", "fixtures",
+                       "uses_mock_fixture", "issues"}, ...],
+            "fixtures": 定义的 fixture 名称列表,
+            "mocks": 模块级和测试中的 mock 使用次数
+        }
     """
+    result = {
+        "file": path,
+        "status": "ok",
+        "framework": None,
+        "tests": [],
+        "fixtures": [],
+        "mocks": 0,
+    }
+    file_path = Path(path)
+    if data is None and not file_path.exists():
+        return {**result, "status": "missing", "error": "文件不存在"}
+    try:
+        if data is None:
+            data = file_path.read_bytes()
+        tree = ast.parse(data.decode("utf-8"), filename=path)
+    except (OSError, UnicodeDecodeError) as e:
+        return {**result, "status": "unreadable", "error": f"读取失败 - {e}"}
+    except (SyntaxError, ValueError) as e:
+        return {**result, "status": "syntax_error", "error": f"语法错误 - {e}"}
+
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imported.add(node.module.split(".")[0])
+
+    tests = []
+    fixtures = []
+    functions = (ast.FunctionDef, ast.AsyncFunctionDef)
+    for node in tree.body:
+        if isinstance(node, functions):
+            if _is_fixture(node):
+                fixtures.append(node.name)
+            elif node.name.startswith("test"):
+                tests.append(_analyze_test(node, node.name))
+        elif isinstance(node, ast.ClassDef) and _is_test_class(node):
+            for member in node.body:
+                if not isinstance(member, functions):
+                    continue
+                if _is_fixture(member):
+                    fixtures.append(f"{node.name}.{member.name}")
+                elif member.name.startswith("test"):
+                    tests.append(_analyze_test(member, f"{node.name}.{member.name}"))
+
+    if "pytest" in imported:
+        result["framework"] = "pytest"
+    elif "unittest" in imported:
+        result["framework"] = "unittest"
+    elif tests:
+        result["framework"] = "pytest"  # pytest 可以直接运行不导入框架的测试函数
+
+    result["tests"] = tests
+    result["fixtures"] = fixtures
+    result["mocks"] = _count_mocks(tree)
+    return result
+
+
+def _summarize_metrics(results: list[dict]) -> dict:
+    """汇总所有文件的统计结果。"""
+    tests = [test for result in results for test in result["tests"]]
+    assertions = sum(test["assertions"] for test in tests)
+    return {
+        "files": len(results),
+        "tests": len(tests),
+        "assertions": assertions,
+        "assertions_per_test": round(assertions / len(tests), 2) if tests else 0.0,
+        "fixtures": sum(len(result["fixtures"]) for result in results),
+        "mocks": sum(result["mocks"] for result in results),
+        "issues": sum(1 for test in tests if test["issues"]),
+    }
+
+
+def _render_review_report(results: list[dict], metrics: dict) -> str:
+    """把结构化的分析结果渲染为 Markdown 报告。"""
+    issue_labels = {
+        ISSUE_EMPTY: "空测试",
+        ISSUE_NO_ASSERTIONS: "缺少断言",
+        ISSUE_TRIVIAL_ASSERTION: "只断言常量",
+    }
     report_lines = ["# 测试审查报告"]
-    report_lines.append(f"\n审查文件数: {len(test_files)}")
-
-    valid_files = 0
-    for file_path in test_files:
-        path = Path(file_path)
-        if path.exists():
-            try:
-                content = path.read_text(encoding="utf-8")
-                # 基础检查
-                checks = []
-                if "import pytest" in content or "import unittest" in content:
-                    checks.append("✅ 导入测试框架")
-                if "def test_" in content or "class Test" in content:
-                    checks.append("✅ 包含测试函数/类")
-                if "assert" in content:
-                    checks.append("✅ 包含断言")
-                else:
-                    checks.append("⚠️ 缺少断言")
-
-                report_lines.append(f"\n{path.name}:")
-                report_lines.extend(f"  {check}" for check in checks)
-                valid_files += 1
-            except Exception as e:
-                report_lines.append(f"\n❌ {path.name}: 读取失败 - {e}")
+    report_lines.append(f"\n审查文件数: {len(results)}")
+
+    for result in results:
+        name = Path(result["file"]).name
+        if result["status"] != "ok":
+            report_lines.append(f"\n❌ {result['file']}: {result['error']}")
+            continue
+        report_lines.append(f"\n{name}:")
+        if result["framework"]:
+            report_lines.append(f"  ✅ 测试框架: {result['framework']}")
+        if result["tests"]:
+            report_lines.append(f"  ✅ 测试函数: {len(result['tests'])} 个")
         else:
-            report_lines.append(f"\n❌ {file_path}: 文件不存在")
+            report_lines.append("  ⚠️ 没有测试函数")
+        if result["fixtures"] or result["mocks"]:
+            report_lines.append(
+                f"  ✅ fixture: {len(result['fixtures'])} 个，mock: {result['mocks']} 处"
+            )
+        for test in result["tests"]:
+            if test["issues"]:
+                labels = "、".join(issue_labels[issue] for issue in test["issues"])
+                report_lines.append(
+                    f"  ⚠️ {test['name']} (第 {test['line']} 行): {labels}"
+                )
 
-    report_lines.append(f"\n\n结论: 审查了 {valid_files}/{len(test_files)} 个有效文件")
+    valid_files = sum(1 for result in results if result["status"] == "ok")
+    report_lines.append(
+        f"\n\n统计: {metrics['tests']} 个测试，{metrics['assertions']} 个断言"
+        f"（平均 {metrics['assertions_per_test']} 个），{metrics['issues']} 个测试有问题"
+    )
+    report_lines.append(f"\n结论: 审查了 {valid_files}/{len(results)} 个有效文件")
 
     return "\n".join(report_lines)
 
 
-def _evaluate_test_review(review_report: str) -> bool:
+def _evaluate_test_review(results: list[dict], metrics: dict) -> bool:
     """评估测试审查结果。
 
     Args:
-        review_report: 审查报告
+        results: 每个文件的分析结果
+        metrics: 汇总统计
 
     Returns:
-        是否通过
+        是否通过（所有文件都能解析且至少有一个测试；有问题的测试只给出警告）
     """
-    # 简化逻辑：如果有有效测试文件，则认为通过
-    if "审查了 0/" in review_report or "❌" in review_report:
+    if any(result["status"] != "ok" for result in results):
         return False
-    return True
+    return metrics["tests"] > 0
@@ -3,23 +3,35 @@
 Python 3.9+ 兼容
 """
 
-import json
 from pathlib import Path
 
 from src.core.config import Config
 from src.core.exceptions import ValidationError
 from src.core.logger import setup_logger
+from src.llm.base import LLMRequest
+from src.llm.factory import generate_text
 from src.managers.workspace_manager import WorkspaceManager
+from src.utils.codebase_scanner import scan_codebase
+from src.utils.fingerprint import compute_fingerprint, is_artifact_current
 
 logger = setup_logger(__name__)
 
+# TRD 生成逻辑（模板、提示词）的版本，变化时之前的输入指纹失效
+TRD_GENERATOR_VERSION = 1
 
-def generate_trd(workspace_id: str, prd_path: str | None = None) -> dict:
+
+def generate_trd(
+    workspace_id: str, prd_path: str | None = None, force: bool = False
+) -> dict:
     """生成 TRD 文档。
 
+    PRD 内容、代码库分析结果和 LLM 配置与上次生成时相同（输入指纹一致）、TRD 文件仍然存在
+    且 TRD 没有被标记为需要修改时，直接返回已有的 TRD（`skipped` 为 True）。
+
     Args:
         workspace_id: 工作区ID
         prd_path: PRD 文档路径（可选，默认从工作区获取）
+        force: 是否忽略输入指纹，强制重新生成
 
     Returns:
         包含 TRD 路径的字典
@@ -50,26 +62,57 @@ def generate_trd(workspace_id: str, prd_path: str | None = None) -> dict:
     if not prd_file.exists():
         raise ValidationError(f"PRD 文件不存在: {prd_path}")
 
-    # ✅ 新增：标记TRD为进行中
-    workspace_manager.update_workspace_status(
-        workspace_id, {"trd_status": "in_progress"}
-    )
-
     workspace_dir = config.get_workspace_path(workspace_id)
     project_path = Path(workspace["project_path"])
+    trd_path = workspace_dir / "TRD.md"
 
     try:
         # 读取 PRD 内容
         prd_content = prd_file.read_text(encoding="utf-8")
 
         # 分析现有代码库
-        codebase_info = _analyze_codebase(project_path)
+        codebase_info = _analyze_codebase(project_path, config)
+
+        # 输入未变化时直接返回已有的 TRD
+        fingerprint = compute_fingerprint(
+            {
+                "version": TRD_GENERATOR_VERSION,
+                "prd": compute_fingerprint({"content": prd_content}),
+                # scan_stats 是本次扫描的统计信息，与代码库内容无关
+                "codebase": {
+                    key: value
+                    for key, value in codebase_info.items()
+                    if key != "scan_stats"
+                },
+                "requirement_name": workspace.get("requirement_name"),
+                "project_path": workspace.get("project_path"),
+                "llm": [config.llm_provider, config.llm_model],
+            }
+        )
+        if not force and is_artifact_current(workspace, "trd", fingerprint, trd_path):
+            if status.get("trd_status") != "completed":
+                workspace_manager.update_workspace_status(
+                    workspace_id, {"trd_status": "completed"}
+                )
+            logger.info(f"PRD 和代码库未变化，使用已有 TRD: {trd_path}")
+            return {
+                "success": True,
+                "trd_path": str(trd_path),
+                "workspace_id": workspace_id,
+                "skipped": True,
+            }
+
+        # ✅ 新增：标记TRD为进行中
+        workspace_manager.update_workspace_status(
+            workspace_id, {"trd_status": "in_progress"}
+        )
 
-        # 生成 TRD 内容
-        trd_content = _generate_trd_content(prd_content, codebase_info, workspace)
+        # 生成 TRD 内容（调用 LLM，失败时使用模板）
+        trd_content = generate_text(
+            _build_trd_request(prd_content, codebase_info, workspace), config
+        )
 
         # 保存 TRD 文件
-        trd_path = workspace_dir / "TRD.md"
         trd_path.write_text(trd_content, encoding="utf-8")
 
         # ✅ 新增：标记TRD为已完成
@@ -78,11 +121,12 @@ def generate_trd(workspace_id: str, prd_path: str | None = None) -> dict:
         )
 
         # 更新工作区文件路径
-        workspace = workspace_manager.get_workspace(workspace_id)
-        workspace["files"]["trd_path"] = str(trd_path)
-        meta_file = workspace_dir / "workspace.json"
-        with open(meta_file, "w", encoding="utf-8") as f:
-            json.dump(workspace, f, ensure_ascii=False, indent=2)
+        workspace_manager.update_workspace_files(
+            workspace_id, {"trd_path": str(trd_path)}
+        )
+        workspace_manager.update_workspace_fingerprints(
+            workspace_id, {"trd": fingerprint}
+        )
 
         logger.info(f"TRD 已生成: {trd_path}")
 
@@ -90,6 +134,7 @@ def generate_trd(workspace_id: str, prd_path: str | None = None) -> dict:
             "success": True,
             "trd_path": str(trd_path),
             "workspace_id": workspace_id,
+            "skipped": False,
         }
     except Exception as e:
         # ✅ 新增：标记TRD为失败
@@ -100,39 +145,57 @@ def generate_trd(workspace_id: str, prd_path: str | None = None) -> dict:
         raise
 
 
-def _analyze_codebase(project_path: Path) -> dict:
-    """分析现有代码库。
+def _analyze_codebase(project_path: Path, config: Config) -> dict:
+    """分析现有代码库（基于 .agent-orchestrator/cache 中的项目文件索引，增量刷新）。
 
     Args:
         project_path: 项目路径
+        config: 配置
 
     Returns:
-        代码库分析信息
+        代码库分析信息，格式见 `scan_codebase()`
     """
-    codebase_info = {"language": "unknown", "framework": "unknown", "structure": []}
+    return scan_codebase(
+        project_path,
+        cache_dir=config.cache_dir,
+        excludes=config.codebase_scan_excludes,
+    )
 
-    # 检测编程语言
-    python_files = list(project_path.rglob("*.py"))
-    if python_files:
-        codebase_info["language"] = "python"
 
-    # 检测框架（简化版）
-    if (project_path / "requirements.txt").exists():
-        codebase_info["framework"] = "python-standard"
+def _build_trd_request(
+    prd_content: str, codebase_info: dict, workspace: dict
+) -> LLMRequest:
+    """构造 TRD 生成请求（以模板内容作为 fallback）。
 
-    # 分析目录结构
-    if project_path.exists():
-        for item in project_path.iterdir():
-            if item.is_dir() and not item.name.startswith("."):
-                codebase_info["structure"].append(item.name)
+    Args:
+        prd_content: PRD 文档内容
+        codebase_info: 代码库分析信息
+        workspace: 工作区信息
 
-    return codebase_info
+    Returns:
+        LLM 生成请求
+    """
+    requirement_name = workspace.get("requirement_name", "未知需求")
+    structure = "\n".join(f"- {item}" for item in codebase_info.get("structure", []))
+    prompt = (
+        f"请根据以下 PRD 为「{requirement_name}」编写 TRD，使用 Markdown 格式，"
+        "包含技术概述、架构设计、接口设计、实现方案、测试策略和风险评估。\n\n"
+        f"编程语言: {codebase_info.get('language', 'unknown')}\n"
+        f"框架: {codebase_info.get('framework', 'unknown')}\n"
+        f"现有代码库结构:\n{structure}\n\n"
+        f"PRD：\n{prd_content}"
+    )
+    return LLMRequest(
+        prompt,
+        system="你是一名资深软件架构师。",
+        fallback=_generate_trd_content(prd_content, codebase_info, workspace),
+    )
 
 
 def _generate_trd_content(
     prd_content: str, codebase_info: dict, workspace: dict
 ) -> str:
-    """生成 TRD 文档内容。
+    """生成 TRD 文档内容（模板）。
 
     Args:
         prd_content: PRD 文档内容
@@ -144,6 +207,10 @@ def _generate_trd_content(
     """
     requirement_name = workspace.get("requirement_name", "未知需求")
     project_path = workspace.get("project_path", "")
+    languages = ", ".join(
+        f"{language} ({count})"
+        for language, count in codebase_info.get("languages", {}).items()
+    )
 
     trd_template = f"""# TRD: {requirement_name}
 
@@ -152,6 +219,8 @@ def _generate_trd_content(
 ### 1.1 技术栈
 - 编程语言: {codebase_info.get('language', 'unknown')}
 - 框架: {codebase_info.get('framework', 'unknown')}
+- 语言分布: {languages or '无'}
+- 识别到的框架: {', '.join(codebase_info.get('frameworks', [])) or '无'}
 - 项目路径: {project_path}
 
 ### 1.2 现有代码库结构
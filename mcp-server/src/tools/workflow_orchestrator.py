@@ -50,12 +50,16 @@ from src.tools.trd_confirmation import (
 )
 from src.tools.trd_generator import generate_trd
 from src.tools.workflow_status import get_workflow_status
+from src.utils.progress import progress_scope, report_progress
 
 logger = setup_logger(__name__)
 
 # 默认最大Review重试次数
 DEFAULT_MAX_REVIEW_RETRIES = 3
 
+# 工作流总步骤数（用于进度通知）
+TOTAL_WORKFLOW_STEPS = 8
+
 
 def _update_workflow_state(
     workspace_id: str,
@@ -105,19 +109,7 @@ def _update_workflow_state(
     )
 
     # 保存到工作区元数据
-    workspace_dir = config.get_workspace_path(workspace_id)
-    meta_file = workspace_dir / "workspace.json"
-
-    import json
-
-    from src.utils.file_lock import file_lock
-
-    with file_lock(meta_file):
-        with open(meta_file, encoding="utf-8") as f:
-            workspace_data = json.load(f)
-        workspace_data["workflow_state"] = workflow_state
-        with open(meta_file, "w", encoding="utf-8") as f:
-            json.dump(workspace_data, f, ensure_ascii=False, indent=2)
+    workspace_manager.update_workflow_state(workspace_id, workflow_state)
 
     logger.info(
         f"更新工作流状态: {workspace_id}, 步骤{current_step} ({step_name}) -> {step_status}"
@@ -179,6 +171,7 @@ def execute_full_workflow(
     auto_confirm: bool = True,
     max_review_retries: int = DEFAULT_MAX_REVIEW_RETRIES,
     interaction_response: Union[dict, None] = None,
+    force_regenerate: bool = False,
 ) -> dict:
     """执行完整工作流。
 
@@ -209,6 +202,7 @@ def execute_full_workflow(
             - 当 interaction_type="prd_confirmation" 时，包含 action 字段（"confirm" 或 "modify"）
             - 当 interaction_type="trd_confirmation" 时，包含 action 字段（"confirm" 或 "modify"）
             - 当 interaction_type="question" 时，包含 answer 字段（test_path）
+        force_regenerate: 是否强制重新生成 PRD / TRD（默认为 False：输入未变化时复用已有文档）
 
     Returns:
         包含工作流执行结果的字典，格式：
@@ -280,20 +274,20 @@ def execute_full_workflow(
     # 参数验证（自动确认模式或交互模式但参数已提供）
     # 注意：如果提供了 workspace_id 且成功恢复，参数可能已从工作区恢复
     # 如果从工作区恢复后参数仍为空，允许继续执行，但在使用时再检查
-    if auto_confirm:
-        # 只有在没有 workspace_id 或恢复失败时才进行严格验证
-        if not current_workspace_id:
-            if not project_path or not str(project_path).strip():
-                raise ValidationError("project_path 不能为空")
-            if not requirement_name or not str(requirement_name).strip():
-                raise ValidationError("requirement_name 不能为空")
-            if not requirement_url or not str(requirement_url).strip():
-                raise ValidationError("requirement_url 不能为空")
+    # 只有在没有 workspace_id 或恢复失败时才进行严格验证
+    if auto_confirm and not current_workspace_id:
+        if not project_path or not str(project_path).strip():
+            raise ValidationError("project_path 不能为空")
+        if not requirement_name or not str(requirement_name).strip():
+            raise ValidationError("requirement_name 不能为空")
+        if not requirement_url or not str(requirement_url).strip():
+            raise ValidationError("requirement_url 不能为空")
 
     try:
         # 步骤1: 提交答案并创建工作区（如果还没有工作区）
         if not workspace_id:
             logger.info("步骤1: 提交答案并创建工作区")
+            report_progress(0, TOTAL_WORKFLOW_STEPS, "步骤1: 提交答案并创建工作区")
             if not project_path or not requirement_name or not requirement_url:
                 raise ValidationError(
                     "创建工作区需要 project_path, requirement_name, requirement_url"
@@ -338,6 +332,7 @@ def execute_full_workflow(
 
         # 步骤2: PRD 循环（生成 → 确认）
         logger.info("步骤2: PRD 循环（生成 → 确认）")
+        report_progress(1, TOTAL_WORKFLOW_STEPS, "步骤2: PRD 循环（生成 → 确认）")
 
         max_prd_loops = 3  # 最多重试3次
 
@@ -379,7 +374,9 @@ def execute_full_workflow(
             logger.info(f"PRD 循环第 {prd_loop_count} 次")
 
             # 生成 PRD
-            prd_result = generate_prd(workspace_id, requirement_url)
+            prd_result = generate_prd(
+                workspace_id, requirement_url, force=force_regenerate
+            )
             if not prd_result.get("success"):
                 raise AgentOrchestratorError(
                     f"PRD 生成失败: {prd_result.get('error', '未知错误')}"
@@ -477,6 +474,7 @@ def execute_full_workflow(
 
         # 步骤3: TRD 循环（生成 → 确认）
         logger.info("步骤3: TRD 循环（生成 → 确认）")
+        report_progress(2, TOTAL_WORKFLOW_STEPS, "步骤3: TRD 循环（生成 → 确认）")
 
         max_trd_loops = 3  # 最多重试3次
 
@@ -518,7 +516,7 @@ def execute_full_workflow(
             logger.info(f"TRD 循环第 {trd_loop_count} 次")
 
             # 生成 TRD
-            trd_result = generate_trd(workspace_id)
+            trd_result = generate_trd(workspace_id, force=force_regenerate)
             if not trd_result.get("success"):
                 raise AgentOrchestratorError(
                     f"TRD 生成失败: {trd_result.get('error', '未知错误')}"
@@ -616,6 +614,7 @@ def execute_full_workflow(
 
         # 步骤4: 任务分解
         logger.info("步骤4: 任务分解")
+        report_progress(3, TOTAL_WORKFLOW_STEPS, "步骤4: 任务分解")
 
         # 检查是否应该跳过步骤4
         if _should_skip_step(workspace_id, 4, "任务分解"):
@@ -676,6 +675,7 @@ def execute_full_workflow(
 
         # 步骤5: 任务循环执行
         logger.info("步骤5: 任务循环执行")
+        report_progress(4, TOTAL_WORKFLOW_STEPS, "步骤5: 任务循环执行")
 
         # 检查是否应该跳过步骤5
         if _should_skip_step(workspace_id, 5, "任务执行"):
@@ -707,9 +707,11 @@ def execute_full_workflow(
             f"可开始阶段={workflow_status.get('next_available_stages', [])}"
         )
 
-        execute_result = execute_all_tasks(
-            workspace_id, max_review_retries=max_review_retries
-        )
+        # 任务执行的进度映射到步骤5的进度区间内
+        with progress_scope(4, TOTAL_WORKFLOW_STEPS):
+            execute_result = execute_all_tasks(
+                workspace_id, max_review_retries=max_review_retries
+            )
         workflow_steps.append(
             {
                 "step": 5,
@@ -744,6 +746,7 @@ def execute_full_workflow(
 
         # 步骤6: 询问测试路径（使用默认路径）
         logger.info("步骤6: 询问测试路径（使用默认路径）")
+        report_progress(5, TOTAL_WORKFLOW_STEPS, "步骤6: 询问测试路径（使用默认路径）")
 
         # 检查是否应该跳过步骤6
         if _should_skip_step(workspace_id, 6, "测试路径设置"):
@@ -859,6 +862,7 @@ def execute_full_workflow(
 
         # 步骤7: 生成测试
         logger.info("步骤7: 生成测试")
+        report_progress(6, TOTAL_WORKFLOW_STEPS, "步骤7: 生成测试")
 
         # 检查是否应该跳过步骤7
         if _should_skip_step(workspace_id, 7, "生成测试"):
@@ -903,6 +907,7 @@ def execute_full_workflow(
 
         # 步骤8: 生成覆盖率报告
         logger.info("步骤8: 生成覆盖率报告")
+        report_progress(7, TOTAL_WORKFLOW_STEPS, "步骤8: 生成覆盖率报告")
 
         # 检查是否应该跳过步骤8
         if _should_skip_step(workspace_id, 8, "生成覆盖率报告"):
@@ -973,6 +978,7 @@ def execute_full_workflow(
         final_status = final_status_result.get("stages", {})
 
         logger.info(f"完整工作流执行成功: {workspace_id}")
+        report_progress(TOTAL_WORKFLOW_STEPS, TOTAL_WORKFLOW_STEPS, "工作流执行完成")
 
         return {
             "success": True,
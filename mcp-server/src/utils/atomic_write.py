@@ -0,0 +1,174 @@
+"""原子写入工具 - 工作区元数据文件的统一写入路径。
+
+Python 3.9+ 兼容
+
+`workspace.json`、`tasks.json`、`.workspace-index.json` 等元数据文件统一通过本模块写入：
+- 先写入同目录下的临时文件，再用 `os.replace` 原子替换目标文件，
+  其他进程（多个 Cursor 终端）读取时只会看到旧文件或新文件，不会读到截断的文件
+- 可选 fsync：在替换前对临时文件 fsync（替换后的目标文件一定是完整的），替换后对目录 fsync
+  （保证替换本身在断电后仍然有效）；`fsync_batch()` 内的多次写入只把目录 fsync 推迟到
+  批次结束时，每个目录统一执行一次
+- 默认使用紧凑 JSON 序列化（无缩进），C 编码器比 `indent=2` 的纯 Python 编码快得多
+
+是否 fsync、是否使用紧凑 JSON 由调用方传入（存储后端使用 `Config.storage_fsync`、
+`Config.storage_compact_json`，即 STORAGE_FSYNC / STORAGE_COMPACT_JSON 环境变量）。
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# 新建文件的默认权限（替换已有文件时沿用原文件权限）
+_DEFAULT_FILE_MODE = 0o644
+
+# 当前线程的 fsync 批次：待 fsync 的目录集合，None 表示不在批次内
+_batch_state = threading.local()
+
+
+def dumps_json(data: Any, compact: bool = True) -> str:
+    """序列化 JSON 数据。
+
+    Args:
+        data: 要序列化的数据
+        compact: 是否使用紧凑格式（默认为 True）
+
+    Returns:
+        JSON 字符串
+    """
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _fsync_path(path: Path) -> None:
+    """对文件或目录执行 fsync（目录 fsync 在部分平台不受支持，忽略错误）。"""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        with contextlib.suppress(OSError):
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_text_atomic(
+    file_path: Path, content: str, fsync: bool = True
+) -> os.stat_result:
+    """原子写入文本文件。
+
+    Args:
+        file_path: 目标文件路径
+        content: 文件内容
+        fsync: 是否 fsync（默认为 True）
+
+    Returns:
+        写入后目标文件的 stat 结果（可用于缓存校验）
+
+    Raises:
+        OSError: 当写入或替换失败时（临时文件会被清理）
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        mode = file_path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = _DEFAULT_FILE_MODE
+
+    pending = getattr(_batch_state, "pending", None)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{file_path.name}.", suffix=".tmp", dir=str(file_path.parent)
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content.encode("utf-8"))
+            f.flush()
+            if hasattr(os, "fchmod"):  # mkstemp 创建的文件权限为 0600
+                os.fchmod(f.fileno(), mode)
+            if fsync:  # 替换前必须落盘，否则断电后目标文件可能为空或被截断
+                os.fsync(f.fileno())
+            stat_result = os.fstat(f.fileno())
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+    if fsync:
+        if pending is None:
+            _fsync_path(file_path.parent)
+        else:
+            pending.add(file_path.parent)
+
+    return stat_result
+
+
+def write_json_atomic(
+    file_path: Path,
+    data: Any,
+    compact: bool = True,
+    fsync: bool = True,
+) -> os.stat_result:
+    """原子写入 JSON 文件。
+
+    Args:
+        file_path: 目标文件路径
+        data: 要写入的数据
+        compact: 是否使用紧凑格式（默认为 True）
+        fsync: 是否 fsync（默认为 True）
+
+    Returns:
+        写入后目标文件的 stat 结果（可用于缓存校验）
+
+    Example:
+        ```python
+        from src.utils.atomic_write import write_json_atomic
+
+        with file_lock(meta_file):
+            workspace = json.load(...)
+            workspace["status"]["prd_status"] = "completed"
+            write_json_atomic(meta_file, workspace)
+        ```
+    """
+    return write_text_atomic(file_path, dumps_json(data, compact), fsync=fsync)
+
+
+@contextmanager
+def fsync_batch() -> Iterator[None]:
+    """fsync 批处理上下文管理器。
+
+    批次内的每次原子写入仍然在替换前对临时文件 fsync，只有目录 fsync 推迟到批次结束时
+    对每个写入过的目录统一执行一次。可以嵌套，只有最外层批次结束时 fsync 目录。
+
+    Example:
+        ```python
+        with fsync_batch():
+            write_json_atomic(tasks_file, tasks_data)
+            write_json_atomic(meta_file, workspace)
+        ```
+    """
+    if getattr(_batch_state, "pending", None) is not None:
+        yield
+        return
+
+    _batch_state.pending = set()
+    try:
+        yield
+    finally:
+        pending = _batch_state.pending
+        _batch_state.pending = None
+        for directory in pending:
+            _fsync_path(directory)
+        if pending:
+            logger.debug(f"批量 fsync {len(pending)} 个目录")
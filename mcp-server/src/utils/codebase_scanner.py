@@ -0,0 +1,208 @@
+"""代码库扫描工具 - 检测项目的语言、框架和目录结构。
+
+Python 3.9+ 兼容
+
+基于项目文件索引（`src.utils.file_index`）汇总，不再单独遍历项目：
+- 按扩展名统计各语言的源文件数（已排除忽略规则命中的目录和文件）
+- 根据清单文件（pyproject.toml、package.json、go.mod、Cargo.toml 等）识别语言和框架，
+  清单文件的识别结果按 (路径, 大小, mtime) 在进程内缓存
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from src.core.logger import setup_logger
+from src.utils.file_index import get_file_index
+
+logger = setup_logger(__name__)
+
+# 读取清单文件的最大字节数
+_MAX_MANIFEST_BYTES = 1024 * 1024
+
+# 清单文件 -> 语言
+MANIFEST_LANGUAGES = {
+    "pyproject.toml": "python",
+    "setup.py": "python",
+    "setup.cfg": "python",
+    "requirements.txt": "python",
+    "Pipfile": "python",
+    "package.json": "javascript",
+    "tsconfig.json": "typescript",
+    "go.mod": "go",
+    "Cargo.toml": "rust",
+    "pom.xml": "java",
+    "build.gradle": "java",
+    "build.gradle.kts": "kotlin",
+    "Package.swift": "swift",
+    "Gemfile": "ruby",
+    "composer.json": "php",
+    "pubspec.yaml": "dart",
+    "CMakeLists.txt": "cpp",
+}
+
+_PYTHON_FRAMEWORKS = ["django", "flask", "fastapi", "tornado", "aiohttp", "pyramid"]
+_PYTHON_FRAMEWORK_PATTERNS = [
+    (name, re.compile(rf"(?im)(?:^|[\s\"'\[,]){name}(?=[\s\"'<>=~!\[\];,]|$)"))
+    for name in _PYTHON_FRAMEWORKS
+]
+_JVM_FRAMEWORK_PATTERNS = [
+    ("spring-boot", re.compile(r"spring-boot")),
+    ("quarkus", re.compile(r"io\.quarkus")),
+    ("micronaut", re.compile(r"io\.micronaut")),
+]
+
+# 清单文件 -> [(框架, 内容匹配规则)]，按优先级排列（package.json 单独解析依赖）
+_FRAMEWORK_PATTERNS = {
+    "pyproject.toml": _PYTHON_FRAMEWORK_PATTERNS,
+    "setup.py": _PYTHON_FRAMEWORK_PATTERNS,
+    "setup.cfg": _PYTHON_FRAMEWORK_PATTERNS,
+    "requirements.txt": _PYTHON_FRAMEWORK_PATTERNS,
+    "Pipfile": _PYTHON_FRAMEWORK_PATTERNS,
+    "go.mod": [
+        ("gin", re.compile(r"github\.com/gin-gonic/gin")),
+        ("echo", re.compile(r"github\.com/labstack/echo")),
+        ("fiber", re.compile(r"github\.com/gofiber/fiber")),
+    ],
+    "Cargo.toml": [
+        ("actix-web", re.compile(r"(?m)^\s*actix-web\b")),
+        ("axum", re.compile(r"(?m)^\s*axum\b")),
+        ("rocket", re.compile(r"(?m)^\s*rocket\b")),
+    ],
+    "pom.xml": _JVM_FRAMEWORK_PATTERNS,
+    "build.gradle": _JVM_FRAMEWORK_PATTERNS,
+    "build.gradle.kts": _JVM_FRAMEWORK_PATTERNS,
+    "Gemfile": [
+        ("rails", re.compile(r"gem\s+['\"]rails['\"]")),
+        ("sinatra", re.compile(r"gem\s+['\"]sinatra['\"]")),
+    ],
+    "composer.json": [
+        ("laravel", re.compile(r"\"laravel/framework\"")),
+        ("symfony", re.compile(r"\"symfony/framework-bundle\"")),
+    ],
+    "pubspec.yaml": [("flutter", re.compile(r"(?m)^\s*flutter\s*:"))],
+}
+
+# package.json 依赖 -> 框架，按优先级排列（next 优先于 react）
+_NPM_FRAMEWORKS = [
+    ("next", "next.js"),
+    ("nuxt", "nuxt"),
+    ("@angular/core", "angular"),
+    ("react-native", "react-native"),
+    ("react", "react"),
+    ("vue", "vue"),
+    ("svelte", "svelte"),
+    ("@nestjs/core", "nestjs"),
+    ("express", "express"),
+    ("electron", "electron"),
+]
+
+
+@lru_cache(maxsize=256)
+def _detect_frameworks(manifest: Path, size: int, mtime: int) -> tuple[str, ...]:
+    """根据清单文件内容识别框架（size 和 mtime 只用作缓存键）。"""
+    try:
+        with open(manifest, encoding="utf-8", errors="replace") as f:
+            content = f.read(_MAX_MANIFEST_BYTES)
+    except OSError:
+        return ()
+
+    if manifest.name == "package.json":
+        try:
+            package = json.loads(content)
+        except ValueError:
+            return ()
+        if not isinstance(package, dict):
+            return ()
+        dependencies = set()
+        for key in ("dependencies", "devDependencies", "peerDependencies"):
+            section = package.get(key)
+            if isinstance(section, dict):
+                dependencies.update(section)
+        return tuple(name for dep, name in _NPM_FRAMEWORKS if dep in dependencies)
+
+    return tuple(
+        name
+        for name, pattern in _FRAMEWORK_PATTERNS.get(manifest.name, [])
+        if pattern.search(content)
+    )
+
+
+def scan_codebase(
+    project_path: Path,
+    cache_dir: Optional[Path] = None,
+    excludes: Optional[list[str]] = None,
+) -> dict:
+    """扫描代码库，检测语言、框架和目录结构。
+
+    Args:
+        project_path: 项目路径
+        cache_dir: 缓存目录（文件索引保存位置，None 表示不持久化）
+        excludes: 追加的忽略规则（.gitignore 语法，相对项目根目录）
+
+    Returns:
+        扫描结果，格式：
+        {
+            "language": 主要语言（源文件最多的语言，没有源文件时取根目录清单文件的语言）,
+            "languages": {语言: 源文件数}（按文件数降序）,
+            "framework": 主要框架（未识别到框架时为 "<语言>-standard" 或 "unknown"）,
+            "frameworks": 识别到的框架列表（根目录清单文件优先）,
+            "manifests": 清单文件相对路径列表,
+            "structure": 根目录下的非隐藏、未被忽略的目录,
+            "file_count": 源文件总数,
+            "scan_stats": 文件索引刷新统计（格式见 FileIndex.refresh()）
+        }
+    """
+    index = get_file_index(project_path, cache_dir, excludes)
+
+    languages: dict[str, int] = {}
+    manifests = []
+    for file in index.files():
+        if file["language"]:
+            languages[file["language"]] = languages.get(file["language"], 0) + 1
+        if file["path"].rsplit("/", 1)[-1] in MANIFEST_LANGUAGES:
+            manifests.append(file)
+    # 根目录的清单文件排在前面
+    manifests.sort(key=lambda file: (file["path"].count("/"), file["path"]))
+
+    frameworks: list[str] = []
+    for file in manifests:
+        detected = _detect_frameworks(
+            index.project_path / file["path"], file["size"], file["mtime"]
+        )
+        for framework in detected:
+            if framework not in frameworks:
+                frameworks.append(framework)
+
+    root_languages = [
+        MANIFEST_LANGUAGES[file["path"]]
+        for file in manifests
+        if "/" not in file["path"]
+    ]
+    # TypeScript 项目同时有 package.json 和 tsconfig.json，优先取 typescript
+    root_languages.sort(key=lambda language: language != "typescript")
+
+    languages = dict(sorted(languages.items(), key=lambda item: (-item[1], item[0])))
+    language = "unknown"
+    if languages:
+        language = next(iter(languages))
+    elif root_languages:
+        language = root_languages[0]
+    framework = "unknown"
+    if frameworks:
+        framework = frameworks[0]
+    elif root_languages:
+        framework = f"{root_languages[0]}-standard"
+
+    return {
+        "language": language,
+        "languages": languages,
+        "framework": framework,
+        "frameworks": frameworks,
+        "manifests": [file["path"] for file in manifests],
+        "structure": [name for name in index.directories() if not name.startswith(".")],
+        "file_count": sum(languages.values()),
+        "scan_stats": index.stats,
+    }
@@ -0,0 +1,123 @@
+"""内容哈希缓存 - 按内容哈希缓存可以重新计算的结果，LRU 淘汰。
+
+Python 3.9+ 兼容
+
+用于审查结果（`execute_task` 的 Review 循环和重复执行的工作流会反复审查内容没有变化的
+文件）和 LLM 响应（相同的提示词）等计算代价高、只取决于输入内容的结果：
+- 缓存键是 (命名空间, 各部分内容) 的 sha256，命名空间包含版本和参数（如审查器版本、
+  启用的规则、LLM 提供方和模型），变化时自动失效；内容相同即命中，与修改时间无关
+- 每个条目一个 JSON 文件，原子写入，多个进程同时读写时不需要加锁
+- 命中时更新条目的 mtime，超过上限时按 mtime 淘汰最久未使用的条目（LRU）
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from src.core.logger import setup_logger
+from src.utils.atomic_write import write_json_atomic
+
+logger = setup_logger(__name__)
+
+
+class ContentHashLRUCache:
+    """按内容哈希缓存的结果（LRU 淘汰）。"""
+
+    def __init__(self, cache_dir: Path, namespace: str, max_entries: int = 1024):
+        """初始化缓存。
+
+        Args:
+            cache_dir: 缓存目录（不存在时在第一次写入时创建）
+            namespace: 命名空间（版本、参数等，变化时之前的缓存不再命中）
+            max_entries: 最多保留的条目数
+        """
+        self.cache_dir = Path(cache_dir)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._written = 0
+
+    def key(self, *parts: Union[str, bytes]) -> str:
+        """计算缓存键。
+
+        Args:
+            parts: 决定结果的各部分内容，如审查时的文件名和文件内容
+                （部分规则与文件名有关，如 __init__.py 不检查未使用的导入）
+        """
+        digest = hashlib.sha256()
+        digest.update(self.namespace.encode("utf-8"))
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        """缓存条目的文件路径。"""
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """读取缓存的结果，命中时更新条目的使用时间。"""
+        entry = self._entry(key)
+        try:
+            value = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if not isinstance(value, dict):
+            self.misses += 1
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(entry)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        """保存结果（失败时只记录警告）。"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self._entry(key), value, fsync=False)
+            self._written += 1
+        except OSError as e:
+            logger.warning(f"保存缓存条目失败: {self.cache_dir}, 错误: {e}")
+
+    def evict(self) -> int:
+        """淘汰最久未使用的条目，只保留 max_entries 个。
+
+        只在本对象写入过新条目后扫描缓存目录。
+
+        Returns:
+            删除的条目数
+        """
+        if not self._written:
+            return 0
+        self._written = 0
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            ]
+        except OSError:
+            return 0
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+
+        def last_used(entry: os.DirEntry) -> int:
+            try:
+                return entry.stat().st_mtime_ns
+            except OSError:
+                return 0
+
+        removed = 0
+        for entry in sorted(entries, key=last_used)[:excess]:
+            try:
+                os.unlink(entry.path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,571 @@
+"""项目文件索引 - 持久化的项目文件列表，按目录 mtime 增量刷新。
+
+Python 3.9+ 兼容
+
+TRD 生成（代码库分析）和覆盖率估算共用同一份索引，大型项目只需完整扫描一次：
+- 索引记录每个未被忽略的文件：路径、大小、mtime、语言（按扩展名）、是否为测试文件
+- 忽略规则与 .gitignore 语法一致：默认排除 `.git`、`node_modules`、`venv` 等目录，
+  可以追加规则（CODEBASE_SCAN_EXCLUDES），各级目录的 .gitignore 也会生效；
+  被忽略的目录不会进入
+- 索引保存在 `.agent-orchestrator/cache/file-index/` 下，同一进程内按项目复用
+
+增量刷新：
+- 目录中增删文件或子目录会改变目录 mtime，只有 mtime 变化的目录才重新列出，
+  其余目录只 stat 一次目录和其中已索引的文件（更新大小和 mtime）
+- .gitignore 变化时该目录的整个子树重新列出；忽略规则变化时整个索引重建
+- mtime 距离上次刷新开始不足 _RACY_WINDOW_NS 的目录视为不可信，下次仍重新列出
+  （文件系统时间戳精度有限，刷新期间的修改可能不会改变 mtime）
+- 内容没有变化时不会重写索引文件
+
+Example:
+    ```python
+    from src.utils.file_index import get_file_index
+
+    index = get_file_index(project_path, config.cache_dir, config.codebase_scan_excludes)
+    python_tests = index.files(language="python", is_test=True)
+    ```
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from src.core.logger import setup_logger
+from src.utils.atomic_write import write_json_atomic
+
+logger = setup_logger(__name__)
+
+# 索引格式版本，格式变化时旧索引自动失效
+_INDEX_VERSION = 1
+
+# mtime 在上次刷新开始前这段时间内的目录不信任索引（纳秒）
+_RACY_WINDOW_NS = 2_000_000_000
+
+# 同一进程内缓存的索引数（按项目）
+_MAX_CACHED_INDEXES = 8
+
+# 默认忽略规则（.gitignore 语法）
+DEFAULT_EXCLUDES = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".agent-orchestrator/",
+    "node_modules/",
+    "bower_components/",
+    "venv/",
+    ".venv/",
+    "__pycache__/",
+    ".tox/",
+    ".nox/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    "*.egg-info/",
+    "build/",
+    "dist/",
+    "target/",
+    "htmlcov/",
+    ".idea/",
+    ".vscode/",
+    ".gradle/",
+    ".next/",
+    ".nuxt/",
+    "Pods/",
+    "DerivedData/",
+]
+
+# 扩展名 -> 语言
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".pyi": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".kts": "kotlin",
+    ".scala": "scala",
+    ".swift": "swift",
+    ".m": "objective-c",
+    ".mm": "objective-c",
+    ".rb": "ruby",
+    ".php": "php",
+    ".cs": "csharp",
+    ".c": "c",
+    ".h": "c",
+    ".cc": "cpp",
+    ".cpp": "cpp",
+    ".cxx": "cpp",
+    ".hpp": "cpp",
+    ".dart": "dart",
+    ".lua": "lua",
+    ".sh": "shell",
+    ".vue": "vue",
+    ".svelte": "svelte",
+}
+
+
+def _translate_pattern(pattern: str) -> str:
+    """把 .gitignore 通配符转换为正则表达式。"""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                parts.append("(?:.*/)?")  # 零或多级目录
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                parts.append(".*")
+                i += 2
+                continue
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+class _IgnoreRule:
+    """一条 .gitignore 规则。"""
+
+    __slots__ = ("base", "regex", "negate", "dir_only", "anchored")
+
+    def __init__(
+        self,
+        base: str,
+        regex: "re.Pattern",
+        negate: bool,
+        dir_only: bool,
+        anchored: bool,
+    ) -> None:
+        self.base = base
+        self.regex = regex
+        self.negate = negate
+        self.dir_only = dir_only
+        self.anchored = anchored
+
+
+def parse_ignore_rules(lines: list[str], base: str = "") -> list[_IgnoreRule]:
+    """解析 .gitignore 语法的规则。
+
+    Args:
+        lines: 规则行
+        base: 规则所在目录（相对项目根目录的 POSIX 路径，根目录为 ""）
+
+    Returns:
+        规则列表（空行和注释会被跳过）
+    """
+    rules = []
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+        line = line.rstrip()
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]  # \# 或 \! 开头的字面量
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # 只有末尾斜杠的规则匹配任意层级的同名文件，其余规则相对所在目录
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        regex = re.compile(_translate_pattern(line))
+        rules.append(_IgnoreRule(base, regex, negate, dir_only, anchored))
+    return rules
+
+
+def is_ignored(rules: list[_IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """判断路径是否被忽略（最后一条匹配的规则生效）。
+
+    Args:
+        rules: 规则列表（外层目录的规则在前）
+        rel_path: 相对项目根目录的 POSIX 路径
+        is_dir: 是否为目录
+    """
+    ignored = False
+    name = rel_path.rsplit("/", 1)[-1]
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.anchored:
+            if rule.base:
+                if not rel_path.startswith(rule.base + "/"):
+                    continue
+                target = rel_path[len(rule.base) + 1 :]
+            else:
+                target = rel_path
+        else:
+            target = name
+        if rule.regex.fullmatch(target):
+            ignored = not rule.negate
+    return ignored
+
+
+def _read_gitignore(path: Path, base: str) -> list[_IgnoreRule]:
+    """读取目录下的 .gitignore（不存在或无法读取时返回空列表）。"""
+    try:
+        text = (path / ".gitignore").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    return parse_ignore_rules(text.splitlines(), base)
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    """文件 mtime（纳秒），不存在时返回 None。"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _join(rel: str, name: str) -> str:
+    """拼接相对路径（根目录为 ""）。"""
+    return f"{rel}/{name}" if rel else name
+
+
+# 测试目录名和测试文件名规则
+_TEST_DIRS = {"test", "tests", "testing", "__tests__", "spec", "specs"}
+_TEST_FILE_PATTERN = re.compile(
+    r"^(?:test_.*|tests?|conftest|.*_tests?|.*[.-](?:test|spec)|.*Tests?|Test[A-Z].*)"
+    r"\.[^.]+$"
+)
+
+
+def is_test_file(rel_path: str) -> bool:
+    """根据路径判断是否为测试文件（位于测试目录中，或文件名符合常见测试命名）。
+
+    Args:
+        rel_path: 相对项目根目录的 POSIX 路径
+    """
+    parts = rel_path.split("/")
+    if any(part in _TEST_DIRS for part in parts[:-1]):
+        return True
+    return bool(_TEST_FILE_PATTERN.match(parts[-1]))
+
+
+def _list_directory(path: Path, rel: str, rules: list[_IgnoreRule]) -> dict:
+    """列出一个目录，生成索引记录（不含目录 mtime）。
+
+    Returns:
+        {"dirs": [子目录名], "files": {文件名: [大小, mtime, 语言, 是否测试文件]}}
+    """
+    dirs: list[str] = []
+    files: dict[str, list] = {}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    child = _join(rel, entry.name)
+                    if is_ignored(rules, child, is_dir):
+                        continue
+                    if is_dir:
+                        dirs.append(entry.name)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files[entry.name] = [
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    LANGUAGE_EXTENSIONS.get(os.path.splitext(entry.name)[1]),
+                    is_test_file(child),
+                ]
+    except OSError as e:
+        logger.debug(f"无法读取目录，跳过: {path}, 错误: {e}")
+    dirs.sort()
+    return {"dirs": dirs, "files": dict(sorted(files.items()))}
+
+
+def _restat_files(path: Path, entry: dict) -> Optional[bool]:
+    """更新未重新列出的目录中已索引文件的大小和 mtime。
+
+    Returns:
+        是否有文件变化；有文件已不存在时返回 None（目录需要重新列出）
+    """
+    changed = False
+    for name, record in entry["files"].items():
+        try:
+            stat = os.stat(path / name)
+        except OSError:
+            return None
+        if record[0] != stat.st_size or record[1] != stat.st_mtime_ns:
+            record[0] = stat.st_size
+            record[1] = stat.st_mtime_ns
+            changed = True
+    return changed
+
+
+class FileIndex:
+    """项目文件索引（线程安全）。"""
+
+    def __init__(
+        self,
+        project_path: Path,
+        index_file: Optional[Path] = None,
+        excludes: Optional[list[str]] = None,
+    ) -> None:
+        """初始化文件索引（不刷新，需要调用 refresh()）。
+
+        Args:
+            project_path: 项目路径
+            index_file: 索引文件路径（None 表示不持久化）
+            excludes: 追加的忽略规则（.gitignore 语法，相对项目根目录）
+        """
+        self.project_path = Path(project_path).resolve()
+        self.index_file = index_file
+        self.excludes = DEFAULT_EXCLUDES + list(excludes or [])
+        self._lock = threading.Lock()
+        # {目录相对路径: {"mtime", "gitignore", "dirs", "files"}}
+        self._dirs: dict[str, dict] = {}
+        self._scanned_at = 0
+        self._stats = {"directories": 0, "rescanned": 0, "files": 0}
+        if index_file is not None:
+            self._load()
+
+    def _load(self) -> None:
+        """读取索引文件，格式、项目或忽略规则不匹配时忽略。"""
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != _INDEX_VERSION
+            or data.get("project_path") != str(self.project_path)
+            or data.get("excludes") != self.excludes
+        ):
+            return
+        self._dirs = data.get("dirs", {})
+        self._scanned_at = data.get("scanned_at", 0)
+
+    def _save(self) -> None:
+        """保存索引文件（失败时只记录警告）。"""
+        try:
+            write_json_atomic(
+                self.index_file,
+                {
+                    "version": _INDEX_VERSION,
+                    "project_path": str(self.project_path),
+                    "excludes": self.excludes,
+                    "scanned_at": self._scanned_at,
+                    "dirs": self._dirs,
+                },
+                fsync=False,
+            )
+        except OSError as e:
+            logger.warning(f"保存文件索引失败: {self.index_file}, 错误: {e}")
+
+    def refresh(self) -> dict:
+        """按目录 mtime 增量刷新索引。
+
+        Returns:
+            刷新统计，格式：
+            {
+                "directories": 索引中的目录数,
+                "rescanned": 重新列出的目录数,
+                "files": 索引中的文件数
+            }
+        """
+        with self._lock:
+            trusted_before = self._scanned_at - _RACY_WINDOW_NS
+            scanned_at = time.time_ns()
+            old_dirs = self._dirs
+            dirs: dict[str, dict] = {}
+            rescanned = 0
+            changed = False
+
+            # (相对路径, 外层规则, 是否可以使用已有索引)
+            stack = [("", parse_ignore_rules(self.excludes), True)]
+            while stack:
+                rel, rules, trusted = stack.pop()
+                path = self.project_path / rel if rel else self.project_path
+                mtime = _mtime_ns(path)
+                if mtime is None:
+                    continue
+                gitignore_mtime = _mtime_ns(path / ".gitignore")
+                if gitignore_mtime is not None:
+                    rules = rules + _read_gitignore(path, rel)
+
+                entry = old_dirs.get(rel) if trusted else None
+                if entry is not None and (
+                    entry.get("gitignore") != gitignore_mtime
+                    or (gitignore_mtime or 0) >= trusted_before
+                ):
+                    # .gitignore 变化会影响整个子树的忽略结果
+                    entry = None
+                    trusted = False
+                if entry is not None and (
+                    entry.get("mtime") != mtime or mtime >= trusted_before
+                ):
+                    entry = None
+                if entry is not None:
+                    files_changed = _restat_files(path, entry)
+                    if files_changed is None:
+                        entry = None
+                    elif files_changed:
+                        changed = True
+                if entry is None:
+                    entry = _list_directory(path, rel, rules)
+                    entry["mtime"] = mtime
+                    entry["gitignore"] = gitignore_mtime
+                    rescanned += 1
+                    changed = True
+                dirs[rel] = entry
+
+                for name in reversed(entry["dirs"]):
+                    stack.append((_join(rel, name), rules, trusted))
+
+            if dirs.keys() != old_dirs.keys():
+                changed = True
+            self._dirs = dirs
+            self._scanned_at = scanned_at
+            self._stats = {
+                "directories": len(dirs),
+                "rescanned": rescanned,
+                "files": sum(len(entry["files"]) for entry in dirs.values()),
+            }
+            if changed and self.index_file is not None:
+                self._save()
+
+            logger.debug(
+                f"文件索引已刷新: {self.project_path}, 目录 {len(dirs)} 个"
+                f"（重新列出 {rescanned} 个）, 文件 {self._stats['files']} 个"
+            )
+            return dict(self._stats)
+
+    @property
+    def stats(self) -> dict:
+        """最近一次刷新的统计（格式见 refresh()）。"""
+        with self._lock:
+            return dict(self._stats)
+
+    def files(
+        self, language: Optional[str] = None, is_test: Optional[bool] = None
+    ) -> list[dict]:
+        """查询索引中的文件（按路径排序）。
+
+        Args:
+            language: 只返回该语言的文件（None 表示不限）
+            is_test: 只返回测试文件（True）或非测试文件（False），None 表示不限
+
+        Returns:
+            文件列表，每项格式：
+            {
+                "path": 相对项目根目录的 POSIX 路径,
+                "size": 大小（字节）,
+                "mtime": mtime（纳秒）,
+                "language": 语言（无法识别时为 None）,
+                "is_test": 是否为测试文件
+            }
+        """
+        with self._lock:
+            result = []
+            for rel in sorted(self._dirs):
+                for name, record in self._dirs[rel]["files"].items():
+                    size, mtime, file_language, file_is_test = record
+                    if language is not None and file_language != language:
+                        continue
+                    if is_test is not None and file_is_test != is_test:
+                        continue
+                    result.append(
+                        {
+                            "path": _join(rel, name),
+                            "size": size,
+                            "mtime": mtime,
+                            "language": file_language,
+                            "is_test": file_is_test,
+                        }
+                    )
+            return result
+
+    def directories(self, rel: str = "") -> list[str]:
+        """查询目录下未被忽略的子目录名。
+
+        Args:
+            rel: 目录相对项目根目录的 POSIX 路径（根目录为 ""）
+        """
+        with self._lock:
+            entry = self._dirs.get(rel)
+            return list(entry["dirs"]) if entry else []
+
+
+# 同一进程内的索引：{(项目路径, 索引文件, 忽略规则): FileIndex}
+_indexes: "OrderedDict[tuple, FileIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _index_file(cache_dir: Path, project_path: Path) -> Path:
+    """项目对应的索引文件。"""
+    digest = hashlib.sha256(str(project_path).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / "file-index" / f"{digest}.json"
+
+
+def get_file_index(
+    project_path: Path,
+    cache_dir: Optional[Path] = None,
+    excludes: Optional[list[str]] = None,
+) -> FileIndex:
+    """获取项目的文件索引（已刷新）。
+
+    同一进程内同一项目复用同一个索引对象，每次获取时增量刷新。
+
+    Args:
+        project_path: 项目路径
+        cache_dir: 缓存目录（None 表示不持久化，也不在进程内复用）
+        excludes: 追加的忽略规则（.gitignore 语法，相对项目根目录）
+
+    Returns:
+        刷新后的文件索引
+    """
+    project_path = Path(project_path).resolve()
+    if cache_dir is None:
+        index = FileIndex(project_path, excludes=excludes)
+    else:
+        index_file = _index_file(Path(cache_dir), project_path)
+        key = (str(project_path), str(index_file), tuple(excludes or ()))
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = FileIndex(project_path, index_file, excludes)
+            _indexes.move_to_end(key)
+            while len(_indexes) > _MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+    index.refresh()
+    return index
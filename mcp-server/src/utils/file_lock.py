@@ -1,10 +1,28 @@
 """文件锁工具 - 支持多进程并发安全。
 
 Python 3.9+ 兼容
+
+锁被占用时使用带随机抖动的指数退避重试：等待间隔从 1 毫秒开始翻倍，
+上限为 retry_interval，并且不会超过剩余的超时时间。短暂的锁竞争
+（通常只是一次原子写入）只增加几毫秒延迟，长时间占用的锁也不会
+让等待者频繁唤醒。锁文件只打开一次，重试时复用同一个文件描述符。
+
+Unix 上锁文件（`<文件>.lock`）释放后不会删除：如果持有者删除锁文件，
+正在等待的进程会锁住已删除的旧文件，而第三个进程又创建新锁文件并加锁，
+两个写入者就会同时进入临界区。锁文件常驻后所有进程始终锁同一个 inode。
+
+锁在同一线程内可重入（按锁文件路径记录当前线程持有的锁），嵌套调用
+（例如持有写锁时再读取同一文件）不会等待自己释放直到超时。
+
+锁竞争统计（等待时间、重试次数、超时次数）可以通过 get_lock_stats()
+读取，用于调整超时和退避参数。
 """
 
+import contextlib
 import os
+import random
 import sys
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
@@ -13,6 +31,9 @@ from src.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# 指数退避的初始等待间隔（秒）
+_INITIAL_BACKOFF = 0.001
+
 
 class FileLockError(Exception):
     """文件锁相关错误。"""
@@ -20,191 +41,320 @@ class FileLockError(Exception):
     pass
 
 
-@contextmanager
-def file_lock(file_path: Path, timeout: float = 30.0, retry_interval: float = 0.1):
-    """文件锁上下文管理器。
+class _LockStats:
+    """锁竞争统计（线程安全，按锁类型分别累计）。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def record(self, kind: str, wait_time: float, retries: int, timed_out: bool):
+        """记录一次加锁尝试。"""
+        with self._lock:
+            stats = self._stats.setdefault(
+                kind,
+                {
+                    "acquisitions": 0,
+                    "contended": 0,
+                    "timeouts": 0,
+                    "retries": 0,
+                    "total_wait": 0.0,
+                    "max_wait": 0.0,
+                },
+            )
+            if timed_out:
+                stats["timeouts"] += 1
+            else:
+                stats["acquisitions"] += 1
+                if retries:
+                    stats["contended"] += 1
+            stats["retries"] += retries
+            stats["total_wait"] += wait_time
+            stats["max_wait"] = max(stats["max_wait"], wait_time)
+
+    def snapshot(self) -> dict[str, dict]:
+        """返回统计副本。"""
+        with self._lock:
+            return {kind: dict(stats) for kind, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """清空统计。"""
+        with self._lock:
+            self._stats.clear()
+
+
+_lock_stats = _LockStats()
+
+
+def get_lock_stats() -> dict[str, dict]:
+    """获取当前进程的锁竞争统计。
+
+    Returns:
+        按锁类型（"exclusive" 排他锁、"shared" 共享锁）分组的统计，格式：
+        {
+            "exclusive": {
+                "acquisitions": 成功获取次数,
+                "contended": 需要等待才获取到的次数,
+                "timeouts": 超时次数,
+                "retries": 重试总次数,
+                "total_wait": 总等待时间（秒）,
+                "max_wait": 最长一次等待时间（秒）
+            },
+            ...
+        }
+    """
+    return _lock_stats.snapshot()
 
-    支持跨平台文件锁：
-    - Unix/Linux/macOS: 使用 fcntl
-    - Windows: 使用 msvcrt
 
-    Args:
-        file_path: 要锁定的文件路径
-        timeout: 获取锁的超时时间（秒）
-        retry_interval: 重试间隔（秒）
+def reset_lock_stats() -> None:
+    """清空锁竞争统计。"""
+    _lock_stats.reset()
 
-    Yields:
-        None
 
-    Raises:
-        FileLockError: 当无法在超时时间内获取锁时
+def _backoff_delay(attempt: int, max_interval: float) -> float:
+    """计算第 attempt 次重试前的等待时间（指数退避 + 随机抖动）。
 
-    Example:
-        ```python
-        from src.utils.file_lock import file_lock
+    抖动取间隔的后一半，既避免多个等待者同时醒来，又保证间隔按指数增长。
+    """
+    interval = min(max_interval, _INITIAL_BACKOFF * (2**attempt))
+    return interval / 2 + random.uniform(0, interval / 2)
 
-        with file_lock(Path("workspace.json")):
-            # 安全地读写文件
-            workspace = json.load(...)
-            workspace["status"] = "completed"
-            json.dump(workspace, ...)
-        ```
+
+def _acquire(file_path: Path, exclusive: bool, timeout: float, retry_interval: float):
+    """获取锁，锁被占用时指数退避重试，直到超时。
+
+    Returns:
+        持有锁的文件描述符
+
+    Raises:
+        FileLockError: 当无法在超时时间内获取锁时
     """
     lock_file = file_path.with_suffix(file_path.suffix + ".lock")
     lock_file.parent.mkdir(parents=True, exist_ok=True)
 
+    kind = "exclusive" if exclusive else "shared"
     lock_fd = None
-    start_time = time.time()
+    retries = 0
+    start_time = time.monotonic()
+    deadline = start_time + timeout
 
-    try:
-        # 尝试获取锁
-        while True:
+    while True:
+        try:
+            if sys.platform == "win32":
+                # Windows 使用 msvcrt
+                try:
+                    import msvcrt  # noqa: F401
+                except ImportError:
+                    raise FileLockError("Windows 平台需要 msvcrt 模块") from None
+                # Windows 文件锁是进程级别的，这里使用独占创建模式（读锁降级为
+                # 排他锁）。如果文件已存在，os.O_EXCL 会失败
+                lock_fd = os.open(str(lock_file), os.O_CREAT | os.O_EXCL | os.O_RDWR)
+                break
+
+            # Unix/Linux/macOS 使用 fcntl
             try:
-                if sys.platform == "win32":
-                    # Windows 使用 msvcrt
-                    try:
-                        import msvcrt
-                    except ImportError:
-                        raise FileLockError("Windows 平台需要 msvcrt 模块") from None
-                    lock_fd = os.open(
-                        str(lock_file), os.O_CREAT | os.O_EXCL | os.O_RDWR
-                    )
-                    # Windows 文件锁是进程级别的，这里使用独占创建模式
-                    # 如果文件已存在，os.O_EXCL 会失败
-                    break
-                else:
-                    # Unix/Linux/macOS 使用 fcntl
-                    try:
-                        import fcntl
-                    except ImportError:
-                        raise FileLockError("Unix 平台需要 fcntl 模块") from None
-                    lock_fd = os.open(str(lock_file), os.O_CREAT | os.O_RDWR)
-                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)  # 非阻塞排他锁
-                    break
-            except OSError as e:
-                # 锁被占用，检查超时
-                if time.time() - start_time >= timeout:
+                import fcntl
+            except ImportError:
+                raise FileLockError("Unix 平台需要 fcntl 模块") from None
+            if lock_fd is None:
+                # 锁文件只打开一次，重试时复用
+                lock_fd = os.open(str(lock_file), os.O_CREAT | os.O_RDWR)
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            fcntl.flock(lock_fd, operation | fcntl.LOCK_NB)  # 非阻塞加锁
+            if _is_current_lock_file(lock_fd, lock_file):
+                break
+            # 锁文件在等待期间被删除（例如手动清理），锁住的是旧文件，重新打开
+            _release(lock_fd)
+            lock_fd = None
+            continue
+        except OSError as e:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if lock_fd is not None:
+                    with contextlib.suppress(OSError):
+                        os.close(lock_fd)
+                _lock_stats.record(
+                    kind, time.monotonic() - start_time, retries, timed_out=True
+                )
+                if exclusive:
                     raise FileLockError(
                         f"无法在 {timeout} 秒内获取文件锁: {file_path}. "
                         f"可能被其他进程占用。"
                     ) from e
+                raise FileLockError(
+                    f"无法在 {timeout} 秒内获取读锁: {file_path}"
+                ) from e
+
+            # 等待后重试
+            time.sleep(min(remaining, _backoff_delay(retries, retry_interval)))
+            retries += 1
+
+    wait_time = time.monotonic() - start_time
+    _lock_stats.record(kind, wait_time, retries, timed_out=False)
+    if retries:
+        logger.debug(
+            f"获取{'文件锁' if exclusive else '读锁'}等待 {wait_time * 1000:.1f} ms"
+            f"（重试 {retries} 次）: {file_path}"
+        )
+    return lock_fd
+
+
+def _is_current_lock_file(lock_fd: int, lock_file: Path) -> bool:
+    """检查文件描述符是否仍然指向路径上的锁文件（未被删除或替换）。"""
+    try:
+        path_stat = lock_file.stat()
+    except FileNotFoundError:
+        return False
+    fd_stat = os.fstat(lock_fd)
+    return (fd_stat.st_dev, fd_stat.st_ino) == (path_stat.st_dev, path_stat.st_ino)
 
-                # 等待后重试
-                time.sleep(retry_interval)
-                if lock_fd is not None:
-                    try:
-                        os.close(lock_fd)
-                    except OSError:
-                        pass
-                    lock_fd = None
 
-        logger.debug(f"获取文件锁: {file_path}")
+def _release(lock_fd) -> None:
+    """释放锁并关闭锁文件描述符。
+
+    Raises:
+        OSError: 解锁或关闭文件描述符失败时
+    """
+    if sys.platform != "win32":
+        try:
+            import fcntl
+
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        except ImportError:
+            pass  # 如果 fcntl 不可用，跳过解锁
+    os.close(lock_fd)
+
+
+class _HeldLock:
+    """当前线程持有的锁。"""
+
+    __slots__ = ("fd", "exclusive", "depth")
+
+    def __init__(self, fd: int, exclusive: bool) -> None:
+        self.fd = fd
+        self.exclusive = exclusive
+        self.depth = 1
+
+
+# 每个线程持有的锁表：{锁文件绝对路径: _HeldLock}
+_held_locks = threading.local()
+
+
+def _held_table() -> dict[str, _HeldLock]:
+    """获取当前线程的锁表。"""
+    table = getattr(_held_locks, "table", None)
+    if table is None:
+        table = _held_locks.table = {}
+    return table
+
+
+@contextmanager
+def _lock(file_path: Path, exclusive: bool, timeout: float, retry_interval: float):
+    """加锁上下文管理器（file_lock 和 read_lock 的共同实现）。
+
+    同一线程对同一路径重复加锁时直接复用已持有的锁（持有写锁时可以再加
+    读锁或写锁），只有最外层退出时才真正释放。
+    """
+    name = "文件锁" if exclusive else "读锁"
+    lock_file = file_path.with_suffix(file_path.suffix + ".lock")
+    key = os.path.abspath(lock_file)
+    table = _held_table()
+
+    held = table.get(key)
+    if held is not None:
+        if exclusive and not held.exclusive:
+            # 读锁升级为写锁不是原子操作，升级期间其他进程可能修改文件
+            raise FileLockError(f"持有读锁时不能再获取文件锁: {file_path}")
+        held.depth += 1
+        try:
+            yield
+        finally:
+            held.depth -= 1
+        return
+
+    lock_fd = None
+    try:
+        # 尝试获取锁
+        lock_fd = _acquire(file_path, exclusive, timeout, retry_interval)
+        table[key] = _HeldLock(lock_fd, exclusive)
+        logger.debug(f"获取{name}: {file_path}")
 
         # 执行受保护的操作
         yield
 
     finally:
-        # 释放锁
+        table.pop(key, None)
+
+        # 释放锁（Unix 锁文件保留，所有进程始终锁同一个 inode）
         if lock_fd is not None:
             try:
-                if sys.platform != "win32":
-                    try:
-                        import fcntl
-
-                        fcntl.flock(lock_fd, fcntl.LOCK_UN)
-                    except ImportError:
-                        pass  # 如果 fcntl 不可用，跳过解锁
-                os.close(lock_fd)
+                _release(lock_fd)
             except OSError as e:
-                logger.warning(f"释放文件锁时出错: {e}")
+                logger.warning(f"释放{name}时出错: {e}")
 
-        # 删除锁文件（如果存在）
-        try:
-            if lock_file.exists():
-                lock_file.unlink()
-        except OSError as e:
-            logger.warning(f"删除锁文件时出错: {e}")
+            # Windows 以锁文件是否存在作为锁，释放时必须删除
+            if sys.platform == "win32":
+                try:
+                    lock_file.unlink()
+                except OSError as e:
+                    logger.warning(f"删除锁文件时出错: {e}")
 
-        logger.debug(f"释放文件锁: {file_path}")
+        logger.debug(f"释放{name}: {file_path}")
 
 
-@contextmanager
-def read_lock(file_path: Path, timeout: float = 30.0, retry_interval: float = 0.1):
-    """读锁上下文管理器（共享锁）。
+def file_lock(file_path: Path, timeout: float = 30.0, retry_interval: float = 0.1):
+    """文件锁上下文管理器。
 
-    允许多个进程同时读取，但阻止写入。
+    支持跨平台文件锁：
+    - Unix/Linux/macOS: 使用 fcntl
+    - Windows: 使用 msvcrt
+
+    同一线程内可以重入：已持有某路径的文件锁时，再次对该路径获取文件锁
+    或读锁会立即成功，不会等待自己释放。
 
     Args:
         file_path: 要锁定的文件路径
         timeout: 获取锁的超时时间（秒）
-        retry_interval: 重试间隔（秒）
+        retry_interval: 最大重试间隔（秒），指数退避的间隔不超过该值
 
     Yields:
         None
 
     Raises:
-        FileLockError: 当无法在超时时间内获取锁时
+        FileLockError: 当无法在超时时间内获取锁时，或当前线程持有该路径的
+            读锁时
 
-    Note:
-        Windows 平台不支持共享锁，会降级为排他锁。
+    Example:
+        ```python
+        from src.utils.file_lock import file_lock
+
+        with file_lock(Path("workspace.json")):
+            # 安全地读写文件
+            workspace = json.load(...)
+            workspace["status"] = "completed"
+            json.dump(workspace, ...)
+        ```
     """
-    lock_file = file_path.with_suffix(file_path.suffix + ".lock")
-    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    return _lock(file_path, True, timeout, retry_interval)
 
-    lock_fd = None
-    start_time = time.time()
 
-    try:
-        while True:
-            try:
-                if sys.platform == "win32":
-                    # Windows 不支持共享锁，使用排他锁
-                    try:
-                        import msvcrt
-                    except ImportError:
-                        raise FileLockError("Windows 平台需要 msvcrt 模块") from None
-                    lock_fd = os.open(
-                        str(lock_file), os.O_CREAT | os.O_EXCL | os.O_RDWR
-                    )
-                    break
-                else:
-                    # Unix/Linux/macOS 使用 fcntl 共享锁
-                    try:
-                        import fcntl
-                    except ImportError:
-                        raise FileLockError("Unix 平台需要 fcntl 模块") from None
-                    lock_fd = os.open(str(lock_file), os.O_CREAT | os.O_RDWR)
-                    fcntl.flock(lock_fd, fcntl.LOCK_SH | fcntl.LOCK_NB)  # 非阻塞共享锁
-                    break
-            except OSError as e:
-                if time.time() - start_time >= timeout:
-                    raise FileLockError(
-                        f"无法在 {timeout} 秒内获取读锁: {file_path}"
-                    ) from e
+def read_lock(file_path: Path, timeout: float = 30.0, retry_interval: float = 0.1):
+    """读锁上下文管理器（共享锁）。
 
-                time.sleep(retry_interval)
-                if lock_fd is not None:
-                    try:
-                        os.close(lock_fd)
-                    except OSError:
-                        pass
-                    lock_fd = None
+    允许多个进程同时读取，但阻止写入。同一线程内可以重入。
 
-        logger.debug(f"获取读锁: {file_path}")
-        yield
+    Args:
+        file_path: 要锁定的文件路径
+        timeout: 获取锁的超时时间（秒）
+        retry_interval: 最大重试间隔（秒），指数退避的间隔不超过该值
 
-    finally:
-        if lock_fd is not None:
-            try:
-                if sys.platform != "win32":
-                    try:
-                        import fcntl
-
-                        fcntl.flock(lock_fd, fcntl.LOCK_UN)
-                    except ImportError:
-                        pass  # 如果 fcntl 不可用，跳过解锁
-                os.close(lock_fd)
-            except OSError as e:
-                logger.warning(f"释放读锁时出错: {e}")
+    Yields:
+        None
+
+    Raises:
+        FileLockError: 当无法在超时时间内获取锁时
 
-        logger.debug(f"释放读锁: {file_path}")
+    Note:
+        Windows 平台不支持共享锁，会降级为排他锁。
+    """
+    return _lock(file_path, False, timeout, retry_interval)
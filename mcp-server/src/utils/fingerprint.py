@@ -0,0 +1,51 @@
+"""输入指纹 - 输入未变化时跳过重新生成文档。
+
+Python 3.9+ 兼容
+
+`generate_prd` / `generate_trd` 把生成时的输入指纹保存在工作区元数据的
+`fingerprints` 字段中（如 `{"prd": "...", "trd": "..."}`）。再次生成时如果指纹相同、
+文档仍然存在且阶段没有被标记为需要重新生成（`modify_prd` / `modify_trd`），直接返回已有文档。
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+# 需要重新生成的阶段状态（由 modify_prd / modify_trd 设置）
+NEEDS_REGENERATION = "needs_regeneration"
+
+
+def compute_fingerprint(inputs: dict) -> str:
+    """计算输入指纹。
+
+    Args:
+        inputs: 影响生成结果的输入（可 JSON 序列化）
+
+    Returns:
+        sha256 十六进制字符串
+    """
+    payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_artifact_current(
+    workspace: dict, stage: str, fingerprint: str, artifact_path: Path
+) -> bool:
+    """判断阶段文档是否可以直接复用。
+
+    Args:
+        workspace: 工作区信息
+        stage: 阶段名（"prd" / "trd"，对应 `{stage}_status`、`{stage}_path`）
+        fingerprint: 本次输入的指纹
+        artifact_path: 文档路径
+
+    Returns:
+        指纹相同、文档存在且阶段没有被标记为需要重新生成时返回 True
+    """
+    if workspace.get("fingerprints", {}).get(stage) != fingerprint:
+        return False
+    if workspace.get("status", {}).get(f"{stage}_status") == NEEDS_REGENERATION:
+        return False
+    if workspace.get("files", {}).get(f"{stage}_path") != str(artifact_path):
+        return False
+    return artifact_path.is_file()
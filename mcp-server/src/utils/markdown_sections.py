@@ -0,0 +1,109 @@
+"""Markdown 章节解析 - 一次遍历构建标题树。
+
+Python 3.9+ 兼容
+
+用于从 TRD 等 Markdown 文档中按章节提取内容：
+- 逐行扫描一次，用栈维护当前标题路径，时间复杂度与文档行数成线性关系
+- 代码块（``` 或 ~~~）中的 `#` 行不作为标题
+- 章节 ID 由标题路径（和同名章节的序号）计算，文档其他部分变化时保持不变
+"""
+
+import hashlib
+import re
+from collections.abc import Iterable
+from typing import Optional
+
+# Markdown 标题（`## 标题 ##` 末尾的 # 会被去掉）
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)(?:\s+#+)?\s*$")
+
+# 代码块起止行
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+# 每个章节保留的摘要行数
+SUMMARY_LINES = 3
+
+
+def _section_id(path: tuple[str, ...], occurrence: int) -> str:
+    """根据标题路径计算稳定的章节 ID。"""
+    key = "\x1f".join(path) + f"\x1e{occurrence}"
+    return "sec-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def parse_sections(lines: Iterable[str]) -> list[dict]:
+    """解析 Markdown 标题树。
+
+    Args:
+        lines: 文档行（如 `text.splitlines()`）
+
+    Returns:
+        按文档顺序排列的章节列表，每个章节格式：
+        {
+            "id": 稳定的章节 ID,
+            "level": 标题级别（1-6）,
+            "title": 标题,
+            "line": 标题所在行号（从 1 开始）,
+            "parent_id": 上级章节 ID（顶级章节为 None）,
+            "children": 直接下级章节 ID 列表,
+            "summary": 正文（代码块之外）前 SUMMARY_LINES 个非空行,
+            "size": 章节自身正文的字符数（不含下级章节）,
+            "total_size": 章节及全部下级章节的字符数
+        }
+    """
+    sections: list[dict] = []
+    stack: list[dict] = []
+    occurrences: dict[tuple[str, ...], int] = {}
+    current: Optional[dict] = None
+    in_fence = False
+
+    def close_until(level: int) -> None:
+        # 弹出级别不高于 level 的章节，把大小累加到上级
+        while stack and stack[-1]["level"] >= level:
+            closed = stack.pop()
+            if stack:
+                stack[-1]["total_size"] += closed["total_size"]
+
+    for number, raw_line in enumerate(lines, 1):
+        line = raw_line.rstrip()
+        size = len(line) + 1
+
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING_PATTERN.match(line)
+            if match:
+                level = len(match.group(1))
+                title = match.group(2).strip()
+                close_until(level)
+                parent = stack[-1] if stack else None
+                path = tuple(section["title"] for section in stack) + (title,)
+                occurrence = occurrences.get(path, 0)
+                occurrences[path] = occurrence + 1
+                current = {
+                    "id": _section_id(path, occurrence),
+                    "level": level,
+                    "title": title,
+                    "line": number,
+                    "parent_id": parent["id"] if parent else None,
+                    "children": [],
+                    "summary": [],
+                    "size": 0,
+                    "total_size": size,
+                }
+                if parent is not None:
+                    parent["children"].append(current["id"])
+                sections.append(current)
+                stack.append(current)
+                continue
+            if (
+                current is not None
+                and line.strip()
+                and len(current["summary"]) < SUMMARY_LINES
+            ):
+                current["summary"].append(line.strip())
+
+        if current is not None:
+            current["size"] += size
+            current["total_size"] += size
+
+    close_until(1)
+    return sections
@@ -0,0 +1,137 @@
+"""进度报告工具 - 长时间运行的工具向调用方报告执行进度。
+
+Python 3.9+ 兼容
+
+工具函数只调用 `report_progress()`，不依赖 MCP：
+- MCP Server 在执行工具时通过 `progress_reporter()` 设置回调（客户端请求了进度通知时
+  转发为 MCP progress notification），未设置回调时 `report_progress()` 什么也不做
+- 工具内部调用其他长时间运行的工具时，用 `progress_scope()` 把子工具的进度映射到
+  当前进度的一个区间，保证调用方看到的进度单调递增
+
+回调保存在 contextvars 中，在线程池中执行的子任务需要复制上下文
+（`contextvars.copy_context().run`）才能继承回调。
+
+Example:
+    ```python
+    from src.utils.progress import progress_scope, report_progress
+
+    report_progress(4, 8, "步骤5: 任务执行")
+    with progress_scope(4, 8):
+        # 子工具报告的 3/10 会被转换为 4.3/8
+        report_progress(3, 10, "任务 task-003 完成")
+    ```
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from src.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# 进度回调：(进度, 总量, 消息)
+ProgressCallback = Callable[[float, Optional[float], str], None]
+
+
+class _ProgressTarget:
+    """当前上下文的进度目标：回调 + 把本层进度映射到最外层进度的线性变换。"""
+
+    __slots__ = ("callback", "offset", "span", "total")
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        offset: float = 0.0,
+        span: Optional[float] = None,
+        total: Optional[float] = None,
+    ) -> None:
+        """初始化进度目标。
+
+        Args:
+            callback: 进度回调
+            offset: 本层进度 0 对应的最外层进度
+            span: 本层进度从 0 到 total 对应的最外层进度跨度，None 表示最外层（原样转发）
+            total: 最外层总量
+        """
+        self.callback = callback
+        self.offset = offset
+        self.span = span
+        self.total = total
+
+
+_current_target: ContextVar[Optional[_ProgressTarget]] = ContextVar(
+    "progress_target", default=None
+)
+
+
+@contextmanager
+def progress_reporter(callback: Optional[ProgressCallback]) -> Iterator[None]:
+    """设置当前上下文的进度回调。
+
+    Args:
+        callback: 进度回调，为 None 时关闭进度报告
+    """
+    target = _ProgressTarget(callback) if callback is not None else None
+    token = _current_target.set(target)
+    try:
+        yield
+    finally:
+        _current_target.reset(token)
+
+
+@contextmanager
+def progress_scope(progress: float, total: float) -> Iterator[None]:
+    """把嵌套调用报告的进度（0 到 100%）映射到当前进度 progress 到 progress + 1 之间。
+
+    Args:
+        progress: 当前进度（子调用开始时）
+        total: 当前总量
+    """
+    parent = _current_target.get()
+    if parent is None or not total:
+        yield
+        return
+
+    if parent.span is None:
+        child = _ProgressTarget(parent.callback, progress, 1.0, total)
+    else:
+        child = _ProgressTarget(
+            parent.callback,
+            parent.offset + parent.span * progress / total,
+            parent.span / total,
+            parent.total,
+        )
+    token = _current_target.set(child)
+    try:
+        yield
+    finally:
+        _current_target.reset(token)
+
+
+def report_progress(
+    progress: float, total: Optional[float] = None, message: str = ""
+) -> None:
+    """报告进度（未设置回调时不做任何事，回调出错不影响工具执行）。
+
+    Args:
+        progress: 已完成的量
+        total: 总量（未知时为 None）
+        message: 进度说明
+    """
+    target = _current_target.get()
+    if target is None:
+        return
+
+    if target.span is None:
+        value, value_total = progress, total
+    else:
+        fraction = progress / total if total else 0.0
+        value = target.offset + target.span * fraction
+        value_total = target.total
+
+    try:
+        target.callback(value, value_total, message)
+    except Exception as e:
+        logger.debug(f"发送进度通知失败: {e}")
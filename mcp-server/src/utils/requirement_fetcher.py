@@ -0,0 +1,224 @@
+"""需求文档下载 - 连接复用、条件请求和本地缓存。
+
+Python 3.9+ 兼容
+
+`generate_prd` 的需求文档可以是 http(s) URL：
+- 进程内共享一个 `httpx.Client`，多次下载复用连接池
+- 下载的文档按 URL 缓存在 .agent-orchestrator/cache/requirements/ 下
+  （`{URL 哈希}.body` 为原始内容，`{URL 哈希}.json` 为 ETag、Last-Modified、内容类型等元数据），
+  再次下载时发送 If-None-Match / If-Modified-Since，服务器返回 304 时直接使用缓存
+- 响应按块写入临时文件后原子替换缓存，不会把整个文档读入内存；超过大小上限时中止
+- 网络错误时如果有缓存则使用缓存（记录警告）
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from src.core.exceptions import ValidationError
+from src.core.logger import setup_logger
+from src.utils.atomic_write import write_json_atomic
+
+logger = setup_logger(__name__)
+
+# cache_dir 下的缓存目录名
+REQUIREMENT_CACHE_DIR = "requirements"
+
+# 下载时每次写入的字节数
+_CHUNK_SIZE = 64 * 1024
+
+# 进程内共享的 HTTP 客户端（按超时配置缓存）
+_clients: dict[float, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def is_http_url(value: str) -> bool:
+    """判断是否为 http(s) URL。"""
+    parsed = urlparse(value.strip())
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
+
+def _get_client(timeout: float) -> Any:
+    """获取共享的 HTTP 客户端（第一次调用时创建）。"""
+    with _clients_lock:
+        client = _clients.get(timeout)
+        if client is None:
+            import httpx
+
+            client = httpx.Client(
+                timeout=timeout,
+                follow_redirects=True,
+                headers={"User-Agent": "agent-orchestrator"},
+            )
+            _clients[timeout] = client
+        return client
+
+
+def close_requirement_clients() -> None:
+    """关闭共享的 HTTP 客户端。"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+class RequirementFetcher:
+    """带条件请求和本地缓存的需求文档下载器。"""
+
+    def __init__(self, cache_dir: Path, timeout: float = 30.0, max_bytes: int = 0):
+        """初始化下载器。
+
+        Args:
+            cache_dir: 缓存目录
+            timeout: 请求超时（秒）
+            max_bytes: 文档大小上限（字节，0 表示不限制）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        """URL 对应的缓存文件路径：(元数据文件, 文档内容文件)。"""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _load_meta(self, meta_path: Path, body_path: Path, url: str) -> Optional[dict]:
+        """读取缓存元数据（缓存不完整或 URL 不一致时返回 None）。"""
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None
+        if not body_path.is_file():
+            return None
+        return meta
+
+    def fetch(self, url: str) -> dict:
+        """下载需求文档（未变化时使用缓存）。
+
+        Args:
+            url: http(s) URL
+
+        Returns:
+            下载结果，格式：
+            {
+                "url": URL,
+                "path": 缓存的文档路径,
+                "content_type": 内容类型（不含参数）,
+                "encoding": 字符编码,
+                "status": "downloaded" / "not_modified" / "stale"（下载失败，使用缓存）,
+                "size": 文档字节数
+            }
+
+        Raises:
+            ValidationError: 当 URL 无效、下载失败且没有缓存时
+        """
+        if not is_http_url(url):
+            raise ValidationError(f"无效的需求文档 URL: {url}")
+
+        meta_path, body_path = self._paths(url)
+        meta = self._load_meta(meta_path, body_path, url)
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            status = self._download(url, headers, meta_path, body_path)
+        except Exception as e:
+            if meta is None:
+                raise ValidationError(f"下载需求文档失败: {url}, 错误: {e}") from e
+            logger.warning(f"下载需求文档失败，使用缓存: {url}, 错误: {e}")
+            status = "stale"
+        else:
+            if status == "not_modified":
+                logger.info(f"需求文档未变化，使用缓存: {url}")
+            meta = self._load_meta(meta_path, body_path, url) or {}
+
+        return {
+            "url": url,
+            "path": str(body_path),
+            "content_type": meta.get("content_type", ""),
+            "encoding": meta.get("encoding") or "utf-8",
+            "status": status,
+            "size": meta.get("size", 0),
+        }
+
+    def _download(
+        self, url: str, headers: dict, meta_path: Path, body_path: Path
+    ) -> str:
+        """发送（条件）请求，内容变化时写入缓存。
+
+        Returns:
+            "downloaded" 或 "not_modified"
+        """
+        client = _get_client(self.timeout)
+        with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                self._touch_meta(meta_path)
+                return "not_modified"
+            response.raise_for_status()
+
+            declared = response.headers.get("Content-Length", "")
+            if self.max_bytes and declared.isdigit() and int(declared) > self.max_bytes:
+                raise ValidationError(
+                    f"需求文档超过大小上限 {self.max_bytes} 字节: {declared}"
+                )
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=str(self.cache_dir), prefix=f".{body_path.name}.", suffix=".tmp"
+            )
+            size = 0
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    for chunk in response.iter_bytes(_CHUNK_SIZE):
+                        size += len(chunk)
+                        if self.max_bytes and size > self.max_bytes:
+                            raise ValidationError(
+                                f"需求文档超过大小上限 {self.max_bytes} 字节"
+                            )
+                        handle.write(chunk)
+                os.replace(tmp_name, body_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+
+            content_type = response.headers.get("Content-Type", "")
+            write_json_atomic(
+                meta_path,
+                {
+                    "url": url,
+                    "final_url": str(response.url),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "content_type": content_type.split(";")[0].strip().lower(),
+                    "encoding": response.charset_encoding,
+                    "size": size,
+                    "fetched_at": datetime.now().isoformat(),
+                },
+                fsync=False,
+            )
+        logger.info(f"需求文档已下载: {url}, {size} 字节")
+        return "downloaded"
+
+    def _touch_meta(self, meta_path: Path) -> None:
+        """记录最近一次验证缓存的时间。"""
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            meta["validated_at"] = datetime.now().isoformat()
+            write_json_atomic(meta_path, meta, fsync=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"更新需求文档缓存元数据失败: {e}")
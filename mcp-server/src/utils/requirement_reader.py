@@ -0,0 +1,301 @@
+"""需求文档读取 - 流式读取、规范化并提取章节大纲。
+
+Python 3.9+ 兼容
+
+需求文档可能是从 Confluence 等系统导出的数 MB 的 HTML 或 Markdown，
+生成 PRD 只需要开头的一部分内容和文档结构：
+- 按块读取（不把整个文件读入内存），逐行规范化：HTML 转为 Markdown 风格的文本
+  （标题转为 `#`，段落和列表项换行，去掉 script/style），去掉行尾空白，合并连续空行
+- 只保留规范化后的前 max_chars 个字符，超长的单行按 _MAX_LINE_CHARS 切分，
+  内存占用与输入大小无关
+- 从 Markdown 标题（代码块中的除外）提取章节大纲：级别、标题、行号和章节大小
+"""
+
+import codecs
+import hashlib
+import re
+from collections.abc import Iterable, Iterator
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+from src.utils.markdown_sections import FENCE_PATTERN, HEADING_PATTERN
+
+# 文档格式
+FORMAT_MARKDOWN = "markdown"
+FORMAT_HTML = "html"
+FORMAT_TEXT = "text"
+
+# 每次读取的字符数
+CHUNK_SIZE = 64 * 1024
+
+# 默认保留的规范化文本字符数
+DEFAULT_MAX_CHARS = 20000
+
+# 大纲最多保留的章节数
+MAX_OUTLINE_SECTIONS = 200
+
+# 单行最大字符数（超过时切分，避免没有换行的大文件占用内存）
+_MAX_LINE_CHARS = 16 * 1024
+
+_SUFFIX_FORMATS = {
+    ".md": FORMAT_MARKDOWN,
+    ".markdown": FORMAT_MARKDOWN,
+    ".mdown": FORMAT_MARKDOWN,
+    ".html": FORMAT_HTML,
+    ".htm": FORMAT_HTML,
+    ".xhtml": FORMAT_HTML,
+}
+
+_CONTENT_TYPE_FORMATS = {
+    "text/html": FORMAT_HTML,
+    "application/xhtml+xml": FORMAT_HTML,
+    "text/markdown": FORMAT_MARKDOWN,
+    "text/x-markdown": FORMAT_MARKDOWN,
+}
+
+_HTML_SNIFF = re.compile(r"^\s*(?:<!doctype\s+html|<html|<head|<body)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def detect_format(name: str, head: str = "", content_type: str = "") -> str:
+    """根据内容类型、文件名后缀或内容开头（依次优先）判断文档格式。
+
+    Args:
+        name: 文件名或 URL 路径
+        head: 文档开头的内容
+        content_type: HTTP 内容类型（不含参数）
+
+    Returns:
+        FORMAT_MARKDOWN / FORMAT_HTML / FORMAT_TEXT
+    """
+    if content_type in _CONTENT_TYPE_FORMATS:
+        return _CONTENT_TYPE_FORMATS[content_type]
+    suffix = Path(name).suffix.lower()
+    if suffix in _SUFFIX_FORMATS:
+        return _SUFFIX_FORMATS[suffix]
+    if _HTML_SNIFF.match(head):
+        return FORMAT_HTML
+    if any(HEADING_PATTERN.match(line) for line in head.splitlines()[:50]):
+        return FORMAT_MARKDOWN
+    return FORMAT_TEXT
+
+
+class _HtmlToText(HTMLParser):
+    """把 HTML 增量转换为 Markdown 风格的文本片段。"""
+
+    _BLOCK_TAGS = {
+        "p",
+        "div",
+        "section",
+        "article",
+        "header",
+        "footer",
+        "table",
+        "tr",
+        "ul",
+        "ol",
+        "blockquote",
+        "pre",
+    }
+    _SKIP_TAGS = {"script", "style", "title", "noscript", "template"}
+
+    def __init__(self, emit: Callable[[str], None]) -> None:
+        super().__init__(convert_charrefs=True)
+        self._emit = emit
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif self._skip_depth:
+            return
+        elif len(tag) == 2 and tag[0] == "h" and tag[1] in "123456":
+            self._emit(f"\n\n{'#' * int(tag[1])} ")
+        elif tag == "li":
+            self._emit("\n- ")
+        elif tag == "br":
+            self._emit("\n")
+        elif tag in ("td", "th"):
+            self._emit(" | ")
+        elif tag in self._BLOCK_TAGS:
+            self._emit("\n\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif self._skip_depth:
+            return
+        elif (
+            len(tag) == 2 and tag[0] == "h" and tag[1] in "123456"
+        ) or tag in self._BLOCK_TAGS:
+            self._emit("\n\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._emit(_WHITESPACE.sub(" ", data))
+
+
+def _split_lines(fragments: Iterable[str]) -> Iterator[str]:
+    """把文本片段拼接为行（跨片段的行只保留一份未完成部分）。"""
+    pending = ""
+    for fragment in fragments:
+        if not fragment:
+            continue
+        pending += fragment
+        lines = pending.split("\n")
+        pending = lines.pop()
+        yield from lines
+        while len(pending) > _MAX_LINE_CHARS:
+            yield pending[:_MAX_LINE_CHARS]
+            pending = pending[_MAX_LINE_CHARS:]
+    if pending:
+        yield pending
+
+
+def _html_fragments(chunks: Iterable[str]) -> Iterator[str]:
+    """增量解析 HTML 块，产出转换后的文本片段。"""
+    output: list[str] = []
+    parser = _HtmlToText(output.append)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield "".join(output)
+        output.clear()
+    parser.close()
+    yield "".join(output)
+
+
+def parse_requirement(
+    chunks: Iterable[str], fmt: str, max_chars: int = DEFAULT_MAX_CHARS
+) -> dict:
+    """流式规范化需求文档并提取章节大纲。
+
+    Args:
+        chunks: 文档内容块
+        fmt: 文档格式（FORMAT_MARKDOWN / FORMAT_HTML / FORMAT_TEXT）
+        max_chars: 保留的规范化文本字符数
+
+    Returns:
+        需求文档信息，格式：
+        {
+            "format": 文档格式,
+            "text": 规范化文本的前 max_chars 个字符,
+            "outline": [{"level", "title", "line", "size"}]（size 为章节到下一个标题前的字符数）,
+            "total_chars": 规范化文本的总字符数,
+            "line_count": 规范化文本的行数,
+            "truncated": text 是否被截断,
+            "sha256": 完整规范化文本的哈希（用于判断需求是否变化）
+        }
+    """
+    fragments = _html_fragments(chunks) if fmt == FORMAT_HTML else chunks
+    strip_indent = fmt == FORMAT_HTML
+    detect_headings = fmt != FORMAT_TEXT
+
+    kept: list[str] = []
+    kept_chars = 0
+    total_chars = 0
+    line_count = 0
+    outline: list[dict] = []
+    current: Optional[dict] = None
+    in_fence = False
+    blank = True  # 文档开头的空行直接丢弃
+    digest = hashlib.sha256()
+
+    for raw_line in _split_lines(fragments):
+        line = raw_line.strip() if strip_indent else raw_line.rstrip()
+        if line.startswith("\ufeff"):
+            line = line[1:]
+        if not line:
+            if blank:
+                continue
+            blank = True
+        else:
+            blank = False
+
+        if detect_headings and line:
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+            elif not in_fence:
+                match = HEADING_PATTERN.match(line)
+                if match:
+                    current = None
+                    if len(outline) < MAX_OUTLINE_SECTIONS:
+                        current = {
+                            "level": len(match.group(1)),
+                            "title": match.group(2).strip(),
+                            "line": line_count + 1,
+                            "size": 0,
+                        }
+                        outline.append(current)
+
+        line_count += 1
+        digest.update(line.encode("utf-8", "replace"))
+        digest.update(b"\n")
+        size = len(line) + 1
+        total_chars += size
+        if current is not None:
+            current["size"] += size
+        if kept_chars < max_chars:
+            piece = (line + "\n")[: max_chars - kept_chars]
+            kept.append(piece)
+            kept_chars += len(piece)
+
+    text = "".join(kept).rstrip("\n")
+    return {
+        "format": fmt,
+        "text": text,
+        "outline": outline,
+        "total_chars": total_chars,
+        "line_count": line_count,
+        "truncated": total_chars > kept_chars,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _read_chunks(handle: TextIO, first: str, chunk_size: int) -> Iterator[str]:
+    """依次产出已读取的第一块（用于判断格式）和文件的剩余内容。"""
+    yield first
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_requirement(
+    path: Path,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    chunk_size: int = CHUNK_SIZE,
+    encoding: str = "utf-8",
+    name: Optional[str] = None,
+    content_type: str = "",
+) -> dict:
+    """按块读取需求文档文件。
+
+    Args:
+        path: 文件路径
+        max_chars: 保留的规范化文本字符数
+        chunk_size: 每次读取的字符数
+        encoding: 字符编码（无法解码的字节被替换）
+        name: 判断格式时使用的文件名（默认为 path，如下载的文档使用 URL 路径）
+        content_type: HTTP 内容类型（下载的文档，优先用于判断格式）
+
+    Returns:
+        需求文档信息，格式见 `parse_requirement()`
+
+    Raises:
+        OSError: 当文件无法读取时
+    """
+    # 未知编码按 UTF-8 读取；UTF-8 文档去掉开头的 BOM
+    try:
+        encoding = codecs.lookup(encoding).name
+    except LookupError:
+        encoding = "utf-8"
+    if encoding == "utf-8":
+        encoding = "utf-8-sig"
+    with open(path, encoding=encoding, errors="replace") as handle:
+        first = handle.read(chunk_size)
+        fmt = detect_format(name or str(path), first[:4096], content_type)
+        return parse_requirement(
+            _read_chunks(handle, first, chunk_size), fmt, max_chars
+        )
@@ -0,0 +1,525 @@
+"""代码审查引擎 - 基于 ast 的可插拔规则检查。
+
+Python 3.9+ 兼容
+
+- 每个文件只读取、解析一次，所有规则共用同一棵语法树
+- 规则通过 `@review_rule` 注册，每条规则有固定的严重级别（error / warning / info）
+- 文件较多（不少于 PROCESS_POOL_MIN_ITEMS 个）时在共享的进程池中并行审查（解析和遍历语法树是
+  CPU 密集型操作，线程无法并行）；文件较少时启动子进程和传输结果的开销大于并行的收益，
+  在当前进程中审查
+- 结果是结构化的发现列表，是否通过由 error 级别的发现决定，而不是扫描报告文本
+- 可选按文件内容哈希缓存每个文件的结果（`src.utils.content_cache`），内容未变化的文件不再审查
+
+进程池第一次使用时创建，进程退出时关闭（`shutdown_process_pool`）。子进程通过 forkserver
+（不支持时为 spawn）启动，不会从有多个线程的 MCP Server 进程中 fork；子进程按规则名称查找规则，
+自定义规则需要在模块导入时注册。
+"""
+
+import ast
+import atexit
+import contextlib
+import json
+import multiprocessing
+import re
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.core.logger import setup_logger
+from src.utils.content_cache import ContentHashLRUCache
+
+logger = setup_logger(__name__)
+
+# 严重级别（按严重程度降序）
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+SEVERITY_INFO = "info"
+SEVERITIES = (SEVERITY_ERROR, SEVERITY_WARNING, SEVERITY_INFO)
+
+# 审查引擎版本（内置规则的行为变化时递增，使之前缓存的结果失效）
+ENGINE_VERSION = 1
+
+# 默认规则参数
+DEFAULT_OPTIONS = {"max_complexity": 10}
+
+# 工作区下的审查结果缓存目录名（review_code 和 review_tests 共用）
+REVIEW_CACHE_DIR = "review_cache"
+
+# 使用进程池的最少任务数（少于该数量时在当前进程中执行）
+PROCESS_POOL_MIN_ITEMS = 8
+
+# 规则检查函数：接收源文件，返回 (行号, 说明) 列表
+RuleCheck = Callable[["SourceFile"], Iterable[tuple[int, str]]]
+
+
+class SourceFile:
+    """待审查的源文件（规则检查函数的参数）。"""
+
+    __slots__ = ("path", "content", "tree", "options")
+
+    def __init__(
+        self, path: str, content: str, tree: Optional[ast.AST], options: dict
+    ) -> None:
+        """初始化源文件。
+
+        Args:
+            path: 文件路径
+            content: 文件内容
+            tree: 语法树（非 Python 文件为 None）
+            options: 规则参数（如 max_complexity）
+        """
+        self.path = path
+        self.content = content
+        self.tree = tree
+        self.options = options
+
+
+class ReviewRule:
+    """已注册的审查规则。"""
+
+    __slots__ = ("name", "severity", "description", "needs_ast", "check")
+
+    def __init__(
+        self,
+        name: str,
+        severity: str,
+        description: str,
+        needs_ast: bool,
+        check: RuleCheck,
+    ) -> None:
+        """初始化审查规则。
+
+        Args:
+            name: 规则名称
+            severity: 严重级别（SEVERITIES 之一）
+            description: 规则说明
+            needs_ast: 是否需要语法树（为 True 时只检查能解析的 Python 文件）
+            check: 检查函数
+        """
+        self.name = name
+        self.severity = severity
+        self.description = description
+        self.needs_ast = needs_ast
+        self.check = check
+
+
+_RULES: dict[str, ReviewRule] = {}
+
+
+def review_rule(
+    name: str, severity: str, description: str, needs_ast: bool = True
+) -> Callable[[RuleCheck], RuleCheck]:
+    """注册审查规则的装饰器。
+
+    Args:
+        name: 规则名称（重复注册时覆盖）
+        severity: 严重级别（SEVERITIES 之一）
+        description: 规则说明
+        needs_ast: 是否需要语法树
+
+    Raises:
+        ValueError: 当严重级别无效时
+    """
+    if severity not in SEVERITIES:
+        raise ValueError(f"无效的严重级别: {severity}")
+
+    def decorator(check: RuleCheck) -> RuleCheck:
+        _RULES[name] = ReviewRule(name, severity, description, needs_ast, check)
+        return check
+
+    return decorator
+
+
+def get_rules() -> dict[str, ReviewRule]:
+    """获取所有已注册的规则。"""
+    return dict(_RULES)
+
+
+# ==================== 内置规则 ====================
+
+_TODO_PATTERN = re.compile(r"\b(TODO|FIXME)\b")
+
+# 增加圈复杂度的语句和表达式
+_BRANCH_NODES = (
+    ast.If,
+    ast.IfExp,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.ExceptHandler,
+    ast.Assert,
+)
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+@review_rule("short_file", SEVERITY_WARNING, "文件内容过短", needs_ast=False)
+def _check_short_file(source: SourceFile) -> Iterable[tuple[int, str]]:
+    """检查文件内容是否过短（少于 10 个字符）。"""
+    if len(source.content) < 10:
+        yield 1, "文件内容过短"
+
+
+@review_rule("todo", SEVERITY_WARNING, "包含 TODO / FIXME 注释", needs_ast=False)
+def _check_todo(source: SourceFile) -> Iterable[tuple[int, str]]:
+    """检查 TODO / FIXME 注释。"""
+    for lineno, line in enumerate(source.content.splitlines(), start=1):
+        match = _TODO_PATTERN.search(line)
+        if match:
+            yield lineno, f"包含 {match.group(1)} 注释"
+
+
+def _complexity(function: ast.AST) -> int:
+    """计算函数的圈复杂度（嵌套的函数和类单独计算）。"""
+    complexity = 1
+    pending = list(ast.iter_child_nodes(function))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, _SCOPE_NODES):
+            continue
+        if isinstance(node, _BRANCH_NODES):
+            complexity += 1
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            complexity += 1 + len(node.ifs)
+        elif type(node).__name__ == "match_case":  # Python 3.10+
+            complexity += 1
+        pending.extend(ast.iter_child_nodes(node))
+    return complexity
+
+
+@review_rule("complexity", SEVERITY_WARNING, "函数圈复杂度过高")
+def _check_complexity(source: SourceFile) -> Iterable[tuple[int, str]]:
+    """检查圈复杂度超过 max_complexity 的函数。"""
+    limit = source.options.get("max_complexity", DEFAULT_OPTIONS["max_complexity"])
+    for node in ast.walk(source.tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            complexity = _complexity(node)
+            if complexity > limit:
+                yield node.lineno, (
+                    f"函数 {node.name} 圈复杂度为 {complexity}，超过 {limit}"
+                )
+
+
+@review_rule("missing_docstring", SEVERITY_INFO, "公开的模块、类和函数缺少文档字符串")
+def _check_missing_docstring(source: SourceFile) -> Iterable[tuple[int, str]]:
+    """检查缺少文档字符串的模块和公开的类、函数（包括公开类的方法）。"""
+    tree = source.tree
+    if tree.body and ast.get_docstring(tree) is None:
+        yield 1, "模块缺少文档字符串"
+
+    def visit(body: list, owner: str) -> Iterable[tuple[int, str]]:
+        """检查一层定义，owner 为所在类的名称前缀。"""
+        for node in body:
+            if not isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+            ):
+                continue
+            if node.name.startswith("_"):
+                continue
+            name = f"{owner}{node.name}"
+            if ast.get_docstring(node) is None:
+                kind = "类" if isinstance(node, ast.ClassDef) else "函数"
+                yield node.lineno, f"{kind} {name} 缺少文档字符串"
+            if isinstance(node, ast.ClassDef):
+                yield from visit(node.body, f"{name}.")
+
+    yield from visit(tree.body, "")
+
+
+@review_rule("bare_except", SEVERITY_WARNING, "使用了不带异常类型的 except")
+def _check_bare_except(source: SourceFile) -> Iterable[tuple[int, str]]:
+    """检查不带异常类型的 except。"""
+    for node in ast.walk(source.tree):
+        if isinstance(node, ast.ExceptHandler) and node.type is None:
+            yield node.lineno, "不带异常类型的 except 会吞掉 KeyboardInterrupt 等异常"
+
+
+@review_rule("unused_import", SEVERITY_WARNING, "导入的名称未被使用")
+def _check_unused_import(source: SourceFile) -> Iterable[tuple[int, str]]:
+    """检查导入后没有使用的名称（字符串中出现的名称视为已使用）。"""
+    # __init__.py 的导入通常是为了重新导出
+    if Path(source.path).name == "__init__.py":
+        return
+
+    imported: dict[str, int] = {}
+    used: set[str] = set()
+    for node in ast.walk(source.tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                name = alias.asname or alias.name.split(".")[0]
+                imported.setdefault(name, node.lineno)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module == "__future__":
+                continue
+            for alias in node.names:
+                if alias.name != "*":
+                    imported.setdefault(alias.asname or alias.name, node.lineno)
+        elif isinstance(node, ast.Name):
+            used.add(node.id)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # __all__ 中的名称和字符串形式的类型注解
+            used.update(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", node.value))
+
+    for name, lineno in sorted(imported.items(), key=lambda item: item[1]):
+        if name not in used:
+            yield lineno, f"导入的 {name} 未被使用"
+
+
+# ==================== 审查执行 ====================
+
+
+def _finding(
+    path: str, line: int, rule: str, severity: str, message: str
+) -> dict[str, object]:
+    """构造一条审查发现。"""
+    return {
+        "file": path,
+        "line": line,
+        "rule": rule,
+        "severity": severity,
+        "message": message,
+    }
+
+
+def review_file(
+    path: str,
+    rules: Optional[list[str]] = None,
+    options: Optional[dict] = None,
+    data: Optional[bytes] = None,
+) -> dict:
+    """审查单个文件（进程池中执行的函数，参数和返回值都可 pickle）。
+
+    Args:
+        path: 文件路径
+        rules: 启用的规则名称（None 表示全部已注册规则，未知名称忽略）
+        options: 规则参数（覆盖 DEFAULT_OPTIONS）
+        data: 已读取的文件内容（None 表示从 path 读取）
+
+    Returns:
+        {
+            "file": 文件路径,
+            "status": "ok" / "missing" / "unreadable" / "syntax_error",
+            "findings": [{"file", "line", "rule", "severity", "message"}, ...]
+        }
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    file_path = Path(path)
+    if data is None and not file_path.exists():
+        return {
+            "file": path,
+            "status": "missing",
+            "findings": [_finding(path, 0, "file", SEVERITY_ERROR, "文件不存在")],
+        }
+    try:
+        if data is None:
+            data = file_path.read_bytes()
+        content = data.decode("utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return {
+            "file": path,
+            "status": "unreadable",
+            "findings": [_finding(path, 0, "file", SEVERITY_ERROR, f"读取失败 - {e}")],
+        }
+
+    status = "ok"
+    findings = []
+    tree = None
+    if file_path.suffix == ".py":
+        try:
+            tree = ast.parse(content, filename=path)
+        except (SyntaxError, ValueError) as e:
+            status = "syntax_error"
+            findings.append(
+                _finding(
+                    path,
+                    getattr(e, "lineno", None) or 0,
+                    "syntax",
+                    SEVERITY_ERROR,
+                    f"语法错误 - {getattr(e, 'msg', e)}",
+                )
+            )
+
+    source = SourceFile(path, content, tree, options)
+    names = list(_RULES) if rules is None else rules
+    for name in names:
+        rule = _RULES.get(name)
+        if rule is None or (rule.needs_ast and tree is None):
+            continue
+        try:
+            for line, message in rule.check(source):
+                findings.append(_finding(path, line, name, rule.severity, message))
+        except Exception as e:
+            logger.warning(f"审查规则 {name} 执行失败: {path}: {e}")
+
+    findings.sort(key=lambda finding: finding["line"])
+    return {"file": path, "status": status, "findings": findings}
+
+
+def cache_namespace(
+    rules: Optional[list[str]] = None, options: Optional[dict] = None
+) -> str:
+    """审查结果缓存的命名空间（引擎版本、启用的规则和规则参数）。"""
+    names = sorted(_RULES) if rules is None else sorted(rules)
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    return (
+        f"code-review:{ENGINE_VERSION}:{','.join(names)}:"
+        f"{json.dumps(options, sort_keys=True)}"
+    )
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _start_method() -> str:
+    """子进程的启动方式（forkserver 优先，不会从多线程进程中 fork）。"""
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """获取共享的进程池（第一次调用或最大进程数变化时创建）。"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(_start_method()),
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """关闭共享的进程池（进程退出时自动调用）。"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_process_pool)
+
+
+def map_in_processes(
+    func: Callable[..., Any],
+    arguments: list[tuple],
+    workers: int,
+    min_items: int = PROCESS_POOL_MIN_ITEMS,
+) -> list[Any]:
+    """在共享的进程池中执行 func(*args)，结果顺序与 arguments 相同。
+
+    workers 小于等于 1、参数少于 min_items 组或无法创建子进程时（如受限环境）
+    在当前进程中串行执行。func 和参数必须可 pickle（模块级函数）。
+    """
+    if workers > 1 and len(arguments) >= max(min_items, 2):
+        try:
+            executor = _get_pool(workers)
+            futures = [executor.submit(func, *args) for args in arguments]
+            return [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            logger.warning(f"进程池不可用，改为串行执行: {e}")
+            shutdown_process_pool()
+        except OSError as e:
+            logger.warning(f"进程池不可用，改为串行执行: {e}")
+    return [func(*args) for args in arguments]
+
+
+def _with_path(result: dict, path: str) -> dict:
+    """把缓存结果中的文件路径替换为当前路径（内容相同的文件可能位于不同路径）。"""
+    result = {**result, "file": path}
+    if "findings" in result:
+        result["findings"] = [
+            {**finding, "file": path} for finding in result["findings"]
+        ]
+    return result
+
+
+def analyze_files(
+    analyze: Callable[..., dict],
+    paths: list[str],
+    args: tuple = (),
+    workers: int = 1,
+    cache: Optional[ContentHashLRUCache] = None,
+) -> list[dict]:
+    """用 analyze(path, *args, data) 逐个分析文件，结果按内容哈希缓存，未命中的文件较多时并行分析。
+
+    Args:
+        analyze: 模块级分析函数（可 pickle），data 为已读取的文件内容（None 表示自行读取），
+            返回值包含 "file" 和 "status"（"ok" 和 "syntax_error" 的结果会被缓存）
+        paths: 文件路径列表
+        args: 传给 analyze 的其他参数
+        workers: 最大进程数（未命中缓存的文件少于 PROCESS_POOL_MIN_ITEMS 个时在当前进程中分析）
+        cache: 结果缓存，None 表示不缓存
+
+    Returns:
+        每个文件的分析结果（顺序与 paths 相同）
+    """
+    results: list[Optional[dict]] = [None] * len(paths)
+    pending = []
+    for i, path in enumerate(paths):
+        data = key = None
+        if cache is not None:
+            # 读取失败时由 analyze 报告文件不存在或读取失败
+            with contextlib.suppress(OSError):
+                data = Path(path).read_bytes()
+            if data is not None:
+                key = cache.key(Path(path).name, data)
+                cached = cache.get(key)
+                if cached is not None:
+                    results[i] = _with_path(cached, path)
+                    continue
+        pending.append((i, path, data, key))
+
+    outputs = map_in_processes(
+        analyze, [(path, *args, data) for _, path, data, _ in pending], workers
+    )
+    for (i, _, _, key), result in zip(pending, outputs):
+        results[i] = result
+        if key is not None and result["status"] in ("ok", "syntax_error"):
+            cache.put(key, result)
+
+    if cache is not None:
+        cache.evict()
+        if cache.hits:
+            logger.info(f"分析结果缓存命中 {cache.hits}/{len(paths)} 个文件")
+    return results
+
+
+def review_files(
+    paths: list[str],
+    rules: Optional[list[str]] = None,
+    options: Optional[dict] = None,
+    workers: int = 1,
+    cache: Optional[ContentHashLRUCache] = None,
+) -> list[dict]:
+    """审查多个文件，workers 大于 1 且需要审查的文件不少于 PROCESS_POOL_MIN_ITEMS 个时在进程池中并行执行。
+
+    Args:
+        paths: 文件路径列表
+        rules: 启用的规则名称（None 表示全部）
+        options: 规则参数
+        workers: 最大进程数
+        cache: 审查结果缓存（命名空间应为 cache_namespace(rules, options)），
+            None 表示不缓存
+
+    Returns:
+        每个文件的审查结果（顺序与 paths 相同，格式见 review_file）
+    """
+    return analyze_files(review_file, paths, (rules, options), workers, cache)
+
+
+def summarize_findings(findings: list[dict]) -> dict[str, int]:
+    """按严重级别统计发现数：{"error": n, "warning": n, "info": n}。"""
+    summary = dict.fromkeys(SEVERITIES, 0)
+    for finding in findings:
+        summary[finding["severity"]] = summary.get(finding["severity"], 0) + 1
+    return summary
@@ -0,0 +1,107 @@
+"""任务依赖图 - 循环检测、拓扑分层和关键路径。
+
+Python 3.9+ 兼容
+
+任务通过 `depends_on` 字段（任务ID或任务ID列表）声明依赖：
+- 按拓扑顺序分层：第 0 层没有依赖，第 n 层的任务只依赖前 n 层的任务，
+  同一层的任务可以并行执行
+- 关键路径为按任务权重（`estimated_size`，没有时为 1）累加最长的依赖链，
+  决定了全部任务并行执行时的最短完成时间
+- 只考虑图中任务之间的依赖，指向其他任务（如已完成的任务）的依赖视为已满足，
+  与 `run_with_dependencies` 的调度规则一致
+"""
+
+from src.core.exceptions import ValidationError
+
+
+def dependencies_of(task: dict) -> list[str]:
+    """读取任务的 depends_on 字段（支持单个任务ID或任务ID列表）。"""
+    depends_on = task.get("depends_on") or []
+    if isinstance(depends_on, str):
+        return [depends_on]
+    return [dep for dep in depends_on if isinstance(dep, str)]
+
+
+def _task_weight(task: dict) -> int:
+    """任务权重（用于关键路径）。"""
+    size = task.get("estimated_size")
+    if isinstance(size, int) and not isinstance(size, bool) and size > 0:
+        return size
+    return 1
+
+
+def build_task_graph(tasks: list[dict]) -> dict:
+    """构建任务依赖图。
+
+    Args:
+        tasks: 任务列表（缺少 task_id 的任务被忽略）
+
+    Returns:
+        依赖图，格式：
+        {
+            "dependencies": {任务ID: 图中依赖的任务ID列表},
+            "levels": [[任务ID, ...], ...]（同一层按任务列表顺序）,
+            "critical_path": [任务ID, ...]（从第一个任务到最后一个任务）,
+            "critical_path_weight": 关键路径的权重之和
+        }
+
+    Raises:
+        ValidationError: 当存在循环依赖时（错误信息包含无法排序的任务）
+    """
+    nodes = {task["task_id"]: task for task in tasks if task.get("task_id")}
+    order = list(nodes)
+    dependencies: dict[str, list[str]] = {}
+    dependents: dict[str, list[str]] = {task_id: [] for task_id in order}
+    remaining: dict[str, int] = {}
+    for task_id in order:
+        deps = []
+        for dep in dependencies_of(nodes[task_id]):
+            if dep in nodes and dep != task_id and dep not in deps:
+                deps.append(dep)
+                dependents[dep].append(task_id)
+        dependencies[task_id] = deps
+        remaining[task_id] = len(deps)
+
+    position = {task_id: index for index, task_id in enumerate(order)}
+    levels: list[list[str]] = []
+    current = [task_id for task_id in order if not remaining[task_id]]
+    # 关键路径：到每个任务为止的最大权重和前驱任务
+    distance: dict[str, int] = {}
+    previous: dict[str, str] = {}
+    while current:
+        levels.append(current)
+        following = []
+        for task_id in current:
+            best = max(
+                dependencies[task_id], key=lambda dep: distance[dep], default=None
+            )
+            distance[task_id] = _task_weight(nodes[task_id]) + (
+                distance[best] if best is not None else 0
+            )
+            if best is not None:
+                previous[task_id] = best
+            for dependent in dependents[task_id]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    following.append(dependent)
+        current = sorted(following, key=position.__getitem__)
+
+    unresolved = [task_id for task_id in order if task_id not in distance]
+    if unresolved:
+        raise ValidationError(f"任务存在循环依赖: {', '.join(unresolved)}")
+
+    critical_path: list[str] = []
+    if distance:
+        task_id = max(order, key=lambda candidate: distance[candidate])
+        critical_path.append(task_id)
+        while task_id in previous:
+            task_id = previous[task_id]
+            critical_path.append(task_id)
+        critical_path.reverse()
+
+    return {
+        "dependencies": dependencies,
+        "levels": levels,
+        "critical_path": critical_path,
+        "critical_path_weight": distance[critical_path[-1]] if critical_path else 0,
+    }
@@ -0,0 +1,112 @@
+"""依赖感知的任务调度器 - 在线程池中并发执行有依赖关系的任务。
+
+Python 3.9+ 兼容
+
+调度规则：
+- 依赖全部成功完成的任务进入就绪队列，按原始顺序提交，同时运行的任务数不超过 max_workers
+- 依赖失败（或被跳过）的任务不会执行，连同其所有下游任务一起记录为跳过
+- 处于循环依赖中的任务永远不会就绪，调度结束后记录为跳过
+- 只考虑本次调度的任务之间的依赖，指向其他任务（如已完成的任务）的依赖视为已满足
+"""
+
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, TypeVar
+
+from src.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+
+def run_with_dependencies(
+    task_ids: list[str],
+    dependencies: dict[str, list[str]],
+    run: Callable[[str], T],
+    max_workers: int,
+    succeeded: Callable[[T], bool] = bool,
+) -> tuple[dict[str, T], dict[str, str]]:
+    """按依赖关系并发执行任务。
+
+    Args:
+        task_ids: 要执行的任务ID列表（顺序决定同时就绪时的提交顺序）
+        dependencies: {任务ID: 依赖的任务ID列表}
+        run: 执行单个任务的函数，不应抛出异常（失败通过返回值表示）
+        max_workers: 最大并发数，小于等于 1 时在当前线程中按顺序执行
+        succeeded: 根据 run 的返回值判断任务是否成功，失败任务的下游任务会被跳过
+
+    Returns:
+        (执行结果, 跳过的任务)，格式：
+        (
+            {任务ID: run 的返回值},
+            {任务ID: 跳过原因}
+        )
+    """
+    pending = set(task_ids)
+    waiting_on: dict[str, set[str]] = {}
+    dependents: dict[str, list[str]] = {task_id: [] for task_id in task_ids}
+    for task_id in task_ids:
+        deps = {dep for dep in dependencies.get(task_id, []) if dep in pending}
+        deps.discard(task_id)
+        waiting_on[task_id] = deps
+        for dep in deps:
+            dependents[dep].append(task_id)
+
+    order = {task_id: position for position, task_id in enumerate(task_ids)}
+    ready = [task_id for task_id in task_ids if not waiting_on[task_id]]
+    results: dict[str, T] = {}
+    skipped: dict[str, str] = {}
+
+    def finish(task_id: str, result: T) -> None:
+        """记录任务结果，释放或跳过下游任务。"""
+        results[task_id] = result
+        if not succeeded(result):
+            _skip_dependents(task_id, dependents, skipped)
+            return
+        for dependent in dependents[task_id]:
+            waiting_on[dependent].discard(task_id)
+            if not waiting_on[dependent] and dependent not in skipped:
+                ready.append(dependent)
+        ready.sort(key=order.__getitem__)
+
+    if max_workers <= 1:
+        while ready:
+            task_id = ready.pop(0)
+            finish(task_id, run(task_id))
+    else:
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="task-scheduler"
+        ) as executor:
+            running: dict[Future, str] = {}
+            while ready or running:
+                while ready and len(running) < max_workers:
+                    task_id = ready.pop(0)
+                    # 复制上下文，任务中可以继续使用调用方的上下文变量（如进度回调）
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, run, task_id)] = task_id
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: order[running[f]]):
+                    finish(running.pop(future), future.result())
+
+    # 剩余任务的依赖永远无法满足（循环依赖）
+    for task_id in task_ids:
+        if task_id not in results and task_id not in skipped:
+            skipped[task_id] = "存在循环依赖"
+            logger.warning(f"任务存在循环依赖，跳过: {task_id}")
+
+    return results, skipped
+
+
+def _skip_dependents(
+    failed_id: str, dependents: dict[str, list[str]], skipped: dict[str, str]
+) -> None:
+    """将失败任务的所有下游任务标记为跳过。"""
+    stack = list(dependents[failed_id])
+    while stack:
+        task_id = stack.pop()
+        if task_id in skipped:
+            continue
+        skipped[task_id] = f"依赖任务未完成: {failed_id}"
+        logger.warning(f"依赖任务 {failed_id} 未完成，跳过: {task_id}")
+        stack.extend(dependents[task_id])
@@ -0,0 +1,212 @@
+"""工具注册表 - 基于装饰器注册工具处理函数和输入 Schema。
+
+Python 3.9+ 兼容
+
+替代 `call_tool` 中逐个比较工具名称的 if/elif 链：
+- 工具处理函数和 JSON Schema 在模块加载时注册一次
+- `Tool` 列表只构建一次并缓存，`list_tools` 不再每次重建
+- 按名称 O(1) 查找处理函数
+- 调用前根据缓存的 Schema 校验参数（必填字段和基础类型）
+"""
+
+from typing import Any, Callable, Optional
+
+from mcp.types import Tool
+
+from src.core.exceptions import ValidationError
+
+ToolHandler = Callable[[dict], dict]
+
+# 字段校验规则：(字段名, 允许的 Python 类型, 数组元素类型)
+_FieldCheck = tuple[str, tuple[type, ...], Optional[tuple[type, ...]]]
+
+# JSON Schema 基础类型到 Python 类型的映射
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+}
+
+
+class ToolSpec:
+    """已注册工具的定义（名称、描述、输入 Schema 和处理函数）。"""
+
+    __slots__ = ("name", "description", "input_schema", "handler", "_checks")
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        input_schema: dict,
+        handler: ToolHandler,
+    ) -> None:
+        """初始化工具定义。
+
+        Args:
+            name: 工具名称
+            description: 工具描述
+            input_schema: 输入参数 JSON Schema
+            handler: 处理函数，接收参数字典，返回结果字典
+        """
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.handler = handler
+
+        # 预先计算校验规则，避免每次调用时遍历 Schema
+        self._checks: list[_FieldCheck] = []
+        for field, schema in input_schema.get("properties", {}).items():
+            field_types = _JSON_TYPES.get(schema.get("type", ""))
+            if field_types is None:
+                continue
+            item_types = None
+            if schema.get("type") == "array":
+                item_types = _JSON_TYPES.get(schema.get("items", {}).get("type", ""))
+            self._checks.append((field, field_types, item_types))
+
+    def validate(self, arguments: dict[str, Any]) -> None:
+        """根据 Schema 校验参数。
+
+        Args:
+            arguments: 工具参数
+
+        Raises:
+            ValidationError: 当必填字段缺失或字段类型不匹配时
+        """
+        for field in self.input_schema.get("required", []):
+            if arguments.get(field) is None:
+                raise ValidationError(f"必填字段缺失或为空: {field}")
+
+        for field, field_types, item_types in self._checks:
+            value = arguments.get(field)
+            if value is None:
+                continue
+            # bool 是 int 的子类，integer/number 字段不接受布尔值
+            if not isinstance(value, field_types) or (
+                isinstance(value, bool) and bool not in field_types
+            ):
+                expected = self.input_schema["properties"][field]["type"]
+                raise ValidationError(f"字段类型错误: {field} 应为 {expected}")
+            if item_types is not None and not all(
+                isinstance(item, item_types) for item in value
+            ):
+                raise ValidationError(f"字段类型错误: {field} 的元素类型不匹配")
+
+
+class ToolRegistry:
+    """工具注册表。"""
+
+    def __init__(self) -> None:
+        """初始化工具注册表。"""
+        self._specs: dict[str, ToolSpec] = {}
+        self._tools: Optional[list[Tool]] = None
+
+    def tool(
+        self,
+        name: str,
+        description: str,
+        properties: Optional[dict] = None,
+        required: Optional[list[str]] = None,
+    ) -> Callable[[ToolHandler], ToolHandler]:
+        """注册工具的装饰器。
+
+        Args:
+            name: 工具名称
+            description: 工具描述
+            properties: 输入参数属性定义（JSON Schema properties）
+            required: 必填参数列表
+
+        Returns:
+            装饰器，原样返回被装饰的处理函数
+
+        Example:
+            ```python
+            registry = ToolRegistry()
+
+            @registry.tool(
+                name="get_workspace",
+                description="获取工作区信息",
+                properties={"workspace_id": {"type": "string"}},
+                required=["workspace_id"],
+            )
+            def _get_workspace(arguments: dict) -> dict:
+                ...
+            ```
+        """
+        input_schema = {
+            "type": "object",
+            "properties": properties or {},
+            "required": required or [],
+        }
+
+        def decorator(handler: ToolHandler) -> ToolHandler:
+            if name in self._specs:
+                raise ValueError(f"工具重复注册: {name}")
+            self._specs[name] = ToolSpec(name, description, input_schema, handler)
+            self._tools = None  # 注册新工具后重新构建 Tool 列表
+            return handler
+
+        return decorator
+
+    def list_tools(self) -> list[Tool]:
+        """获取所有工具定义（首次调用时构建并缓存）。
+
+        Returns:
+            按注册顺序排列的 Tool 列表
+        """
+        if self._tools is None:
+            self._tools = [
+                Tool(
+                    name=spec.name,
+                    description=spec.description,
+                    inputSchema=spec.input_schema,
+                )
+                for spec in self._specs.values()
+            ]
+        return self._tools
+
+    def get(self, name: str) -> ToolSpec:
+        """按名称获取工具定义。
+
+        Args:
+            name: 工具名称
+
+        Returns:
+            工具定义
+
+        Raises:
+            ValueError: 当工具名称未知时
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"未知工具: {name}")
+        return spec
+
+    def dispatch(self, name: str, arguments: dict[str, Any]) -> dict:
+        """校验参数并调用工具处理函数。
+
+        Args:
+            name: 工具名称
+            arguments: 工具参数
+
+        Returns:
+            处理函数的返回结果
+
+        Raises:
+            ValueError: 当工具名称未知时
+            ValidationError: 当参数校验失败时
+        """
+        spec = self.get(name)
+        spec.validate(arguments)
+        return spec.handler(arguments)
+
+    def __contains__(self, name: object) -> bool:
+        """检查工具是否已注册。"""
+        return name in self._specs
+
+    def __len__(self) -> int:
+        """已注册的工具数量。"""
+        return len(self._specs)
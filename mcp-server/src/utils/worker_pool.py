@@ -0,0 +1,127 @@
+"""工具工作池 - 将阻塞的工具处理函数移出 asyncio 事件循环。
+
+Python 3.9+ 兼容
+
+MCP Server 通过 stdio 单连接串行读取请求，如果工具处理函数直接在事件循环中
+执行文件锁、子进程等阻塞操作，一个耗时的覆盖率分析就会冻结所有其他请求。
+本模块提供有界的线程池（可选进程池），并支持按工具名称限制并发数，
+保证 `get_workflow_status`、`get_tasks` 等轻量查询在长任务执行期间仍能立即返回。
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.core.config import Config
+from src.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class WorkerPool:
+    """工具工作池。
+
+    - 默认所有工具在线程池中执行
+    - `config.tool_process_tools` 中列出的工具在进程池中执行（处理函数和参数必须可 pickle）
+    - `config.tool_concurrency_limits` 限制单个工具的同时执行数，
+      超出限制的调用在事件循环中异步等待，不占用工作线程
+    """
+
+    def __init__(self, config: Optional[Config] = None) -> None:
+        """初始化工作池。
+
+        Args:
+            config: 配置管理器，如果为 None 则创建默认配置
+        """
+        self.config = config or Config()
+        self.max_workers = self.config.tool_worker_threads
+        self.max_processes = self.config.tool_worker_processes
+        self.process_tools = set(self.config.tool_process_tools)
+        self.concurrency_limits = dict(self.config.tool_concurrency_limits)
+
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def uses_process(self, tool_name: str) -> bool:
+        """工具是否在进程池中执行（此时处理函数和参数必须可 pickle）。"""
+        return tool_name in self.process_tools and self.max_processes > 0
+
+    def _get_executor(self, tool_name: str) -> Executor:
+        """获取工具对应的执行器（延迟创建）。"""
+        if self.uses_process(tool_name):
+            if self._process_executor is None:
+                self._process_executor = ProcessPoolExecutor(
+                    max_workers=self.max_processes
+                )
+            return self._process_executor
+
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="mcp-tool"
+            )
+        return self._thread_executor
+
+    def _get_semaphore(self, tool_name: str) -> Optional[asyncio.Semaphore]:
+        """获取工具的并发限制信号量，未配置限制时返回 None。
+
+        信号量绑定到事件循环，事件循环变化时（如测试中每个用例新建循环）重新创建。
+        """
+        limit = self.concurrency_limits.get(tool_name)
+        if not limit or limit <= 0:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphores = {}
+            self._semaphore_loop = loop
+
+        if tool_name not in self._semaphores:
+            self._semaphores[tool_name] = asyncio.Semaphore(limit)
+        return self._semaphores[tool_name]
+
+    async def run(
+        self, tool_name: str, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """在工作池中执行工具处理函数。
+
+        Args:
+            tool_name: 工具名称（用于选择执行器和并发限制）
+            func: 同步处理函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            处理函数的返回值
+
+        Raises:
+            处理函数抛出的任何异常都会原样传播
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor(tool_name)
+        call = functools.partial(func, *args, **kwargs)
+
+        semaphore = self._get_semaphore(tool_name)
+        if semaphore is None:
+            return await loop.run_in_executor(executor, call)
+
+        if semaphore.locked():
+            logger.info(f"工具 {tool_name} 达到并发上限，排队等待")
+        async with semaphore:
+            return await loop.run_in_executor(executor, call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作池。
+
+        Args:
+            wait: 是否等待正在执行的任务完成
+        """
+        if self._thread_executor is not None:
+            self._thread_executor.shutdown(wait=wait)
+            self._thread_executor = None
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=wait)
+            self._process_executor = None
+        logger.debug("工具工作池已关闭")
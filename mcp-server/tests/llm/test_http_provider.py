@@ -0,0 +1,140 @@
+"""HTTP API 提供方测试。"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.core.config import Config
+from src.core.exceptions import LLMError
+from src.llm.base import LLMRequest
+from src.llm.http_provider import ClaudeProvider, GeminiProvider
+
+
+@pytest.fixture
+def config(temp_dir, monkeypatch):
+    """不等待重试的配置。"""
+    monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+    monkeypatch.setenv("MAX_RETRY_ATTEMPTS", "3")
+    monkeypatch.setenv("RETRY_DELAY", "0")
+    return Config()
+
+
+def _complete(provider, handler, request: LLMRequest) -> str:
+    """使用 MockTransport 调用提供方。"""
+
+    async def run() -> str:
+        provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await provider.complete(request, 256)
+        finally:
+            await provider.aclose()
+
+    return asyncio.run(run())
+
+
+class TestClaudeProvider:
+    """Claude 提供方测试类。"""
+
+    def test_request_and_response(self, config):
+        """测试请求格式和响应解析。"""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["url"] = str(request.url)
+            seen["headers"] = request.headers
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(
+                200,
+                json={
+                    "content": [
+                        {"type": "text", "text": "你好"},
+                        {"type": "text", "text": "世界"},
+                    ]
+                },
+            )
+
+        provider = ClaudeProvider(config, "secret")
+        result = _complete(provider, handler, LLMRequest("提示词", system="系统"))
+
+        assert result == "你好世界"
+        assert seen["url"] == "https://api.anthropic.com/v1/messages"
+        assert seen["headers"]["x-api-key"] == "secret"
+        assert seen["body"]["model"] == ClaudeProvider.default_model
+        assert seen["body"]["max_tokens"] == 256
+        assert seen["body"]["system"] == "系统"
+        assert seen["body"]["messages"] == [{"role": "user", "content": "提示词"}]
+
+    def test_retries_retryable_status(self, config):
+        """测试 429 / 5xx 响应会重试。"""
+        statuses = [429, 503]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if statuses:
+                return httpx.Response(statuses.pop(0))
+            return httpx.Response(
+                200, json={"content": [{"type": "text", "text": "ok"}]}
+            )
+
+        assert _complete(ClaudeProvider(config, "k"), handler, LLMRequest("x")) == "ok"
+
+    def test_gives_up_after_max_attempts(self, config):
+        """测试重试次数用尽后抛出 LLMError。"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(500)
+
+        with pytest.raises(LLMError, match="HTTP 500"):
+            _complete(ClaudeProvider(config, "k"), handler, LLMRequest("x"))
+        assert len(calls) == 3
+
+    def test_client_error_is_not_retried(self, config):
+        """测试 4xx 错误不重试。"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(401, text="unauthorized")
+
+        with pytest.raises(LLMError, match="HTTP 401"):
+            _complete(ClaudeProvider(config, "k"), handler, LLMRequest("x"))
+        assert len(calls) == 1
+
+    def test_invalid_response(self, config):
+        """测试响应格式无效。"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"unexpected": True})
+
+        with pytest.raises(LLMError, match="响应格式无效"):
+            _complete(ClaudeProvider(config, "k"), handler, LLMRequest("x"))
+
+
+class TestGeminiProvider:
+    """Gemini 提供方测试类。"""
+
+    def test_request_and_response(self, config, monkeypatch):
+        """测试请求格式、模型配置和响应解析。"""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["url"] = str(request.url)
+            seen["headers"] = request.headers
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(
+                200,
+                json={"candidates": [{"content": {"parts": [{"text": "结果"}]}}]},
+            )
+
+        provider = GeminiProvider(config, "secret", "gemini-test")
+        result = _complete(provider, handler, LLMRequest("提示词", system="系统"))
+
+        assert result == "结果"
+        assert seen["url"].endswith("/models/gemini-test:generateContent")
+        assert seen["headers"]["x-goog-api-key"] == "secret"
+        assert seen["body"]["generationConfig"]["maxOutputTokens"] == 256
+        assert seen["body"]["systemInstruction"] == {"parts": [{"text": "系统"}]}
+        assert seen["body"]["contents"][0]["parts"] == [{"text": "提示词"}]
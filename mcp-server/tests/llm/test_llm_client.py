@@ -0,0 +1,219 @@
+"""LLM 客户端和工厂测试。"""
+
+import asyncio
+
+import pytest
+
+from src.core.config import Config
+from src.core.exceptions import LLMError, ValidationError
+from src.llm.base import LLMProvider, LLMRequest
+from src.llm.client import LLM_CACHE_DIR, LLMClient
+from src.llm.factory import close_llm_clients, generate_texts, get_llm_client
+from src.llm.http_provider import GeminiProvider
+from src.llm.stub_provider import StubProvider
+
+
+class FakeProvider(LLMProvider):
+    """记录调用次数和最大并发数的提供方。"""
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        super().__init__("fake-model")
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+
+    async def complete(self, request: LLMRequest, max_tokens: int) -> str:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.fail:
+            raise LLMError("调用失败")
+        return f"响应: {request.prompt} ({max_tokens})"
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def config(temp_dir, monkeypatch):
+    """使用临时目录的配置。"""
+    monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "2")
+    monkeypatch.setenv("LLM_MAX_TOKENS", "128")
+    return Config()
+
+
+class TestLLMClient:
+    """LLM 客户端测试类。"""
+
+    def test_complete_uses_default_max_tokens(self, config):
+        """测试未指定 max_tokens 时使用 LLM_MAX_TOKENS。"""
+        client = LLMClient(config, FakeProvider())
+        try:
+            assert client.complete(LLMRequest("你好")) == "响应: 你好 (128)"
+            assert (
+                client.complete(LLMRequest("再见", max_tokens=16)) == "响应: 再见 (16)"
+            )
+        finally:
+            client.close()
+
+    def test_concurrency_is_limited(self, config):
+        """测试同时进行的请求数不超过 LLM_MAX_CONCURRENCY。"""
+        provider = FakeProvider(delay=0.05)
+        client = LLMClient(config, provider)
+        try:
+            results = client.complete_many(
+                [LLMRequest(f"提示词 {i}") for i in range(6)]
+            )
+        finally:
+            client.close()
+
+        assert results == [f"响应: 提示词 {i} (128)" for i in range(6)]
+        assert provider.calls == 6
+        assert provider.max_active == 2
+
+    def test_identical_requests_are_merged(self, config):
+        """测试相同的进行中请求只调用一次提供方。"""
+        provider = FakeProvider(delay=0.05)
+        client = LLMClient(config, provider)
+        try:
+            results = client.complete_many([LLMRequest("相同")] * 3)
+        finally:
+            client.close()
+
+        assert results == ["响应: 相同 (128)"] * 3
+        assert provider.calls == 1
+
+    def test_responses_are_cached_on_disk(self, config):
+        """测试响应缓存在磁盘上，新的客户端也能命中。"""
+        provider = FakeProvider()
+        client = LLMClient(config, provider)
+        try:
+            client.complete(LLMRequest("缓存"))
+        finally:
+            client.close()
+        assert list((config.cache_dir / LLM_CACHE_DIR).glob("*.json"))
+
+        provider = FakeProvider()
+        client = LLMClient(config, provider)
+        try:
+            assert client.complete(LLMRequest("缓存")) == "响应: 缓存 (128)"
+            assert client.complete(LLMRequest("缓存", system="不同")) != ""
+        finally:
+            client.close()
+        assert provider.calls == 1
+        assert client.cache.hits == 1
+
+    def test_cache_disabled(self, config, monkeypatch):
+        """测试 LLM_CACHE=false 时不缓存。"""
+        monkeypatch.setenv("LLM_CACHE", "false")
+        provider = FakeProvider()
+        client = LLMClient(Config(), provider)
+        try:
+            client.complete(LLMRequest("不缓存"))
+            client.complete(LLMRequest("不缓存"))
+        finally:
+            client.close()
+        assert client.cache is None
+        assert provider.calls == 2
+
+    def test_failures_are_returned_per_request(self, config):
+        """测试批量调用时失败以异常对象返回，同步调用时抛出。"""
+        provider = FakeProvider(fail=True)
+        client = LLMClient(config, provider)
+        try:
+            results = client.complete_many([LLMRequest("a"), LLMRequest("b")])
+            with pytest.raises(LLMError):
+                client.complete(LLMRequest("c"))
+        finally:
+            client.close()
+        assert all(isinstance(result, LLMError) for result in results)
+        assert not list((config.cache_dir / LLM_CACHE_DIR).glob("*.json"))
+
+    def test_close_releases_provider(self, config):
+        """测试关闭客户端时释放提供方资源。"""
+        provider = FakeProvider()
+        client = LLMClient(config, provider)
+        client.complete(LLMRequest("x"))
+        client.close()
+        assert provider.closed
+
+
+class TestStubProvider:
+    """本地 stub 提供方测试类。"""
+
+    def test_returns_fallback(self):
+        """测试请求带有 fallback 时原样返回。"""
+        result = asyncio.run(
+            StubProvider().complete(LLMRequest("提示词", fallback="模板"), 10)
+        )
+        assert result == "模板"
+
+    def test_is_deterministic(self):
+        """测试相同请求得到相同响应。"""
+        provider = StubProvider()
+        first = asyncio.run(provider.complete(LLMRequest("提示词"), 10))
+        second = asyncio.run(provider.complete(LLMRequest("提示词"), 10))
+        other = asyncio.run(provider.complete(LLMRequest("其他"), 10))
+        assert first == second
+        assert first != other
+        assert first.startswith("[stub:")
+
+
+class TestLLMFactory:
+    """LLM 客户端工厂测试类。"""
+
+    def teardown_method(self):
+        close_llm_clients()
+
+    def test_default_provider_is_stub(self, config):
+        """测试默认使用 stub 提供方，且客户端被复用。"""
+        client = get_llm_client(config)
+        assert isinstance(client.provider, StubProvider)
+        assert client.cache is None
+        assert get_llm_client(Config()) is client
+
+    def test_unknown_provider(self, config, monkeypatch):
+        """测试未知提供方。"""
+        monkeypatch.setenv("LLM_PROVIDER", "unknown")
+        with pytest.raises(ValidationError, match="未知 LLM 提供方"):
+            get_llm_client(Config())
+
+    def test_missing_api_key(self, config, monkeypatch):
+        """测试缺少 API 密钥。"""
+        monkeypatch.setenv("LLM_PROVIDER", "claude")
+        monkeypatch.delenv("CLAUDE_API_KEY", raising=False)
+        with pytest.raises(ValidationError, match="CLAUDE_API_KEY"):
+            get_llm_client(Config())
+
+    def test_creates_http_provider_with_api_key(self, config, monkeypatch):
+        """测试 HTTP API 提供方使用对应配置项中的 API 密钥。"""
+        monkeypatch.setenv("LLM_PROVIDER", "gemini")
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+        client = get_llm_client(Config())
+
+        assert isinstance(client.provider, GeminiProvider)
+        assert client.provider.api_key == "test-key"
+
+    def test_generate_texts_falls_back_on_failure(self, config, monkeypatch):
+        """测试调用失败时使用 fallback，没有 fallback 时抛出 LLMError。"""
+        client = LLMClient(config, FakeProvider(fail=True))
+        monkeypatch.setattr("src.llm.factory.get_llm_client", lambda config: client)
+        try:
+            assert generate_texts([LLMRequest("x", fallback="模板")], config) == [
+                "模板"
+            ]
+            with pytest.raises(LLMError):
+                generate_texts([LLMRequest("y")], config)
+        finally:
+            client.close()
@@ -1,6 +1,7 @@
 """任务管理器测试 - TDD 第一步：编写失败的测试。"""
 
 import json
+from unittest.mock import patch
 
 import pytest
 
@@ -8,6 +9,7 @@ from src.core.config import Config
 from src.core.exceptions import TaskNotFoundError
 from src.managers.task_manager import TaskManager
 from src.managers.workspace_manager import WorkspaceManager
+from src.storage import json_backend
 from tests.conftest import create_test_workspace
 
 
@@ -162,3 +164,92 @@ class TestTaskManager:
         updated_task = manager.get_task(workspace_id, "task-001")
         assert updated_task["status"] == "completed"
         assert updated_task["code_files"] == ["file.py"]
+
+    def test_update_tasks_bulk_writes_once(
+        self, manager, workspace_manager, sample_project_dir
+    ):
+        """测试批量更新在一次写入内更新多个任务并追加新任务。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        tasks = [
+            {"task_id": f"task-{i:03d}", "description": f"任务{i}", "status": "pending"}
+            for i in range(1, 501)
+        ]
+        manager.save_tasks(workspace_id, {"workspace_id": workspace_id, "tasks": tasks})
+        updates = {
+            f"task-{i:03d}": {"status": "completed", "code_files": [f"f{i}.py"]}
+            for i in range(1, 501)
+        }
+        updates["task-501"] = {"status": "pending", "description": "新任务"}
+
+        # Act
+        with patch(
+            "src.storage.json_backend.write_json_atomic",
+            wraps=json_backend.write_json_atomic,
+        ) as mock_write:
+            manager.update_tasks_bulk(workspace_id, updates)
+
+        # Assert
+        assert mock_write.call_count == 1
+        result = manager.get_tasks(workspace_id)
+        assert len(result) == 501
+        assert manager.get_tasks_by_status(workspace_id, "pending") == [
+            {"task_id": "task-501", "status": "pending", "description": "新任务"}
+        ]
+        task = manager.get_task(workspace_id, "task-250")
+        assert task["code_files"] == ["f250.py"]
+        assert task["description"] == "任务250"
+
+    def test_get_task_uses_index_without_reparsing(
+        self, manager, workspace_manager, sample_project_dir
+    ):
+        """测试任务索引建立后，获取单个任务不再重新解析任务文件。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        tasks = [{"task_id": f"task-{i:03d}", "status": "pending"} for i in range(50)]
+        manager.save_tasks(workspace_id, {"workspace_id": workspace_id, "tasks": tasks})
+
+        # Act
+        with patch("src.storage.json_backend.json.load") as mock_load:
+            found = [manager.get_task(workspace_id, t["task_id"]) for t in tasks]
+
+        # Assert
+        mock_load.assert_not_called()
+        assert [t["task_id"] for t in found] == [t["task_id"] for t in tasks]
+
+    def test_external_change_invalidates_task_index(
+        self, manager, workspace_manager, sample_project_dir
+    ):
+        """测试其他进程修改任务文件后，索引失效并重新读取。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        # JSON 存储后端的任务文件
+        tasks_file = manager.config.get_workspace_path(workspace_id) / "tasks.json"
+        manager.save_tasks(
+            workspace_id,
+            {"workspace_id": workspace_id, "tasks": [{"task_id": "task-001"}]},
+        )
+        assert manager.get_task(workspace_id, "task-001")["task_id"] == "task-001"
+
+        # Act（模拟其他进程重写任务文件，内容长度不同以改变文件签名）
+        tasks_data = {
+            "workspace_id": workspace_id,
+            "tasks": [
+                {"task_id": "task-002", "description": "外部写入的任务"},
+            ],
+        }
+        with open(tasks_file, "w", encoding="utf-8") as f:
+            json.dump(tasks_data, f, ensure_ascii=False, indent=2)
+
+        # Assert
+        with pytest.raises(TaskNotFoundError):
+            manager.get_task(workspace_id, "task-001")
+        assert manager.get_task(workspace_id, "task-002")["description"] == (
+            "外部写入的任务"
+        )
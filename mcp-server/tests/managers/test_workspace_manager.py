@@ -148,3 +148,153 @@ class TestWorkspaceManager:
 
         assert "test-workspace-001" in loaded_index
         assert workspace_id in loaded_index
+
+
+class TestWorkspaceCache:
+    """工作区进程内缓存测试类。"""
+
+    @pytest.fixture
+    def manager(self, temp_dir, monkeypatch):
+        """创建工作区管理器实例（关闭时间戳精度窗口，便于验证缓存命中）。"""
+        from src.storage import json_backend
+
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setattr(json_backend, "_RACY_WINDOW_NS", 0)
+        json_backend.clear_workspace_cache()
+        yield WorkspaceManager(config=Config())
+        json_backend.clear_workspace_cache()
+
+    @pytest.fixture
+    def workspace_id(self, manager, sample_project_dir):
+        """创建测试工作区。"""
+        return manager.create_workspace(
+            project_path=str(sample_project_dir),
+            requirement_name="测试需求",
+            requirement_url="https://example.com/req",
+        )
+
+    def test_repeated_reads_use_cache(self, manager, workspace_id, monkeypatch):
+        """测试文件未变化时重复读取不再解析 JSON。"""
+        # Arrange
+        from src.storage import json_backend
+
+        other_manager = WorkspaceManager(config=manager.config)
+        load_calls = []
+        original_load = json_backend.json.load
+
+        def counting_load(f):
+            load_calls.append(f)
+            return original_load(f)
+
+        monkeypatch.setattr(json_backend.json, "load", counting_load)
+
+        # Act - 另一个实例同样共享进程内缓存
+        first = manager.get_workspace(workspace_id)
+        second = other_manager.get_workspace(workspace_id)
+
+        # Assert
+        assert first == second
+        assert load_calls == []
+
+    def test_returned_workspace_is_a_copy(self, manager, workspace_id):
+        """测试修改返回值不会污染缓存。"""
+        # Act
+        workspace = manager.get_workspace(workspace_id)
+        workspace["status"]["prd_status"] = "modified"
+        workspace["files"]["prd_path"] = "/tmp/x.md"
+
+        # Assert
+        fresh = manager.get_workspace(workspace_id)
+        assert fresh["status"]["prd_status"] == "pending"
+        assert fresh["files"]["prd_path"] is None
+
+    def test_external_write_invalidates_cache(self, manager, workspace_id):
+        """测试其他写入方修改文件后读取到最新数据。"""
+        # Arrange
+        import json
+
+        manager.get_workspace(workspace_id)
+        meta_file = manager.config.get_workspace_path(workspace_id) / "workspace.json"
+        data = json.loads(meta_file.read_text(encoding="utf-8"))
+        data["files"]["prd_path"] = "/tmp/external/PRD.md"
+
+        # Act
+        meta_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        workspace = manager.get_workspace(workspace_id)
+
+        # Assert
+        assert workspace["files"]["prd_path"] == "/tmp/external/PRD.md"
+
+    def test_update_status_writes_through_cache(self, manager, workspace_id):
+        """测试更新状态后缓存与文件一致。"""
+        # Act
+        manager.update_workspace_status(workspace_id, {"prd_status": "completed"})
+
+        # Assert
+        assert manager.get_workspace(workspace_id)["status"]["prd_status"] == (
+            "completed"
+        )
+
+    def test_deleted_workspace_raises_not_found(self, manager, workspace_id):
+        """测试缓存存在但文件被删除时抛出异常。"""
+        # Arrange
+        manager.get_workspace(workspace_id)
+        meta_file = manager.config.get_workspace_path(workspace_id) / "workspace.json"
+        meta_file.unlink()
+
+        # Act & Assert
+        with pytest.raises(WorkspaceNotFoundError):
+            manager.get_workspace(workspace_id)
+
+    def test_racy_entry_is_reread(self, manager, workspace_id, monkeypatch):
+        """测试读取时处于时间戳精度窗口内的缓存条目会重新读取文件。"""
+        # Arrange
+        from src.storage import json_backend
+
+        monkeypatch.setattr(json_backend, "_RACY_WINDOW_NS", 10**12)
+        json_backend.clear_workspace_cache()
+        manager.get_workspace(workspace_id)
+        load_calls = []
+        original_load = json_backend.json.load
+        monkeypatch.setattr(
+            json_backend.json,
+            "load",
+            lambda f: load_calls.append(f) or original_load(f),
+        )
+
+        # Act
+        manager.get_workspace(workspace_id)
+
+        # Assert
+        assert len(load_calls) == 1
+
+    def test_update_workspace_files_keeps_status(self, manager, workspace_id):
+        """测试更新文件路径不会覆盖其他字段。"""
+        # Arrange
+        manager.update_workspace_status(workspace_id, {"trd_status": "completed"})
+
+        # Act
+        manager.update_workspace_files(workspace_id, {"trd_path": "/tmp/TRD.md"})
+
+        # Assert
+        workspace = manager.get_workspace(workspace_id)
+        assert workspace["files"]["trd_path"] == "/tmp/TRD.md"
+        assert workspace["status"]["trd_status"] == "completed"
+
+    def test_update_workflow_state(self, manager, workspace_id):
+        """测试保存工作流状态（调用方后续修改不影响已保存的数据）。"""
+        # Arrange
+        workflow_state = {"current_step": 2, "completed_steps": []}
+
+        # Act
+        manager.update_workflow_state(workspace_id, workflow_state)
+        workflow_state["current_step"] = 99
+
+        # Assert
+        workspace = manager.get_workspace(workspace_id)
+        assert workspace["workflow_state"]["current_step"] == 2
+
+    def test_update_missing_workspace_raises_not_found(self, manager):
+        """测试更新不存在的工作区抛出异常。"""
+        with pytest.raises(WorkspaceNotFoundError):
+            manager.update_workspace_files("non_existent_id", {"prd_path": "x"})
@@ -0,0 +1,114 @@
+"""存储迁移命令测试。"""
+
+import json
+
+import pytest
+
+from src.core.config import Config
+from src.managers.task_manager import TaskManager
+from src.managers.workspace_manager import WorkspaceManager
+from src.storage.json_backend import JsonStorageBackend
+from src.storage.migrate import main, migrate_json_to_sqlite
+from src.storage.sqlite_backend import SqliteStorageBackend
+
+
+class TestMigrateJsonToSqlite:
+    """JSON 到 SQLite 迁移测试类。"""
+
+    @pytest.fixture
+    def config(self, temp_dir, monkeypatch):
+        """创建测试用配置（JSON 后端）。"""
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+        return Config()
+
+    @pytest.fixture
+    def workspace_id(self, config, sample_project_dir):
+        """创建带任务的 JSON 工作区。"""
+        storage = JsonStorageBackend(config)
+        workspace_manager = WorkspaceManager(config=config, storage=storage)
+        task_manager = TaskManager(config=config, storage=storage)
+        workspace_id = workspace_manager.create_workspace(
+            project_path=str(sample_project_dir),
+            requirement_name="测试需求",
+            requirement_url="https://example.com/req",
+        )
+        location = task_manager.save_tasks(
+            workspace_id,
+            {
+                "workspace_id": workspace_id,
+                "created_at": "2024-01-01T00:00:00",
+                "tasks": [
+                    {"task_id": "task-001", "status": "completed"},
+                    {"task_id": "task-002", "status": "pending"},
+                ],
+            },
+        )
+        workspace_manager.update_workspace_files(
+            workspace_id, {"tasks_json_path": location}
+        )
+        workspace_manager.update_workspace_status(
+            workspace_id, {"tasks_status": "completed"}
+        )
+        return workspace_id
+
+    def test_migrate_imports_workspaces_and_tasks(self, config, workspace_id):
+        """测试迁移导入工作区和任务，并保留 JSON 文件。"""
+        # Act
+        result = migrate_json_to_sqlite(config)
+
+        # Assert
+        assert result == {"workspaces": 1, "tasks": 2, "skipped": [], "failed": {}}
+        target = SqliteStorageBackend(config.storage_sqlite_path)
+        try:
+            workspace = target.get_workspace(workspace_id)
+            assert workspace["status"]["tasks_status"] == "completed"
+            assert target.has_tasks(workspace_id)
+            assert [t["task_id"] for t in target.get_tasks(workspace_id)] == [
+                "task-001",
+                "task-002",
+            ]
+            assert target.find_tasks_by_status(workspace_id, "pending")[0][
+                "task_id"
+            ] == ("task-002")
+        finally:
+            target.close()
+        assert (config.get_workspace_path(workspace_id) / "workspace.json").exists()
+
+    def test_migrate_skips_existing_unless_overwrite(self, config, workspace_id):
+        """测试重复迁移跳过已存在的工作区，--overwrite 时覆盖。"""
+        # Arrange
+        migrate_json_to_sqlite(config)
+
+        # Act
+        second = migrate_json_to_sqlite(config)
+        third = migrate_json_to_sqlite(config, overwrite=True)
+
+        # Assert
+        assert second["skipped"] == [workspace_id]
+        assert second["workspaces"] == 0
+        assert third["workspaces"] == 1
+
+    def test_migrate_reports_corrupted_workspace(self, config, workspace_id):
+        """测试损坏的 workspace.json 记录为失败，不影响其他工作区。"""
+        # Arrange
+        broken_dir = config.get_workspace_path("req-broken")
+        broken_dir.mkdir(parents=True)
+        (broken_dir / "workspace.json").write_text("{", encoding="utf-8")
+
+        # Act
+        result = migrate_json_to_sqlite(config)
+
+        # Assert
+        assert result["workspaces"] == 1
+        assert list(result["failed"]) == ["req-broken"]
+
+    def test_main_prints_summary(self, config, workspace_id, capsys):
+        """测试命令行入口。"""
+        # Act
+        exit_code = main([])
+
+        # Assert
+        assert exit_code == 0
+        output = capsys.readouterr().out
+        assert json.loads(output[: output.rindex("}") + 1])["workspaces"] == 1
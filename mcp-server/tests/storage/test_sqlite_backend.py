@@ -0,0 +1,227 @@
+"""SQLite 存储后端测试。"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.core.config import Config
+from src.core.exceptions import ValidationError, WorkspaceNotFoundError
+from src.managers.task_manager import TaskManager
+from src.managers.workspace_manager import WorkspaceManager
+from src.storage.factory import close_storage_backends, get_storage_backend
+from src.storage.sqlite_backend import SqliteStorageBackend
+
+
+def _workspace(workspace_id: str, prd_status: str = "pending") -> dict:
+    """构造测试用工作区数据。"""
+    return {
+        "workspace_id": workspace_id,
+        "project_path": "/tmp/project",
+        "requirement_name": "测试需求",
+        "created_at": f"2024-01-01T00:00:{workspace_id[-2:]}",
+        "status": {
+            "prd_status": prd_status,
+            "trd_status": "pending",
+            "tasks_status": "pending",
+            "code_status": "pending",
+            "test_status": "pending",
+        },
+        "files": {"prd_path": None, "trd_path": None, "tasks_json_path": None},
+    }
+
+
+class TestSqliteStorageBackend:
+    """SQLite 存储后端测试类。"""
+
+    @pytest.fixture
+    def backend(self, temp_dir):
+        """创建 SQLite 存储后端。"""
+        backend = SqliteStorageBackend(temp_dir / "orchestrator.db")
+        yield backend
+        backend.close()
+
+    def test_uses_wal_mode(self, backend):
+        """测试数据库使用 WAL 模式。"""
+        conn = sqlite3.connect(str(backend.db_path))
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
+    def test_workspace_round_trip(self, backend):
+        """测试保存、读取和更新工作区。"""
+        # Arrange
+        backend.create_workspace(_workspace("ws-01"))
+
+        # Act
+        backend.update_workspace(
+            "ws-01", lambda ws: ws["status"].update({"prd_status": "completed"})
+        )
+        workspace = backend.get_workspace("ws-01")
+
+        # Assert
+        assert workspace["status"]["prd_status"] == "completed"
+        assert workspace["requirement_name"] == "测试需求"
+        assert backend.list_workspaces()["ws-01"]["project_path"] == "/tmp/project"
+
+    def test_missing_workspace(self, backend):
+        """测试读取和更新不存在的工作区。"""
+        with pytest.raises(WorkspaceNotFoundError):
+            backend.get_workspace("missing")
+        with pytest.raises(WorkspaceNotFoundError):
+            backend.update_workspace("missing", lambda ws: None)
+
+    def test_find_workspaces_by_status_uses_index(self, backend):
+        """测试按状态查询工作区（使用状态列索引）。"""
+        # Arrange
+        backend.create_workspace(_workspace("ws-01", prd_status="completed"))
+        backend.create_workspace(_workspace("ws-02"))
+        backend.create_workspace(_workspace("ws-03", prd_status="completed"))
+
+        # Act
+        result = backend.find_workspaces_by_status("prd_status", "completed")
+        plan = backend._connect().execute(
+            "EXPLAIN QUERY PLAN SELECT workspace_id FROM workspaces "
+            "WHERE prd_status = ?",
+            ("completed",),
+        )
+
+        # Assert
+        assert result == ["ws-01", "ws-03"]
+        assert "idx_workspaces_prd_status" in " ".join(str(row) for row in plan)
+        with pytest.raises(ValidationError, match="未知状态字段"):
+            backend.find_workspaces_by_status("data; DROP TABLE tasks", "x")
+
+    def test_tasks_round_trip_and_row_level_update(self, backend):
+        """测试保存任务列表、行级更新和按状态查询。"""
+        # Arrange
+        tasks = [
+            {"task_id": f"task-{i:03d}", "description": f"任务{i}", "status": "pending"}
+            for i in range(1, 4)
+        ]
+        assert backend.has_tasks("ws-01") is False
+
+        # Act
+        backend.save_tasks("ws-01", {"workspace_id": "ws-01", "tasks": tasks})
+        backend.update_task("ws-01", "task-002", "completed", {"code_files": ["a.py"]})
+        backend.update_task("ws-01", "task-004", "pending", {"description": "新任务"})
+
+        # Assert
+        assert backend.has_tasks("ws-01") is True
+        assert [t["task_id"] for t in backend.get_tasks("ws-01")] == [
+            "task-001",
+            "task-002",
+            "task-003",
+            "task-004",
+        ]
+        task = backend.get_task("ws-01", "task-002")
+        assert task["status"] == "completed"
+        assert task["code_files"] == ["a.py"]
+        assert task["description"] == "任务2"
+        assert backend.get_task("ws-01", "missing") is None
+        pending = backend.find_tasks_by_status("ws-01", "pending")
+        assert [t["task_id"] for t in pending] == ["task-001", "task-003", "task-004"]
+
+    def test_save_tasks_replaces_existing(self, backend):
+        """测试重新保存任务列表会替换旧任务。"""
+        # Arrange
+        backend.save_tasks("ws-01", {"tasks": [{"task_id": "a"}, {"task_id": "b"}]})
+
+        # Act
+        backend.save_tasks("ws-01", {"tasks": [{"task_id": "c"}]})
+
+        # Assert
+        assert [t["task_id"] for t in backend.get_tasks("ws-01")] == ["c"]
+
+    def test_update_tasks_in_one_transaction(self, backend):
+        """测试批量更新多个任务并追加不存在的任务。"""
+        # Arrange
+        backend.save_tasks("ws-01", {"tasks": [{"task_id": "a"}, {"task_id": "b"}]})
+
+        # Act
+        backend.update_tasks(
+            "ws-01",
+            {"b": {"status": "completed"}, "c": {"status": "pending"}},
+        )
+
+        # Assert
+        assert [t["task_id"] for t in backend.get_tasks("ws-01")] == ["a", "b", "c"]
+        assert backend.get_task("ws-01", "b")["status"] == "completed"
+        assert backend.find_tasks_by_status("ws-01", "pending") == [
+            {"task_id": "c", "status": "pending"}
+        ]
+
+    def test_concurrent_task_updates_from_threads(self, backend):
+        """测试多线程并发更新不同任务不丢失更新。"""
+        # Arrange
+        tasks = [{"task_id": f"task-{i:03d}", "status": "pending"} for i in range(20)]
+        backend.save_tasks("ws-01", {"tasks": tasks})
+
+        def worker(start: int) -> None:
+            for i in range(start, 20, 4):
+                backend.update_task("ws-01", f"task-{i:03d}", "completed", {})
+
+        # Act
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert backend.find_tasks_by_status("ws-01", "pending") == []
+
+
+class TestManagersWithSqliteBackend:
+    """使用 SQLite 后端的管理器测试类。"""
+
+    @pytest.fixture
+    def config(self, temp_dir, monkeypatch):
+        """创建使用 SQLite 后端的配置。"""
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+        yield Config()
+        close_storage_backends()
+
+    def test_factory_returns_shared_sqlite_backend(self, config):
+        """测试同一数据库路径复用同一个后端实例。"""
+        backend = get_storage_backend(config)
+
+        assert isinstance(backend, SqliteStorageBackend)
+        assert get_storage_backend(config) is backend
+
+    def test_unknown_backend(self, config):
+        """测试未知存储后端类型。"""
+        config.storage_backend = "redis"
+
+        with pytest.raises(ValidationError, match="未知存储后端"):
+            get_storage_backend(config)
+
+    def test_workspace_and_task_managers(self, config, sample_project_dir):
+        """测试管理器通过 SQLite 后端读写，不生成 JSON 文件。"""
+        # Arrange
+        workspace_manager = WorkspaceManager(config=config)
+        task_manager = TaskManager(config=config)
+        workspace_id = workspace_manager.create_workspace(
+            project_path=str(sample_project_dir),
+            requirement_name="测试需求",
+            requirement_url="https://example.com/req",
+        )
+
+        # Act
+        workspace_manager.update_workspace_status(
+            workspace_id, {"tasks_status": "completed"}
+        )
+        task_manager.save_tasks(workspace_id, {"tasks": [{"task_id": "task-001"}]})
+        task_manager.update_task_status(workspace_id, "task-001", "completed")
+
+        # Assert
+        assert workspace_manager.find_workspaces_by_status(
+            "tasks_status", "completed"
+        ) == [workspace_id]
+        assert task_manager.get_task(workspace_id, "task-001")["status"] == "completed"
+        assert task_manager.get_tasks_by_status(workspace_id, "completed") != []
+        workspace_dir = config.get_workspace_path(workspace_id)
+        assert not (workspace_dir / "workspace.json").exists()
+        assert not config.workspace_index_file.exists()
@@ -6,7 +6,7 @@ Python 3.9+ 兼容
 import asyncio
 import json
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from mcp.types import TextContent
@@ -26,8 +26,8 @@ class TestMCPServer:
         tools = await list_tools()
 
         assert (
-            len(tools) == 28
-        )  # 5 个基础设施工具 + 2 个工作流编排工具 + 3 个 PRD 确认工具 + 3 个 TRD 确认工具 + 2 个测试路径询问工具 + 2 个任务执行工具 + 1 个工作流状态查询工具 + 1 个阶段依赖检查工具 + 8 个 SKILL 工具 + 1 个完整工作流编排工具
+            len(tools) == 29
+        )  # 5 个基础设施工具 + 2 个工作流编排工具 + 3 个 PRD 确认工具 + 3 个 TRD 确认工具 + 2 个测试路径询问工具 + 3 个任务执行工具 + 1 个工作流状态查询工具 + 1 个阶段依赖检查工具 + 8 个 SKILL 工具 + 1 个完整工作流编排工具
 
         # 检查基础设施工具
         tool_names = [tool.name for tool in tools]
@@ -58,6 +58,7 @@ class TestMCPServer:
         # 检查任务执行工具
         assert "execute_task" in tool_names
         assert "execute_all_tasks" in tool_names
+        assert "get_task_plan" in tool_names
 
         # 检查工作流状态查询工具
         assert "get_workflow_status" in tool_names
@@ -511,6 +512,33 @@ class TestMCPServer:
         assert data["success"] is True
         assert "coverage" in data
 
+    @pytest.mark.asyncio
+    async def test_call_tool_analyze_coverage_for_task(
+        self, create_test_workspace_fixture, sample_project_dir, workspace_manager
+    ):
+        """测试 analyze_coverage 工具 - 只提供 task_id 时分析任务的 code_files。"""
+        workspace_id = create_test_workspace_fixture
+        code_file = str(sample_project_dir / "module.py")
+        mock_task_manager = MagicMock()
+        mock_task_manager.get_task.return_value = {
+            "task_id": "task-001",
+            "code_files": [code_file],
+        }
+
+        with (
+            patch("src.mcp_server.workspace_manager", workspace_manager),
+            patch("src.mcp_server.task_manager", mock_task_manager),
+            patch("src.mcp_server.analyze_coverage") as mock_analyze_coverage,
+        ):
+            mock_analyze_coverage.return_value = {"success": True, "coverage": 0.0}
+            await call_tool(
+                "analyze_coverage",
+                {"workspace_id": workspace_id, "task_id": "task-001"},
+            )
+
+        mock_task_manager.get_task.assert_called_once_with(workspace_id, "task-001")
+        assert mock_analyze_coverage.call_args.kwargs["source_files"] == [code_file]
+
     @pytest.mark.asyncio
     async def test_call_tool_unknown_tool(self):
         """测试未知工具。"""
@@ -1067,6 +1095,82 @@ class TestMCPServer:
         assert data["failed_tasks"] == 0
         assert len(data["task_results"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_execute_all_tasks_via_mcp_sends_progress_and_summary(
+        self, create_test_workspace_fixture
+    ):
+        """测试请求带 progressToken 时发送进度通知，且默认返回精简结果。"""
+        from mcp.server.lowlevel.server import request_ctx
+        from mcp.shared.context import RequestContext
+        from mcp.types import RequestParams
+
+        from src.utils.progress import report_progress
+
+        workspace_id = create_test_workspace_fixture
+        notifications = []
+
+        class FakeSession:
+            async def send_progress_notification(
+                self, token, progress, total=None, message=None, **kwargs
+            ):
+                notifications.append((token, progress, total, message))
+
+        def fake_execute_all(**kwargs):
+            task_results = []
+            for i in range(1, 3):
+                report_progress(i, 2, f"任务 task-00{i} 完成")
+                task_results.append(
+                    {
+                        "success": True,
+                        "task_id": f"task-00{i}",
+                        "workspace_id": workspace_id,
+                        "passed": True,
+                        "retry_count": 0,
+                        "review_report": "很长的 Review 报告" * 100,
+                        "code_files": [f"/path/to/file{i}.py"],
+                    }
+                )
+            return {
+                "success": True,
+                "workspace_id": workspace_id,
+                "total_tasks": 2,
+                "completed_tasks": 2,
+                "failed_tasks": 0,
+                "task_results": task_results,
+            }
+
+        token = request_ctx.set(
+            RequestContext(
+                request_id=7,
+                meta=RequestParams.Meta(progressToken="progress-1"),
+                session=FakeSession(),
+                lifespan_context=None,
+            )
+        )
+        try:
+            with patch(
+                "src.mcp_server.execute_all_tasks", side_effect=fake_execute_all
+            ):
+                result = await call_tool(
+                    "execute_all_tasks", {"workspace_id": workspace_id}
+                )
+        finally:
+            request_ctx.reset(token)
+
+        assert notifications == [
+            ("progress-1", 1, 2, "任务 task-001 完成"),
+            ("progress-1", 2, 2, "任务 task-002 完成"),
+        ]
+        data = json.loads(result[0].text)
+        assert data["completed_tasks"] == 2
+        assert data["task_results"][0] == {
+            "task_id": "task-001",
+            "success": True,
+            "passed": True,
+            "retry_count": 0,
+            "code_files": ["/path/to/file1.py"],
+        }
+
     @pytest.mark.asyncio
     async def test_execute_all_tasks_via_mcp_with_retries(
         self, create_test_workspace_fixture, workspace_manager
@@ -2242,3 +2346,65 @@ class TestMCPServer:
         data = json.loads(result[0].text)
         assert data["success"] is False
         assert "error" in data
+
+    @pytest.mark.asyncio
+    async def test_long_running_tool_does_not_block_status_query(
+        self, create_test_workspace_fixture, workspace_manager
+    ):
+        """测试长时间运行的工具执行期间，状态查询仍能立即返回。"""
+        import threading
+        import time
+
+        workspace_id = create_test_workspace_fixture
+        release = threading.Event()
+
+        def slow_workflow(**kwargs):
+            release.wait(timeout=5)
+            return {"success": True, "workspace_id": workspace_id}
+
+        with patch("src.mcp_server.execute_full_workflow", side_effect=slow_workflow):
+            workflow_future = asyncio.ensure_future(
+                call_tool("execute_full_workflow", {"workspace_id": workspace_id})
+            )
+            await asyncio.sleep(0.05)
+
+            start = time.perf_counter()
+            status_result = await call_tool(
+                "get_workflow_status", {"workspace_id": workspace_id}
+            )
+            elapsed = time.perf_counter() - start
+
+            assert not workflow_future.done()
+            release.set()
+            workflow_result = await workflow_future
+
+        assert json.loads(status_result[0].text)["success"] is True
+        assert json.loads(workflow_result[0].text)["success"] is True
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_list_tools_returns_cached_tool_list(self):
+        """测试 list_tools 返回缓存的 Tool 列表，不在每次调用时重建。"""
+        first = await list_tools()
+        second = await list_tools()
+
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_call_tool_rejects_invalid_argument_type(self):
+        """测试 call_tool 根据 Schema 拒绝类型错误的参数。"""
+        with patch("src.mcp_server.execute_task") as mock_execute:
+            result = await call_tool(
+                "execute_task",
+                {
+                    "workspace_id": "req-xxx",
+                    "task_id": "task-001",
+                    "max_review_retries": "3",
+                },
+            )
+
+        data = json.loads(result[0].text)
+        assert data["success"] is False
+        assert data["error_type"] == "ValidationError"
+        assert "max_review_retries" in data["error"]
+        mock_execute.assert_not_called()
@@ -222,3 +222,120 @@ class TestCodeGenerator:
             # 验证状态被标记为失败
             workspace = workspace_manager.get_workspace(workspace_id)
             assert workspace["status"]["code_status"] == "failed"
+
+    def test_generate_code_batch_updates_tasks_once(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试批量生成代码只写一次任务文件，无效任务不影响其他任务。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+        from src.tools.code_generator import generate_code_batch
+
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        task_manager = TaskManager()
+        task_manager.update_tasks_bulk(
+            workspace_id,
+            {
+                "task-001": {"status": "pending", "description": "登录"},
+                "task-002": {"status": "pending", "description": "注册"},
+                "task-003": {"status": "reviewed"},
+            },
+        )
+        workspace_manager.update_workspace_status(
+            workspace_id, {"tasks_status": "completed"}
+        )
+        bulk_updates = []
+        original_bulk = TaskManager.update_tasks_bulk
+
+        def counting_bulk(self, workspace_id, updates):
+            bulk_updates.append(sorted(updates))
+            return original_bulk(self, workspace_id, updates)
+
+        monkeypatch.setattr(TaskManager, "update_tasks_bulk", counting_bulk)
+
+        # Act
+        result = generate_code_batch(
+            workspace_id, ["task-001", "task-002", "task-003", "task-404"]
+        )
+
+        # Assert
+        assert result["success"] is False
+        assert sorted(result["generated"]) == ["task-001", "task-002"]
+        assert sorted(result["failed"]) == ["task-003", "task-404"]
+        assert bulk_updates == [["task-001", "task-002"]]
+        assert (sample_project_dir / "task_001.py").exists()
+        assert (sample_project_dir / "tests" / "test_task_002.py").exists()
+        task = task_manager.get_task(workspace_id, "task-001")
+        assert task["status"] == "completed"
+        assert task["code_files"] == result["generated"]["task-001"]
+        # task-003 不是 completed，代码生成状态仍为进行中
+        assert result["code_status"] == "in_progress"
+
+    def test_generate_code_batch_completes_code_status(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试所有任务完成时批量生成把 code_status 更新为 completed。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+        from src.tools.code_generator import generate_code_batch
+
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {"task-001": {"status": "pending"}, "task-002": {"status": "pending"}},
+        )
+        workspace_manager.update_workspace_status(
+            workspace_id, {"tasks_status": "completed"}
+        )
+
+        # Act
+        result = generate_code_batch(workspace_id, ["task-001", "task-002"])
+
+        # Assert
+        assert result["success"] is True
+        assert result["code_status"] == "completed"
+        workspace = workspace_manager.get_workspace(workspace_id)
+        assert workspace["status"]["code_status"] == "completed"
+
+    def test_generate_code_batch_requests_llm_once(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试批量生成代码时所有任务的 LLM 请求一次发出，代码块标记被去掉。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+        from src.tools.code_generator import generate_code_batch
+
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {"task-001": {"status": "pending"}, "task-002": {"status": "pending"}},
+        )
+        workspace_manager.update_workspace_status(
+            workspace_id, {"tasks_status": "completed"}
+        )
+        batches = []
+
+        def fake_generate_texts(requests, config):
+            batches.append(len(requests))
+            return [f"```python\n# 生成 {i}\n```" for i in range(len(requests))]
+
+        monkeypatch.setattr(
+            "src.tools.code_generator.generate_texts", fake_generate_texts
+        )
+
+        # Act
+        result = generate_code_batch(workspace_id, ["task-001", "task-002"])
+
+        # Assert
+        assert result["success"] is True
+        assert batches == [4]
+        assert (sample_project_dir / "task_002.py").read_text() == "# 生成 2\n"
+        assert (sample_project_dir / "tests" / "test_task_002.py").read_text() == (
+            "# 生成 3\n"
+        )
@@ -4,6 +4,7 @@ import json
 
 from src.core.config import Config
 from src.tools.code_reviewer import review_code
+from src.utils import review_engine
 from tests.conftest import create_test_workspace
 
 
@@ -327,3 +328,92 @@ class TestCodeReviewer:
         assert "passed" in result
         # 包含 TODO 的文件应该审查不通过
         assert result["passed"] is False or "TODO" in result["review_report"]
+
+    def test_review_code_returns_structured_findings(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试返回结构化的发现，是否通过由 error 级别的发现决定。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+
+        config = Config()
+        workspace_dir = config.get_workspace_path(workspace_id)
+
+        warning_file = temp_dir / "warning.py"
+        warning_file.write_text('"""模块。"""\n\nimport os\n')
+        broken_file = temp_dir / "broken.py"
+        broken_file.write_text("def broken(:\n")
+
+        tasks_file = workspace_dir / "tasks.json"
+        tasks_data = {
+            "workspace_id": workspace_id,
+            "tasks": [
+                {
+                    "task_id": "task-001",
+                    "status": "completed",
+                    "code_files": [str(warning_file)],
+                },
+                {
+                    "task_id": "task-002",
+                    "status": "completed",
+                    "code_files": [str(broken_file)],
+                },
+            ],
+        }
+        with open(tasks_file, "w", encoding="utf-8") as f:
+            json.dump(tasks_data, f, ensure_ascii=False, indent=2)
+
+        # Act
+        warning_result = review_code(workspace_id, "task-001")
+        broken_result = review_code(workspace_id, "task-002")
+
+        # Assert
+        assert warning_result["passed"] is True
+        assert [f["rule"] for f in warning_result["findings"]] == ["unused_import"]
+        assert warning_result["summary"] == {"error": 0, "warning": 1, "info": 0}
+        assert broken_result["passed"] is False
+        assert broken_result["findings"][0]["rule"] == "syntax"
+        assert "❌" in broken_result["review_report"]
+
+    def test_review_code_reuses_cached_findings(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试重复审查时内容未变化的文件使用缓存的结果。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+
+        config = Config()
+        workspace_dir = config.get_workspace_path(workspace_id)
+
+        code_file = temp_dir / "cached.py"
+        code_file.write_text('"""模块。"""\n\nimport os\n')
+        tasks_file = workspace_dir / "tasks.json"
+        tasks_data = {
+            "workspace_id": workspace_id,
+            "tasks": [
+                {
+                    "task_id": "task-001",
+                    "status": "completed",
+                    "code_files": [str(code_file)],
+                }
+            ],
+        }
+        with open(tasks_file, "w", encoding="utf-8") as f:
+            json.dump(tasks_data, f, ensure_ascii=False, indent=2)
+        first = review_code(workspace_id, "task-001")
+
+        def fail_review_file(*args):
+            raise AssertionError("内容未变化的文件不应重新审查")
+
+        monkeypatch.setattr(review_engine, "review_file", fail_review_file)
+
+        # Act
+        second = review_code(workspace_id, "task-001")
+
+        # Assert
+        assert second["findings"] == first["findings"]
+        assert len(list((workspace_dir / "review_cache").glob("*.json"))) == 1
@@ -1,11 +1,44 @@
 """覆盖率分析工具测试 - TDD 第一步：编写失败的测试。"""
 
+import os
+import subprocess
 from pathlib import Path
+from unittest.mock import MagicMock
 
+import pytest
+
+from src.core.config import Config
+from src.tools import coverage_analyzer
 from src.tools.coverage_analyzer import analyze_coverage
 from tests.conftest import create_test_workspace
 
 
+@pytest.fixture(autouse=True)
+def reset_coverage_probe():
+    """每个测试重新检测 coverage 工具（检测结果在进程内缓存）。"""
+    coverage_analyzer._coverage_probe.clear()
+    yield
+    coverage_analyzer._coverage_probe.clear()
+
+
+def _fake_coverage(calls: list, percent: float = 80.0):
+    """模拟 coverage 命令，记录每次调用的参数。"""
+
+    def mock_run(cmd, **kwargs):
+        calls.append((cmd, kwargs))
+        if "json" in cmd:
+            return MagicMock(
+                returncode=0, stdout=f'{{"totals": {{"percent_covered": {percent}}}}}'
+            )
+        if "html" in cmd:
+            report_dir = Path(cmd[cmd.index("-d") + 1])
+            report_dir.mkdir(parents=True, exist_ok=True)
+            (report_dir / "index.html").write_text("<html></html>")
+        return MagicMock(returncode=0, stdout="")
+
+    return mock_run
+
+
 class TestCoverageAnalyzer:
     """覆盖率分析工具测试类。"""
 
@@ -282,3 +315,335 @@ class TestCoverageAnalyzer:
         # 即使 HTML 报告生成失败，也应该返回成功
         assert result["success"] is True
         assert "coverage" in result
+
+    def test_estimate_coverage_uses_file_index(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试估算覆盖率基于文件索引，忽略虚拟环境等目录。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        (sample_project_dir / "module.py").write_text("def func():\n    return 1\n")
+        (sample_project_dir / "test_module.py").write_text("def test_func(): ...\n")
+        venv_dir = sample_project_dir / "venv" / "lib"
+        venv_dir.mkdir(parents=True)
+        for i in range(8):
+            (venv_dir / f"site_{i}.py").write_text("")
+
+        import subprocess
+
+        def mock_run(*args, **kwargs):
+            raise FileNotFoundError("coverage command not found")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+
+        # Act
+        result = analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert result["coverage"] == 50.0
+        index_dir = Config().cache_dir / "file-index"
+        assert len(list(index_dir.glob("*.json"))) == 1
+
+    def test_analyze_coverage_runs_tests_once_and_reports_in_parallel(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试只运行一次测试，数据文件写入工作区，JSON 报告从 stdout 解析。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        (sample_project_dir / "module.py").write_text("x = 1\n")
+        monkeypatch.setenv("COVERAGE_RUN_TIMEOUT", "42")
+        calls = []
+        monkeypatch.setattr(subprocess, "run", _fake_coverage(calls))
+
+        # Act
+        result = analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert result["coverage"] == 80.0
+        assert result["cached"] is False
+        assert Path(result["coverage_report_path"]).exists()
+        commands = [cmd[3] for cmd, _ in calls]
+        assert commands[:2] == ["--version", "run"]
+        assert sorted(commands[2:]) == ["html", "json"]
+        run_kwargs = calls[1][1]
+        assert run_kwargs["timeout"] == 42.0
+        workspace_dir = Config().get_workspace_path(workspace_id)
+        assert run_kwargs["env"]["COVERAGE_FILE"] == str(workspace_dir / ".coverage")
+
+    def test_analyze_coverage_probes_tool_once_per_process(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试 coverage 工具不可用的结果在进程内缓存。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        calls = []
+
+        def mock_run(cmd, **kwargs):
+            calls.append(cmd)
+            return MagicMock(returncode=1, stdout="")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+
+        # Act
+        analyze_coverage(workspace_id, str(sample_project_dir))
+        analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert calls == [["python3", "-m", "coverage", "--version"]]
+
+    def test_analyze_coverage_returns_cached_result_for_unchanged_project(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试项目未变化时直接返回缓存结果，源文件变化后重新运行。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        module = sample_project_dir / "module.py"
+        module.write_text("x = 1\n")
+        calls = []
+        monkeypatch.setattr(subprocess, "run", _fake_coverage(calls))
+        first = analyze_coverage(workspace_id, str(sample_project_dir))
+        calls.clear()
+
+        # Act
+        second = analyze_coverage(workspace_id, str(sample_project_dir))
+        module.write_text("x = 100\n")
+        third = analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert second["cached"] is True
+        assert second["coverage"] == first["coverage"]
+        assert second["coverage_report_path"] == first["coverage_report_path"]
+        assert third["cached"] is False
+        assert [cmd[3] for cmd, _ in calls][0] == "run"
+
+    def test_analyze_coverage_cache_follows_file_content(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试缓存指纹取决于文件内容：只修改 mtime 时命中，刚写入的文件大小和 mtime 不变但内容变化时失效。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        module = sample_project_dir / "module.py"
+        module.write_text("x = 1\n")
+        monkeypatch.setattr(subprocess, "run", _fake_coverage([]))
+        analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Act
+        old_mtime = module.stat().st_mtime_ns - 10_000_000_000
+        os.utime(module, ns=(old_mtime, old_mtime))
+        touched = analyze_coverage(workspace_id, str(sample_project_dir))
+        # 模拟粗粒度时间戳：同一时间单位内写入相同大小的新内容
+        recent_mtime = module.stat().st_mtime_ns + 10_000_000_000
+        os.utime(module, ns=(recent_mtime, recent_mtime))
+        analyze_coverage(workspace_id, str(sample_project_dir))
+        module.write_text("x = 2\n")
+        os.utime(module, ns=(recent_mtime, recent_mtime))
+        changed = analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert touched["cached"] is True
+        assert changed["cached"] is False
+
+    def test_targeted_analysis_keeps_full_report(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试定向分析使用单独的数据文件和报告目录，缓存的全量结果仍指向未过滤的报告。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        module = sample_project_dir / "module.py"
+        module.write_text("x = 1\n")
+        (sample_project_dir / "test_module.py").write_text("import module\n")
+        data_files = []
+
+        def mock_run(cmd, **kwargs):
+            data_files.append(kwargs["env"]["COVERAGE_FILE"])
+            if "json" in cmd:
+                return MagicMock(
+                    returncode=0, stdout='{"totals": {"percent_covered": 80.0}}'
+                )
+            if "html" in cmd:
+                report_dir = Path(cmd[cmd.index("-d") + 1])
+                report_dir.mkdir(parents=True, exist_ok=True)
+                include = [arg for arg in cmd if arg.startswith("--include=")]
+                (report_dir / "index.html").write_text(" ".join(include) or "all")
+            return MagicMock(returncode=0, stdout="")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        monkeypatch.setattr(coverage_analyzer, "_coverage_available", lambda t: True)
+
+        # Act
+        full = analyze_coverage(workspace_id, str(sample_project_dir))
+        full_data_files = set(data_files)
+        data_files.clear()
+        targeted = analyze_coverage(
+            workspace_id, str(sample_project_dir), source_files=[str(module)]
+        )
+        cached_full = analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert targeted["coverage_report_path"] != full["coverage_report_path"]
+        assert "--include=" in Path(targeted["coverage_report_path"]).read_text()
+        assert set(data_files).isdisjoint(full_data_files)
+        assert cached_full["cached"] is True
+        assert cached_full["coverage_report_path"] == full["coverage_report_path"]
+        assert Path(cached_full["coverage_report_path"]).read_text() == "all"
+
+    def test_cached_result_requires_its_own_report(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试报告被之后的分析重新生成后，之前的缓存结果不再命中。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        module = sample_project_dir / "module.py"
+        module.write_text("x = 1\n")
+        monkeypatch.setattr(subprocess, "run", _fake_coverage([]))
+        first = analyze_coverage(workspace_id, str(sample_project_dir))
+        module.write_text("x = 22\n")
+        analyze_coverage(workspace_id, str(sample_project_dir))
+        report = Path(first["coverage_report_path"])
+        mtime = report.stat().st_mtime_ns + 1_000_000_000
+        os.utime(report, ns=(mtime, mtime))
+
+        # Act
+        module.write_text("x = 1\n")
+        result = analyze_coverage(workspace_id, str(sample_project_dir))
+
+        # Assert
+        assert result["cached"] is False
+
+    def test_include_pattern_escapes_commas_and_wildcards(self):
+        """测试 --include 模式中路径的逗号和通配符替换为单字符通配符。"""
+        # Act
+        pattern = coverage_analyzer._include_pattern(Path("/src/a,b/[x]*?.py"))
+
+        # Assert
+        assert pattern == "/src/a?b/?x???.py"
+
+    def test_analyze_coverage_shards_tests_across_workers(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试分片并行运行测试，合并数据文件并返回每个分片的耗时。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        tests_dir = sample_project_dir / "tests"
+        tests_dir.mkdir()
+        (tests_dir / "test_big.py").write_text("def test_a(): ...\n" * 50)
+        (tests_dir / "test_small.py").write_text("def test_b(): ...\n")
+        (tests_dir / "test_tiny.py").write_text("")
+        (tests_dir / "helpers.py").write_text("")
+        (sample_project_dir / "module.py").write_text("x = 1\n")
+        calls = []
+        monkeypatch.setattr(subprocess, "run", _fake_coverage(calls))
+
+        # Act
+        result = analyze_coverage(
+            workspace_id, str(sample_project_dir), parallel_workers=2
+        )
+
+        # Assert
+        shard_commands = sorted(cmd[7:] for cmd, _ in calls if "-p" in cmd)
+        assert shard_commands == [
+            ["tests/test_big.py"],
+            ["tests/test_small.py", "tests/test_tiny.py"],
+        ]
+        commands = [cmd[3] for cmd, _ in calls]
+        assert commands.index("combine") > max(
+            i for i, cmd in enumerate(commands) if cmd == "run"
+        )
+        assert commands.index("json") > commands.index("combine")
+        assert [shard["shard"] for shard in result["shards"]] == [0, 1]
+        assert sum(shard["test_files"] for shard in result["shards"]) == 3
+        assert all(shard["duration"] >= 0 for shard in result["shards"])
+        assert result["coverage"] == 80.0
+
+    def test_analyze_coverage_for_source_files(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试定向分析只运行导入指定源文件的测试，并返回每个文件的覆盖率。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        pkg_dir = sample_project_dir / "src" / "app"
+        pkg_dir.mkdir(parents=True)
+        (pkg_dir / "__init__.py").write_text("")
+        (pkg_dir / "login.py").write_text("def login(): ...\n")
+        (pkg_dir / "orders.py").write_text("def order(): ...\n")
+        tests_dir = sample_project_dir / "tests"
+        tests_dir.mkdir()
+        (tests_dir / "test_login.py").write_text("from app.login import login\n")
+        (tests_dir / "test_login_views.py").write_text("from app import login\n")
+        (tests_dir / "test_orders.py").write_text("import app.orders\n")
+        calls = []
+
+        def mock_run(cmd, **kwargs):
+            calls.append((cmd, kwargs))
+            if "json" in cmd:
+                login_path = pkg_dir.resolve() / "login.py"
+                return MagicMock(
+                    returncode=0,
+                    stdout=(
+                        '{"totals": {"percent_covered": 75.0}, "files": '
+                        f'{{"{login_path}": {{"summary": {{"percent_covered": 75.0}}}}}}}}'
+                    ),
+                )
+            return MagicMock(returncode=0, stdout="")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+
+        # Act
+        result = analyze_coverage(
+            workspace_id,
+            str(sample_project_dir),
+            source_files=[str(pkg_dir / "login.py"), "README.md"],
+        )
+
+        # Assert
+        run_command = next(cmd for cmd, _ in calls if "run" in cmd and "-m" in cmd[4:])
+        assert run_command[-2:] == ["tests/test_login.py", "tests/test_login_views.py"]
+        json_command = next(cmd for cmd, _ in calls if "json" in cmd)
+        assert json_command[-1] == f"--include={pkg_dir.resolve() / 'login.py'}"
+        assert result["test_files"] == [
+            "tests/test_login.py",
+            "tests/test_login_views.py",
+        ]
+        assert result["file_coverage"] == {"src/app/login.py": 75.0}
+        assert result["coverage"] == 75.0
+
+    def test_analyze_coverage_for_untested_source_files(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试没有测试导入指定源文件时不运行 coverage，覆盖率为 0。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        (sample_project_dir / "module.py").write_text("x = 1\n")
+        calls = []
+        monkeypatch.setattr(subprocess, "run", _fake_coverage(calls))
+
+        # Act
+        result = analyze_coverage(
+            workspace_id, str(sample_project_dir), source_files=["module.py"]
+        )
+
+        # Assert
+        assert calls == []
+        assert result["coverage"] == 0.0
+        assert result["file_coverage"] == {"module.py": 0.0}
+        assert result["test_files"] == []
@@ -83,3 +83,120 @@ class TestPRDGenerator:
         assert prd_path.exists()
         assert prd_path.suffix == ".md"
         assert "PRD" in prd_path.name or "prd" in prd_path.name.lower()
+
+    def test_generate_prd_from_large_html_requirement(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试大型 HTML 需求文档只保留前 REQUIREMENT_MAX_CHARS 个字符和章节大纲。"""
+        # Arrange
+        monkeypatch.setenv("REQUIREMENT_MAX_CHARS", "300")
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        requirement_file = temp_dir / "export.html"
+        sections = "".join(
+            f"<h2>模块 {i}</h2><p>{'需求描述' * 200}</p>" for i in range(50)
+        )
+        requirement_file.write_text(
+            f"<html><body><h1>用户中心</h1>{sections}</body></html>", encoding="utf-8"
+        )
+        prompts = []
+
+        def fake_generate_text(request, config):
+            prompts.append(request.prompt)
+            return request.fallback
+
+        monkeypatch.setattr("src.tools.prd_generator.generate_text", fake_generate_text)
+
+        # Act
+        result = generate_prd(workspace_id, str(requirement_file))
+
+        # Assert
+        prd_content = Path(result["prd_path"]).read_text(encoding="utf-8")
+        assert "<h2>" not in prd_content
+        assert "- 用户中心\n  - 模块 0\n" in prd_content
+        assert "  - 模块 49" in prd_content
+        assert "需求文档共" in prompts[0]
+        assert len(prompts[0]) < 2000
+
+    def test_generate_prd_from_fetched_url(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试 URL 需求文档按下载结果的编码和内容类型读取。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        body_path = temp_dir / "cached.body"
+        body_path.write_bytes("<h1>登录需求</h1><p>支持短信验证码</p>".encode("gbk"))
+        fetched_urls = []
+
+        def fake_fetch(self, url):
+            fetched_urls.append(url)
+            return {
+                "url": url,
+                "path": str(body_path),
+                "content_type": "text/html",
+                "encoding": "gbk",
+                "status": "not_modified",
+                "size": body_path.stat().st_size,
+            }
+
+        monkeypatch.setattr(
+            "src.tools.prd_generator.RequirementFetcher.fetch", fake_fetch
+        )
+
+        # Act
+        result = generate_prd(workspace_id, "https://example.com/wiki/page")
+
+        # Assert
+        prd_content = Path(result["prd_path"]).read_text(encoding="utf-8")
+        assert fetched_urls == ["https://example.com/wiki/page"]
+        assert "# 登录需求\n\n支持短信验证码" in prd_content
+        assert "- 登录需求" in prd_content
+
+    def test_generate_prd_skips_unchanged_requirement(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试需求未变化时不重新生成 PRD，force、需求变化或 modify_prd 后重新生成。"""
+        # Arrange
+        from src.tools.prd_confirmation import modify_prd
+
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        requirement_file = temp_dir / "requirement.md"
+        requirement_file.write_text("# 需求\n\n第一版", encoding="utf-8")
+        generated = []
+
+        def fake_generate_text(request, config):
+            generated.append(request.prompt)
+            return request.fallback
+
+        monkeypatch.setattr("src.tools.prd_generator.generate_text", fake_generate_text)
+
+        # Act & Assert
+        first = generate_prd(workspace_id, str(requirement_file))
+        Path(first["prd_path"]).write_text("# 手工修改的 PRD", encoding="utf-8")
+        second = generate_prd(workspace_id, str(requirement_file))
+        assert first["skipped"] is False
+        assert second["skipped"] is True
+        assert len(generated) == 1
+        assert (
+            Path(second["prd_path"]).read_text(encoding="utf-8") == "# 手工修改的 PRD"
+        )
+
+        assert (
+            generate_prd(workspace_id, str(requirement_file), force=True)["skipped"]
+            is False
+        )
+
+        requirement_file.write_text("# 需求\n\n第二版", encoding="utf-8")
+        assert generate_prd(workspace_id, str(requirement_file))["skipped"] is False
+
+        modify_prd(workspace_id)
+        assert generate_prd(workspace_id, str(requirement_file))["skipped"] is False
+        assert len(generated) == 4
+
+        workspace = workspace_manager.get_workspace(workspace_id)
+        assert len(workspace["fingerprints"]["prd"]) == 64
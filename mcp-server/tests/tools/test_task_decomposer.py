@@ -301,3 +301,187 @@ class TestTaskDecomposer:
             # 验证状态被标记为失败
             workspace = workspace_manager.get_workspace(workspace_id)
             assert workspace["status"]["tasks_status"] == "failed"
+
+    def test_decompose_tasks_uses_llm_response(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试使用 LLM 返回的任务列表，响应无效时使用规则分解的结果。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        config = Config()
+        trd_file = config.get_workspace_path(workspace_id) / "TRD.md"
+        trd_file.write_text("# TRD: 测试需求")
+        workspace_manager.update_workspace_status(
+            workspace_id, {"trd_status": "completed"}
+        )
+        responses = [
+            '```json\n[{"description": "实现登录接口"}, "实现注册接口"]\n```',
+            "无法解析的响应",
+        ]
+        monkeypatch.setattr(
+            "src.tools.task_decomposer.generate_text",
+            lambda request, config: responses.pop(0),
+        )
+
+        # Act
+        result = decompose_tasks(workspace_id, str(trd_file))
+        tasks = json.loads(Path(result["tasks_json_path"]).read_text(encoding="utf-8"))
+        fallback_result = decompose_tasks(workspace_id, str(trd_file))
+
+        # Assert
+        assert [task["task_id"] for task in tasks["tasks"]] == ["task-001", "task-002"]
+        assert [task["description"] for task in tasks["tasks"]] == [
+            "实现登录接口",
+            "实现注册接口",
+        ]
+        assert [task["depends_on"] for task in tasks["tasks"]] == [[], []]
+        assert tasks["graph"]["levels"] == [["task-001", "task-002"]]
+        # 响应无效时使用规则分解的默认任务
+        assert fallback_result["task_count"] == 1
+
+    def test_decompose_tasks_from_section_tree(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试按标题树生成任务：只有标题匹配的章节生成任务，并记录上级任务。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        config = Config()
+        trd_file = config.get_workspace_path(workspace_id) / "TRD.md"
+        trd_file.write_text(
+            "# TRD\n\n"
+            "## 背景\n需要实现统一的认证服务，替换旧系统。\n\n"
+            "## 实现方案\n认证服务拆分为登录和注册两个模块。\n\n"
+            "### 功能1：用户登录\n支持用户名密码登录和记住登录状态。\n"
+            "```\n## 功能：代码块中的标题\n```\n\n"
+            "### 功能2：用户注册\n支持邮箱注册和发送验证邮件。\n",
+            encoding="utf-8",
+        )
+        workspace_manager.update_workspace_status(
+            workspace_id, {"trd_status": "completed"}
+        )
+        monkeypatch.setattr(
+            "src.tools.task_decomposer.generate_text",
+            lambda request, config: request.fallback,
+        )
+
+        # Act
+        result = decompose_tasks(workspace_id, str(trd_file))
+        tasks = json.loads(Path(result["tasks_json_path"]).read_text(encoding="utf-8"))[
+            "tasks"
+        ]
+
+        # Assert - 「背景」正文包含「实现」但标题不匹配，不生成任务
+        assert [task["title"] for task in tasks] == [
+            "实现方案",
+            "功能1：用户登录",
+            "功能2：用户注册",
+        ]
+        assert tasks[0]["parent_task_id"] is None
+        assert tasks[1]["parent_task_id"] == tasks[0]["task_id"]
+        assert tasks[2]["parent_task_id"] == tasks[0]["task_id"]
+        assert tasks[0]["estimated_size"] > tasks[1]["estimated_size"]
+        assert len({task["section_id"] for task in tasks}) == 3
+        # 任务ID由章节 ID 计算，细节任务依赖上级任务
+        assert [task["task_id"] for task in tasks] == [
+            "task-" + task["section_id"][len("sec-") :] for task in tasks
+        ]
+        assert [task["depends_on"] for task in tasks] == [
+            [],
+            [tasks[0]["task_id"]],
+            [tasks[0]["task_id"]],
+        ]
+        assert result["level_count"] == 2
+        assert result["critical_path"][0] == tasks[0]["task_id"]
+
+    def test_decompose_tasks_keeps_task_ids_when_sections_added(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试在前面插入新章节后，已有章节的任务ID不变。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        config = Config()
+        trd_file = config.get_workspace_path(workspace_id) / "TRD.md"
+        login = "## 功能：用户登录\n支持用户名密码登录和记住登录状态。\n"
+        workspace_manager.update_workspace_status(
+            workspace_id, {"trd_status": "completed"}
+        )
+        monkeypatch.setattr(
+            "src.tools.task_decomposer.generate_text",
+            lambda request, config: request.fallback,
+        )
+
+        def task_ids(trd_content: str) -> dict[str, str]:
+            trd_file.write_text(trd_content, encoding="utf-8")
+            result = decompose_tasks(workspace_id, str(trd_file))
+            tasks = json.loads(
+                Path(result["tasks_json_path"]).read_text(encoding="utf-8")
+            )["tasks"]
+            return {task["title"]: task["task_id"] for task in tasks}
+
+        # Act
+        before = task_ids("# TRD\n\n" + login)
+        after = task_ids(
+            "# TRD\n\n## 功能：用户注册\n支持邮箱注册和发送验证邮件。\n\n" + login
+        )
+
+        # Assert
+        assert after["功能：用户登录"] == before["功能：用户登录"]
+        assert after["功能：用户注册"] != before["功能：用户登录"]
+
+    def test_decompose_tasks_uses_llm_dependencies(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试 LLM 返回的依赖：只保留指向前面任务的依赖，并生成依赖图。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        config = Config()
+        trd_file = config.get_workspace_path(workspace_id) / "TRD.md"
+        trd_file.write_text("# TRD: 测试需求")
+        workspace_manager.update_workspace_status(
+            workspace_id, {"trd_status": "completed"}
+        )
+        response = json.dumps(
+            [
+                {"description": "设计数据模型", "depends_on": [2]},
+                {"description": "实现登录接口", "depends_on": [1]},
+                {"description": "实现注册接口", "depends_on": "task-001"},
+                {"description": "编写集成测试", "depends_on": [2, 3, 4, 0]},
+            ],
+            ensure_ascii=False,
+        )
+        monkeypatch.setattr(
+            "src.tools.task_decomposer.generate_text",
+            lambda request, config: response,
+        )
+
+        # Act
+        result = decompose_tasks(workspace_id, str(trd_file))
+        tasks_data = json.loads(
+            Path(result["tasks_json_path"]).read_text(encoding="utf-8")
+        )
+
+        # Assert - 指向自身、后面任务或不存在任务的依赖被丢弃
+        assert [task["depends_on"] for task in tasks_data["tasks"]] == [
+            [],
+            ["task-001"],
+            ["task-001"],
+            ["task-002", "task-003"],
+        ]
+        assert tasks_data["graph"]["levels"] == [
+            ["task-001"],
+            ["task-002", "task-003"],
+            ["task-004"],
+        ]
+        assert tasks_data["graph"]["critical_path"] == [
+            "task-001",
+            "task-002",
+            "task-004",
+        ]
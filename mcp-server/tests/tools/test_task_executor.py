@@ -1,11 +1,13 @@
 """任务执行工具测试 - TDD 第四步：编写单元测试。"""
 
+import time
 from unittest.mock import patch
 
 import pytest
 
-from src.core.exceptions import TaskNotFoundError
-from src.tools.task_executor import execute_all_tasks, execute_task
+from src.core.exceptions import TaskNotFoundError, ValidationError
+from src.tools import task_executor
+from src.tools.task_executor import execute_all_tasks, execute_task, get_task_plan
 from tests.conftest import create_test_workspace
 
 
@@ -605,8 +607,8 @@ class TestTaskExecutor:
         from src.managers.task_manager import TaskManager
 
         task_manager = TaskManager()
-        # 直接写入一个缺少 task_id 的任务到 tasks.json
-        tasks_file = task_manager.get_tasks_file(workspace_id)
+        # 直接写入一个缺少 task_id 的任务到 tasks.json（JSON 存储后端）
+        tasks_file = task_manager.config.get_workspace_path(workspace_id) / "tasks.json"
         tasks_file.parent.mkdir(parents=True, exist_ok=True)
         import json
 
@@ -649,3 +651,245 @@ class TestTaskExecutor:
             assert result["completed_tasks"] == 1  # 只有1个有效任务被执行
             assert result["failed_tasks"] == 0
             assert mock_execute.call_count == 1  # 只执行了1个任务（另一个被跳过）
+
+    def test_execute_all_tasks_runs_in_parallel_and_honours_dependencies(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试任务并发执行、遵守 depends_on，且结果按任务列表顺序返回。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager=workspace_manager,
+            project_dir=sample_project_dir,
+        )
+
+        from src.managers.task_manager import TaskManager
+
+        task_manager = TaskManager()
+        task_manager.update_tasks_bulk(
+            workspace_id,
+            {
+                "task-001": {"status": "pending"},
+                "task-002": {"status": "pending"},
+                "task-003": {"status": "pending"},
+                "task-004": {"status": "pending", "depends_on": ["task-001"]},
+            },
+        )
+        started = {}
+        finished = []
+
+        def fake_execute(
+            workspace_id, task_id, max_review_retries=3, generate_result=None
+        ):
+            started[task_id] = list(finished)
+            time.sleep(0.1)
+            finished.append(task_id)
+            return {
+                "success": True,
+                "task_id": task_id,
+                "workspace_id": workspace_id,
+                "passed": True,
+                "retry_count": 0,
+                "review_report": "审查通过",
+                "code_files": [],
+            }
+
+        # Act
+        with patch("src.tools.task_executor.execute_task", side_effect=fake_execute):
+            start = time.monotonic()
+            result = execute_all_tasks(workspace_id, max_parallel_tasks=3)
+            elapsed = time.monotonic() - start
+
+        # Assert
+        assert result["success"] is True
+        assert result["completed_tasks"] == 4
+        assert [r["task_id"] for r in result["task_results"]] == [
+            "task-001",
+            "task-002",
+            "task-003",
+            "task-004",
+        ]
+        assert "task-001" in started["task-004"]
+        assert elapsed < 0.35  # 顺序执行需要 0.4 秒
+
+    def test_execute_all_tasks_skips_tasks_with_failed_dependency(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试依赖任务失败时，下游任务不执行并记为失败。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager=workspace_manager,
+            project_dir=sample_project_dir,
+        )
+
+        from src.managers.task_manager import TaskManager
+
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {
+                "task-001": {"status": "pending"},
+                "task-002": {"status": "pending", "depends_on": "task-001"},
+            },
+        )
+
+        # Act
+        with patch("src.tools.task_executor.execute_task") as mock_execute:
+            mock_execute.return_value = {
+                "success": False,
+                "task_id": "task-001",
+                "workspace_id": workspace_id,
+                "passed": False,
+                "retry_count": 3,
+                "review_report": "需要修复",
+                "code_files": [],
+                "error": "达到最大重试次数",
+            }
+            result = execute_all_tasks(workspace_id)
+
+        # Assert
+        assert mock_execute.call_count == 1
+        assert result["success"] is False
+        assert result["failed_tasks"] == 2
+        assert result["task_results"][1]["task_id"] == "task-002"
+        assert result["task_results"][1]["error"] == "依赖任务未完成: task-001"
+
+    def test_execute_all_tasks_reports_progress_per_task(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试每个任务完成时报告进度。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+        from src.utils.progress import progress_reporter
+
+        workspace_id = create_test_workspace(
+            workspace_manager=workspace_manager,
+            project_dir=sample_project_dir,
+        )
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {f"task-00{i}": {"status": "pending"} for i in range(1, 4)},
+        )
+        reports = []
+
+        # Act
+        with (
+            patch("src.tools.task_executor.execute_task") as mock_execute,
+            progress_reporter(lambda *args: reports.append(args)),
+        ):
+            mock_execute.side_effect = lambda workspace_id, task_id, **kwargs: {
+                "success": True,
+                "task_id": task_id,
+                "passed": task_id != "task-002",
+            }
+            execute_all_tasks(workspace_id, max_parallel_tasks=1)
+
+        # Assert
+        assert reports == [
+            (0, 3, "开始执行 3 个任务"),
+            (1, 3, "任务 task-001 完成"),
+            (2, 3, "任务 task-002 失败"),
+            (3, 3, "任务 task-003 完成"),
+            (3, 3, "所有任务执行完成"),
+        ]
+
+    def test_execute_all_tasks_generates_ready_tasks_in_one_batch(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试没有待处理依赖的任务一次批量生成代码，有依赖的任务单独生成。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+
+        workspace_id = create_test_workspace(
+            workspace_manager=workspace_manager,
+            project_dir=sample_project_dir,
+        )
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {
+                "task-001": {"status": "pending"},
+                "task-002": {"status": "pending"},
+                "task-003": {"status": "pending", "depends_on": ["task-001"]},
+            },
+        )
+        workspace_manager.update_workspace_status(
+            workspace_id, {"tasks_status": "completed"}
+        )
+
+        # Act
+        with (
+            patch(
+                "src.tools.task_executor.generate_code_batch",
+                wraps=task_executor.generate_code_batch,
+            ) as mock_batch,
+            patch(
+                "src.tools.task_executor.generate_code",
+                wraps=task_executor.generate_code,
+            ) as mock_generate,
+            patch("src.tools.task_executor.review_code") as mock_review,
+        ):
+            mock_review.return_value = {"success": True, "passed": True}
+            result = execute_all_tasks(workspace_id, max_parallel_tasks=2)
+
+        # Assert
+        assert result["completed_tasks"] == 3
+        mock_batch.assert_called_once_with(workspace_id, ["task-001", "task-002"])
+        assert [c.args[1] for c in mock_generate.call_args_list] == ["task-003"]
+        assert result["task_results"][0]["code_files"][0].endswith("task_001.py")
+
+    def test_get_task_plan(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试执行计划：已完成的任务不参与规划，对它们的依赖视为已满足。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+
+        workspace_id = create_test_workspace(
+            workspace_manager=workspace_manager,
+            project_dir=sample_project_dir,
+        )
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {
+                "task-001": {"status": "completed"},
+                "task-002": {"status": "pending", "depends_on": ["task-001"]},
+                "task-003": {"status": "pending", "depends_on": ["task-001"]},
+                "task-004": {
+                    "status": "pending",
+                    "depends_on": ["task-002", "task-003"],
+                },
+            },
+        )
+
+        # Act
+        plan = get_task_plan(workspace_id)
+        full_plan = get_task_plan(workspace_id, include_completed=True)
+
+        # Assert
+        assert plan["total_tasks"] == 3
+        assert plan["batches"] == [["task-002", "task-003"], ["task-004"]]
+        assert plan["max_parallelism"] == 2
+        assert plan["critical_path"] == ["task-002", "task-004"]
+        assert full_plan["batches"][0] == ["task-001"]
+        assert full_plan["critical_path_weight"] == 3
+
+    def test_get_task_plan_rejects_cycle(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试任务存在循环依赖时抛出 ValidationError。"""
+        # Arrange
+        from src.managers.task_manager import TaskManager
+
+        workspace_id = create_test_workspace(
+            workspace_manager=workspace_manager,
+            project_dir=sample_project_dir,
+        )
+        TaskManager().update_tasks_bulk(
+            workspace_id,
+            {
+                "task-001": {"status": "pending", "depends_on": "task-002"},
+                "task-002": {"status": "pending", "depends_on": "task-001"},
+            },
+        )
+
+        # Act & Assert
+        with pytest.raises(ValidationError, match="循环依赖"):
+            get_task_plan(workspace_id)
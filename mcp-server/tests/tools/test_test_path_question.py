@@ -382,8 +382,11 @@ class TestTestPathQuestion:
         workspace_id = create_test_workspace(workspace_manager, sample_project_dir)
         test_path = str(sample_project_dir / "tests" / "mock")
 
-        # Mock json.dump 抛出异常
-        with patch("json.dump", side_effect=RuntimeError("Unexpected error")):
+        # Mock 原子写入抛出异常
+        with patch(
+            "src.tools.test_path_question.WorkspaceManager.update_workspace_files",
+            side_effect=RuntimeError("Unexpected error"),
+        ):
             with pytest.raises(ValidationError, match="提交测试路径失败"):
                 submit_test_path(workspace_id, test_path)
 
@@ -393,7 +396,7 @@ class TestTestPathQuestion:
         """测试在文件锁内检查 meta_file 不存在。
 
         验证当在文件锁内检查 meta_file 不存在时抛出 WorkspaceNotFoundError。
-        这覆盖了第 175 行的检查。
+        这覆盖了 JSON 存储后端在文件锁内的检查。
         """
         # Arrange
         workspace_id = create_test_workspace(workspace_manager, sample_project_dir)
@@ -410,10 +413,10 @@ class TestTestPathQuestion:
         # Mock file_lock 上下文管理器，在进入时删除文件
         original_file_lock = file_lock
 
-        @patch("src.tools.test_path_question.file_lock")
+        @patch("src.storage.json_backend.file_lock")
         def test_with_mock_lock(mock_lock):
             def lock_context(meta_file_path):
-                # 删除文件以触发第 175 行的检查
+                # 删除文件以触发文件锁内的检查
                 if meta_file_path == meta_file:
                     meta_file.unlink()
                 # 返回一个上下文管理器
@@ -1,6 +1,10 @@
 """测试审查工具测试 - TDD 第一步：编写失败的测试。"""
 
+import pytest
+
+from src.core.config import Config
 from src.tools.test_reviewer import review_tests
+from tests.conftest import create_test_workspace
 
 
 class TestTestReviewer:
@@ -36,3 +40,123 @@ class TestTestReviewer:
         # Assert
         assert result["success"] is True
         assert "passed" in result
+
+    def test_review_tests_caches_results_in_workspace(
+        self, temp_dir, workspace_manager, sample_project_dir
+    ):
+        """测试每个文件的检查结果按内容哈希缓存在工作区中。"""
+        # Arrange
+        workspace_id = create_test_workspace(workspace_manager, sample_project_dir)
+        test_file = temp_dir / "test_example.py"
+        test_file.write_text("def test_example():\n    assert True")
+        cache_dir = Config().get_workspace_path(workspace_id) / "review_cache"
+
+        # Act
+        first = review_tests(workspace_id, [str(test_file)])
+        second = review_tests(workspace_id, [str(test_file)])
+
+        # Assert
+        assert len(list(cache_dir.glob("*.json"))) == 1
+        assert second["review_report"] == first["review_report"]
+
+    def test_review_tests_few_files_run_in_process(self, temp_dir, monkeypatch):
+        """测试只有少量测试文件时在当前进程中解析，不启动进程池。"""
+        # Arrange
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setenv("REVIEW_WORKERS", "4")
+        monkeypatch.setattr(
+            "src.utils.review_engine._get_pool",
+            lambda workers: pytest.fail("不应该创建进程池"),
+        )
+        test_files = []
+        for name in ("test_a.py", "test_b.py"):
+            path = temp_dir / name
+            path.write_text("def test_example():\n    assert 1 + 1 == 2\n")
+            test_files.append(str(path))
+
+        # Act
+        result = review_tests("test-workspace-003", test_files)
+
+        # Assert
+        assert result["passed"] is True
+        assert result["metrics"]["tests"] == 2
+
+    def test_review_tests_returns_structured_metrics(self, temp_dir, monkeypatch):
+        """测试统计测试、断言、fixture 和 mock，并标记空测试和无效断言。"""
+        # Arrange
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        test_file = temp_dir / "test_service.py"
+        test_file.write_text(
+            "import pytest\n"
+            "from unittest.mock import MagicMock, patch\n"
+            "\n\n"
+            "@pytest.fixture\n"
+            "def client():\n"
+            "    return MagicMock()\n"
+            "\n\n"
+            "@patch('service.load')\n"
+            "def test_load(mock_load, client):\n"
+            "    assert client.get() is not None\n"
+            "    mock_load.assert_called_once()\n"
+            "\n\n"
+            "def test_empty():\n"
+            "    pass\n"
+            "\n\n"
+            "class TestService:\n"
+            "    def test_always_true(self):\n"
+            "        assert True\n"
+            "\n"
+            "    def test_raises(self):\n"
+            "        with pytest.raises(ValueError):\n"
+            "            int('x')\n"
+        )
+
+        # Act
+        result = review_tests("test-workspace-003", [str(test_file)])
+
+        # Assert
+        assert result["passed"] is True
+        assert result["metrics"] == {
+            "files": 1,
+            "tests": 4,
+            "assertions": 4,
+            "assertions_per_test": 1.0,
+            "fixtures": 1,
+            "mocks": 2,
+            "issues": 2,
+        }
+        file_result = result["files"][0]
+        assert file_result["framework"] == "pytest"
+        assert file_result["fixtures"] == ["client"]
+        tests = {test["name"]: test for test in file_result["tests"]}
+        assert tests["test_load"]["assertions"] == 2
+        assert tests["test_load"]["fixtures"] == ["client", "mock_load"]
+        assert tests["test_empty"]["issues"] == ["empty"]
+        assert tests["TestService.test_always_true"]["issues"] == ["trivial_assertion"]
+        assert tests["TestService.test_raises"]["issues"] == []
+
+    def test_review_tests_fails_on_unparsable_or_missing_files(
+        self, temp_dir, monkeypatch
+    ):
+        """测试文件不存在或有语法错误时不通过，结果顺序与输入一致（并行解析）。"""
+        # Arrange
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setenv("REVIEW_WORKERS", "2")
+        good = temp_dir / "test_good.py"
+        good.write_text("def test_ok():\n    assert 1 + 1 == 2\n")
+        broken = temp_dir / "test_broken.py"
+        broken.write_text("def test_broken(:\n")
+        missing = str(temp_dir / "test_missing.py")
+
+        # Act
+        result = review_tests("test-workspace-004", [str(good), str(broken), missing])
+
+        # Assert
+        assert result["passed"] is False
+        assert [f["status"] for f in result["files"]] == [
+            "ok",
+            "syntax_error",
+            "missing",
+        ]
+        assert result["metrics"]["tests"] == 1
+        assert "❌" in result["review_report"]
@@ -272,3 +272,44 @@ class TestTRDGenerator:
             # 验证状态被标记为失败
             workspace = workspace_manager.get_workspace(workspace_id)
             assert workspace["status"]["trd_status"] == "failed"
+
+    def test_generate_trd_skips_unchanged_inputs(
+        self, temp_dir, monkeypatch, workspace_manager, sample_project_dir
+    ):
+        """测试 PRD 和代码库未变化时不重新生成 TRD。"""
+        # Arrange
+        workspace_id = create_test_workspace(
+            workspace_manager, sample_project_dir, requirement_name="测试需求"
+        )
+        config = Config()
+        prd_file = config.get_workspace_path(workspace_id) / "PRD.md"
+        prd_file.write_text("# PRD: 测试需求", encoding="utf-8")
+        workspace_manager.update_workspace_status(
+            workspace_id, {"prd_status": "completed"}
+        )
+        generated = []
+
+        def fake_generate_text(request, config):
+            generated.append(request.prompt)
+            return request.fallback
+
+        monkeypatch.setattr("src.tools.trd_generator.generate_text", fake_generate_text)
+
+        # Act
+        first = generate_trd(workspace_id, str(prd_file))
+        second = generate_trd(workspace_id, str(prd_file))
+        (sample_project_dir / "app.py").write_text("print('hi')\n")
+        after_code_change = generate_trd(workspace_id, str(prd_file))
+        prd_file.write_text("# PRD: 测试需求\n\n新增功能", encoding="utf-8")
+        after_prd_change = generate_trd(workspace_id, str(prd_file))
+        forced = generate_trd(workspace_id, str(prd_file), force=True)
+
+        # Assert
+        assert first["skipped"] is False
+        assert second["skipped"] is True
+        assert after_code_change["skipped"] is False
+        assert after_prd_change["skipped"] is False
+        assert forced["skipped"] is False
+        assert len(generated) == 4
+        workspace = workspace_manager.get_workspace(workspace_id)
+        assert workspace["status"]["trd_status"] == "completed"
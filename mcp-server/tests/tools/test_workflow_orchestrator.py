@@ -18,6 +18,7 @@ from src.tools.workflow_orchestrator import (
     _update_workflow_state,
     execute_full_workflow,
 )
+from src.utils.progress import progress_reporter
 from tests.conftest import create_test_workspace
 
 
@@ -135,17 +136,24 @@ class TestWorkflowOrchestrator:
             }
 
             # Act
-            result = execute_full_workflow(
-                project_path=project_path,
-                requirement_name=requirement_name,
-                requirement_url=requirement_url,
-                auto_confirm=True,
-            )
+            reports = []
+            with progress_reporter(lambda *args: reports.append(args)):
+                result = execute_full_workflow(
+                    project_path=project_path,
+                    requirement_name=requirement_name,
+                    requirement_url=requirement_url,
+                    auto_confirm=True,
+                )
 
             # Assert
             assert result["success"] is True
             assert result["workspace_id"] == workspace_id
             assert len(result["workflow_steps"]) == 8  # 8个步骤
+
+            # 验证每个步骤开始时报告进度，结束时报告完成
+            assert [progress for progress, _, _ in reports] == list(range(9))
+            assert all(total == 8 for _, total, _ in reports)
+            assert reports[4][2] == "步骤5: 任务循环执行"
             assert "final_status" in result
 
             # 验证所有步骤都已完成
@@ -0,0 +1,171 @@
+"""原子写入工具测试。"""
+
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core.config import Config
+from src.storage.json_backend import JsonStorageBackend
+from src.utils.atomic_write import (
+    dumps_json,
+    fsync_batch,
+    write_json_atomic,
+    write_text_atomic,
+)
+
+
+class TestAtomicWrite:
+    """原子写入工具测试类。"""
+
+    def test_write_json_atomic_compact_by_default(self, temp_dir):
+        """测试默认使用紧凑 JSON 格式。"""
+        # Arrange
+        target = temp_dir / "workspace.json"
+
+        # Act
+        write_json_atomic(target, {"name": "测试", "items": [1, 2]})
+
+        # Assert
+        assert target.read_text(encoding="utf-8") == '{"name":"测试","items":[1,2]}'
+
+    def test_compact_can_be_disabled(self):
+        """测试关闭紧凑格式。"""
+        # Act
+        content = dumps_json({"a": 1}, compact=False)
+
+        # Assert
+        assert content == '{\n  "a": 1\n}'
+
+    def test_json_backend_uses_storage_config(self, temp_dir, monkeypatch):
+        """测试 JSON 存储后端按 STORAGE_COMPACT_JSON / STORAGE_FSYNC 配置写入。"""
+        # Arrange
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setenv("STORAGE_COMPACT_JSON", "false")
+        monkeypatch.setenv("STORAGE_FSYNC", "0")
+        config = Config()
+        backend = JsonStorageBackend(config)
+
+        # Act
+        with patch("src.utils.atomic_write.os.fsync") as mock_fsync:
+            backend.create_workspace({"workspace_id": "req-001", "status": {}})
+
+        # Assert
+        assert config.storage_compact_json is False
+        assert config.storage_fsync is False
+        meta_file = config.get_workspace_path("req-001") / "workspace.json"
+        assert meta_file.read_text(encoding="utf-8").startswith("{\n  ")
+        mock_fsync.assert_not_called()
+
+    def test_replaces_existing_file_and_keeps_mode(self, temp_dir):
+        """测试替换已有文件并保留文件权限，不残留临时文件。"""
+        # Arrange
+        target = temp_dir / "tasks.json"
+        target.write_text("{}", encoding="utf-8")
+        os.chmod(target, 0o640)
+        old_inode = target.stat().st_ino
+
+        # Act
+        stat_result = write_json_atomic(target, {"tasks": []})
+
+        # Assert
+        assert json.loads(target.read_text(encoding="utf-8")) == {"tasks": []}
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert target.stat().st_ino != old_inode
+        assert stat_result.st_ino == target.stat().st_ino
+        assert [p.name for p in temp_dir.iterdir()] == ["tasks.json"]
+
+    def test_failed_write_keeps_original_file(self, temp_dir):
+        """测试写入失败时原文件保持不变，临时文件被清理。"""
+        # Arrange
+        target = temp_dir / "workspace.json"
+        target.write_text('{"ok": true}', encoding="utf-8")
+
+        # Act
+        with (
+            patch("src.utils.atomic_write.os.replace", side_effect=OSError("失败")),
+            pytest.raises(OSError, match="失败"),
+        ):
+            write_text_atomic(target, "new content")
+
+        # Assert
+        assert target.read_text(encoding="utf-8") == '{"ok": true}'
+        assert [p.name for p in temp_dir.iterdir()] == ["workspace.json"]
+
+    def test_fsync_can_be_disabled(self, temp_dir):
+        """测试关闭 fsync 时不调用 os.fsync。"""
+        # Act
+        with patch("src.utils.atomic_write.os.fsync") as mock_fsync:
+            write_json_atomic(temp_dir / "a.json", {}, fsync=False)
+
+        # Assert
+        mock_fsync.assert_not_called()
+
+    def test_fsync_before_replace(self, temp_dir):
+        """测试替换目标文件前已经对临时文件 fsync。"""
+        # Arrange
+        events = []
+        real_replace = os.replace
+
+        def record_replace(src, dst):
+            events.append("replace")
+            real_replace(src, dst)
+
+        # Act
+        with (
+            patch(
+                "src.utils.atomic_write.os.fsync",
+                side_effect=lambda fd: events.append("fsync"),
+            ),
+            patch("src.utils.atomic_write.os.replace", side_effect=record_replace),
+        ):
+            write_json_atomic(temp_dir / "a.json", {})
+
+        # Assert - 临时文件 fsync → 替换 → 目录 fsync
+        assert events == ["fsync", "replace", "fsync"]
+
+    def test_fsync_batch_defers_directory_fsync(self, temp_dir):
+        """测试批次内每次写入仍然 fsync 临时文件，目录 fsync 推迟到批次结束时统一执行。"""
+        # Act
+        with patch("src.utils.atomic_write.os.fsync") as mock_fsync, fsync_batch():
+            for i in range(5):
+                write_json_atomic(temp_dir / "a.json", {"i": i})
+            write_json_atomic(temp_dir / "b.json", {})
+            calls_inside_batch = mock_fsync.call_count
+
+        # Assert - 六次写入各 fsync 一次临时文件，批次结束时 fsync 一次目录
+        assert calls_inside_batch == 6
+        assert mock_fsync.call_count == 7
+
+    def test_concurrent_readers_never_see_partial_file(self, temp_dir):
+        """测试写入过程中读取方始终读到完整的 JSON。"""
+        # Arrange
+        target = temp_dir / "workspace.json"
+        payload = {"tasks": [{"task_id": f"task-{i:03d}"} for i in range(200)]}
+        write_json_atomic(target, payload, fsync=False)
+        stop = threading.Event()
+        errors = []
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    json.loads(target.read_text(encoding="utf-8"))
+                except json.JSONDecodeError as e:
+                    errors.append(e)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+
+        # Act
+        try:
+            for i in range(200):
+                payload["version"] = i
+                write_json_atomic(target, payload, fsync=False)
+        finally:
+            stop.set()
+            thread.join()
+
+        # Assert
+        assert errors == []
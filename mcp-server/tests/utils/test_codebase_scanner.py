@@ -0,0 +1,109 @@
+"""代码库扫描工具测试。"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from src.utils.codebase_scanner import scan_codebase
+
+
+def _write(path: Path, content: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _age_tree(root: Path, seconds: float = 60) -> None:
+    """把目录树的 mtime 调到过去，让扫描缓存可信。"""
+    past = time.time() - seconds
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+        os.utime(dirpath, (past, past))
+
+
+class TestScanCodebase:
+    """代码库扫描测试类。"""
+
+    def test_detects_languages_and_skips_ignored_directories(self, temp_dir):
+        """测试统计各语言文件数，默认排除目录和 .gitignore 中的目录不参与统计。"""
+        project = temp_dir / "project"
+        _write(project / "src" / "app.py")
+        _write(project / "src" / "models.py")
+        _write(project / "web" / "index.ts")
+        _write(project / "node_modules" / "lib" / "index.js")
+        _write(project / "venv" / "lib" / "site.py")
+        _write(project / ".gitignore", "generated/\n")
+        _write(project / "generated" / "out.py")
+        _write(project / ".github" / "ci.yml")
+
+        result = scan_codebase(project)
+
+        assert result["language"] == "python"
+        assert result["languages"] == {"python": 2, "typescript": 1}
+        assert result["file_count"] == 3
+        assert result["structure"] == ["src", "web"]
+
+    def test_configured_excludes(self, temp_dir):
+        """测试追加的忽略规则。"""
+        project = temp_dir / "project"
+        _write(project / "src" / "main.go")
+        _write(project / "third_party" / "lib.go")
+
+        result = scan_codebase(project, excludes=["third_party/"])
+
+        assert result["languages"] == {"go": 1}
+
+    def test_detects_frameworks_from_manifests(self, temp_dir):
+        """测试根据清单文件识别框架，根目录清单优先。"""
+        project = temp_dir / "project"
+        _write(project / "requirements.txt", "Django==4.2\nrequests>=2\n")
+        _write(
+            project / "frontend" / "package.json",
+            json.dumps({"dependencies": {"react": "^18", "next": "14"}}),
+        )
+        _write(project / "frontend" / "tsconfig.json", "{}")
+
+        result = scan_codebase(project)
+
+        assert result["frameworks"] == ["django", "next.js", "react"]
+        assert result["framework"] == "django"
+        assert result["manifests"] == [
+            "requirements.txt",
+            "frontend/package.json",
+            "frontend/tsconfig.json",
+        ]
+        # 没有源文件时使用根目录清单文件的语言
+        assert result["language"] == "python"
+
+    def test_standard_framework_fallback(self, temp_dir):
+        """测试没有识别到框架时使用 <语言>-standard。"""
+        project = temp_dir / "project"
+        _write(project / "requirements.txt", "requests\n")
+
+        result = scan_codebase(project)
+
+        assert result["framework"] == "python-standard"
+
+    def test_missing_project(self, temp_dir):
+        """测试项目目录不存在时返回 unknown。"""
+        result = scan_codebase(temp_dir / "missing")
+
+        assert result["language"] == "unknown"
+        assert result["framework"] == "unknown"
+        assert result["structure"] == []
+
+    def test_unchanged_tree_uses_cache(self, temp_dir):
+        """测试代码库未变化时复用文件索引，不重新列出目录。"""
+        project = temp_dir / "project"
+        cache_dir = temp_dir / "cache"
+        _write(project / "src" / "pkg" / "a.py")
+        _write(project / "tests" / "test_a.py")
+        _age_tree(project)
+
+        first = scan_codebase(project, cache_dir=cache_dir)
+        second = scan_codebase(project, cache_dir=cache_dir)
+
+        assert first["scan_stats"]["rescanned"] == 4
+        assert second["scan_stats"] == {"directories": 4, "rescanned": 0, "files": 2}
+        assert second["languages"] == first["languages"] == {"python": 2}
@@ -0,0 +1,51 @@
+"""内容哈希缓存测试。"""
+
+import os
+import time
+
+from src.utils.content_cache import ContentHashLRUCache
+
+
+class TestContentHashLRUCache:
+    """内容哈希缓存测试类。"""
+
+    def test_key_depends_on_namespace_name_and_content(self, temp_dir):
+        """测试缓存键由命名空间、文件名和内容决定。"""
+        cache = ContentHashLRUCache(temp_dir, "ns:1")
+
+        key = cache.key("a.py", b"x = 1\n")
+
+        assert key == cache.key("a.py", b"x = 1\n")
+        assert key != cache.key("a.py", b"x = 2\n")
+        assert key != cache.key("__init__.py", b"x = 1\n")
+        assert key != ContentHashLRUCache(temp_dir, "ns:2").key("a.py", b"x = 1\n")
+        assert cache.key("ab", "c") != cache.key("a", "bc")
+
+    def test_put_and_get(self, temp_dir):
+        """测试保存后读取，统计命中和未命中次数。"""
+        cache = ContentHashLRUCache(temp_dir / "cache", "ns")
+        key = cache.key("a.py", b"x")
+
+        assert cache.get(key) is None
+        cache.put(key, {"findings": []})
+
+        assert cache.get(key) == {"findings": []}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        """测试超过上限时淘汰最久未使用的条目，命中会更新使用时间。"""
+        cache = ContentHashLRUCache(temp_dir, "ns", max_entries=2)
+        keys = [cache.key(f"{i}.py", b"") for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, {"i": i})
+            past = time.time() - 100 + i
+            os.utime(temp_dir / f"{key}.json", (past, past))
+        assert cache.get(keys[0]) == {"i": 0}
+
+        cache.put(keys[2], {"i": 2})
+        removed = cache.evict()
+
+        assert removed == 1
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == {"i": 0}
+        assert cache.get(keys[2]) == {"i": 2}
@@ -0,0 +1,202 @@
+"""项目文件索引测试。"""
+
+import os
+import time
+from pathlib import Path
+
+from src.utils.file_index import (
+    FileIndex,
+    get_file_index,
+    is_ignored,
+    is_test_file,
+    parse_ignore_rules,
+)
+
+
+def _write(path: Path, content: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _age_tree(root: Path, seconds: float = 60) -> None:
+    """把目录树的 mtime 调到过去，让索引可信。"""
+    past = time.time() - seconds
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+        os.utime(dirpath, (past, past))
+
+
+class TestIgnoreRules:
+    """忽略规则测试类。"""
+
+    def test_basename_and_anchored_patterns(self):
+        """测试不带斜杠的规则匹配任意层级，带斜杠的规则相对所在目录。"""
+        rules = parse_ignore_rules(["*.log", "/build", "docs/generated/"])
+
+        assert is_ignored(rules, "a/b/debug.log", is_dir=False)
+        assert is_ignored(rules, "build", is_dir=True)
+        assert not is_ignored(rules, "src/build", is_dir=True)
+        assert is_ignored(rules, "docs/generated", is_dir=True)
+        assert not is_ignored(rules, "docs/generated", is_dir=False)
+
+    def test_negation_and_double_star(self):
+        """测试否定规则和 ** 通配符。"""
+        rules = parse_ignore_rules(["*.py", "!keep.py", "**/fixtures/**"])
+        rules += parse_ignore_rules(["local.txt"], base="sub")
+
+        assert is_ignored(rules, "src/a.py", is_dir=False)
+        assert not is_ignored(rules, "src/keep.py", is_dir=False)
+        assert is_ignored(rules, "tests/fixtures/data.json", is_dir=False)
+        assert is_ignored(rules, "sub/local.txt", is_dir=False)
+
+
+class TestIsTestFile:
+    """测试文件识别测试类。"""
+
+    def test_test_file_names_and_directories(self):
+        """测试常见测试命名和测试目录。"""
+        assert is_test_file("test_login.py")
+        assert is_test_file("pkg/login_test.go")
+        assert is_test_file("web/login.spec.ts")
+        assert is_test_file("src/LoginTest.java")
+        assert is_test_file("tests/helpers.py")
+        assert not is_test_file("src/login.py")
+        assert not is_test_file("src/contest.py")
+
+
+class TestFileIndex:
+    """文件索引测试类。"""
+
+    def test_indexes_files_with_metadata(self, temp_dir):
+        """测试记录路径、大小、mtime、语言和是否为测试文件，忽略的目录不进入。"""
+        project = temp_dir / "project"
+        _write(project / "src" / "app.py", "print(1)\n")
+        _write(project / "tests" / "test_app.py")
+        _write(project / "README.md")
+        _write(project / "node_modules" / "lib" / "index.js")
+        _write(project / ".gitignore", "*.log\n")
+        _write(project / "debug.log")
+
+        index = FileIndex(project)
+        index.refresh()
+
+        files = {f["path"]: f for f in index.files()}
+        assert sorted(files) == [
+            ".gitignore",
+            "README.md",
+            "src/app.py",
+            "tests/test_app.py",
+        ]
+        app = files["src/app.py"]
+        assert app["size"] == 9
+        assert app["mtime"] == (project / "src" / "app.py").stat().st_mtime_ns
+        assert app["language"] == "python"
+        assert app["is_test"] is False
+        assert files["README.md"]["language"] is None
+        assert [f["path"] for f in index.files(language="python", is_test=True)] == [
+            "tests/test_app.py"
+        ]
+        assert index.directories() == ["src", "tests"]
+
+    def test_unchanged_tree_is_not_relisted(self, temp_dir):
+        """测试项目未变化时不重新列出目录，也不重写索引文件。"""
+        project = temp_dir / "project"
+        index_file = temp_dir / "index.json"
+        _write(project / "src" / "pkg" / "a.py")
+        _write(project / "tests" / "test_a.py")
+        _age_tree(project)
+        index = FileIndex(project, index_file)
+        assert index.refresh()["rescanned"] == 4
+        saved_mtime = index_file.stat().st_mtime_ns
+
+        stats = index.refresh()
+
+        assert stats == {"directories": 4, "rescanned": 0, "files": 2}
+        assert index_file.stat().st_mtime_ns == saved_mtime
+
+    def test_persisted_index_is_reused(self, temp_dir):
+        """测试新的索引对象（例如另一个进程）从索引文件增量刷新。"""
+        project = temp_dir / "project"
+        index_file = temp_dir / "index.json"
+        _write(project / "src" / "a.py")
+        _age_tree(project)
+        FileIndex(project, index_file).refresh()
+
+        index = FileIndex(project, index_file)
+        stats = index.refresh()
+
+        assert stats["rescanned"] == 0
+        assert [f["path"] for f in index.files()] == ["src/a.py"]
+
+    def test_only_changed_directory_is_relisted(self, temp_dir):
+        """测试只重新列出 mtime 变化的目录。"""
+        project = temp_dir / "project"
+        _write(project / "src" / "pkg" / "a.py")
+        _write(project / "tests" / "test_a.py")
+        _age_tree(project)
+        index = FileIndex(project, temp_dir / "index.json")
+        index.refresh()
+
+        _write(project / "src" / "pkg" / "b.rs")
+        stats = index.refresh()
+
+        assert stats["rescanned"] == 1
+        assert [f["path"] for f in index.files(language="rust")] == ["src/pkg/b.rs"]
+
+    def test_modified_file_updates_size_without_relisting(self, temp_dir):
+        """测试修改文件内容（目录 mtime 不变）时更新大小和 mtime。"""
+        project = temp_dir / "project"
+        _write(project / "src" / "a.py", "x = 1\n")
+        _age_tree(project)
+        index = FileIndex(project, temp_dir / "index.json")
+        index.refresh()
+
+        (project / "src" / "a.py").write_text("x = 100\n")
+        stats = index.refresh()
+
+        assert stats["rescanned"] == 0
+        assert index.files()[0]["size"] == 8
+
+    def test_gitignore_change_relists_subtree(self, temp_dir):
+        """测试 .gitignore 变化时重新列出整个子树。"""
+        project = temp_dir / "project"
+        _write(project / ".gitignore", "")
+        _write(project / "src" / "gen" / "a.py")
+        _write(project / "src" / "b.py")
+        _age_tree(project)
+        index = FileIndex(project, temp_dir / "index.json")
+        index.refresh()
+
+        # 修改文件内容不会改变目录 mtime
+        (project / ".gitignore").write_text("gen/\n")
+        _age_tree(project, seconds=30)
+        index.refresh()
+
+        assert [f["path"] for f in index.files(language="python")] == ["src/b.py"]
+
+    def test_changed_excludes_rebuild_index(self, temp_dir):
+        """测试忽略规则变化时重建索引。"""
+        project = temp_dir / "project"
+        index_file = temp_dir / "index.json"
+        _write(project / "src" / "a.py")
+        _write(project / "vendor" / "b.py")
+        _age_tree(project)
+        FileIndex(project, index_file).refresh()
+
+        index = FileIndex(project, index_file, excludes=["vendor/"])
+        stats = index.refresh()
+
+        assert stats["rescanned"] == 2
+        assert [f["path"] for f in index.files()] == ["src/a.py"]
+
+    def test_get_file_index_reuses_index_in_process(self, temp_dir):
+        """测试同一进程内同一项目复用索引对象。"""
+        project = temp_dir / "project"
+        _write(project / "a.py")
+
+        first = get_file_index(project, temp_dir / "cache")
+        second = get_file_index(project, temp_dir / "cache")
+
+        assert first is second
+        assert (temp_dir / "cache" / "file-index").is_dir()
@@ -1,13 +1,39 @@
 """文件锁工具测试 - TDD 第一步：编写失败的测试。"""
 
 import json
+import multiprocessing
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import pytest
 
-from src.utils.file_lock import FileLockError, file_lock, read_lock
+from src.utils.file_lock import (
+    FileLockError,
+    _backoff_delay,
+    file_lock,
+    get_lock_stats,
+    read_lock,
+    reset_lock_stats,
+)
+
+
+def _increment_worker(counter_file: str, iterations: int) -> None:
+    """压力测试子进程：在文件锁内读取-修改-写入计数器（非原子写入）。"""
+    path = Path(counter_file)
+    for _ in range(iterations):
+        with file_lock(path):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            data["value"] += 1
+            path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def _read_worker(counter_file: str, iterations: int) -> None:
+    """压力测试子进程：在读锁内读取计数器，读到写了一半的文件会解析失败。"""
+    path = Path(counter_file)
+    for _ in range(iterations):
+        with read_lock(path):
+            json.loads(path.read_text(encoding="utf-8"))
 
 
 class TestFileLock:
@@ -43,12 +69,57 @@ class TestFileLock:
         test_file = temp_dir / "test.json"
         test_file.write_text('{"value": 0}', encoding="utf-8")
 
+        def try_lock():
+            with file_lock(test_file, timeout=0.1):
+                pass
+
+        # Act & Assert
+        # 在锁内从其他线程尝试获取锁（应该超时）
+        with (
+            file_lock(test_file, timeout=0.1),
+            ThreadPoolExecutor(max_workers=1) as executor,
+            pytest.raises(FileLockError),
+        ):
+            executor.submit(try_lock).result()
+
+    def test_file_lock_is_reentrant_in_same_thread(self, temp_dir):
+        """测试同一线程嵌套获取同一文件的锁不会等待自己释放。"""
+        # Arrange
+        test_file = temp_dir / "test.json"
+        test_file.write_text('{"value": 0}', encoding="utf-8")
+
+        def try_lock():
+            with file_lock(test_file, timeout=0.05):
+                pass
+
         # Act & Assert
-        with file_lock(test_file, timeout=0.1):
-            # 在锁内尝试再次获取锁（应该超时）
-            with pytest.raises(FileLockError):
-                with file_lock(test_file, timeout=0.1):
-                    pass
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with file_lock(test_file, timeout=0.1):
+                with (
+                    file_lock(test_file, timeout=0.1),
+                    read_lock(test_file, timeout=0.1),
+                ):
+                    test_file.write_text('{"value": 1}', encoding="utf-8")
+                # 内层退出后锁仍由外层持有
+                with pytest.raises(FileLockError):
+                    executor.submit(try_lock).result()
+            # 最外层退出后锁被真正释放
+            executor.submit(try_lock).result()
+
+        assert test_file.read_text(encoding="utf-8") == '{"value": 1}'
+
+    def test_file_lock_inside_read_lock_is_rejected(self, temp_dir):
+        """测试持有读锁时获取同一文件的写锁会立即报错（而不是死锁）。"""
+        # Arrange
+        test_file = temp_dir / "test.json"
+
+        # Act & Assert
+        with (
+            read_lock(test_file),
+            pytest.raises(FileLockError, match="持有读锁"),
+            file_lock(test_file),
+        ):
+            pass
 
     def test_read_lock_allows_multiple_readers(self, temp_dir):
         """测试读锁允许多个读者。"""
@@ -165,8 +236,11 @@ class TestFileLock:
             # 锁文件应该在锁期间存在
             assert lock_file.exists()
 
-        # Assert - 锁文件应该在释放后删除
-        assert not lock_file.exists()
+        # Assert - 锁文件释放后保留，后续加锁的进程始终锁同一个文件
+        assert lock_file.exists()
+        lock_inode = lock_file.stat().st_ino
+        with file_lock(test_file):
+            assert lock_file.stat().st_ino == lock_inode
 
     def test_file_lock_handles_missing_file(self, temp_dir):
         """测试文件锁处理不存在的文件。"""
@@ -401,3 +475,106 @@ class TestFileLock:
             data = test_file.read_text(encoding="utf-8")
 
         assert data == '{"value": 0}'
+
+    def test_backoff_delay_grows_exponentially_and_is_capped(self):
+        """测试退避间隔按指数增长且不超过最大重试间隔。"""
+        # Act
+        delays = [_backoff_delay(attempt, 0.1) for attempt in range(12)]
+
+        # Assert
+        assert 0.0005 <= delays[0] <= 0.001
+        assert 0.004 <= delays[3] <= 0.008
+        assert all(0.05 <= delay <= 0.1 for delay in delays[7:])
+
+    def test_contended_lock_is_acquired_soon_after_release(self, temp_dir):
+        """测试锁释放后等待者很快获取锁，并记录竞争统计。"""
+        # Arrange
+        test_file = temp_dir / "test.json"
+        reset_lock_stats()
+        released_at = []
+
+        def holder():
+            with file_lock(test_file):
+                time.sleep(0.05)
+                released_at.append(time.monotonic())
+
+        # Act
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(holder)
+            time.sleep(0.01)  # 确保持有者先获取锁
+            with file_lock(test_file):
+                acquired_at = time.monotonic()
+            future.result()
+
+        # Assert
+        assert acquired_at - released_at[0] < 0.1
+        stats = get_lock_stats()["exclusive"]
+        assert stats["acquisitions"] == 2
+        assert stats["contended"] == 1
+        assert stats["retries"] > 0
+        assert stats["max_wait"] >= 0.03
+        assert stats["timeouts"] == 0
+
+    def test_lock_stats_record_timeouts(self, temp_dir):
+        """测试读锁超时计入统计。"""
+        # Arrange
+        test_file = temp_dir / "test.json"
+        reset_lock_stats()
+
+        # Act
+        def try_read():
+            with read_lock(test_file, timeout=0.05):
+                pass
+
+        with (
+            ThreadPoolExecutor(max_workers=1) as executor,
+            file_lock(test_file),
+            pytest.raises(FileLockError, match="读锁"),
+        ):
+            executor.submit(try_read).result()
+
+        # Assert
+        stats = get_lock_stats()
+        assert stats["shared"]["timeouts"] == 1
+        assert stats["shared"]["acquisitions"] == 0
+        assert stats["shared"]["total_wait"] >= 0.05
+
+    @pytest.mark.slow
+    def test_multi_process_stress(self, temp_dir, capsys):
+        """多进程压力测试：并发写入不丢失更新，读取不会读到中间状态，并统计吞吐量。"""
+        # Arrange
+        counter_file = temp_dir / "counter.json"
+        counter_file.write_text('{"value": 0}', encoding="utf-8")
+        writers, readers, iterations = 6, 2, 100
+        processes = [
+            multiprocessing.Process(
+                target=_increment_worker, args=(str(counter_file), iterations)
+            )
+            for _ in range(writers)
+        ] + [
+            multiprocessing.Process(
+                target=_read_worker, args=(str(counter_file), iterations)
+            )
+            for _ in range(readers)
+        ]
+
+        # Act
+        start = time.monotonic()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+        elapsed = time.monotonic() - start
+
+        # Assert
+        assert [process.exitcode for process in processes] == [0] * len(processes)
+        final_data = json.loads(counter_file.read_text(encoding="utf-8"))
+        assert final_data["value"] == writers * iterations
+
+        operations = (writers + readers) * iterations
+        with capsys.disabled():
+            print(
+                f"\n文件锁吞吐量: {operations / elapsed:.0f} 次/秒 "
+                f"({writers} 个写进程 + {readers} 个读进程, "
+                f"共 {operations} 次加锁, {elapsed:.2f} 秒)"
+            )
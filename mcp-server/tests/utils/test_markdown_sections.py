@@ -0,0 +1,67 @@
+"""Markdown 章节解析测试。"""
+
+from src.utils.markdown_sections import SUMMARY_LINES, parse_sections
+
+
+class TestParseSections:
+    """标题树解析测试类。"""
+
+    def test_heading_tree(self):
+        """测试构建标题树，代码块中的 # 行不是标题。"""
+        lines = [
+            "# TRD",
+            "## 实现方案",
+            "概述",
+            "### 功能1",
+            "```",
+            "# 注释",
+            "```",
+            "### 功能2 ##",
+            "## 测试",
+        ]
+
+        sections = parse_sections(lines)
+
+        assert [(s["level"], s["title"], s["line"]) for s in sections] == [
+            (1, "TRD", 1),
+            (2, "实现方案", 2),
+            (3, "功能1", 4),
+            (3, "功能2", 8),
+            (2, "测试", 9),
+        ]
+        root, plan, first, second, test = sections
+        assert root["parent_id"] is None
+        assert root["children"] == [plan["id"], test["id"]]
+        assert plan["children"] == [first["id"], second["id"]]
+        assert first["parent_id"] == plan["id"]
+        assert first["summary"] == []
+        assert plan["summary"] == ["概述"]
+
+    def test_sizes(self):
+        """测试章节大小和包含下级章节的总大小。"""
+        sections = parse_sections(["## A", "abc", "### B", "de", "## C"])
+
+        a, b, c = sections
+        assert a["size"] == len("abc\n")
+        assert b["total_size"] == len("### B\nde\n")
+        assert a["total_size"] == len("## A\nabc\n### B\nde\n")
+        assert c["total_size"] == len("## C\n")
+
+    def test_ids_are_stable(self):
+        """测试章节 ID 只取决于标题路径，同名章节按出现顺序区分。"""
+        before = parse_sections(["## 功能", "### 登录", "## 功能", "### 登录"])
+        after = parse_sections(["# 新标题", "前言"] + ["## 功能", "### 登录"])
+
+        ids = [s["id"] for s in before]
+        assert len(set(ids)) == 4
+        assert parse_sections(["## 功能", "### 登录"])[1]["id"] == ids[1]
+        assert after[2]["id"] != ids[1]  # 上级路径变化
+
+    def test_summary_is_bounded(self):
+        """测试摘要只保留前几个非空行。"""
+        lines = ["## 功能"] + [f"第 {i} 行" for i in range(10)]
+
+        section = parse_sections(lines)[0]
+
+        assert len(section["summary"]) == SUMMARY_LINES
+        assert section["size"] == sum(len(line) + 1 for line in lines[1:])
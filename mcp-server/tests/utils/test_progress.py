@@ -0,0 +1,63 @@
+"""进度报告工具测试。"""
+
+from src.utils.progress import progress_reporter, progress_scope, report_progress
+from src.utils.task_scheduler import run_with_dependencies
+
+
+class TestProgress:
+    """进度报告工具测试类。"""
+
+    def test_report_without_reporter_is_noop(self):
+        """测试未设置回调时报告进度不做任何事。"""
+        # Act & Assert（不抛出异常）
+        report_progress(1, 2, "无回调")
+
+    def test_reports_pass_through_and_scopes_map_into_parent_range(self):
+        """测试最外层进度原样转发，嵌套调用的进度映射到父级区间。"""
+        # Arrange
+        reports = []
+
+        # Act
+        with progress_reporter(lambda *args: reports.append(args)):
+            report_progress(4, 8, "步骤5")
+            with progress_scope(4, 8):
+                report_progress(1, 4, "任务1")
+                with progress_scope(2, 4):
+                    report_progress(1, 2, "子任务")
+            report_progress(5, 8, "步骤6")
+        report_progress(8, 8, "回调已移除")
+
+        # Assert
+        assert reports == [
+            (4, 8, "步骤5"),
+            (4.25, 8, "任务1"),
+            (4.625, 8, "子任务"),
+            (5, 8, "步骤6"),
+        ]
+
+    def test_callback_errors_do_not_propagate(self):
+        """测试回调出错不影响工具执行。"""
+
+        # Arrange
+        def broken(*args):
+            raise RuntimeError("连接已断开")
+
+        # Act & Assert
+        with progress_reporter(broken):
+            report_progress(1, 1, "完成")
+
+    def test_scheduler_threads_inherit_reporter(self):
+        """测试调度器工作线程继承调用方的进度回调。"""
+        # Arrange
+        reports = []
+
+        def run(task_id):
+            report_progress(1, 1, task_id)
+            return True
+
+        # Act
+        with progress_reporter(lambda *args: reports.append(args)):
+            run_with_dependencies(["a", "b", "c"], {}, run, max_workers=3)
+
+        # Assert
+        assert sorted(message for _, _, message in reports) == ["a", "b", "c"]
@@ -0,0 +1,129 @@
+"""需求文档下载测试（使用本地 HTTP 服务器）。"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.utils.requirement_fetcher import (
+    RequirementFetcher,
+    close_requirement_clients,
+    is_http_url,
+)
+
+
+class _Document:
+    """本地服务器提供的文档。"""
+
+    def __init__(self) -> None:
+        self.body = "<h1>需求</h1><p>第一版</p>".encode("gbk")
+        self.content_type = "text/html; charset=gbk"
+        self.etag = '"v1"'
+        self.last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+        self.requests: list[dict] = []
+
+
+@pytest.fixture
+def server():
+    """启动本地 HTTP 服务器，支持 ETag / Last-Modified 条件请求。"""
+    document = _Document()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            document.requests.append(dict(self.headers))
+            if self.path == "/missing":
+                self.send_response(404)
+                self.end_headers()
+                return
+            if self.path == "/redirect":
+                self.send_response(302)
+                self.send_header("Location", "/req.html")
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == document.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", document.content_type)
+            self.send_header("Content-Length", str(len(document.body)))
+            if document.etag:
+                self.send_header("ETag", document.etag)
+            self.send_header("Last-Modified", document.last_modified)
+            self.end_headers()
+            self.wfile.write(document.body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    document.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        yield document
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        close_requirement_clients()
+
+
+class TestRequirementFetcher:
+    """需求文档下载器测试类。"""
+
+    def test_is_http_url(self):
+        """测试 URL 判断。"""
+        assert is_http_url("https://example.com/req")
+        assert not is_http_url("/tmp/req.md")
+        assert not is_http_url("ftp://example.com/req")
+
+    def test_conditional_get_uses_cache(self, temp_dir, server):
+        """测试再次下载时发送条件请求，304 时使用缓存。"""
+        fetcher = RequirementFetcher(temp_dir / "cache", timeout=5)
+        url = f"{server.base_url}/req.html"
+
+        first = fetcher.fetch(url)
+        second = fetcher.fetch(url)
+
+        assert first["status"] == "downloaded"
+        assert first["content_type"] == "text/html"
+        assert first["encoding"] == "gbk"
+        assert Path(first["path"]).read_bytes() == server.body
+        assert second["status"] == "not_modified"
+        assert second["path"] == first["path"]
+        assert "If-None-Match" not in server.requests[0]
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert server.requests[1]["If-Modified-Since"] == server.last_modified
+
+    def test_changed_document_is_downloaded_again(self, temp_dir, server):
+        """测试文档变化后重新下载并更新缓存。"""
+        fetcher = RequirementFetcher(temp_dir / "cache", timeout=5)
+        url = f"{server.base_url}/redirect"
+        fetcher.fetch(url)
+        server.body = "<h1>需求</h1><p>第二版</p>".encode("gbk")
+        server.etag = '"v2"'
+
+        result = fetcher.fetch(url)
+
+        assert result["status"] == "downloaded"
+        assert Path(result["path"]).read_bytes() == server.body
+
+    def test_falls_back_to_cache_on_error(self, temp_dir, server):
+        """测试下载失败时使用缓存，没有缓存时抛出 ValidationError。"""
+        cache_dir = temp_dir / "cache"
+        url = f"{server.base_url}/req.html"
+        RequirementFetcher(cache_dir, timeout=5).fetch(url)
+
+        # 超过大小上限（也会被当作下载失败）
+        server.etag = '"v2"'
+        result = RequirementFetcher(cache_dir, timeout=5, max_bytes=4).fetch(url)
+        assert result["status"] == "stale"
+        assert Path(result["path"]).read_bytes() == server.body
+
+        with pytest.raises(ValidationError, match="下载需求文档失败"):
+            RequirementFetcher(cache_dir, timeout=5).fetch(f"{server.base_url}/missing")
+        assert not list(cache_dir.glob("*.tmp"))
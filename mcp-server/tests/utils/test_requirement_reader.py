@@ -0,0 +1,120 @@
+"""需求文档读取测试。"""
+
+from src.utils.requirement_reader import (
+    FORMAT_HTML,
+    FORMAT_MARKDOWN,
+    FORMAT_TEXT,
+    MAX_OUTLINE_SECTIONS,
+    detect_format,
+    parse_requirement,
+    read_requirement,
+)
+
+
+class TestDetectFormat:
+    """文档格式判断测试类。"""
+
+    def test_suffix_takes_precedence(self):
+        """测试按后缀判断格式。"""
+        assert detect_format("需求.md", "<html>") == FORMAT_MARKDOWN
+        assert detect_format("export.HTML") == FORMAT_HTML
+
+    def test_sniff_content(self):
+        """测试没有已知后缀时按内容判断格式。"""
+        assert detect_format("req", "  <!DOCTYPE html><html>") == FORMAT_HTML
+        assert detect_format("req.txt", "说明\n## 功能\n") == FORMAT_MARKDOWN
+        assert detect_format("req.txt", "纯文本需求") == FORMAT_TEXT
+
+
+class TestParseRequirement:
+    """需求文档解析测试类。"""
+
+    def test_markdown_outline(self):
+        """测试提取 Markdown 标题大纲，代码块中的标题被忽略。"""
+        chunks = [
+            "\n\n# 需求\n背景说明   \n\n\n\n## 功",
+            "能 1\n登录\n```\n# 不是标题\n```\n### 细节 ##\n内容\n",
+        ]
+
+        document = parse_requirement(chunks, FORMAT_MARKDOWN)
+
+        assert document["text"] == (
+            "# 需求\n背景说明\n\n## 功能 1\n登录\n```\n# 不是标题\n```\n### 细节 ##\n内容"
+        )
+        assert [(s["level"], s["title"], s["line"]) for s in document["outline"]] == [
+            (1, "需求", 1),
+            (2, "功能 1", 4),
+            (3, "细节", 9),
+        ]
+        assert document["outline"][0]["size"] == len("# 需求\n背景说明\n\n")
+        assert document["line_count"] == 10
+        assert document["truncated"] is False
+
+    def test_html_is_normalized(self):
+        """测试 HTML 转为 Markdown 风格文本（跨块的标签也能正确解析）。"""
+        chunks = [
+            "<html><head><title>标题</title><style>p {}</style></head><body><h1>用户",
+            "认证</h1><p>支持 &amp; 登录\n   注册</p><ul><li>短信</li><li>邮箱</li>",
+            "</ul><script>alert(1)</script><h2>接口</h2><p>REST<br>JSON</p></body></html>",
+        ]
+
+        document = parse_requirement(chunks, FORMAT_HTML)
+
+        assert document["text"] == (
+            "# 用户认证\n\n支持 & 登录 注册\n\n- 短信\n- 邮箱\n\n## 接口\n\nREST\nJSON"
+        )
+        assert [s["title"] for s in document["outline"]] == ["用户认证", "接口"]
+
+    def test_plain_text_has_no_outline(self):
+        """测试纯文本不提取大纲。"""
+        document = parse_requirement(["# 不是标题\n正文"], FORMAT_TEXT)
+
+        assert document["outline"] == []
+        assert document["text"] == "# 不是标题\n正文"
+
+    def test_text_is_bounded(self):
+        """测试只保留前 max_chars 个字符，但统计全部内容和大纲。"""
+        chunks = (f"## 章节 {i}\n{'x' * 100}\n" for i in range(1000))
+
+        document = parse_requirement(chunks, FORMAT_MARKDOWN, max_chars=50)
+
+        assert len(document["text"]) <= 50
+        assert document["truncated"] is True
+        assert document["line_count"] == 2000
+        assert document["total_chars"] > 100000
+        assert len(document["outline"]) == MAX_OUTLINE_SECTIONS
+
+    def test_long_lines_are_split(self):
+        """测试没有换行的超长内容被切分为多行。"""
+        document = parse_requirement(["a" * 40000], FORMAT_TEXT, max_chars=10)
+
+        assert document["line_count"] == 3
+        assert document["text"] == "a" * 10
+
+
+class TestReadRequirement:
+    """需求文档文件读取测试类。"""
+
+    def test_read_file_in_chunks(self, temp_dir):
+        """测试按块读取文件（去掉 BOM，非法编码被替换）。"""
+        path = temp_dir / "requirement.md"
+        path.write_bytes(
+            "\ufeff# 需求\r\n正文\r\n".encode("utf-8")
+            + b"\xff\n## \xe5\x8a\x9f\xe8\x83\xbd\n"
+        )
+
+        document = read_requirement(path, chunk_size=4)
+
+        assert document["format"] == FORMAT_MARKDOWN
+        assert document["text"] == "# 需求\n正文\n\ufffd\n## 功能"
+        assert [s["title"] for s in document["outline"]] == ["需求", "功能"]
+
+    def test_read_file_with_encoding_alias_or_unknown_encoding(self, temp_dir):
+        """测试编码别名（如 UTF8）同样去掉 BOM，未知编码按 UTF-8 读取。"""
+        path = temp_dir / "requirement.md"
+        path.write_bytes("\ufeff# 需求\n".encode("utf-8"))
+
+        for encoding in ("UTF8", "no-such-encoding"):
+            document = read_requirement(path, encoding=encoding)
+
+            assert document["text"] == "# 需求"
@@ -0,0 +1,212 @@
+"""代码审查引擎测试。"""
+
+import pytest
+
+from src.utils import review_engine
+from src.utils.content_cache import ContentHashLRUCache
+from src.utils.review_engine import (
+    SEVERITY_ERROR,
+    SEVERITY_INFO,
+    SEVERITY_WARNING,
+    cache_namespace,
+    get_rules,
+    review_file,
+    review_files,
+    review_rule,
+    summarize_findings,
+)
+
+
+def _rules(result: dict) -> list[tuple[str, int]]:
+    return [(finding["rule"], finding["line"]) for finding in result["findings"]]
+
+
+class TestReviewRules:
+    """内置规则测试类。"""
+
+    def test_clean_file_has_no_findings(self, temp_dir):
+        """测试规范的文件没有发现。"""
+        path = temp_dir / "clean.py"
+        path.write_text(
+            '"""模块。"""\n\nimport os\n\n\n'
+            'def cwd():\n    """当前目录。"""\n    return os.getcwd()\n'
+        )
+
+        result = review_file(str(path))
+
+        assert result["status"] == "ok"
+        assert result["findings"] == []
+
+    def test_bare_except_and_unused_import(self, temp_dir):
+        """测试不带异常类型的 except 和未使用的导入。"""
+        path = temp_dir / "bad.py"
+        path.write_text(
+            '"""模块。"""\n'
+            "import json\n"
+            "from typing import Optional\n"
+            "\n\n"
+            "def _load() -> 'Optional[int]':\n"
+            "    try:\n"
+            "        return 1\n"
+            "    except:\n"
+            "        return None\n"
+        )
+
+        result = review_file(str(path))
+
+        assert _rules(result) == [("unused_import", 2), ("bare_except", 9)]
+        assert all(f["severity"] == SEVERITY_WARNING for f in result["findings"])
+
+    def test_missing_docstring(self, temp_dir):
+        """测试公开的模块、类、方法缺少文档字符串，私有函数不检查。"""
+        path = temp_dir / "nodoc.py"
+        path.write_text(
+            "class Service:\n"
+            "    def run(self):\n"
+            "        return 1\n"
+            "\n\n"
+            "def _helper():\n"
+            "    return 2\n"
+        )
+
+        result = review_file(str(path), rules=["missing_docstring"])
+
+        assert [f["message"] for f in result["findings"]] == [
+            "模块缺少文档字符串",
+            "类 Service 缺少文档字符串",
+            "函数 Service.run 缺少文档字符串",
+        ]
+        assert result["findings"][0]["severity"] == SEVERITY_INFO
+
+    def test_complexity(self, temp_dir):
+        """测试圈复杂度超过上限的函数，嵌套函数单独计算。"""
+        branches = "".join(f"    if x == {i}:\n        return {i}\n" for i in range(4))
+        path = temp_dir / "complex.py"
+        path.write_text(
+            f"def outer(x):\n{branches}"
+            "    def inner(y):\n        return y if y else 0\n"
+            "    return inner(x)\n"
+        )
+
+        result = review_file(
+            str(path), rules=["complexity"], options={"max_complexity": 4}
+        )
+
+        assert [f["message"] for f in result["findings"]] == [
+            "函数 outer 圈复杂度为 5，超过 4"
+        ]
+
+    def test_file_errors_are_error_findings(self, temp_dir):
+        """测试文件不存在和语法错误是 error 级别，非 Python 文件只做文本检查。"""
+        broken = temp_dir / "broken.py"
+        broken.write_text("def broken(:\n    pass  # TODO\n")
+        notes = temp_dir / "notes.md"
+        notes.write_text("# 说明\n\nFIXME: 补充内容\n")
+
+        missing, broken_result, notes_result = review_files(
+            [str(temp_dir / "missing.py"), str(broken), str(notes)]
+        )
+
+        assert missing["status"] == "missing"
+        assert missing["findings"][0]["severity"] == SEVERITY_ERROR
+        assert broken_result["status"] == "syntax_error"
+        assert _rules(broken_result) == [("syntax", 1), ("todo", 2)]
+        assert _rules(notes_result) == [("todo", 3)]
+
+    def test_custom_rule(self, temp_dir, monkeypatch):
+        """测试注册自定义规则。"""
+        monkeypatch.setattr(review_engine, "_RULES", dict(review_engine._RULES))
+
+        @review_rule("no_print", SEVERITY_ERROR, "禁止使用 print")
+        def _check_print(source):
+            for lineno, line in enumerate(source.content.splitlines(), start=1):
+                if "print(" in line:
+                    yield lineno, "使用了 print"
+
+        path = temp_dir / "debug.py"
+        path.write_text("x = 1\nprint(x)\n")
+
+        result = review_file(str(path), rules=["no_print"])
+
+        assert get_rules()["no_print"].severity == SEVERITY_ERROR
+        assert _rules(result) == [("no_print", 2)]
+        assert summarize_findings(result["findings"]) == {
+            "error": 1,
+            "warning": 0,
+            "info": 0,
+        }
+
+
+class TestReviewFiles:
+    """并行审查测试类。"""
+
+    def test_process_pool_keeps_order(self, temp_dir):
+        """测试在进程池中审查多个文件，结果顺序与输入一致，进程池被复用。"""
+        paths = []
+        for i in range(review_engine.PROCESS_POOL_MIN_ITEMS):
+            path = temp_dir / f"m{i}.py"
+            path.write_text(f'"""模块 {i}。"""\n\nimport os{i % 2 and ", sys" or ""}\n')
+            paths.append(str(path))
+
+        try:
+            results = review_files(paths, rules=["unused_import"], workers=2)
+            pool = review_engine._pool
+            review_files(paths, rules=["unused_import"], workers=2)
+
+            assert pool is not None
+            assert review_engine._pool is pool
+        finally:
+            review_engine.shutdown_process_pool()
+
+        assert [result["file"] for result in results] == paths
+        assert [len(result["findings"]) for result in results] == [1, 2] * (
+            len(paths) // 2
+        )
+
+    def test_small_batch_runs_in_process(self, temp_dir, monkeypatch):
+        """测试文件少于 PROCESS_POOL_MIN_ITEMS 个时不创建进程池。"""
+        monkeypatch.setattr(
+            review_engine,
+            "_get_pool",
+            lambda workers: pytest.fail("不应该创建进程池"),
+        )
+        paths = []
+        for i in range(2):
+            path = temp_dir / f"s{i}.py"
+            path.write_text("import os\n")
+            paths.append(str(path))
+
+        results = review_files(paths, rules=["unused_import"], workers=4)
+
+        assert [len(result["findings"]) for result in results] == [1, 1]
+
+    def test_cache_skips_unchanged_files(self, temp_dir, monkeypatch):
+        """测试内容未变化的文件使用缓存结果，路径替换为当前路径。"""
+        cache_dir = temp_dir / "cache"
+        first = temp_dir / "a.py"
+        first.write_text('"""模块。"""\n\nimport os\n')
+        copy = temp_dir / "copy" / "a.py"
+        copy.parent.mkdir()
+        copy.write_text(first.read_text())
+        review_files(
+            [str(first)], cache=ContentHashLRUCache(cache_dir, cache_namespace())
+        )
+
+        reviewed = []
+        original = review_engine.review_file
+
+        def counting_review_file(path, *args):
+            reviewed.append(path)
+            return original(path, *args)
+
+        monkeypatch.setattr(review_engine, "review_file", counting_review_file)
+        changed = temp_dir / "b.py"
+        changed.write_text('"""模块。"""\n')
+        results = review_files(
+            [str(copy), str(changed)],
+            cache=ContentHashLRUCache(cache_dir, cache_namespace()),
+        )
+
+        assert reviewed == [str(changed)]
+        assert results[0]["findings"][0]["file"] == str(copy)
+        assert results[0]["findings"][0]["rule"] == "unused_import"
@@ -0,0 +1,66 @@
+"""任务依赖图测试。"""
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.utils.task_graph import build_task_graph, dependencies_of
+
+
+def _task(task_id, depends_on=None, size=None):
+    task = {"task_id": task_id, "status": "pending"}
+    if depends_on is not None:
+        task["depends_on"] = depends_on
+    if size is not None:
+        task["estimated_size"] = size
+    return task
+
+
+class TestTaskGraph:
+    """任务依赖图测试类。"""
+
+    def test_dependencies_of(self):
+        """测试读取单个或多个依赖。"""
+        assert dependencies_of(_task("a", "b")) == ["b"]
+        assert dependencies_of(_task("a", ["b", 1, "c"])) == ["b", "c"]
+        assert dependencies_of(_task("a")) == []
+
+    def test_levels_and_critical_path(self):
+        """测试拓扑分层和按权重计算的关键路径。"""
+        tasks = [
+            _task("t1", size=10),
+            _task("t2", ["t1"], size=5),
+            _task("t3", ["t1"], size=50),
+            _task("t4", ["t2", "t3"], size=1),
+            _task("t5", size=20),
+        ]
+
+        graph = build_task_graph(tasks)
+
+        assert graph["levels"] == [["t1", "t5"], ["t2", "t3"], ["t4"]]
+        assert graph["critical_path"] == ["t1", "t3", "t4"]
+        assert graph["critical_path_weight"] == 61
+        assert graph["dependencies"]["t4"] == ["t2", "t3"]
+
+    def test_external_and_self_dependencies_are_ignored(self):
+        """测试指向图外任务和自身的依赖视为已满足，任务没有大小时权重为 1。"""
+        graph = build_task_graph([_task("t1", ["t0", "t1"]), _task("t2", "t1")])
+
+        assert graph["levels"] == [["t1"], ["t2"]]
+        assert graph["dependencies"]["t1"] == []
+        assert graph["critical_path_weight"] == 2
+
+    def test_cycle_is_rejected(self):
+        """测试循环依赖抛出 ValidationError，错误信息包含无法排序的任务。"""
+        tasks = [_task("t1"), _task("t2", ["t3"]), _task("t3", ["t2"])]
+
+        with pytest.raises(ValidationError, match="循环依赖: t2, t3"):
+            build_task_graph(tasks)
+
+    def test_empty(self):
+        """测试空任务列表。"""
+        assert build_task_graph([]) == {
+            "dependencies": {},
+            "levels": [],
+            "critical_path": [],
+            "critical_path_weight": 0,
+        }
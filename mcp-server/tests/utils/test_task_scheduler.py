@@ -0,0 +1,119 @@
+"""依赖感知任务调度器测试。"""
+
+import threading
+import time
+
+from src.utils.task_scheduler import run_with_dependencies
+
+
+class TestRunWithDependencies:
+    """run_with_dependencies 测试类。"""
+
+    def test_runs_independent_tasks_concurrently_within_limit(self):
+        """测试独立任务并发执行，且同时运行的任务数不超过限制。"""
+        # Arrange
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def run(task_id):
+            with lock:
+                running.append(task_id)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(task_id)
+            return True
+
+        task_ids = [f"task-{i}" for i in range(8)]
+
+        # Act
+        start = time.monotonic()
+        results, skipped = run_with_dependencies(task_ids, {}, run, max_workers=4)
+        elapsed = time.monotonic() - start
+
+        # Assert
+        assert set(results) == set(task_ids)
+        assert skipped == {}
+        assert max(peak) == 4
+        assert elapsed < 0.05 * 8 / 2
+
+    def test_respects_dependencies(self):
+        """测试任务在依赖完成后才开始执行。"""
+        # Arrange
+        finished = []
+        started = {}
+
+        def run(task_id):
+            started[task_id] = list(finished)
+            time.sleep(0.01)
+            finished.append(task_id)
+            return True
+
+        dependencies = {"c": ["a", "b"], "d": ["c"], "b": ["a"]}
+
+        # Act
+        results, skipped = run_with_dependencies(
+            ["a", "b", "c", "d", "e"], dependencies, run, max_workers=3
+        )
+
+        # Assert
+        assert skipped == {}
+        assert len(results) == 5
+        assert "a" in started["b"]
+        assert {"a", "b"} <= set(started["c"])
+        assert "c" in started["d"]
+
+    def test_skips_dependents_of_failed_task(self):
+        """测试失败任务的所有下游任务被跳过，其他任务照常执行。"""
+        # Arrange
+        executed = []
+
+        def run(task_id):
+            executed.append(task_id)
+            return task_id != "a"
+
+        dependencies = {"b": ["a"], "c": ["b"], "d": []}
+
+        # Act
+        results, skipped = run_with_dependencies(
+            ["a", "b", "c", "d"], dependencies, run, max_workers=2
+        )
+
+        # Assert
+        assert sorted(executed) == ["a", "d"]
+        assert results == {"a": False, "d": True}
+        assert skipped == {
+            "b": "依赖任务未完成: a",
+            "c": "依赖任务未完成: a",
+        }
+
+    def test_reports_cycles_and_ignores_external_dependencies(self):
+        """测试循环依赖的任务被跳过，指向调度范围外的依赖视为已满足。"""
+        # Arrange
+        dependencies = {"a": ["b"], "b": ["a"], "c": ["done-earlier"]}
+
+        # Act
+        results, skipped = run_with_dependencies(
+            ["a", "b", "c"], dependencies, lambda task_id: True, max_workers=2
+        )
+
+        # Assert
+        assert results == {"c": True}
+        assert skipped == {"a": "存在循环依赖", "b": "存在循环依赖"}
+
+    def test_sequential_mode_runs_in_order_on_calling_thread(self):
+        """测试并发数为 1 时在当前线程中按顺序执行。"""
+        # Arrange
+        calls = []
+
+        def run(task_id):
+            calls.append((task_id, threading.current_thread().name))
+            return True
+
+        # Act
+        run_with_dependencies(["a", "b", "c"], {"a": ["c"]}, run, max_workers=1)
+
+        # Assert
+        current = threading.current_thread().name
+        assert calls == [("b", current), ("c", current), ("a", current)]
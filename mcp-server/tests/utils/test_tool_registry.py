@@ -0,0 +1,107 @@
+"""工具注册表测试。"""
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.utils.tool_registry import ToolRegistry
+
+
+class TestToolRegistry:
+    """工具注册表测试类。"""
+
+    @pytest.fixture
+    def registry(self):
+        """创建包含示例工具的注册表。"""
+        registry = ToolRegistry()
+
+        @registry.tool(
+            name="echo",
+            description="回显参数",
+            properties={
+                "message": {"type": "string"},
+                "count": {"type": "integer"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "enabled": {"type": "boolean"},
+            },
+            required=["message"],
+        )
+        def _echo(arguments: dict) -> dict:
+            return {"success": True, "message": arguments["message"]}
+
+        return registry
+
+    def test_register_and_dispatch(self, registry):
+        """测试注册后按名称分发。"""
+        # Act
+        result = registry.dispatch("echo", {"message": "hello"})
+
+        # Assert
+        assert result == {"success": True, "message": "hello"}
+        assert "echo" in registry
+        assert len(registry) == 1
+
+    def test_list_tools_is_built_once(self, registry):
+        """测试 Tool 列表只构建一次并缓存。"""
+        # Act
+        first = registry.list_tools()
+        second = registry.list_tools()
+
+        # Assert
+        assert first is second
+        assert first[0].name == "echo"
+        assert first[0].inputSchema["required"] == ["message"]
+
+    def test_register_invalidates_tool_cache(self, registry):
+        """测试注册新工具后 Tool 列表重新构建。"""
+        # Arrange
+        first = registry.list_tools()
+
+        # Act
+        registry.tool(name="noop", description="空操作")(lambda arguments: {})
+        second = registry.list_tools()
+
+        # Assert
+        assert first is not second
+        assert [tool.name for tool in second] == ["echo", "noop"]
+
+    def test_duplicate_registration_fails(self, registry):
+        """测试重复注册同名工具失败。"""
+        with pytest.raises(ValueError, match="工具重复注册"):
+            registry.tool(name="echo", description="重复")(lambda arguments: {})
+
+    def test_unknown_tool(self, registry):
+        """测试未知工具。"""
+        with pytest.raises(ValueError, match="未知工具"):
+            registry.dispatch("missing", {})
+
+    def test_missing_required_field(self, registry):
+        """测试缺少必填字段。"""
+        with pytest.raises(ValidationError, match="必填字段缺失或为空: message"):
+            registry.dispatch("echo", {})
+
+    @pytest.mark.parametrize(
+        "arguments",
+        [
+            {"message": 1},
+            {"message": "hi", "count": "3"},
+            {"message": "hi", "count": True},
+            {"message": "hi", "tags": "a"},
+            {"message": "hi", "tags": ["a", 1]},
+            {"message": "hi", "enabled": "yes"},
+        ],
+    )
+    def test_type_mismatch(self, registry, arguments):
+        """测试字段类型不匹配。"""
+        with pytest.raises(ValidationError, match="字段类型错误"):
+            registry.dispatch("echo", arguments)
+
+    def test_optional_fields_and_extra_fields_are_accepted(self, registry):
+        """测试可选字段缺失和额外字段不影响校验。"""
+        # Act
+        result = registry.dispatch(
+            "echo",
+            {"message": "hi", "count": 2, "tags": ["a"], "enabled": False, "x": 1},
+        )
+
+        # Assert
+        assert result["success"] is True
@@ -0,0 +1,137 @@
+"""工具工作池测试。"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core.config import Config
+from src.utils.worker_pool import WorkerPool
+
+
+class TestWorkerPool:
+    """工具工作池测试类。"""
+
+    @pytest.fixture
+    def pool(self, temp_dir, monkeypatch):
+        """创建工作池实例。"""
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setenv("TOOL_WORKER_THREADS", "4")
+        monkeypatch.setenv("TOOL_CONCURRENCY_LIMITS", "slow_tool=1")
+        pool = WorkerPool(config=Config())
+        yield pool
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_executes_off_event_loop_thread(self, pool):
+        """测试处理函数在工作线程中执行。"""
+        # Act
+        thread_name = await pool.run(
+            "any_tool", lambda: threading.current_thread().name
+        )
+
+        # Assert
+        assert thread_name != threading.current_thread().name
+        assert thread_name.startswith("mcp-tool")
+
+    @pytest.mark.asyncio
+    async def test_run_passes_arguments_and_returns_result(self, pool):
+        """测试参数传递和返回值。"""
+
+        def add(a, b, scale=1):
+            return (a + b) * scale
+
+        # Act
+        result = await pool.run("add", add, 1, 2, scale=10)
+
+        # Assert
+        assert result == 30
+
+    @pytest.mark.asyncio
+    async def test_run_propagates_exceptions(self, pool):
+        """测试处理函数的异常原样传播。"""
+
+        def fail():
+            raise ValueError("处理失败")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="处理失败"):
+            await pool.run("fail", fail)
+
+    @pytest.mark.asyncio
+    async def test_slow_tool_does_not_block_fast_tool(self, pool):
+        """测试慢工具执行期间，快工具仍然可以立即返回。"""
+        # Arrange
+        release = threading.Event()
+
+        def slow():
+            release.wait(timeout=5)
+            return "slow"
+
+        slow_future = asyncio.ensure_future(pool.run("slow_tool", slow))
+        await asyncio.sleep(0.01)
+
+        # Act
+        start = time.perf_counter()
+        fast_result = await pool.run("fast_tool", lambda: "fast")
+        elapsed = time.perf_counter() - start
+        release.set()
+
+        # Assert
+        assert fast_result == "fast"
+        assert elapsed < 0.5
+        assert await slow_future == "slow"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_serializes_tool(self, pool):
+        """测试按工具的并发限制。"""
+        # Arrange
+        active = []
+        max_active = []
+        lock = threading.Lock()
+
+        def slow():
+            with lock:
+                active.append(1)
+                max_active.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        # Act - slow_tool 限制为 1，其他工具不受限制
+        await asyncio.gather(*(pool.run("slow_tool", slow) for _ in range(3)))
+        limited_max = max(max_active)
+        max_active.clear()
+        await asyncio.gather(*(pool.run("other_tool", slow) for _ in range(3)))
+
+        # Assert
+        assert limited_max == 1
+        assert max(max_active) > 1
+
+    @pytest.mark.asyncio
+    async def test_shutdown_and_reuse(self, pool):
+        """测试关闭后再次使用会重新创建执行器。"""
+        # Arrange
+        await pool.run("tool", lambda: None)
+
+        # Act
+        pool.shutdown()
+        result = await pool.run("tool", lambda: "ok")
+
+        # Assert
+        assert result == "ok"
+
+    def test_config_parses_concurrency_limits(self, temp_dir, monkeypatch):
+        """测试并发限制配置解析（忽略格式错误的条目）。"""
+        # Arrange
+        monkeypatch.setenv("AGENT_ORCHESTRATOR_ROOT", str(temp_dir))
+        monkeypatch.setenv("TOOL_CONCURRENCY_LIMITS", "a=1, b=3,bad,c=x")
+        monkeypatch.setenv("TOOL_PROCESS_TOOLS", "analyze_coverage, ")
+
+        # Act
+        config = Config()
+
+        # Assert
+        assert config.tool_concurrency_limits == {"a": 1, "b": 3}
+        assert config.tool_process_tools == ["analyze_coverage"]